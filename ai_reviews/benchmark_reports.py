@@ -0,0 +1,165 @@
+#!/usr/bin/env python3
+"""
+Benchmark: report generation from the job-history store, streamed versus
+materialized, at growing history sizes.
+
+For each size a temporary JobStore is filled with synthetic jobs, then each
+writer runs in two modes:
+- streaming: rows are read lazily from store.iter_jobs() and written as they
+             come (markdown and CSV row by row, PDF one page table at a time)
+- legacy:    every row is loaded into a list first, the markdown is joined
+             into one string, and the PDF is a single Table over all rows
+             (the writers before the streaming rewrite)
+
+Wall time is measured on a plain run, peak Python memory on a second run
+under tracemalloc. The legacy PDF grows much faster than linearly, so it is
+skipped above --legacy_max jobs.
+
+Usage:
+    python ai_reviews/benchmark_reports.py --sizes 10,1000,50000
+    python ai_reviews/benchmark_reports.py --sizes 1000 --writers pdf --legacy_max 1000
+"""
+
+import argparse
+import contextlib
+import io
+import json
+import os
+import sys
+import tempfile
+import time
+import tracemalloc
+from datetime import datetime, timedelta
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+from job_store import JobStore
+from review_jobs import JOB_FIELDS, record_to_row, save_to_csv, save_to_markdown, save_to_pdf
+
+WRITERS = ("csv", "markdown", "pdf")
+PIPELINES = ("used-cars-training-pipeline", "used-cars-sweep", "batch-scoring")
+
+
+def fill_store(store: JobStore, count: int) -> None:
+    """Insert count synthetic jobs, one hour apart, in batches."""
+    start = datetime(2025, 1, 1)
+    for offset in range(0, count, 5000):
+        records = []
+        for i in range(offset, min(offset + 5000, count)):
+            created = start + timedelta(hours=i)
+            ended = created + timedelta(minutes=5 + i % 40)
+            records.append({
+                "name": f"hist_{i:06d}_{i * 2654435761 % 16**6:06x}",
+                "display_name": PIPELINES[i % len(PIPELINES)],
+                "status": "Failed" if i % 10 == 0 else "Completed",
+                "dataset": "azureml:used-cars-data:1",
+                "start_time": created.strftime("%Y-%m-%d %H:%M:%S"),
+                "end_time": ended.strftime("%Y-%m-%d %H:%M:%S"),
+                "created_at": created.isoformat(),
+                "started_at": created.isoformat(),
+                "ended_at": ended.isoformat(),
+            })
+        store.upsert_jobs(records)
+
+
+def legacy_markdown(jobs_data, output_path, workspace_name):
+    """Markdown built as a list of lines and written in one go."""
+    lines = ["# Azure ML Jobs Review", "", f"**Workspace:** {workspace_name}",
+             f"**Generated:** {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}", "",
+             "| Job ID | Display Name | Status | Dataset | Start Time | End Time |",
+             "|--------|--------------|--------|---------|------------|----------|"]
+    for job in jobs_data:
+        lines.append("| " + " | ".join(str(job[field]) for field in JOB_FIELDS) + " |")
+    with open(output_path, 'w') as f:
+        f.write('\n'.join(lines))
+
+
+def legacy_pdf(jobs_data, output_path, workspace_name):
+    """One Table over every row, laid out by SimpleDocTemplate."""
+    from reportlab.lib import colors
+    from reportlab.lib.pagesizes import letter, landscape
+    from reportlab.lib.styles import getSampleStyleSheet
+    from reportlab.lib.units import inch
+    from reportlab.platypus import SimpleDocTemplate, Table, TableStyle, Paragraph, Spacer
+
+    styles = getSampleStyleSheet()
+    table = Table([JOB_FIELDS] + [[job[field] for field in JOB_FIELDS] for job in jobs_data],
+                  colWidths=[1.5*inch, 1.8*inch, 1*inch, 1.8*inch, 1.5*inch, 1.5*inch])
+    table.setStyle(TableStyle([
+        ('BACKGROUND', (0, 0), (-1, 0), colors.grey),
+        ('TEXTCOLOR', (0, 0), (-1, 0), colors.whitesmoke),
+        ('ALIGN', (0, 0), (-1, -1), 'CENTER'),
+        ('FONTNAME', (0, 0), (-1, 0), 'Helvetica-Bold'),
+        ('FONTSIZE', (0, 0), (-1, 0), 10),
+        ('BOTTOMPADDING', (0, 0), (-1, 0), 12),
+        ('BACKGROUND', (0, 1), (-1, -1), colors.beige),
+        ('GRID', (0, 0), (-1, -1), 1, colors.black),
+        ('FONTNAME', (0, 1), (-1, -1), 'Helvetica'),
+        ('FONTSIZE', (0, 1), (-1, -1), 8),
+        ('VALIGN', (0, 0), (-1, -1), 'MIDDLE'),
+    ]))
+    SimpleDocTemplate(output_path, pagesize=landscape(letter)).build([
+        Paragraph(f"<b>Azure ML Jobs Review - {workspace_name}</b>", styles['Heading1']),
+        Spacer(1, 0.2*inch), table])
+
+
+def write(store: JobStore, writer: str, mode: str, output_path: str) -> None:
+    if mode == "streaming":
+        rows = (record_to_row(r) for r in store.iter_jobs())
+        save = {"csv": lambda: save_to_csv(rows, output_path),
+                "markdown": lambda: save_to_markdown(rows, output_path, "benchmark"),
+                "pdf": lambda: save_to_pdf(rows, output_path, "benchmark")}[writer]
+    else:
+        rows = [record_to_row(r) for r in store.jobs()]
+        save = {"csv": lambda: save_to_csv(rows, output_path),
+                "markdown": lambda: legacy_markdown(rows, output_path, "benchmark"),
+                "pdf": lambda: legacy_pdf(rows, output_path, "benchmark")}[writer]
+    with contextlib.redirect_stdout(io.StringIO()):
+        if save() is False:
+            raise RuntimeError(f"{writer} writer failed")
+
+
+def measure(store: JobStore, writer: str, mode: str, output_path: str) -> dict:
+    t0 = time.perf_counter()
+    write(store, writer, mode, output_path)
+    wall_s = time.perf_counter() - t0
+    tracemalloc.start()
+    write(store, writer, mode, output_path)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return {"wall_s": round(wall_s, 3), "peak_mb": round(peak / 2**20, 2),
+            "file_kb": round(os.path.getsize(output_path) / 1024, 1)}
+
+
+def main(args):
+    results = []
+    if "pdf" in args.writers:
+        import reportlab.platypus  # noqa: F401  (keep the import out of the first timing)
+    with tempfile.TemporaryDirectory() as work:
+        for size in args.sizes:
+            with JobStore(os.path.join(work, f"history_{size}.sqlite")) as store:
+                fill_store(store, size)
+                for writer in args.writers:
+                    for mode in ("streaming", "legacy"):
+                        if mode == "legacy" and writer == "pdf" and size > args.legacy_max:
+                            results.append({"jobs": size, "writer": writer, "mode": mode,
+                                            "skipped": f"more than --legacy_max {args.legacy_max} jobs"})
+                            continue
+                        output_path = os.path.join(work, f"report_{size}_{mode}.{writer}")
+                        result = {"jobs": size, "writer": writer, "mode": mode,
+                                  **measure(store, writer, mode, output_path)}
+                        results.append(result)
+                        print(f"📄 {size:>6} jobs  {writer:<8} {mode:<9} {result['wall_s']:>8.3f}s "
+                              f"{result['peak_mb']:>8.2f} MB", file=sys.stderr, flush=True)
+    print(json.dumps({"sizes": args.sizes, "results": results}, indent=2))
+    return 0
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Compare streamed and materialized job report writers")
+    parser.add_argument("--sizes", type=lambda s: [int(x) for x in s.split(",")], default=[10, 1000, 50000],
+                        help="Comma-separated history sizes (jobs)")
+    parser.add_argument("--writers", type=lambda s: s.split(","), default=list(WRITERS),
+                        help="Comma-separated subset of csv,markdown,pdf")
+    parser.add_argument("--legacy_max", type=int, default=5000,
+                        help="Largest history the single-table legacy PDF is run on")
+    sys.exit(main(parser.parse_args()))
@@ -0,0 +1,126 @@
+#!/usr/bin/env python3
+"""
+Duration and failure analytics over the job history in the JobStore.
+
+The whole history is loaded into two DataFrames (jobs and steps) with one
+query each, and every statistic is a vectorized group-by:
+
+- run time:   ended_at - started_at, as p50/p90/p95 per pipeline (display
+              name) and per pipeline step
+- queue time: for jobs, started_at - created_at; for steps, the wait since
+              the previous step of the same job ended (or the job started)
+- failures:   Failed / finished runs
+- trend:      the last --trend_days of history against everything before,
+              as the change of the p50 run time and of the failure rate
+
+Canceled runs (e.g. the steps after a failed one) count as finished runs
+but not toward the durations.
+
+Usage:
+    from job_analytics import load_history, summarize_history, summary_rows
+
+    jobs, steps = load_history(store)
+    summary = summarize_history(jobs, steps, trend_days=7)
+    rows = summary_rows(summary)   # dicts keyed by SUMMARY_FIELDS
+"""
+
+import numpy as np
+import pandas as pd
+
+SUMMARY_FIELDS = ['Name', 'Kind', 'Runs', 'Failed', 'Fail %', 'p50 min', 'p90 min', 'p95 min', 'Queue p50 min',
+                  'p50 trend', 'Fail trend']
+FINISHED_STATUSES = ["Completed", "Failed", "Canceled"]
+PERCENTILES = (0.5, 0.9, 0.95)
+
+
+def _timestamps(frame: pd.DataFrame, columns) -> pd.DataFrame:
+    for column in columns:
+        frame[column] = pd.to_datetime(frame[column], format="ISO8601", errors="coerce")
+    return frame
+
+
+def load_history(store, since: str = None) -> tuple:
+    """(jobs, steps) DataFrames of the stored history, optionally created at/after since (ISO)."""
+    where, params = ("WHERE j.created_at >= ?", [since]) if since else ("", [])
+    jobs = pd.read_sql_query(f"SELECT name, display_name, status, created_at, started_at, ended_at "
+                             f"FROM jobs j {where}", store.conn, params=params)
+    steps = pd.read_sql_query(f"SELECT s.job_name, s.step, s.status, s.started_at, s.ended_at, "
+                              f"j.display_name AS pipeline, j.created_at, j.started_at AS job_started_at "
+                              f"FROM steps s JOIN jobs j ON j.name = s.job_name {where}", store.conn, params=params)
+    return (_timestamps(jobs, ["created_at", "started_at", "ended_at"]),
+            _timestamps(steps, ["started_at", "ended_at", "created_at", "job_started_at"]))
+
+
+def _durations(jobs: pd.DataFrame, steps: pd.DataFrame) -> tuple:
+    """Add run_s and queue_s (seconds) to copies of the jobs and steps frames."""
+    jobs = jobs.assign(run_s=(jobs["ended_at"] - jobs["started_at"]).dt.total_seconds(),
+                       queue_s=(jobs["started_at"] - jobs["created_at"]).dt.total_seconds())
+    steps = steps.sort_values(["job_name", "started_at"], kind="stable")
+    previous_end = steps.groupby("job_name", sort=False)["ended_at"].shift().fillna(steps["job_started_at"])
+    steps = steps.assign(run_s=(steps["ended_at"] - steps["started_at"]).dt.total_seconds(),
+                         queue_s=(steps["started_at"] - previous_end).dt.total_seconds().clip(lower=0))
+    return jobs, steps
+
+
+def _summarize(frame: pd.DataFrame, keys: list, recent: pd.Series) -> pd.DataFrame:
+    """Per-group counts, failure rate, run-time percentiles, queue p50 and recent-vs-earlier trend."""
+    finished = frame["status"].isin(FINISHED_STATUSES)
+    data = frame.assign(finished=finished, failed=frame["status"].eq("Failed"), recent=recent,
+                        timed=frame["run_s"].where(finished & frame["status"].ne("Canceled")) / 60,
+                        queue=frame["queue_s"] / 60)
+    grouped = data.groupby(keys, sort=True)
+    summary = grouped.agg(runs=("finished", "sum"), failed=("failed", "sum"), queue_p50=("queue", "median"))
+    summary["failure_rate"] = summary["failed"] / summary["runs"].replace(0, np.nan)
+    percentiles = grouped["timed"].quantile(list(PERCENTILES)).unstack().reindex(summary.index)
+    for q in PERCENTILES:
+        summary[f"p{int(q * 100)}"] = percentiles[q]
+
+    # Recent window against the earlier history, per group
+    by_window = data.groupby(keys + ["recent"], sort=True).agg(
+        p50=("timed", "median"), runs=("finished", "sum"), failed=("failed", "sum"))
+    by_window["failure_rate"] = by_window["failed"] / by_window["runs"].replace(0, np.nan)
+    windows = by_window[["p50", "failure_rate"]].unstack("recent").reindex(summary.index)
+    for metric in ("p50", "failure_rate"):
+        for window in (True, False):
+            if (metric, window) not in windows.columns:
+                windows[(metric, window)] = np.nan
+    summary["p50_change"] = windows[("p50", True)] / windows[("p50", False)] - 1
+    summary["failure_change"] = windows[("failure_rate", True)] - windows[("failure_rate", False)]
+    return summary
+
+
+def summarize_history(jobs: pd.DataFrame, steps: pd.DataFrame, trend_days: float = 7) -> pd.DataFrame:
+    """One row per pipeline (kind "job") and per pipeline step (kind "step"), pipelines first."""
+    jobs, steps = _durations(jobs, steps)
+    newest = jobs["created_at"].max()
+    cutoff = newest - pd.Timedelta(days=trend_days) if pd.notna(newest) else newest
+    parts = []
+    if len(jobs):
+        job_summary = _summarize(jobs, ["display_name"], jobs["created_at"] > cutoff)
+        job_summary.index = job_summary.index.astype(str)
+        parts.append(job_summary.assign(kind="job"))
+    if len(steps):
+        step_summary = _summarize(steps, ["pipeline", "step"], steps["created_at"] > cutoff)
+        step_summary.index = [f"{pipeline} / {step}" for pipeline, step in step_summary.index]
+        parts.append(step_summary.assign(kind="step"))
+    if not parts:
+        return pd.DataFrame()
+    summary = pd.concat(parts)
+    summary.index.name = "name"
+    return summary
+
+
+def _format(value, pattern: str, missing: str = "n/a") -> str:
+    return missing if pd.isna(value) else pattern.format(value)
+
+
+def summary_rows(summary: pd.DataFrame) -> list:
+    """The summary as report rows (dicts keyed by SUMMARY_FIELDS, values formatted)."""
+    return [{
+        'Name': name, 'Kind': row.kind, 'Runs': int(row.runs), 'Failed': int(row.failed),
+        'Fail %': _format(row.failure_rate * 100, "{:.1f}"),
+        'p50 min': _format(row.p50, "{:.1f}"), 'p90 min': _format(row.p90, "{:.1f}"),
+        'p95 min': _format(row.p95, "{:.1f}"), 'Queue p50 min': _format(row.queue_p50, "{:.1f}"),
+        'p50 trend': _format(row.p50_change * 100, "{:+.1f}%"),
+        'Fail trend': _format(row.failure_change * 100, "{:+.1f} pp"),
+    } for name, row in summary.iterrows()]
@@ -0,0 +1,183 @@
+#!/usr/bin/env python3
+"""
+Local SQLite store of the workspace job history used by review_jobs.py.
+
+Jobs and their pipeline steps are upserted by name, so syncing the same job
+twice just refreshes it. The store also keeps a sync watermark (the newest
+job creation time seen); the next sync only lists jobs created after it and
+re-reads stored jobs that had not finished yet, which are the only ones the
+service can still change. Reports and history analysis then read from the
+store without touching the service.
+
+Tables:
+    jobs   (name, display_name, status, dataset, start_time, end_time,
+            created_at, modified_at, started_at, ended_at, experiment_name,
+            detail_error, synced_at)
+    steps  (job_name, step, status, start_time, end_time, started_at,
+            ended_at, synced_at)
+    sync_state (key, value)
+
+start_time/end_time are the display strings of the reports; created_at,
+modified_at, started_at and ended_at are ISO timestamps (UTC) for queries.
+
+Example:
+    with JobStore("ai_reviews/job_history.sqlite") as store:
+        store.upsert_jobs(records, step_records)
+        store.set_state("watermark", "2025-11-10T08:00:00")
+        rows = store.jobs(limit=20)
+"""
+
+import sqlite3
+from datetime import datetime
+
+TERMINAL_STATUSES = ("Completed", "Failed", "Canceled")
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS jobs (
+    name TEXT PRIMARY KEY,
+    display_name TEXT,
+    status TEXT,
+    dataset TEXT,
+    start_time TEXT,
+    end_time TEXT,
+    created_at TEXT,
+    modified_at TEXT,
+    started_at TEXT,
+    ended_at TEXT,
+    experiment_name TEXT,
+    detail_error TEXT,
+    synced_at TEXT
+);
+CREATE INDEX IF NOT EXISTS jobs_created_at ON jobs (created_at);
+CREATE INDEX IF NOT EXISTS jobs_status ON jobs (status);
+CREATE TABLE IF NOT EXISTS steps (
+    job_name TEXT NOT NULL,
+    step TEXT NOT NULL,
+    status TEXT,
+    start_time TEXT,
+    end_time TEXT,
+    started_at TEXT,
+    ended_at TEXT,
+    synced_at TEXT,
+    PRIMARY KEY (job_name, step)
+);
+CREATE TABLE IF NOT EXISTS sync_state (
+    key TEXT PRIMARY KEY,
+    value TEXT
+);
+"""
+
+JOB_COLUMNS = ["name", "display_name", "status", "dataset", "start_time", "end_time", "created_at",
+               "modified_at", "started_at", "ended_at", "experiment_name", "detail_error"]
+STEP_COLUMNS = ["job_name", "step", "status", "start_time", "end_time", "started_at", "ended_at"]
+
+
+def _upsert_sql(table: str, columns: list, keys: list) -> str:
+    updates = ", ".join(f"{c} = excluded.{c}" for c in columns + ["synced_at"] if c not in keys)
+    names = ", ".join(columns + ["synced_at"])
+    marks = ", ".join("?" for _ in columns + ["synced_at"])
+    return (f"INSERT INTO {table} ({names}) VALUES ({marks}) "
+            f"ON CONFLICT ({', '.join(keys)}) DO UPDATE SET {updates}")
+
+
+class JobStore:
+    """SQLite-backed job history; records are dicts keyed by JOB_COLUMNS / STEP_COLUMNS."""
+
+    def __init__(self, path: str):
+        self.path = path
+        self.conn = sqlite3.connect(path)
+        self.conn.row_factory = sqlite3.Row
+        self.conn.executescript(SCHEMA)
+
+    def close(self):
+        self.conn.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+        return False
+
+    def get_state(self, key: str, default=None):
+        row = self.conn.execute("SELECT value FROM sync_state WHERE key = ?", (key,)).fetchone()
+        return row["value"] if row else default
+
+    def set_state(self, key: str, value):
+        with self.conn:
+            self.conn.execute("INSERT INTO sync_state (key, value) VALUES (?, ?) "
+                              "ON CONFLICT (key) DO UPDATE SET value = excluded.value", (key, str(value)))
+
+    def upsert_jobs(self, jobs: list, steps: list = ()) -> dict:
+        """Insert or update jobs and steps in one transaction; returns {"inserted": n, "updated": m}."""
+        synced_at = datetime.utcnow().isoformat()
+        names = [job["name"] for job in jobs]
+        existing = set()
+        for offset in range(0, len(names), 500):
+            chunk = names[offset:offset + 500]
+            marks = ", ".join("?" for _ in chunk)
+            existing.update(r["name"] for r in self.conn.execute(f"SELECT name FROM jobs WHERE name IN ({marks})",
+                                                                  chunk))
+        with self.conn:
+            self.conn.executemany(_upsert_sql("jobs", JOB_COLUMNS, ["name"]),
+                                  [[job.get(c) for c in JOB_COLUMNS] + [synced_at] for job in jobs])
+            self.conn.executemany(_upsert_sql("steps", STEP_COLUMNS, ["job_name", "step"]),
+                                  [[step.get(c) for c in STEP_COLUMNS] + [synced_at] for step in steps])
+        return {"inserted": len(set(names) - existing), "updated": len(existing)}
+
+    def newest_created_at(self):
+        row = self.conn.execute("SELECT MAX(created_at) AS newest FROM jobs").fetchone()
+        return row["newest"]
+
+    def unfinished_jobs(self) -> list:
+        """Names of stored jobs that were not in a terminal state when last synced."""
+        marks = ", ".join("?" for _ in TERMINAL_STATUSES)
+        return [r["name"] for r in self.conn.execute(
+            f"SELECT name FROM jobs WHERE status IS NULL OR status NOT IN ({marks}) ORDER BY created_at",
+            TERMINAL_STATUSES)]
+
+    def _jobs_query(self, since: str = None, limit: int = None, columns: str = "*"):
+        sql, params = f"SELECT {columns} FROM jobs", []
+        if since:
+            sql += " WHERE created_at >= ?"
+            params.append(since)
+        sql += " ORDER BY created_at DESC, name DESC"
+        if limit:
+            sql += " LIMIT ?"
+            params.append(limit)
+        return sql, params
+
+    def count(self, since: str = None, limit: int = None) -> int:
+        """Number of stored jobs, or of those jobs() would return for since/limit."""
+        sql, params = self._jobs_query(since, limit, columns="name")
+        return self.conn.execute(f"SELECT COUNT(*) FROM ({sql})", params).fetchone()[0]
+
+    def iter_jobs(self, since: str = None, limit: int = None):
+        """Stored jobs as dicts, newest first, optionally created at/after since (ISO); read lazily."""
+        sql, params = self._jobs_query(since, limit)
+        for row in self.conn.execute(sql, params):
+            yield dict(row)
+
+    def jobs(self, since: str = None, limit: int = None) -> list:
+        return list(self.iter_jobs(since, limit))
+
+    def iter_steps(self, since: str = None, limit: int = None):
+        """Steps of the jobs iter_jobs(since, limit) returns, grouped by job in the same order."""
+        sql, params = self._jobs_query(since, limit, columns="name, created_at")
+        query = (f"SELECT steps.* FROM steps JOIN ({sql}) AS j ON j.name = steps.job_name "
+                 f"ORDER BY j.created_at DESC, j.name DESC, steps.started_at, steps.rowid")
+        for row in self.conn.execute(query, params):
+            yield dict(row)
+
+    def steps(self, job_names: list = None) -> list:
+        """Stored steps as dicts, grouped by job in the order of job_names (all jobs if None)."""
+        if job_names is None:
+            return list(self.iter_steps())
+        by_job = {}
+        for offset in range(0, len(job_names), 500):
+            chunk = job_names[offset:offset + 500]
+            marks = ", ".join("?" for _ in chunk)
+            for r in self.conn.execute(f"SELECT * FROM steps WHERE job_name IN ({marks}) "
+                                       f"ORDER BY started_at, rowid", chunk):
+                by_job.setdefault(r["job_name"], []).append(dict(r))
+        return [step for name in job_names for step in by_job.get(name, [])]
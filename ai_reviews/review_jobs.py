@@ -1,31 +1,54 @@
 #!/usr/bin/env python3
 """
-Script to review the last 5 jobs from Azure ML workspace.
+Script to review the jobs of an Azure ML workspace (the last 5 by default).
 Retrieves job information and saves it to markdown, CSV, and PDF formats.
+
+The job history is paged through newest first until --limit jobs or the
+--since cutoff is reached. Per-job details (inputs, properties and child
+steps) are fetched in a bounded thread pool while later pages are still
+being listed; the report keeps the listing order whatever order the
+lookups finish in, and the fetch throughput is printed at the end.
+
+The Azure SDK and reportlab are imported only when they are needed, so
+--help and the CSV helpers start quickly.
+
+Usage:
+    python ai_reviews/review_jobs.py
+    python ai_reviews/review_jobs.py --limit 2000 --since 30d --workers 16 --output_dir reports
+    python ai_reviews/review_jobs.py --fake --limit 0
 """
 
-from azure.ai.ml import MLClient
-from azure.identity import DefaultAzureCredential
-from datetime import datetime
+import argparse
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timedelta, timezone
 import os
+import re
 import sys
 import csv
-import pandas as pd
-from reportlab.lib import colors
-from reportlab.lib.pagesizes import letter, landscape
-from reportlab.platypus import SimpleDocTemplate, Table, TableStyle, Paragraph, Spacer
-from reportlab.lib.styles import getSampleStyleSheet
-from reportlab.lib.units import inch
+import itertools
+import time
+from types import SimpleNamespace
+
+from job_store import JobStore
 
 # Add parent directory to path to import utils
 sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'mlops', 'scripts'))
 
 try:
-    from utils import load_credentials
+    from utils import get_config, get_ml_client
     UTILS_AVAILABLE = True
 except ImportError:
     UTILS_AVAILABLE = False
 
+JOB_FIELDS = ['Job ID', 'Display Name', 'Status', 'Dataset', 'Start Time', 'End Time']
+STEP_FIELDS = ['Job ID', 'Step', 'Status', 'Start Time', 'End Time']
+TERMINAL_STATUSES = ["Completed", "Failed", "Canceled"]
+PREVIEW_LINES = 30
+SYNC_OVERLAP_S = 300
+DEFAULT_LIMIT = 5  # jobs in the reports when --limit is not given
+PDF_ROWS_PER_PAGE = 26  # 18pt rows under a 27pt header fill the 540pt landscape page
+PDF_TITLE_ROWS = 4  # rows the title and date take up on the first page
+
 def get_dataset_input(job):
     """Extract dataset input information from job inputs."""
     try:
@@ -47,11 +70,251 @@ def format_datetime(dt):
         return dt.strftime("%Y-%m-%d %H:%M:%S")
     return "N/A"
 
-def save_to_csv(jobs_data, output_path):
+def to_utc(value):
+    """datetime or ISO string -> naive UTC datetime (None if missing or unparseable)."""
+    if isinstance(value, str):
+        try:
+            value = datetime.fromisoformat(value.replace("Z", "+00:00"))
+        except ValueError:
+            return None
+    if not isinstance(value, datetime):
+        return None
+    if value.tzinfo is not None:
+        value = value.astimezone(timezone.utc).replace(tzinfo=None)
+    return value
+
+def parse_since(value):
+    """'2025-11-01', '2025-11-01T08:00' or a relative '7d' / '12h' / '30m' -> naive UTC datetime."""
+    if not value:
+        return None
+    match = re.fullmatch(r"(\d+)([dhm])", value.strip())
+    if match:
+        unit = {"d": "days", "h": "hours", "m": "minutes"}[match.group(2)]
+        return datetime.utcnow() - timedelta(**{unit: int(match.group(1))})
+    since = to_utc(value)
+    if since is None:
+        raise argparse.ArgumentTypeError(f"Expected an ISO date or a duration like 7d/12h/30m, got: {value}")
+    return since
+
+def job_end_time(job, status):
+    """End time from the job properties, else the last modification of a finished job."""
+    if hasattr(job, 'properties') and job.properties and 'end_time' in job.properties:
+        return format_datetime(job.properties['end_time'])
+    if status in TERMINAL_STATUSES:
+        # For completed jobs, try to get the last modified time
+        if hasattr(job, 'creation_context') and hasattr(job.creation_context, 'last_modified_at'):
+            return format_datetime(job.creation_context.last_modified_at)
+    return "N/A"
+
+def job_to_row(job):
+    """One report row (JOB_FIELDS) for a job."""
+    status = job.status if hasattr(job, 'status') else "N/A"
+    return {
+        'Job ID': job.name if hasattr(job, 'name') else "N/A",
+        'Display Name': job.display_name if hasattr(job, 'display_name') else "N/A",
+        'Status': status,
+        'Dataset': get_dataset_input(job),
+        'Start Time': format_datetime(job.creation_context.created_at if hasattr(job, 'creation_context') else None),
+        'End Time': job_end_time(job, status),
+    }
+
+def step_to_row(parent_name, step):
+    """One report row (STEP_FIELDS) for a child step of a pipeline job."""
+    status = getattr(step, 'status', None) or "N/A"
+    properties = getattr(step, 'properties', None) or {}
+    start_time = properties.get('start_time')
+    if start_time is None and hasattr(step, 'creation_context'):
+        start_time = step.creation_context.created_at
+    return {
+        'Job ID': parent_name,
+        'Step': getattr(step, 'display_name', None) or getattr(step, 'name', "N/A"),
+        'Status': status,
+        'Start Time': format_datetime(start_time),
+        'End Time': job_end_time(step, status),
+    }
+
+def iter_jobs(ml_client, since=None, limit=None):
+    """Page through the job history (newest first) up to limit jobs or back to since."""
+    kwargs = {"max_results": limit} if limit else {}
+    for job in ml_client.jobs.list(**kwargs):
+        created = to_utc(getattr(getattr(job, 'creation_context', None), 'created_at', None))
+        if since is not None and created is not None and created < since:
+            break
+        yield job
+
+def fetch_job_details(ml_client, job, with_steps=True, retries=2):
+    """Full job (inputs, properties) and its child steps; transient errors are retried.
+
+    Returns (job, steps, api_calls, error); on failure the listed job is kept.
+    """
+    calls, error = 0, None
+    for attempt in range(retries + 1):
+        try:
+            calls += 1
+            detail = ml_client.jobs.get(job.name)
+            steps = []
+            if with_steps:
+                calls += 1
+                steps = list(ml_client.jobs.list(parent_job_name=job.name))
+            return detail, steps, calls, None
+        except Exception as e:
+            error = f"{type(e).__name__}: {e}"
+            if attempt < retries:
+                time.sleep(0.1 * 2 ** attempt)
+    return job, [], calls, error
+
+def fetch_all(ml_client, jobs, workers=8, with_steps=True):
+    """fetch_job_details for every job in a bounded pool; results keep the input order.
+
+    jobs may be a lazy pager: lookups start while later pages are still being listed.
+    Returns (results, seconds spent until the last job was listed).
+    """
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=max(1, workers)) as pool:
+        futures = [pool.submit(fetch_job_details, ml_client, job, with_steps) for job in jobs]
+        listed_s = time.perf_counter() - start
+        return [future.result() for future in futures], listed_s
+
+def collect_jobs(ml_client, since=None, limit=None, workers=8, with_steps=True):
+    """Rows for the jobs and their steps, in listing order, plus fetch statistics."""
+    start = time.perf_counter()
+    results, listed_s = fetch_all(ml_client, iter_jobs(ml_client, since, limit), workers, with_steps)
+    wall = time.perf_counter() - start
+
+    rows, step_rows, errors = [], [], []
+    for job, steps, _, error in results:
+        rows.append(job_to_row(job))
+        step_rows.extend(step_to_row(job.name, step) for step in steps)
+        if error:
+            errors.append({"job": job.name, "error": error})
+    stats = {
+        "jobs": len(rows),
+        "steps": len(step_rows),
+        "list_s": round(listed_s, 3),
+        "wall_s": round(wall, 3),
+        "jobs_per_s": round(len(rows) / wall, 1) if wall > 0 else None,
+        "detail_calls": sum(calls for _, _, calls, _ in results),
+        "workers": workers,
+        "errors": errors,
+    }
+    return rows, step_rows, stats
+
+def _iso(value):
+    value = to_utc(value)
+    return value.isoformat() if value else None
+
+def job_record(job):
+    """A job as a JobStore record: the report row plus ISO timestamps for queries."""
+    row = job_to_row(job)
+    context = getattr(job, 'creation_context', None)
+    properties = getattr(job, 'properties', None) or {}
+    return {
+        "name": row['Job ID'], "display_name": row['Display Name'], "status": row['Status'],
+        "dataset": row['Dataset'], "start_time": row['Start Time'], "end_time": row['End Time'],
+        "created_at": _iso(getattr(context, 'created_at', None)),
+        "modified_at": _iso(getattr(context, 'last_modified_at', None)),
+        "started_at": _iso(properties.get('start_time')), "ended_at": _iso(properties.get('end_time')),
+        "experiment_name": getattr(job, 'experiment_name', None), "detail_error": None,
+    }
+
+def step_record(parent_name, step):
+    row = step_to_row(parent_name, step)
+    properties = getattr(step, 'properties', None) or {}
+    return {
+        "job_name": parent_name, "step": row['Step'], "status": row['Status'],
+        "start_time": row['Start Time'], "end_time": row['End Time'],
+        "started_at": _iso(properties.get('start_time')), "ended_at": _iso(properties.get('end_time')),
+    }
+
+def record_to_row(record):
+    return {'Job ID': record['name'], 'Display Name': record['display_name'], 'Status': record['status'],
+            'Dataset': record['dataset'], 'Start Time': record['start_time'], 'End Time': record['end_time']}
+
+def step_record_to_row(record):
+    return {'Job ID': record['job_name'], 'Step': record['step'], 'Status': record['status'],
+            'Start Time': record['start_time'], 'End Time': record['end_time']}
+
+def sync_store(ml_client, store, since=None, limit=None, workers=8, with_steps=True,
+               full_refresh=False, overlap_s=SYNC_OVERLAP_S):
+    """Bring the local store up to date and return sync statistics.
+
+    After the first sync only jobs created since the watermark (minus a small
+    overlap for clock skew) are listed, and stored jobs that had not finished
+    are looked up again. Jobs in the overlap that are already stored as
+    finished are not looked up. The first sync (or --full_refresh) is bounded
+    by since/limit instead. Later syncs only add newer jobs, so a first sync
+    bounded by since, or cut off by limit, leaves the store partial: the bound
+    is kept as the "partial" state (and returned as "partial") until a full
+    refresh without since or limit fills the store in.
+    """
+    start = time.perf_counter()
+    first_sync = store.get_state("watermark") is None
+    watermark = None if full_refresh else store.get_state("watermark")
+    cutoff = since
+    if watermark:
+        overlap = datetime.fromisoformat(watermark) - timedelta(seconds=overlap_s)
+        cutoff = max(cutoff, overlap) if cutoff else overlap
+        limit = None  # every new job must be stored, or the watermark would skip some
+    known = {r['name']: r['status'] for r in store.jobs(since=_iso(cutoff))} if watermark else {}
+
+    listed = []
+    def new_or_changed():
+        for job in iter_jobs(ml_client, cutoff, limit):
+            listed.append(job.name)
+            if known.get(job.name) not in TERMINAL_STATUSES:
+                yield job
+
+    results, listed_s = fetch_all(ml_client, new_or_changed(), workers, with_steps)
+    listed_names = set(listed)
+    unfinished = [SimpleNamespace(name=name) for name in store.unfinished_jobs() if name not in listed_names]
+    refreshed, _ = fetch_all(ml_client, unfinished, workers, with_steps)
+
+    records, step_records, errors = [], [], []
+    for job, steps, _, error in results + refreshed:
+        if error and not hasattr(job, 'status'):
+            # Nothing new to store for a stored job whose lookup failed
+            errors.append({"job": job.name, "error": error})
+            continue
+        record = job_record(job)
+        record["detail_error"] = error
+        records.append(record)
+        step_records.extend(step_record(job.name, step) for step in steps)
+        if error:
+            errors.append({"job": job.name, "error": error})
+    counts = store.upsert_jobs(records, step_records)
+    newest = store.newest_created_at()
+    if newest:
+        store.set_state("watermark", newest)
+    store.set_state("last_sync", datetime.utcnow().isoformat())
+    if first_sync or (full_refresh and not since and not limit):
+        bounds = []
+        if limit and len(listed) >= limit:
+            bounds.append(f"the {limit} newest jobs")
+        if since:
+            bounds.append(f"jobs created since {_iso(since)}")
+        store.set_state("partial", " and ".join(bounds))
+
+    wall = time.perf_counter() - start
+    return {
+        "listed": len(listed),
+        "skipped_unchanged": len(listed) - len(results),
+        "refreshed_unfinished": len(refreshed),
+        "inserted": counts["inserted"],
+        "updated": counts["updated"],
+        "steps": len(step_records),
+        "detail_calls": sum(calls for _, _, calls, _ in results + refreshed),
+        "list_s": round(listed_s, 3),
+        "wall_s": round(wall, 3),
+        "watermark": newest,
+        "stored_jobs": store.count(),
+        "partial": bool(store.get_state("partial")),
+        "errors": errors,
+    }
+
+def save_to_csv(jobs_data, output_path, fieldnames=JOB_FIELDS):
     """Save jobs data to CSV file."""
     try:
         with open(output_path, 'w', newline='', encoding='utf-8') as csvfile:
-            fieldnames = ['Job ID', 'Display Name', 'Status', 'Dataset', 'Start Time', 'End Time']
             writer = csv.DictWriter(csvfile, fieldnames=fieldnames)
             
             writer.writeheader()
@@ -64,41 +327,74 @@ def save_to_csv(jobs_data, output_path):
         print(f"❌ Error saving CSV file: {e}")
         return False
 
-def save_to_pdf(jobs_data, output_path, workspace_name):
-    """Save jobs data to PDF file."""
+def save_to_markdown(jobs_data, output_path, workspace_name, steps_data=(), summary_data=()):
+    """Save jobs data (and pipeline steps and the history summary, if any) to a markdown file, row by row."""
     try:
-        # Create PDF document
-        doc = SimpleDocTemplate(output_path, pagesize=landscape(letter))
-        elements = []
-        
-        # Add title
-        styles = getSampleStyleSheet()
-        title = Paragraph(f"<b>Azure ML Jobs Review - {workspace_name}</b>", styles['Heading1'])
-        elements.append(title)
-        elements.append(Spacer(1, 0.2*inch))
-        
-        # Add generation date
-        date_text = Paragraph(f"Generated: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}", styles['Normal'])
-        elements.append(date_text)
-        elements.append(Spacer(1, 0.3*inch))
-        
-        # Prepare table data
-        table_data = [['Job ID', 'Display Name', 'Status', 'Dataset', 'Start Time', 'End Time']]
-        for job in jobs_data:
-            table_data.append([
-                job['Job ID'],
-                job['Display Name'],
-                job['Status'],
-                job['Dataset'],
-                job['Start Time'],
-                job['End Time']
-            ])
+        with open(output_path, 'w', encoding='utf-8') as f:
+            f.write("# Azure ML Jobs Review\n\n")
+            f.write(f"**Workspace:** {workspace_name}\n")
+            f.write(f"**Generated:** {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}\n\n")
+            f.write("| Job ID | Display Name | Status | Dataset | Start Time | End Time |\n")
+            f.write("|--------|--------------|--------|---------|------------|----------|")
+            for job in jobs_data:
+                f.write("\n| " + " | ".join(str(job[field]) for field in JOB_FIELDS) + " |")
+            
+            header_written = False
+            for step in steps_data:
+                if not header_written:
+                    f.write("\n\n## Pipeline Steps\n\n")
+                    f.write("| Job ID | Step | Status | Start Time | End Time |\n")
+                    f.write("|--------|------|--------|------------|----------|")
+                    header_written = True
+                f.write("\n| " + " | ".join(str(step[field]) for field in STEP_FIELDS) + " |")
+            
+            if summary_data:
+                fields = list(summary_data[0])
+                f.write("\n\n## Duration and Failure Summary\n\n")
+                f.write("| " + " | ".join(fields) + " |\n")
+                f.write("|" + "|".join("-" * (len(field) + 2) for field in fields) + "|")
+                for row in summary_data:
+                    f.write("\n| " + " | ".join(str(row[field]) for field in fields) + " |")
         
-        # Create table
-        table = Table(table_data, colWidths=[1.5*inch, 1.8*inch, 1*inch, 1.8*inch, 1.5*inch, 1.5*inch])
+        print(f"\n✅ Markdown file saved to: {output_path}")
+        return True
+    except Exception as e:
+        print(f"❌ Error saving markdown file: {e}")
+        return False
+
+def _page_chunks(rows, first_page, per_page):
+    """Group rows into lists of first_page rows, then per_page rows (at least one, possibly empty)."""
+    chunk, size = [], first_page
+    for row in rows:
+        chunk.append(row)
+        if len(chunk) == size:
+            yield chunk
+            chunk, size = [], per_page
+    if chunk or size == first_page:
+        yield chunk
+
+def save_to_pdf(jobs_data, output_path, workspace_name, rows_per_page=PDF_ROWS_PER_PAGE, summary_data=()):
+    """Save jobs data to PDF file.
+    
+    Each page gets its own fixed-size table drawn straight onto the canvas,
+    so only one page of rows is held at a time and the time grows linearly
+    with the number of jobs (one Table over every row grows much faster).
+    """
+    try:
+        from reportlab.lib import colors
+        from reportlab.lib.pagesizes import letter, landscape
+        from reportlab.pdfgen import canvas
+        from reportlab.platypus import Table, TableStyle, Paragraph
+        from reportlab.lib.styles import getSampleStyleSheet
+        from reportlab.lib.units import inch
+
+        page_width, page_height = landscape(letter)
+        margin = 0.5*inch
+        col_widths = [1.5*inch, 1.8*inch, 1*inch, 1.8*inch, 1.5*inch, 1.5*inch]
+        table_x = (page_width - sum(col_widths)) / 2
         
         # Style the table
-        table.setStyle(TableStyle([
+        table_style = TableStyle([
             ('BACKGROUND', (0, 0), (-1, 0), colors.grey),
             ('TEXTCOLOR', (0, 0), (-1, 0), colors.whitesmoke),
             ('ALIGN', (0, 0), (-1, -1), 'CENTER'),
@@ -110,12 +406,61 @@ def save_to_pdf(jobs_data, output_path, workspace_name):
             ('FONTNAME', (0, 1), (-1, -1), 'Helvetica'),
             ('FONTSIZE', (0, 1), (-1, -1), 8),
             ('VALIGN', (0, 0), (-1, -1), 'MIDDLE'),
-        ]))
+        ])
         
-        elements.append(table)
+        # Create PDF document
+        pdf = canvas.Canvas(output_path, pagesize=(page_width, page_height))
+        styles = getSampleStyleSheet()
+        first_page_rows = max(1, rows_per_page - PDF_TITLE_ROWS)
+        page_number = 0
+        for chunk in _page_chunks(jobs_data, first_page_rows, rows_per_page):
+            page_number += 1
+            top = page_height - margin
+            if page_number == 1:
+                # Add title and generation date
+                for text, style, space_after in (
+                        (f"<b>Azure ML Jobs Review - {workspace_name}</b>", styles['Heading1'], 0.2*inch),
+                        (f"Generated: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}", styles['Normal'], 0.3*inch)):
+                    paragraph = Paragraph(text, style)
+                    _, height = paragraph.wrapOn(pdf, page_width - 2*margin, page_height)
+                    paragraph.drawOn(pdf, margin, top - height)
+                    top -= height + space_after
+            
+            table_data = [JOB_FIELDS] + [[job[field] for field in JOB_FIELDS] for job in chunk]
+            table = Table(table_data, colWidths=col_widths)
+            table.setStyle(table_style)
+            _, height = table.wrapOn(pdf, page_width - 2*margin, top - margin)
+            table.drawOn(pdf, table_x, top - height)
+            
+            pdf.setFont('Helvetica', 8)
+            pdf.drawRightString(page_width - margin, margin / 2, f"Page {page_number}")
+            pdf.showPage()
+        
+        # History summary on its own page(s) after the jobs; the name column is the wide one
+        fields = list(summary_data[0]) if summary_data else []
+        other_width = (page_width - 2*margin - 2.9*inch) / max(1, len(fields) - 1)
+        summary_widths = [2.9*inch] + [other_width] * (len(fields) - 1)
+        for index, chunk in enumerate(_page_chunks(summary_data, rows_per_page - 2, rows_per_page)):
+            if not chunk:
+                break
+            page_number += 1
+            top = page_height - margin
+            if index == 0:
+                paragraph = Paragraph("<b>Duration and Failure Summary</b>", styles['Heading2'])
+                _, height = paragraph.wrapOn(pdf, page_width - 2*margin, page_height)
+                paragraph.drawOn(pdf, margin, top - height)
+                top -= height + 0.2*inch
+            table = Table([fields] + [[row[field] for field in fields] for row in chunk], colWidths=summary_widths)
+            table.setStyle(table_style)
+            table.setStyle([('ALIGN', (0, 1), (0, -1), 'LEFT'), ('FONTSIZE', (0, 0), (-1, 0), 8)])
+            _, height = table.wrapOn(pdf, page_width - 2*margin, top - margin)
+            table.drawOn(pdf, margin, top - height)
+            pdf.setFont('Helvetica', 8)
+            pdf.drawRightString(page_width - margin, margin / 2, f"Page {page_number}")
+            pdf.showPage()
         
         # Build PDF
-        doc.build(elements)
+        pdf.save()
         print(f"✅ PDF file saved to: {output_path}")
         return True
     except Exception as e:
@@ -125,139 +470,175 @@ def save_to_pdf(jobs_data, output_path, workspace_name):
         return False
 
 def main():
-    # Workspace configuration
-    workspace_name = "project_III_MLOPS"
+    parser = argparse.ArgumentParser(description="Review the latest jobs of an Azure ML workspace")
+    parser.add_argument("--workspace_name", default=None,
+                        help="Defaults to the configured workspace (WORKSPACE_NAME or project_III_MLOPS)")
+    parser.add_argument("--limit", "--max_results", dest="limit", type=int, default=None,
+                        help="Number of jobs to report (default 5; 0 = the whole history). Given explicitly, "
+                             "it also bounds the store's first sync, which otherwise reads the whole history")
+    parser.add_argument("--since", type=parse_since, default=None,
+                        help="Only jobs created after this date (ISO) or within a duration (7d, 12h, 30m)")
+    parser.add_argument("--workers", type=int, default=8, help="Parallel per-job detail lookups")
+    parser.add_argument("--no_steps", action="store_true", help="Skip the child-step lookups")
+    parser.add_argument("--output_dir", default=os.path.dirname(os.path.abspath(__file__)),
+                        help="Folder for the markdown, CSV and PDF files")
+    parser.add_argument("--store", default=None,
+                        help="SQLite job-history store (default: job_history.sqlite in --output_dir)")
+    parser.add_argument("--no_store", action="store_true", help="Fetch from the service without the local store")
+    parser.add_argument("--offline", action="store_true", help="Report from the local store without syncing")
+    parser.add_argument("--full_refresh", action="store_true", help="Ignore the sync watermark")
+    parser.add_argument("--analytics", action="store_true",
+                        help="Add duration percentiles, queue time and failure trends per pipeline and step")
+    parser.add_argument("--trend_days", type=float, default=7,
+                        help="Recent window the analytics trends compare against the earlier history")
+    parser.add_argument("--fake", action="store_true",
+                        help="Use the in-memory fake workspace with a seeded job history (no Azure calls)")
+    args = parser.parse_args()
+
+    if args.fake:
+        os.environ.setdefault("MLOPS_FAKE_WORKSPACE", "history=50")
+
+    if not UTILS_AVAILABLE:
+        print("❌ Error: mlops/scripts/utils.py is required to resolve the workspace configuration.")
+        sys.exit(1)
+
+    # Credentials file, environment and defaults, resolved once (see mlops/config)
+    config = get_config()
+    workspace_name = args.workspace_name or config.workspace_name
+    output_dir = args.output_dir
+    os.makedirs(output_dir, exist_ok=True)
+    store_path = args.store or os.path.join(output_dir, "job_history.sqlite")
     
-    # Try to load credentials from JSON file if available
-    if UTILS_AVAILABLE:
+    ml_client = None
+    if not args.offline:
+        if not config.subscription_id or not config.resource_group:
+            print("⚠️  Warning: AZURE_SUBSCRIPTION_ID or RESOURCE_GROUP not set in environment.")
+            print("Please set these environment variables before running this script.")
+            print("\nExample:")
+            print("  export AZURE_SUBSCRIPTION_ID='your-subscription-id'")
+            print("  export RESOURCE_GROUP='your-resource-group'")
+            sys.exit(1)
+        
+        # Pooled ML client for the workspace
         try:
-            credentials_path = os.path.join(
-                os.path.dirname(__file__), 
-                '..', 
-                'mlops', 
-                'config', 
-                'azure_credentials.json'
-            )
-            if os.path.exists(credentials_path):
-                print(f"Loading credentials from {credentials_path}")
-                # Note: This will only work if the file has actual values, not GitHub Actions templates
-                load_credentials(credentials_path)
+            ml_client = get_ml_client(workspace_name=workspace_name)
+            print(f"✅ Connected to workspace: {workspace_name}")
         except Exception as e:
-            print(f"⚠️  Could not load credentials from file: {e}")
-    
-    # Get credentials from environment
-    subscription_id = os.environ.get("AZURE_SUBSCRIPTION_ID")
-    resource_group = os.environ.get("RESOURCE_GROUP")
-    
-    if not subscription_id or not resource_group:
-        print("⚠️  Warning: AZURE_SUBSCRIPTION_ID or RESOURCE_GROUP not set in environment.")
-        print("Please set these environment variables before running this script.")
-        print("\nExample:")
-        print("  export AZURE_SUBSCRIPTION_ID='your-subscription-id'")
-        print("  export RESOURCE_GROUP='your-resource-group'")
-        sys.exit(1)
-    
-    # Create ML client with explicit parameters
-    try:
-        credential = DefaultAzureCredential()
-        ml_client = MLClient(
-            credential=credential,
-            subscription_id=subscription_id,
-            resource_group_name=resource_group,
-            workspace_name=workspace_name
-        )
-        print(f"✅ Connected to workspace: {workspace_name}")
-    except Exception as e:
-        print(f"❌ Error: Could not initialize ML Client: {e}")
-        sys.exit(1)
-    
-    print(f"📋 Retrieving jobs from workspace: {workspace_name}")
+            print(f"❌ Error: Could not initialize ML Client: {e}")
+            sys.exit(1)
+        
+        print(f"📋 Retrieving jobs from workspace: {workspace_name}")
     
-    # Get the last 5 jobs
+    store = None
     try:
-        jobs_list = list(ml_client.jobs.list(max_results=5))
+        limit = DEFAULT_LIMIT if args.limit is None else args.limit or None
+        with_steps = not args.no_steps
+        stats = None
+        summary_data = []
+        if args.no_store:
+            # Page through the history and fetch the job details in parallel
+            jobs_data, steps_data, stats = collect_jobs(ml_client, since=args.since, limit=limit,
+                                                        workers=args.workers, with_steps=with_steps)
+            job_count = len(jobs_data)
+            job_rows = lambda: jobs_data
+            step_rows = lambda: steps_data
+            if args.analytics:
+                print("⚠️  --analytics reads the job-history store; skipped with --no_store")
+        else:
+            store = JobStore(store_path)
+            if ml_client is not None:
+                # The store keeps everything it ever lists, so only an explicit --limit bounds the sync
+                sync = sync_store(ml_client, store, since=args.since, limit=args.limit or None,
+                                  workers=args.workers, with_steps=with_steps, full_refresh=args.full_refresh)
+                print(f"🔄 Synced {store_path}: {sync['listed']} jobs listed, {sync['inserted']} new, "
+                      f"{sync['updated']} updated ({sync['refreshed_unfinished']} unfinished re-read, "
+                      f"{sync['skipped_unchanged']} unchanged skipped), {sync['detail_calls']} detail calls "
+                      f"in {sync['wall_s']:.2f}s; {sync['stored_jobs']} jobs stored")
+                for failure in sync['errors']:
+                    print(f"⚠️  Details unavailable for {failure['job']}: {failure['error']}")
+            else:
+                print(f"📂 Reporting from {store_path} (last sync: {store.get_state('last_sync', 'never')})")
+            if store.get_state("partial"):
+                print(f"⚠️  The store holds only {store.get_state('partial')} from its first sync plus later "
+                      f"ones; reports and --analytics miss older jobs "
+                      f"(run with --full_refresh --limit 0 and no --since to fill it in)")
+            # Each report streams its rows straight from the store
+            since = _iso(args.since)
+            job_count = store.count(since=since, limit=limit)
+            job_rows = lambda: (record_to_row(r) for r in store.iter_jobs(since=since, limit=limit))
+            step_rows = lambda: (step_record_to_row(r) for r in store.iter_steps(since=since, limit=limit)) \
+                if with_steps else ()
+            if args.analytics:
+                # Whole stored history (within --since), not just the --limit newest jobs
+                from job_analytics import load_history, summarize_history, summary_rows
+                t0 = time.perf_counter()
+                history_jobs, history_steps = load_history(store, since=since)
+                summary_data = summary_rows(summarize_history(history_jobs, history_steps,
+                                                              trend_days=args.trend_days))
+                print(f"📈 Summarized {len(history_jobs)} jobs and {len(history_steps)} steps into "
+                      f"{len(summary_data)} rows in {time.perf_counter() - t0:.2f}s")
         
-        if not jobs_list:
+        if not job_count:
             print("⚠️  No jobs found in the workspace.")
             sys.exit(0)
         
-        print(f"✅ Found {len(jobs_list)} jobs")
-        
-        # Collect job data in a structured format
-        jobs_data = []
-        
-        # Prepare markdown table
-        table_lines = [
-            "# Azure ML Jobs Review",
-            "",
-            f"**Workspace:** {workspace_name}",
-            f"**Generated:** {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}",
-            "",
-            "| Job ID | Display Name | Status | Dataset | Start Time | End Time |",
-            "|--------|--------------|--------|---------|------------|----------|"
-        ]
-        
-        # Add each job to the table and collect data
-        for job in jobs_list:
-            job_id = job.name if hasattr(job, 'name') else "N/A"
-            display_name = job.display_name if hasattr(job, 'display_name') else "N/A"
-            status = job.status if hasattr(job, 'status') else "N/A"
-            dataset = get_dataset_input(job)
-            start_time = format_datetime(job.creation_context.created_at if hasattr(job, 'creation_context') else None)
-            
-            # Get end time from properties if available
-            end_time = "N/A"
-            if hasattr(job, 'properties') and job.properties and 'end_time' in job.properties:
-                end_time = format_datetime(job.properties['end_time'])
-            elif status in ["Completed", "Failed", "Canceled"]:
-                # For completed jobs, try to get the last modified time
-                if hasattr(job, 'creation_context') and hasattr(job.creation_context, 'last_modified_at'):
-                    end_time = format_datetime(job.creation_context.last_modified_at)
-            
-            # Collect structured data for CSV and PDF
-            jobs_data.append({
-                'Job ID': job_id,
-                'Display Name': display_name,
-                'Status': status,
-                'Dataset': dataset,
-                'Start Time': start_time,
-                'End Time': end_time
-            })
-            
-            # Create markdown table row
-            row = f"| {job_id} | {display_name} | {status} | {dataset} | {start_time} | {end_time} |"
-            table_lines.append(row)
-        
-        # Output directory
-        output_dir = os.path.dirname(__file__)
+        print(f"✅ Found {job_count} jobs")
         
         # Save to Markdown
         md_output_path = os.path.join(output_dir, "jobs_review.md")
-        with open(md_output_path, 'w') as f:
-            f.write('\n'.join(table_lines))
-        print(f"\n✅ Markdown file saved to: {md_output_path}")
+        save_to_markdown(job_rows(), md_output_path, workspace_name, steps_data=step_rows(),
+                         summary_data=summary_data)
         
         # Save to CSV
         csv_output_path = os.path.join(output_dir, "job_review.csv")
-        save_to_csv(jobs_data, csv_output_path)
+        save_to_csv(job_rows(), csv_output_path)
+        steps_output_path = None
+        steps = iter(step_rows())
+        first_step = next(steps, None)
+        if first_step is not None:
+            steps_output_path = os.path.join(output_dir, "job_review_steps.csv")
+            save_to_csv(itertools.chain([first_step], steps), steps_output_path, fieldnames=STEP_FIELDS)
+        summary_output_path = None
+        if summary_data:
+            summary_output_path = os.path.join(output_dir, "job_review_summary.csv")
+            save_to_csv(summary_data, summary_output_path, fieldnames=list(summary_data[0]))
         
         # Save to PDF
         pdf_output_path = os.path.join(output_dir, "job_review.pdf")
-        save_to_pdf(jobs_data, pdf_output_path, workspace_name)
+        save_to_pdf(job_rows(), pdf_output_path, workspace_name, summary_data=summary_data)
         
         print(f"\n📊 Summary:")
         print(f"  - Markdown: {md_output_path}")
         print(f"  - CSV: {csv_output_path}")
         print(f"  - PDF: {pdf_output_path}")
+        if steps_output_path:
+            print(f"  - Steps CSV: {steps_output_path}")
+        if summary_output_path:
+            print(f"  - Summary CSV: {summary_output_path}")
+        
+        if stats:
+            print(f"\n📈 Fetched {stats['jobs']} jobs and {stats['steps']} steps in {stats['wall_s']:.2f}s "
+                  f"({stats['jobs_per_s']} jobs/s, {stats['detail_calls']} detail calls, "
+                  f"{stats['workers']} workers; listing took {stats['list_s']:.2f}s)")
+            for failure in stats['errors']:
+                print(f"⚠️  Details unavailable for {failure['job']}: {failure['error']}")
         
         print(f"\nPreview of the markdown table:")
-        print('\n'.join(table_lines))
+        with open(md_output_path, encoding='utf-8') as f:
+            preview = list(itertools.islice(f, PREVIEW_LINES))
+            remaining = sum(1 for _ in f)
+        print(''.join(preview).rstrip('\n'))
+        if remaining:
+            print(f"... ({remaining} more lines in {md_output_path})")
         
     except Exception as e:
         print(f"❌ Error retrieving jobs: {e}")
         import traceback
         traceback.print_exc()
         sys.exit(1)
+    finally:
+        if store is not None:
+            store.close()
 
 if __name__ == "__main__":
     main()
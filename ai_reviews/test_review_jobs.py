@@ -7,11 +7,16 @@ This tests the CSV and PDF generation functions with mock data.
 import os
 import sys
 import tempfile
-from datetime import datetime
+import time
+from datetime import datetime, timedelta
 
 # Import the functions we want to test
 sys.path.insert(0, os.path.dirname(__file__))
 from review_jobs import save_to_csv, save_to_pdf, format_datetime, get_dataset_input
+from review_jobs import collect_jobs, parse_since, sync_store
+from review_jobs import save_to_markdown, record_to_row, step_record_to_row, PDF_ROWS_PER_PAGE, PDF_TITLE_ROWS
+from job_store import JobStore
+from fake_ml_client import FakeMLClient
 
 def test_format_datetime():
     """Test datetime formatting."""
@@ -145,6 +150,209 @@ def test_pdf_generation():
         if os.path.exists(tmp_path):
             os.unlink(tmp_path)
 
+def test_paged_parallel_collection():
+    """Test paging, --since/--limit, parallel detail lookups and deterministic order."""
+    print("\nTesting paged, parallel job collection...")
+    
+    client = FakeMLClient(default_latency=0.02, jitter=0.9, page_size=25, seed=1)
+    names = client.seed_history(120, interval_s=3600)
+    newest_first = names[::-1]
+    
+    # Whole history, in listing order even though lookups finish out of order
+    start = time.perf_counter()
+    rows, steps, stats = collect_jobs(client, workers=16)
+    parallel_s = time.perf_counter() - start
+    assert [r['Job ID'] for r in rows] == newest_first, "Rows should keep the listing order"
+    assert stats['jobs'] == 120 and stats['steps'] == len(steps) > 120, stats
+    assert list(dict.fromkeys(s['Job ID'] for s in steps)) == newest_first, "Steps should follow their jobs"
+    assert len(client.calls_for("jobs", "list_page")) == 5, "120 jobs in pages of 25"
+    
+    # --limit and --since
+    rows, _, _ = collect_jobs(client, limit=30, workers=8, with_steps=False)
+    assert [r['Job ID'] for r in rows] == newest_first[:30]
+    since = datetime.utcnow() - timedelta(hours=10.5)
+    rows, _, stats = collect_jobs(client, since=since, workers=8, with_steps=False)
+    assert [r['Job ID'] for r in rows] == newest_first[:9], [r['Job ID'] for r in rows]
+    assert stats['detail_calls'] == 9
+    assert abs((parse_since("2d") - (datetime.utcnow() - timedelta(days=2))).total_seconds()) < 5
+    assert parse_since("2025-11-01T08:00:00Z") == datetime(2025, 11, 1, 8, 0)
+    
+    # Bounded pool: more workers is faster than one
+    serial = FakeMLClient(default_latency=0.02, page_size=25)
+    serial.seed_history(40)
+    start = time.perf_counter()
+    collect_jobs(serial, workers=1)
+    serial_s = time.perf_counter() - start
+    assert serial_s > 1.5, f"40 jobs x 2 lookups x 20ms serially should take >1.5s, took {serial_s:.2f}s"
+    assert parallel_s < serial_s, f"16 workers over 120 jobs ({parallel_s:.2f}s) vs 1 worker over 40 ({serial_s:.2f}s)"
+    
+    # Failed lookups keep the listed job and are reported
+    flaky = FakeMLClient(default_latency=0.001, fail={"jobs.get"})
+    flaky.seed_history(4)
+    rows, steps, stats = collect_jobs(flaky, workers=4)
+    assert len(rows) == 4 and not steps and len(stats['errors']) == 4, stats
+    
+    print("✅ paged, parallel job collection tests passed")
+    print(f"   120 jobs with 16 workers: {parallel_s:.2f}s; 40 jobs with 1 worker: {serial_s:.2f}s")
+
+def test_incremental_store():
+    """Test that repeat syncs only list the newest page and re-read unfinished jobs."""
+    print("\nTesting incremental job-history store...")
+    
+    client = FakeMLClient(default_latency=0.001, page_size=25)
+    client.seed_history(100)
+    client.add_job("live_run", [(0.0, "Running"), (0.3, "Completed")])
+    client._jobs["live_run"]["created_at"] -= timedelta(minutes=10)
+    client.add_job("later_run", [(0.0, "Completed")])
+    
+    with tempfile.TemporaryDirectory() as tmp:
+        with JobStore(os.path.join(tmp, "history.sqlite")) as store:
+            first = sync_store(client, store, workers=8)
+            assert first['inserted'] == 102 and first['updated'] == 0, first
+            assert store.unfinished_jobs() == ["live_run"], store.unfinished_jobs()
+            assert len(client.calls_for("jobs", "list_page")) == 5
+            
+            # Nothing new: one page listed, only the unfinished job looked up again
+            time.sleep(0.35)
+            calls_before = len(client.calls)
+            second = sync_store(client, store, workers=8)
+            new_calls = client.calls[calls_before:]
+            assert [c['method'] for c in new_calls].count("list_page") == 1, new_calls
+            assert second['listed'] == 1 and second['skipped_unchanged'] == 1, second
+            assert second['refreshed_unfinished'] == 1 and second['detail_calls'] == 2, second
+            assert second['inserted'] == 0 and second['updated'] == 1, second
+            assert store.unfinished_jobs() == []
+            
+            # A new job is picked up; finished jobs are not fetched again
+            client.add_job("new_run", [(0.0, "Failed")])
+            third = sync_store(client, store, workers=8)
+            assert third['inserted'] == 1 and third['detail_calls'] == 2, third
+            
+            jobs = store.jobs(limit=3)
+            assert [j['name'] for j in jobs] == ["new_run", "later_run", "live_run"], [j['name'] for j in jobs]
+            assert jobs[0]['status'] == "Failed" and jobs[2]['status'] == "Completed"
+            assert store.count() == 103
+            history_steps = store.steps([store.jobs()[-1]['name']])
+            assert [s['step'] for s in history_steps][0] == "prep_data", history_steps
+            assert store.get_state("watermark") == jobs[0]['created_at']
+        
+        # The store is reopened from disk for offline reporting
+        with JobStore(os.path.join(tmp, "history.sqlite")) as store:
+            assert store.count() == 103 and not store.get_state("partial")
+
+        # A first sync cut off by a limit is flagged until an unbounded full refresh fills the store in
+        with JobStore(os.path.join(tmp, "limited.sqlite")) as store:
+            limited = sync_store(client, store, limit=5, workers=8)
+            assert limited['stored_jobs'] == 5 and limited['partial'], limited
+            assert sync_store(client, store, workers=8)['partial'], "later syncs only add newer jobs"
+            assert sync_store(client, store, limit=5, full_refresh=True, workers=8)['partial']
+            filled = sync_store(client, store, full_refresh=True, workers=8)
+            assert filled['stored_jobs'] == 103 and not filled['partial'], filled
+
+        # So is a first sync bounded by --since
+        since = sorted(job["created_at"] for job in client._jobs.values())[50]
+        with JobStore(os.path.join(tmp, "recent.sqlite")) as store:
+            recent = sync_store(client, store, since=since, workers=8)
+            assert recent['stored_jobs'] < 103 and recent['partial'], recent
+            assert "since" in store.get_state("partial"), store.get_state("partial")
+            assert sync_store(client, store, since=since, full_refresh=True, workers=8)['partial']
+            assert not sync_store(client, store, full_refresh=True, workers=8)['partial']
+    
+    print("✅ incremental job-history store tests passed")
+
+def test_streamed_reports():
+    """Test that the writers take rows straight from the store and paginate the PDF."""
+    print("\nTesting streamed reports...")
+    
+    client = FakeMLClient(default_latency=0.001, page_size=50)
+    client.seed_history(120)
+    
+    with tempfile.TemporaryDirectory() as tmp:
+        with JobStore(os.path.join(tmp, "history.sqlite")) as store:
+            sync_store(client, store, workers=8)
+            assert store.count() == 120 and store.count(limit=7) == 7
+            
+            # iter_steps follows the job order of iter_jobs
+            names = [r['name'] for r in store.iter_jobs(limit=10)]
+            steps = list(store.iter_steps(limit=10))
+            assert [s['job_name'] for s in steps] == [s['job_name'] for s in store.steps(names)]
+            assert list(dict.fromkeys(s['job_name'] for s in steps)) == names
+            
+            md_path = os.path.join(tmp, "jobs_review.md")
+            result = save_to_markdown((record_to_row(r) for r in store.iter_jobs()), md_path, "project_III_MLOPS",
+                                      steps_data=(step_record_to_row(r) for r in store.iter_steps()))
+            assert result == True, "Markdown generation should return True"
+            with open(md_path, encoding='utf-8') as f:
+                lines = f.read().split("\n")
+            assert len(lines) == 7 + 120 + 5 + len(store.steps()), len(lines)
+            assert lines[7].startswith(f"| {names[0]} |"), lines[7]
+            
+            pdf_path = os.path.join(tmp, "job_review.pdf")
+            result = save_to_pdf((record_to_row(r) for r in store.iter_jobs()), pdf_path, "project_III_MLOPS")
+            assert result == True, "PDF generation should return True"
+            with open(pdf_path, 'rb') as f:
+                content = f.read()
+            pages = content.count(b'/Type /Page') - content.count(b'/Type /Pages')
+            first_page = PDF_ROWS_PER_PAGE - PDF_TITLE_ROWS
+            expected = 1 + -(-(120 - first_page) // PDF_ROWS_PER_PAGE)
+            assert pages == expected, f"expected {expected} pages, got {pages}"
+    
+    print("✅ streamed report tests passed")
+    print(f"   {pages} PDF pages for 120 jobs")
+
+def test_history_analytics():
+    """Test the vectorized history summary against a per-job computation."""
+    print("\nTesting job history analytics...")
+    from statistics import median
+    from job_analytics import load_history, summarize_history, summary_rows, SUMMARY_FIELDS
+    
+    client = FakeMLClient(default_latency=0.001, page_size=100)
+    client.seed_history(300, failure_rate=0.2, seed=11)
+    
+    with tempfile.TemporaryDirectory() as tmp:
+        with JobStore(os.path.join(tmp, "history.sqlite")) as store:
+            sync_store(client, store, workers=8)
+            jobs, steps = load_history(store)
+            assert len(jobs) == 300 and len(steps) == len(store.steps())
+            summary = summarize_history(jobs, steps, trend_days=3)
+            
+            # Expected values for one pipeline, job by job
+            records = [r for r in store.jobs() if r['display_name'] == "batch-scoring"]
+            minutes = lambda a, b: (datetime.fromisoformat(b) - datetime.fromisoformat(a)).total_seconds() / 60
+            row = summary.loc["batch-scoring"]
+            assert row['kind'] == "job" and row['runs'] == len(records) == 100, row
+            assert row['failed'] == sum(r['status'] == "Failed" for r in records)
+            assert abs(row['p50'] - median(minutes(r['started_at'], r['ended_at']) for r in records)) < 1e-6
+            assert abs(row['queue_p50'] - median(minutes(r['created_at'], r['started_at']) for r in records)) < 1e-6
+            newest = max(datetime.fromisoformat(r['created_at']) for r in records)
+            recent = [r for r in records if newest - datetime.fromisoformat(r['created_at']) < timedelta(days=3)]
+            earlier = [r for r in records if r not in recent]
+            rate = lambda rs: sum(r['status'] == "Failed" for r in rs) / len(rs)
+            assert abs(row['failure_change'] - (rate(recent) - rate(earlier))) < 1e-9, row
+            
+            # Steps after a failed one are canceled: finished runs, but no duration
+            step = summary.loc["used-cars-training-pipeline / register_model"]
+            assert step['kind'] == "step" and step['runs'] == 100, step
+            assert 0 <= step['queue_p50'] < 1, "steps wait seconds, not minutes, for the previous one"
+            
+            rows = summary_rows(summary)
+            assert len(rows) == 3 + 7 and list(rows[0]) == SUMMARY_FIELDS, rows[0]
+            
+            md_path = os.path.join(tmp, "jobs_review.md")
+            save_to_markdown([record_to_row(r) for r in store.jobs(limit=5)], md_path, "project_III_MLOPS",
+                             summary_data=rows)
+            with open(md_path, encoding='utf-8') as f:
+                content = f.read()
+            assert "## Duration and Failure Summary" in content
+            assert content.rstrip().endswith(" |") and "| batch-scoring | job | 100 |" in content
+            pdf_path = os.path.join(tmp, "job_review.pdf")
+            assert save_to_pdf([], pdf_path, "project_III_MLOPS", summary_data=rows) == True
+            with open(pdf_path, 'rb') as f:
+                content = f.read()
+            assert content.count(b'/Type /Page') - content.count(b'/Type /Pages') == 2, "jobs page + summary page"
+    
+    print("✅ job history analytics tests passed")
+
 def main():
     """Run all tests."""
     print("="*60)
@@ -155,6 +363,10 @@ def main():
         test_format_datetime()
         test_csv_generation()
         test_pdf_generation()
+        test_paged_parallel_collection()
+        test_incremental_store()
+        test_streamed_reports()
+        test_history_analytics()
         
         print("\n" + "="*60)
         print("✅ All tests passed successfully!")
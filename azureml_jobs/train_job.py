@@ -1,23 +1,44 @@
-from azure.ai.ml import command, Input
-from azure.ai.ml import MLClient
-from azure.identity import DefaultAzureCredential
-
-ml_client = MLClient.from_config(credential=DefaultAzureCredential())
-
-job = command(
-    code="./src/model_training",
-    command="python train_model.py --train_data ${{inputs.train_data}} --test_data ${{inputs.test_data}} --n_estimators 100 --max_depth 10 --model_output ${{outputs.model_output}}",
-    inputs={
-        "train_data": Input(path="azureml:used-cars-train:1", type="uri_file"),
-        "test_data": Input(path="azureml:used-cars-test:1", type="uri_file")
-    },
-    outputs={
-        "model_output": Input(type="uri_folder", mode="rw_mount")
-    },
-    environment="azureml:used-cars-env:1",
-    compute="cpu-cluster",
-    display_name="train-random-forest",
-    description="Train Random Forest Regressor on used cars data"
-)
-
-ml_client.jobs.create_or_update(job)
+import os
+import shutil
+import sys
+import tempfile
+
+from azure.ai.ml import command, Input, Output
+
+# Workspace from mlops/config: environment, credentials file, config.json, defaults
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+from mlops.config import get_ml_client
+
+REPO_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+
+
+def stage_code(dest):
+    """Copy model_training/ plus the shared instrumentation module into one job code folder."""
+    shutil.copytree(os.path.join(REPO_ROOT, "model_training"), dest, dirs_exist_ok=True,
+                    ignore=shutil.ignore_patterns("__pycache__", "outputs"))
+    shutil.copy2(os.path.join(REPO_ROOT, "data-science", "src", "instrumentation.py"), dest)
+    return dest
+
+
+ml_client = get_ml_client()
+code_dir = stage_code(tempfile.mkdtemp(prefix="train_job_code_"))
+
+try:
+    job = command(
+        code=code_dir,
+        command="python train_model.py --train_data ${{inputs.train_data}} --test_data ${{inputs.test_data}} --n_estimators 100 --max_depth 10 --model_output ${{outputs.model_output}}",
+        inputs={
+            "train_data": Input(path="azureml:used-cars-train:1", type="uri_file"),
+            "test_data": Input(path="azureml:used-cars-test:1", type="uri_file")
+        },
+        outputs={
+            "model_output": Output(type="uri_folder", mode="rw_mount")
+        },
+        environment="azureml:used-cars-env:1",
+        compute="cpu-cluster",
+        display_name="train-random-forest",
+        description="Train Random Forest Regressor on used cars data"
+    )
+    ml_client.jobs.create_or_update(job)  # uploads the code snapshot
+finally:
+    shutil.rmtree(code_dir, ignore_errors=True)
@@ -0,0 +1,364 @@
+#!/usr/bin/env python3
+"""
+Parallel, resumable block upload of model artifacts to blob storage.
+
+Model(path=<local folder>) uploads every file as one serial stream, and an
+interrupted upload starts over. Here each file is split into blocks
+(block-blob semantics: stage blocks, then commit the ordered block list):
+
+- one read pass computes the file's SHA-256 and an MD5 per block; the block
+  ID is the block index plus its MD5, so a staged block with the same ID
+  holds the same bytes
+- blocks already staged (by an interrupted earlier run) are skipped, and a
+  blob already committed with the same SHA-256 is not uploaded at all
+- the remaining blocks are staged concurrently by a bounded thread pool,
+  each read from disk when its worker starts (memory stays at about
+  workers x block size), with the MD5 checked by the store and retries with
+  exponential backoff
+- the block list is committed with the SHA-256 as metadata and the
+  committed list and size are checked against the file
+
+Artifacts go under a content-addressed prefix (models/<name>/<sha256[:16]>),
+so re-running an interrupted registration of the same model resumes it. The
+per-run files the hash leaves out (model_registry.RUN_FILES) are not
+uploaded either, so every blob under a prefix is covered by its hash.
+
+Stores:
+    AzureBlobStore    the workspace's default datastore (azure-storage-blob)
+    LocalBlobStore    a folder with the same semantics, for offline tests and
+                      benchmarks; optional per-call latency, per-connection
+                      bandwidth and injected failures
+
+Example:
+    store = LocalBlobStore("/tmp/blobs", latency=0.01, bytes_per_s=20e6)
+    remote_path, stats = upload_artifact(store, "outputs/model", "models/used-cars-model/1a2b3c", workers=8)
+    stats["uploaded_bytes"], stats["resumed_blocks"], stats["mb_s"]
+"""
+
+import base64
+import fnmatch
+import hashlib
+import json
+import os
+import random
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+DEFAULT_BLOCK_SIZE = 8 * 1024 * 1024
+DEFAULT_WORKERS = 8
+MAX_ATTEMPTS = 4
+BACKOFF_SECONDS = 0.5
+LOCAL_BLOB_VAR = "MLOPS_LOCAL_BLOB"
+
+
+class ChecksumError(ValueError):
+    """A block or blob does not match the checksum it was sent with."""
+
+
+class UploadError(RuntimeError):
+    """Blocks could not be staged; the staged ones are kept for a resumed run."""
+
+
+def block_id(index: int, md5: str) -> str:
+    """Fixed-length base64 block ID (the service requires one length per blob)."""
+    return base64.b64encode(f"{index:06d}-{md5}".encode("ascii")).decode("ascii")
+
+
+def plan_file(path: str, block_size: int = DEFAULT_BLOCK_SIZE) -> dict:
+    """One read pass: {"size", "sha256", "blocks": [(block_id, offset, length, md5), ...]}."""
+    sha256 = hashlib.sha256()
+    blocks = []
+    offset = 0
+    with open(path, "rb") as f:
+        for data in iter(lambda: f.read(block_size), b""):
+            sha256.update(data)
+            md5 = hashlib.md5(data).hexdigest()
+            blocks.append((block_id(len(blocks), md5), offset, len(data), md5))
+            offset += len(data)
+    return {"size": offset, "sha256": sha256.hexdigest(), "blocks": blocks}
+
+
+def _read(path: str, offset: int, length: int) -> bytes:
+    with open(path, "rb") as f:
+        f.seek(offset)
+        return f.read(length)
+
+
+class LocalBlobStore:
+    """Block-blob store on a folder: blobs at root/<blob>, staged blocks and metadata beside them.
+
+    latency (s) is added to every call; bytes_per_s limits each staged block
+    like one connection's bandwidth; fail_after=N makes every stage call
+    after the first N raise ConnectionError (an interrupted upload); fail_rate
+    fails that share of stage calls (seeded), which a retry recovers from.
+    """
+
+    def __init__(self, root: str, latency: float = 0.0, bytes_per_s: float = None, fail_after: int = None,
+                 fail_rate: float = 0.0, seed: int = 0):
+        self.root = os.path.abspath(root)
+        self.latency = latency
+        self.bytes_per_s = bytes_per_s
+        self.fail_after = fail_after
+        self.fail_rate = fail_rate
+        self.staged_calls = 0
+        self.staged_bytes = 0
+        self.in_flight = 0
+        self.peak_in_flight = 0
+        self._rng = random.Random(seed)
+        self._lock = threading.Lock()
+        os.makedirs(self.root, exist_ok=True)
+
+    def _blob_path(self, blob: str) -> str:
+        return os.path.join(self.root, *blob.split("/"))
+
+    def _state_path(self, kind: str, blob: str) -> str:
+        return os.path.join(self.root, f".{kind}", *blob.split("/"))
+
+    def url(self, blob: str) -> str:
+        return self._blob_path(blob)
+
+    def stage_block(self, blob: str, block_id: str, data: bytes, md5: str):
+        with self._lock:
+            if self.fail_after is not None and self.staged_calls >= self.fail_after:
+                raise ConnectionError(f"Injected interruption staging {blob}")
+            self.staged_calls += 1
+            self.in_flight += 1
+            self.peak_in_flight = max(self.peak_in_flight, self.in_flight)
+            transient = self.fail_rate and self._rng.random() < self.fail_rate
+        try:
+            time.sleep(self.latency + (len(data) / self.bytes_per_s if self.bytes_per_s else 0))
+        finally:
+            with self._lock:
+                self.in_flight -= 1
+        if transient:
+            raise ConnectionError(f"Injected transient failure staging {blob}")
+        if hashlib.md5(data).hexdigest() != md5:
+            raise ChecksumError(f"MD5 mismatch for block {block_id} of {blob}")
+        folder = self._state_path("blocks", blob)
+        os.makedirs(folder, exist_ok=True)
+        name = base64.b64decode(block_id).hex()
+        with open(os.path.join(folder, name + ".tmp"), "wb") as f:
+            f.write(data)
+        os.replace(os.path.join(folder, name + ".tmp"), os.path.join(folder, name))
+        with self._lock:
+            self.staged_bytes += len(data)
+
+    def uncommitted_blocks(self, blob: str) -> dict:
+        """{block_id: size} of the blocks staged for blob and not committed yet."""
+        time.sleep(self.latency)
+        folder = self._state_path("blocks", blob)
+        if not os.path.isdir(folder):
+            return {}
+        return {base64.b64encode(bytes.fromhex(name)).decode("ascii"): os.path.getsize(os.path.join(folder, name))
+                for name in os.listdir(folder) if not name.endswith(".tmp")}
+
+    def properties(self, blob: str):
+        """{"size", "metadata", "blocks"} of the committed blob, or None."""
+        time.sleep(self.latency)
+        try:
+            with open(self._state_path("meta", blob) + ".json") as f:
+                return json.load(f)
+        except FileNotFoundError:
+            return None
+
+    def commit_block_list(self, blob: str, block_ids: list, metadata: dict):
+        time.sleep(self.latency)
+        folder = self._state_path("blocks", blob)
+        target = self._blob_path(blob)
+        os.makedirs(os.path.dirname(target), exist_ok=True)
+        size = 0
+        with open(target + ".tmp", "wb") as out:
+            for bid in block_ids:
+                try:
+                    with open(os.path.join(folder, base64.b64decode(bid).hex()), "rb") as f:
+                        size += out.write(f.read())
+                except FileNotFoundError:
+                    raise ValueError(f"Block {bid} of {blob} was never staged") from None
+        os.replace(target + ".tmp", target)
+        meta_path = self._state_path("meta", blob) + ".json"
+        os.makedirs(os.path.dirname(meta_path), exist_ok=True)
+        with open(meta_path, "w") as f:
+            json.dump({"size": size, "metadata": dict(metadata), "blocks": list(block_ids)}, f)
+        if os.path.isdir(folder):
+            for name in os.listdir(folder):
+                os.remove(os.path.join(folder, name))
+            os.rmdir(folder)
+
+
+class AzureBlobStore:
+    """The same calls on an Azure blob container (azure-storage-blob block blobs)."""
+
+    def __init__(self, container_client, datastore: str = None):
+        self.container = container_client
+        self.datastore = datastore
+
+    @classmethod
+    def from_datastore(cls, ml_client, datastore: str = None) -> "AzureBlobStore":
+        """Container of the workspace's (default) blob datastore, with the default Azure credential."""
+        from azure.identity import DefaultAzureCredential
+        from azure.storage.blob import ContainerClient
+
+        store = ml_client.datastores.get(datastore) if datastore else ml_client.datastores.get_default()
+        account_url = f"{getattr(store, 'protocol', None) or 'https'}://{store.account_name}.blob.{store.endpoint}"
+        return cls(ContainerClient(account_url, store.container_name, credential=DefaultAzureCredential()),
+                   store.name)
+
+    def url(self, blob: str) -> str:
+        return f"azureml://datastores/{self.datastore}/paths/{blob}"
+
+    def stage_block(self, blob: str, block_id: str, data: bytes, md5: str):
+        from azure.core.exceptions import HttpResponseError
+
+        try:
+            # The service checks the MD5 the SDK sends with validate_content
+            self.container.get_blob_client(blob).stage_block(block_id, data, length=len(data),
+                                                             validate_content=True)
+        except HttpResponseError as e:
+            if getattr(e, "error_code", None) == "Md5Mismatch":
+                raise ChecksumError(f"MD5 mismatch for block {block_id} of {blob}") from e
+            raise
+
+    def uncommitted_blocks(self, blob: str) -> dict:
+        from azure.core.exceptions import ResourceNotFoundError
+
+        try:
+            _, uncommitted = self.container.get_blob_client(blob).get_block_list("uncommitted")
+        except ResourceNotFoundError:
+            return {}
+        return {b.id: b.size for b in uncommitted}
+
+    def properties(self, blob: str):
+        from azure.core.exceptions import ResourceNotFoundError
+
+        client = self.container.get_blob_client(blob)
+        try:
+            props = client.get_blob_properties()
+        except ResourceNotFoundError:
+            return None
+        committed, _ = client.get_block_list("committed")
+        return {"size": props.size, "metadata": dict(props.metadata or {}), "blocks": [b.id for b in committed]}
+
+    def commit_block_list(self, blob: str, block_ids: list, metadata: dict):
+        from azure.storage.blob import BlobBlock
+
+        self.container.get_blob_client(blob).commit_block_list([BlobBlock(block_id=b) for b in block_ids],
+                                                                metadata=metadata)
+
+
+def open_blob_store(ml_client):
+    """LocalBlobStore at $MLOPS_LOCAL_BLOB if set, else the workspace's default datastore."""
+    if os.environ.get(LOCAL_BLOB_VAR):
+        return LocalBlobStore(os.environ[LOCAL_BLOB_VAR])
+    return AzureBlobStore.from_datastore(ml_client)
+
+
+def _retriable(error: Exception) -> bool:
+    """Connection errors, checksum mismatches, throttling and 5xx are retried; 4xx (e.g. 403) are not."""
+    status = getattr(error, "status_code", None) or getattr(getattr(error, "response", None), "status_code", None)
+    return status is None or status in (408, 429) or status >= 500
+
+
+def _stage_with_retry(store, path: str, blob: str, block: tuple, attempts: int, backoff: float) -> int:
+    bid, offset, length, md5 = block
+    for attempt in range(1, attempts + 1):
+        try:
+            # Read again on every attempt, so a bad read is not sent twice
+            store.stage_block(blob, bid, _read(path, offset, length), md5)
+            return length
+        except Exception as e:
+            if attempt == attempts or not _retriable(e):
+                raise UploadError(f"Block at offset {offset} of {blob} failed after {attempt} attempt(s): "
+                                  f"{e}") from e
+            time.sleep(backoff * 2 ** (attempt - 1) * (1 + random.random()))
+
+
+def _artifact_files(local_path: str, exclude=()) -> list:
+    """(relative blob name, local path) of every file, sorted; a single file keeps its name.
+
+    Files in a folder whose name matches one of the exclude patterns are skipped.
+    """
+    if os.path.isfile(local_path):
+        return [(os.path.basename(local_path), local_path)]
+    files = []
+    for root, dirs, names in os.walk(local_path):
+        dirs.sort()
+        for name in names:
+            if any(fnmatch.fnmatch(name, pattern) for pattern in exclude):
+                continue
+            full = os.path.join(root, name)
+            files.append((os.path.relpath(full, local_path).replace(os.sep, "/"), full))
+    return sorted(files)
+
+
+def upload_artifact(store, local_path: str, prefix: str, block_size: int = DEFAULT_BLOCK_SIZE,
+                    workers: int = DEFAULT_WORKERS, attempts: int = MAX_ATTEMPTS,
+                    backoff: float = BACKOFF_SECONDS, exclude=()) -> tuple:
+    """Upload a file or folder under prefix; returns (remote path for Model(path=...), stats).
+
+    exclude holds file name patterns to leave out of a folder upload.
+
+    Raises UploadError if a block keeps failing (re-run to resume) and
+    ChecksumError if a committed blob does not match its file.
+    """
+    if not os.path.exists(local_path):
+        raise FileNotFoundError(f"Artifact path not found: {local_path}")
+    t0 = time.perf_counter()
+    prefix = prefix.strip("/")
+    stats = {"files": 0, "bytes": 0, "blocks": 0, "uploaded_blocks": 0, "uploaded_bytes": 0,
+             "resumed_blocks": 0, "skipped_files": 0, "workers": workers, "block_size": block_size}
+    pending = []
+    for relative, full in _artifact_files(local_path, exclude):
+        blob = f"{prefix}/{relative}"
+        plan = plan_file(full, block_size)
+        stats["files"] += 1
+        stats["bytes"] += plan["size"]
+        stats["blocks"] += len(plan["blocks"])
+        committed = store.properties(blob)
+        if committed and committed["metadata"].get("sha256") == plan["sha256"]:
+            stats["skipped_files"] += 1
+            continue
+        staged = store.uncommitted_blocks(blob)
+        todo = [b for b in plan["blocks"] if staged.get(b[0]) != b[2]]
+        stats["resumed_blocks"] += len(plan["blocks"]) - len(todo)
+        pending.append((blob, full, plan, todo))
+
+    with ThreadPoolExecutor(max_workers=max(1, workers), thread_name_prefix="upload") as pool:
+        futures = [(blob, pool.submit(_stage_with_retry, store, full, blob, block, attempts, backoff))
+                   for blob, full, _, todo in pending for block in todo]
+        errors = []
+        for blob, future in futures:
+            try:
+                stats["uploaded_bytes"] += future.result()
+                stats["uploaded_blocks"] += 1
+            except UploadError as e:
+                errors.append(str(e))
+    if errors:
+        raise UploadError(f"{len(errors)} block(s) not staged, {stats['uploaded_blocks']} staged "
+                          f"(re-run to resume): {errors[0]}")
+
+    for blob, full, plan, _ in pending:
+        ids = [b[0] for b in plan["blocks"]]
+        store.commit_block_list(blob, ids, {"sha256": plan["sha256"]})
+        committed = store.properties(blob)
+        if not committed or committed["size"] != plan["size"] or committed["blocks"] != ids:
+            raise ChecksumError(f"Committed {blob} does not match {full}")
+
+    stats["seconds"] = time.perf_counter() - t0
+    stats["mb_s"] = stats["uploaded_bytes"] / 2**20 / stats["seconds"] if stats["seconds"] else 0.0
+    remote = store.url(prefix if os.path.isdir(local_path) else f"{prefix}/{os.path.basename(local_path)}")
+    return remote, stats
+
+
+def upload_model(store, model, content_sha256: str = None, **options) -> tuple:
+    """Upload model.path under models/<name>/<content hash>; returns (remote path, stats).
+
+    Only the files the hash covers are uploaded: a prefix never gets blobs
+    that differ between runs of the same model.
+    """
+    from model_registry import RUN_FILES, hash_model_path
+
+    if not content_sha256:
+        content_sha256 = hash_model_path(str(model.path))["sha256"]
+    return upload_artifact(store, str(model.path), f"models/{model.name}/{content_sha256[:16]}",
+                           exclude=RUN_FILES, **options)
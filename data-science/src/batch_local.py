@@ -0,0 +1,354 @@
+#!/usr/bin/env python3
+"""
+Local executor for parallel batch-inference components.
+
+Runs the same entry script as the Azure ML parallel job (init()/run(mini_batch))
+on one machine with a process pool:
+- the input CSV file (or folder of CSVs) is partitioned into row mini-batches,
+- every worker process calls init() once, then run() per mini-batch,
+- each finished mini-batch is written to its own part file and recorded in a
+  progress log, so an interrupted run resumes where it stopped,
+- failed mini-batches are retried, and the run aborts once the component's
+  error_threshold (failed rows) or mini_batch_error_threshold is exceeded
+  (-1 disables a threshold, as on Azure ML).
+
+Settings are read from the component YAML and can be overridden on the
+command line.
+
+Example:
+    python batch_local.py --component ../../mlops/azureml/train/batch_score.yml \
+        --input ../../data/used_cars.csv --output /tmp/batch_out \
+        --set model_path=outputs/model --mini_batch_rows 50 --workers 4
+"""
+
+import argparse
+import hashlib
+import importlib.util
+import json
+import os
+import re
+import shlex
+import sys
+import time
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+from datetime import datetime
+
+import pandas as pd
+
+PROGRESS_DIR = "_progress"
+BINDING = re.compile(r"\$\{\{\s*(?:inputs|outputs)\.(\w+)\s*\}\}")
+SIZE_UNITS = {"b": 1, "kb": 1024, "mb": 1024 ** 2, "gb": 1024 ** 3}
+
+_entry = None
+
+
+def load_component(path: str) -> dict:
+    """Read batch settings from a parallel component YAML."""
+    import yaml
+
+    with open(path, encoding="utf-8") as f:
+        spec = yaml.safe_load(f) or {}
+    task = spec.get("task") or {}
+    component_dir = os.path.dirname(os.path.abspath(path))
+    code_dir = os.path.normpath(os.path.join(component_dir, task.get("code", ".")))
+    retry = spec.get("retry_settings") or {}
+    return {
+        "entry_script": os.path.join(code_dir, task["entry_script"]) if task.get("entry_script") else None,
+        "program_arguments": task.get("program_arguments", "") or "",
+        "mini_batch_size": spec.get("mini_batch_size"),
+        "error_threshold": spec.get("error_threshold", -1),
+        "mini_batch_error_threshold": spec.get("mini_batch_error_threshold", -1),
+        "max_retries": retry.get("max_retries", 3),
+        "workers": spec.get("max_concurrency_per_instance"),
+    }
+
+
+def parse_size(value) -> int:
+    """'10mb' -> bytes; plain integers are bytes."""
+    match = re.fullmatch(r"\s*(\d+(?:\.\d+)?)\s*([kmg]?b)?\s*", str(value).lower())
+    if not match:
+        raise ValueError(f"Invalid mini_batch_size: {value}")
+    return int(float(match.group(1)) * SIZE_UNITS[match.group(2) or "b"])
+
+
+def list_input_files(input_path: str) -> list:
+    if os.path.isdir(input_path):
+        files = sorted(os.path.join(input_path, f) for f in os.listdir(input_path) if f.lower().endswith(".csv"))
+        if not files:
+            raise ValueError(f"❌ No CSV files found in directory: {input_path}")
+        return files
+    if os.path.isfile(input_path):
+        return [input_path]
+    raise ValueError(f"❌ Invalid input path: {input_path}")
+
+
+def rows_for_size(files: list, size_bytes: int, sample_lines: int = 1000) -> int:
+    """Estimate how many CSV rows fit in size_bytes from the first file."""
+    with open(files[0], "rb") as f:
+        f.readline()
+        sample = [line for _, line in zip(range(sample_lines), f)]
+    if not sample:
+        return 1
+    avg = sum(len(line) for line in sample) / len(sample)
+    return max(1, int(size_bytes // avg))
+
+
+def input_fingerprint(files: list, rows_per_batch: int, entry_script: str, argv: list) -> str:
+    """Identify a run so progress is only resumed for the same input and settings."""
+    digest = hashlib.sha256()
+    for path in files:
+        stat = os.stat(path)
+        digest.update(f"{os.path.abspath(path)}|{stat.st_size}|{stat.st_mtime_ns}\n".encode())
+    digest.update(f"{rows_per_batch}|{os.path.abspath(entry_script)}|{' '.join(argv)}".encode())
+    return digest.hexdigest()
+
+
+def iter_mini_batches(files: list, rows_per_batch: int):
+    """Yield (index, DataFrame) mini-batches across all input files."""
+    index = 0
+    for path in files:
+        for chunk in pd.read_csv(path, chunksize=rows_per_batch):
+            yield index, chunk
+            index += 1
+
+
+def _init_worker(entry_script: str, argv: list):
+    """Import the entry script in this worker and call its init() once."""
+    global _entry
+    sys.path.insert(0, os.path.dirname(os.path.abspath(entry_script)))
+    spec = importlib.util.spec_from_file_location("batch_entry", entry_script)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    sys.argv = [entry_script] + argv
+    if hasattr(module, "init"):
+        module.init()
+    _entry = module
+
+
+def _run_mini_batch(index: int, frame: pd.DataFrame, part_path: str, max_retries: int) -> dict:
+    """Score one mini-batch with retries and write its part file."""
+    t0 = time.perf_counter()
+    error = None
+    for attempt in range(1, max_retries + 2):
+        try:
+            result = _entry.run(frame)
+            if not isinstance(result, pd.DataFrame):
+                result = pd.DataFrame({"result": list(result)})
+            tmp_path = part_path + ".tmp"
+            result.to_csv(tmp_path, index=False)
+            os.replace(tmp_path, part_path)
+            return {"batch": index, "status": "ok", "rows": len(frame), "output_rows": len(result),
+                    "attempts": attempt, "seconds": round(time.perf_counter() - t0, 4)}
+        except Exception as e:
+            error = f"{type(e).__name__}: {e}"
+    return {"batch": index, "status": "failed", "rows": len(frame), "output_rows": 0,
+            "attempts": max_retries + 1, "seconds": round(time.perf_counter() - t0, 4), "error": error}
+
+
+def load_progress(progress_dir: str, fingerprint: str, restart: bool) -> dict:
+    """Return {batch: record} of completed mini-batches from an earlier matching run."""
+    manifest_path = os.path.join(progress_dir, "manifest.json")
+    progress_path = os.path.join(progress_dir, "progress.jsonl")
+    if not restart and os.path.exists(manifest_path):
+        with open(manifest_path, encoding="utf-8") as f:
+            manifest = json.load(f)
+        if manifest.get("fingerprint") == fingerprint and os.path.exists(progress_path):
+            done = {}
+            with open(progress_path, encoding="utf-8") as f:
+                for line in f:
+                    if line.strip():
+                        record = json.loads(line)
+                        part = os.path.join(progress_dir, f"part-{record['batch']:06d}.csv")
+                        if record["status"] == "ok" and os.path.exists(part):
+                            done[record["batch"]] = record
+            return done
+        print("[WARN] Input or settings changed since the last run; starting over", flush=True)
+
+    os.makedirs(progress_dir, exist_ok=True)
+    for name in os.listdir(progress_dir):
+        os.remove(os.path.join(progress_dir, name))
+    with open(manifest_path, "w", encoding="utf-8") as f:
+        json.dump({"fingerprint": fingerprint, "created_utc": datetime.utcnow().isoformat() + "Z"}, f, indent=2)
+    return {}
+
+
+def merge_parts(progress_dir: str, batches: list, output_file: str):
+    """Concatenate part files in mini-batch order into one CSV."""
+    with open(output_file, "w", encoding="utf-8", newline="") as out:
+        for i, batch in enumerate(batches):
+            with open(os.path.join(progress_dir, f"part-{batch:06d}.csv"), encoding="utf-8") as part:
+                header = part.readline()
+                if i == 0:
+                    out.write(header)
+                for line in part:
+                    out.write(line)
+
+
+def run_local(entry_script: str, input_path: str, output_dir: str, argv: list = None, rows_per_batch: int = 1000,
+              workers: int = None, error_threshold: int = -1, mini_batch_error_threshold: int = -1,
+              max_retries: int = 3, output_file: str = "predictions.csv", restart: bool = False) -> dict:
+    """Run an init()/run() entry script over mini-batches with a process pool; returns the summary."""
+    argv = argv or []
+    workers = workers or os.cpu_count() or 1
+    files = list_input_files(input_path)
+    progress_dir = os.path.join(output_dir, PROGRESS_DIR)
+    fingerprint = input_fingerprint(files, rows_per_batch, entry_script, argv)
+    done = load_progress(progress_dir, fingerprint, restart)
+    resumed = len(done)
+    if resumed:
+        print(f"[DEBUG] Resuming: {resumed} mini-batch(es) already completed", flush=True)
+
+    start = time.perf_counter()
+    failed_batches = 0
+    failed_rows = 0
+    processed = 0
+    rows_scored = 0
+    aborted = None
+    errors = []
+    progress_path = os.path.join(progress_dir, "progress.jsonl")
+
+    with open(progress_path, "a", encoding="utf-8") as progress, \
+            ProcessPoolExecutor(max_workers=workers, initializer=_init_worker,
+                                initargs=(entry_script, argv)) as pool:
+        pending = set()
+
+        def collect(futures):
+            nonlocal failed_batches, failed_rows, processed, rows_scored, aborted
+            for future in futures:
+                record = future.result()
+                processed += 1
+                if record["status"] == "ok":
+                    rows_scored += record["output_rows"]
+                    failed_rows += max(0, record["rows"] - record["output_rows"])
+                    done[record["batch"]] = record
+                else:
+                    failed_batches += 1
+                    failed_rows += record["rows"]
+                    if len(errors) < 5:
+                        errors.append({"batch": record["batch"], "error": record["error"]})
+                progress.write(json.dumps(record) + "\n")
+                progress.flush()
+            if 0 <= mini_batch_error_threshold < failed_batches:
+                aborted = f"mini_batch_error_threshold exceeded ({failed_batches} > {mini_batch_error_threshold})"
+            elif 0 <= error_threshold < failed_rows:
+                aborted = f"error_threshold exceeded ({failed_rows} > {error_threshold})"
+
+        total_batches = 0
+        for index, frame in iter_mini_batches(files, rows_per_batch):
+            total_batches += 1
+            if index in done:
+                continue
+            part_path = os.path.join(progress_dir, f"part-{index:06d}.csv")
+            pending.add(pool.submit(_run_mini_batch, index, frame, part_path, max_retries))
+            # Bound in-flight mini-batches so large inputs are never fully in memory
+            if len(pending) >= workers * 2:
+                finished, pending = wait(pending, return_when=FIRST_COMPLETED)
+                collect(finished)
+                if aborted:
+                    break
+        if not aborted:
+            finished, pending = wait(pending)
+            collect(finished)
+        for future in pending:
+            future.cancel()
+
+    elapsed = time.perf_counter() - start
+    status = "failed" if aborted else ("completed_with_errors" if failed_batches else "completed")
+    output_path = os.path.join(output_dir, output_file)
+    if not aborted:
+        merge_parts(progress_dir, sorted(done), output_path)
+
+    summary = {
+        "status": status,
+        "timestamp_utc": datetime.utcnow().isoformat() + "Z",
+        "entry_script": entry_script,
+        "input_files": files,
+        "rows_per_batch": rows_per_batch,
+        "workers": workers,
+        "mini_batches_total": total_batches if not aborted else None,
+        "mini_batches_resumed": resumed,
+        "mini_batches_processed": processed,
+        "mini_batches_failed": failed_batches,
+        "rows_failed": failed_rows,
+        "rows_scored": rows_scored,
+        "seconds": round(elapsed, 3),
+        "rows_per_second": round(rows_scored / elapsed, 1) if elapsed > 0 else None,
+        "aborted_reason": aborted,
+        "errors": errors,
+        "output": None if aborted else output_path,
+    }
+    with open(os.path.join(output_dir, "batch_summary.json"), "w", encoding="utf-8") as f:
+        json.dump(summary, f, indent=2, default=str)
+    return summary
+
+
+def bind_arguments(program_arguments: str, bindings: dict) -> list:
+    """Replace ${{inputs.X}} / ${{outputs.X}} with local values and split into argv."""
+    def replace(match):
+        name = match.group(1)
+        if name not in bindings:
+            raise ValueError(f"No local value for '{name}'; pass --set {name}=PATH")
+        return bindings[name]
+
+    return shlex.split(BINDING.sub(replace, program_arguments))
+
+
+def main(args):
+    settings = load_component(args.component) if args.component else {}
+    entry_script = args.entry_script or settings.get("entry_script") or os.path.join(
+        os.path.dirname(os.path.abspath(__file__)), "batch_score.py")
+
+    bindings = dict(item.split("=", 1) for item in args.set or [])
+    program_arguments = args.program_arguments if args.program_arguments is not None else settings.get(
+        "program_arguments", "")
+    argv = bind_arguments(program_arguments, bindings)
+
+    files = list_input_files(args.input)
+    if args.mini_batch_rows:
+        rows_per_batch = args.mini_batch_rows
+    elif args.mini_batch_size or settings.get("mini_batch_size"):
+        rows_per_batch = rows_for_size(files, parse_size(args.mini_batch_size or settings["mini_batch_size"]))
+    else:
+        rows_per_batch = 1000
+
+    def pick(name, default):
+        value = getattr(args, name)
+        return value if value is not None else settings.get(name, default)
+
+    os.makedirs(args.output, exist_ok=True)
+    print(f"🚀 Local batch run: {entry_script} over {len(files)} file(s), {rows_per_batch} rows per mini-batch",
+          flush=True)
+    summary = run_local(
+        entry_script, args.input, args.output, argv,
+        rows_per_batch=rows_per_batch,
+        workers=pick("workers", None),
+        error_threshold=pick("error_threshold", -1),
+        mini_batch_error_threshold=pick("mini_batch_error_threshold", -1),
+        max_retries=pick("max_retries", 3),
+        restart=args.restart,
+    )
+    print(json.dumps(summary, indent=2, default=str))
+    if summary["status"] == "failed":
+        print(f"❌ Batch run aborted: {summary['aborted_reason']}", flush=True)
+        return 1
+    print("🏁 Local batch run finished", flush=True)
+    return 0
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Run a parallel batch component locally with a process pool")
+    parser.add_argument("--component", type=str, default=None, help="Parallel component YAML to read settings from")
+    parser.add_argument("--entry_script", type=str, default=None, help="Overrides task.entry_script")
+    parser.add_argument("--input", type=str, required=True, help="CSV file or folder of CSV files")
+    parser.add_argument("--output", type=str, required=True, help="Output folder (also holds resume progress)")
+    parser.add_argument("--set", action="append", help="NAME=VALUE for ${{inputs.NAME}} in program_arguments")
+    parser.add_argument("--program_arguments", type=str, default=None, help="Overrides task.program_arguments")
+    parser.add_argument("--mini_batch_rows", type=int, default=None, help="Rows per mini-batch")
+    parser.add_argument("--mini_batch_size", type=str, default=None, help="Mini-batch size such as 10mb")
+    parser.add_argument("--workers", type=int, default=None, help="Worker processes (default: CPU count)")
+    parser.add_argument("--error_threshold", type=int, default=None, help="Failed rows tolerated; -1 ignores")
+    parser.add_argument("--mini_batch_error_threshold", type=int, default=None, help="Failed mini-batches tolerated")
+    parser.add_argument("--max_retries", type=int, default=None)
+    parser.add_argument("--restart", action="store_true", help="Ignore earlier progress and start over")
+    args = parser.parse_args()
+    sys.exit(main(args))
@@ -0,0 +1,79 @@
+#!/usr/bin/env python3
+"""
+Batch-inference entry script for the used-cars price model.
+
+Follows the Azure ML parallel job (run_function) contract:
+- init() runs once per worker process and loads the model given by --model,
+- run(mini_batch) scores one mini-batch and returns one output row per input
+  row. mini_batch is a DataFrame for tabular input, or a list of CSV file
+  paths for uri_folder input.
+
+With --quantiles 10,90 each row also gets predicted_price_p10/_p90 columns
+taken from the spread of the forest's per-tree predictions.
+
+The same file runs on Azure ML through mlops/azureml/train/batch_score.yml
+and locally through batch_local.py.
+"""
+
+import argparse
+import os
+
+import joblib
+import pandas as pd
+
+from fast_predict import PackedForest
+from score import resolve_model_path
+
+model = None
+feature_names = None
+prediction_column = "predicted_price"
+quantiles = None
+forest = None
+
+
+def init():
+    """Load the model named by --model in the program arguments."""
+    global model, feature_names, prediction_column, quantiles, forest
+    parser = argparse.ArgumentParser(allow_abbrev=False)
+    parser.add_argument("--model", type=str, required=True, help="model.pkl or a folder containing it")
+    parser.add_argument("--prediction_column", type=str, default="predicted_price")
+    parser.add_argument("--quantiles", type=str, default=None, help="Comma-separated percentiles, e.g. 10,90")
+    args, _ = parser.parse_known_args()
+
+    path = resolve_model_path(args.model)
+    model = joblib.load(path)
+    names = getattr(model, "feature_names_in_", None)
+    feature_names = list(names) if names is not None else None
+    prediction_column = args.prediction_column
+    if args.quantiles:
+        quantiles = [float(q) for q in args.quantiles.split(",")]
+        forest = PackedForest(model.steps[-1][1] if hasattr(model, "steps") else model)
+    print(f"✅ [pid {os.getpid()}] Model loaded from: {path}", flush=True)
+
+
+def _as_frame(mini_batch) -> pd.DataFrame:
+    if isinstance(mini_batch, pd.DataFrame):
+        return mini_batch
+    frames = [pd.read_csv(path) for path in mini_batch]
+    return pd.concat(frames, ignore_index=True) if frames else pd.DataFrame()
+
+
+def run(mini_batch) -> pd.DataFrame:
+    """Score one mini-batch; returns the input rows with a prediction column."""
+    df = _as_frame(mini_batch)
+    if df.empty:
+        return df
+    features = df[feature_names] if feature_names is not None else df.drop("price", axis=1, errors="ignore")
+    result = df.copy()
+    if quantiles is None:
+        result[prediction_column] = model.predict(features)
+        return result
+
+    X = model[:-1].transform(features) if hasattr(model, "steps") else features.to_numpy()
+    if hasattr(X, "toarray"):
+        X = X.toarray()
+    mean, bounds = forest.predict_interval(X, quantiles)
+    result[prediction_column] = mean
+    for i, q in enumerate(quantiles):
+        result[f"{prediction_column}_p{q:g}"] = bounds[:, i]
+    return result
@@ -0,0 +1,103 @@
+#!/usr/bin/env python3
+"""
+Latency benchmark: single-record scoring through Pipeline.predict (one-row
+DataFrame) versus RecordPredictor.predict_record.
+
+Usage:
+    python benchmark_fast_predict.py --data ../../data/used_cars.csv
+    python benchmark_fast_predict.py --data ../../data/used_cars.csv --model_path outputs/model.pkl
+"""
+
+import argparse
+import json
+import time
+
+import joblib
+import numpy as np
+import pandas as pd
+
+from fast_predict import RecordPredictor
+
+
+def time_calls(fn, records, repeat: int) -> dict:
+    """Per-call latency statistics in microseconds."""
+    timings = []
+    for _ in range(repeat):
+        for record in records:
+            t0 = time.perf_counter()
+            fn(record)
+            timings.append(time.perf_counter() - t0)
+    us = np.array(timings) * 1e6
+    return {
+        "calls": len(timings),
+        "mean_us": round(float(us.mean()), 2),
+        "p50_us": round(float(np.percentile(us, 50)), 2),
+        "p99_us": round(float(np.percentile(us, 99)), 2),
+    }
+
+
+def train_reference_model(df: pd.DataFrame, n_estimators: int, max_depth: int):
+    """Fit the same Pipeline layout as train.py."""
+    from sklearn.compose import ColumnTransformer
+    from sklearn.ensemble import RandomForestRegressor
+    from sklearn.pipeline import Pipeline
+    from sklearn.preprocessing import OneHotEncoder, StandardScaler
+
+    X = df.drop("price", axis=1)
+    y = df["price"]
+    categorical_cols = X.select_dtypes(include=["object", "category", "string"]).columns
+    numeric_cols = X.select_dtypes(exclude=["object", "category", "string"]).columns
+    preprocessor = ColumnTransformer(transformers=[
+        ("categorical", OneHotEncoder(handle_unknown="ignore"), categorical_cols),
+        ("numeric", StandardScaler(), numeric_cols),
+    ])
+    model = Pipeline(steps=[
+        ("preprocessor", preprocessor),
+        ("regressor", RandomForestRegressor(n_estimators=n_estimators, max_depth=max_depth, random_state=42)),
+    ])
+    return model.fit(X, y)
+
+
+def main(args):
+    df = pd.read_csv(args.data)
+    model = joblib.load(args.model_path) if args.model_path else train_reference_model(
+        df, args.n_estimators, args.max_depth)
+    predictor = RecordPredictor(model)
+
+    features = df.drop("price", axis=1, errors="ignore")
+    records = features.to_dict(orient="records")[: args.records]
+    tuples = [tuple(r[name] for name in predictor.feature_names) for r in records]
+
+    # Warm up both paths
+    model.predict(pd.DataFrame([records[0]]))
+    predictor.predict_record(records[0])
+
+    pipeline_stats = time_calls(lambda r: model.predict(pd.DataFrame([r])), records, args.repeat)
+    dict_stats = time_calls(predictor.predict_record, records, args.repeat)
+    tuple_stats = time_calls(predictor.predict_record, tuples, args.repeat)
+
+    max_diff = float(np.abs(model.predict(features.iloc[: args.records])
+                            - predictor.predict_records(records)).max())
+    result = {
+        "records": len(records),
+        "n_trees": predictor.forest.n_trees,
+        "max_depth": predictor.forest.max_depth,
+        "pipeline_predict": pipeline_stats,
+        "fast_path_dict": dict_stats,
+        "fast_path_tuple": tuple_stats,
+        "speedup_p50": round(pipeline_stats["p50_us"] / dict_stats["p50_us"], 1),
+        "max_abs_diff": max_diff,
+    }
+    print(json.dumps(result, indent=2))
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmark single-record scoring latency")
+    parser.add_argument("--data", type=str, required=True, help="CSV with the model's feature columns")
+    parser.add_argument("--model_path", type=str, default=None, help="Pickled Pipeline; trains one if omitted")
+    parser.add_argument("--n_estimators", type=int, default=100)
+    parser.add_argument("--max_depth", type=int, default=None)
+    parser.add_argument("--records", type=int, default=100)
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+    main(args)
@@ -0,0 +1,77 @@
+#!/usr/bin/env python3
+"""
+Benchmark: quantile prediction intervals versus the plain point prediction.
+
+Compares, on already preprocessed features:
+- point:     RandomForestRegressor.predict
+- loop:      [est.predict(X) for est in estimators_] + np.percentile
+- intervals: PackedForest.predict_interval (preallocated tree-output buffer)
+
+Usage:
+    python benchmark_intervals.py --data ../../data/used_cars.csv --rows 10,1000,50000
+"""
+
+import argparse
+import json
+import time
+
+import joblib
+import numpy as np
+import pandas as pd
+
+from benchmark_fast_predict import train_reference_model
+from fast_predict import PackedForest
+
+
+def best_of(fn, repeat: int) -> float:
+    """Fastest wall time in milliseconds over repeat runs."""
+    timings = []
+    for _ in range(repeat):
+        t0 = time.perf_counter()
+        fn()
+        timings.append(time.perf_counter() - t0)
+    return min(timings) * 1000.0
+
+
+def main(args):
+    df = pd.read_csv(args.data)
+    model = joblib.load(args.model_path) if args.model_path else train_reference_model(
+        df, args.n_estimators, args.max_depth)
+    regressor = model.steps[-1][1]
+    forest = PackedForest(regressor)
+    quantiles = [float(q) for q in args.quantiles.split(",")]
+
+    features = df.drop("price", axis=1, errors="ignore")
+    results = []
+    for n_rows in [int(n) for n in args.rows.split(",")]:
+        batch = features.sample(n=n_rows, replace=True, random_state=0).reset_index(drop=True)
+        X = model[:-1].transform(batch)
+        X = np.asarray(X.toarray() if hasattr(X, "toarray") else X, dtype=np.float32)
+
+        point_ms = best_of(lambda: regressor.predict(X), args.repeat)
+        loop_ms = best_of(lambda: np.percentile(
+            np.column_stack([est.predict(X) for est in regressor.estimators_]), quantiles, axis=1), args.repeat)
+        interval_ms = best_of(lambda: forest.predict_interval(X, quantiles), args.repeat)
+        results.append({
+            "rows": n_rows,
+            "point_ms": round(point_ms, 3),
+            "loop_estimators_ms": round(loop_ms, 3),
+            "intervals_ms": round(interval_ms, 3),
+            "intervals_vs_point": round(interval_ms / point_ms, 2),
+            "loop_vs_point": round(loop_ms / point_ms, 2),
+        })
+
+    print(json.dumps({"n_trees": forest.n_trees, "quantiles": quantiles, "results": results}, indent=2))
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmark quantile intervals against point prediction")
+    parser.add_argument("--data", type=str, required=True, help="CSV with the model's feature columns")
+    parser.add_argument("--model_path", type=str, default=None, help="Pickled Pipeline; trains one if omitted")
+    parser.add_argument("--n_estimators", type=int, default=100)
+    parser.add_argument("--max_depth", type=int, default=None)
+    parser.add_argument("--rows", type=str, default="10,1000,50000")
+    parser.add_argument("--quantiles", type=str, default="10,90")
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+    main(args)
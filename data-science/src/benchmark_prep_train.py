@@ -0,0 +1,104 @@
+#!/usr/bin/env python3
+"""
+Benchmark: two-step prep.py -> train.py versus the fused prep_train.py.
+
+Each mode runs end to end as fresh processes, the way a pipeline step does:
+- two_step: python prep.py (writes train.csv/test.csv), then
+            python train.py --train_data ... --test_data ...
+- fused:    python prep_train.py (splits and trains in one process)
+
+The raw CSV can be enlarged with --scale (rows repeated with small noise) to
+see how the CSV round trip grows with the data. Metrics of both modes are
+compared to confirm they trained the same model.
+
+Usage:
+    python benchmark_prep_train.py --data ../../data/used_cars.csv --scale 1,50,500
+"""
+
+import argparse
+import json
+import os
+import shutil
+import subprocess
+import sys
+import tempfile
+import time
+
+import numpy as np
+import pandas as pd
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+
+
+def scaled_csv(df: pd.DataFrame, scale: int, path: str) -> None:
+    """Repeat the rows scale times, jittering numeric columns so rows stay distinct."""
+    big = pd.concat([df] * scale, ignore_index=True)
+    if scale > 1:
+        rng = np.random.default_rng(0)
+        for col in big.select_dtypes(include="number").columns:
+            if col != "price":
+                big[col] = (big[col] * rng.uniform(0.98, 1.02, len(big))).round(2)
+    big.to_csv(path, index=False)
+
+
+def run(script: str, *argv) -> None:
+    subprocess.run([sys.executable, os.path.join(HERE, script), *argv], cwd=HERE, check=True,
+                   stdout=subprocess.DEVNULL)
+
+
+def time_two_step(raw: str, work: str, n_estimators: int) -> tuple:
+    train_dir, test_dir, model_dir = (os.path.join(work, d) for d in ("train", "test", "model"))
+    t0 = time.perf_counter()
+    run("prep.py", "--raw_data", raw, "--train_data", train_dir, "--test_data", test_dir)
+    run("train.py", "--train_data", train_dir, "--test_data", test_dir,
+        "--n_estimators", str(n_estimators), "--model_output", model_dir, "--metrics_output", work)
+    return time.perf_counter() - t0, model_dir
+
+
+def time_fused(raw: str, work: str, n_estimators: int) -> tuple:
+    model_dir = os.path.join(work, "fused_model")
+    t0 = time.perf_counter()
+    run("prep_train.py", "--raw_data", raw, "--n_estimators", str(n_estimators), "--model_output", model_dir,
+        "--metrics_output", work)
+    return time.perf_counter() - t0, model_dir
+
+
+def main(args):
+    df = pd.read_csv(args.data)
+    results = []
+    for scale in [int(s) for s in args.scale.split(",")]:
+        work = tempfile.mkdtemp()
+        try:
+            raw = os.path.join(work, "raw.csv")
+            scaled_csv(df, scale, raw)
+            two_step, fused = [], []
+            for _ in range(args.repeat):
+                seconds, two_step_dir = time_two_step(raw, work, args.n_estimators)
+                two_step.append(seconds)
+                seconds, fused_dir = time_fused(raw, work, args.n_estimators)
+                fused.append(seconds)
+            metrics = []
+            for directory in (two_step_dir, fused_dir):
+                with open(os.path.join(directory, "metrics.json")) as f:
+                    metrics.append(json.load(f))
+            results.append({
+                "rows": len(df) * scale,
+                "two_step_s": round(min(two_step), 3),
+                "fused_s": round(min(fused), 3),
+                "speedup": round(min(two_step) / min(fused), 2),
+                "same_metrics": metrics[0] == metrics[1],
+            })
+        finally:
+            shutil.rmtree(work, ignore_errors=True)
+
+    print(json.dumps({"n_estimators": args.n_estimators, "repeat": args.repeat, "results": results}, indent=2))
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Compare two-step and fused prep+train wall time")
+    parser.add_argument("--data", type=str, required=True, help="Raw CSV with a price column")
+    parser.add_argument("--scale", type=str, default="1,50,500", help="Comma-separated row multipliers")
+    parser.add_argument("--n_estimators", type=int, default=100)
+    parser.add_argument("--repeat", type=int, default=3, help="Runs per mode; the fastest is reported")
+    args = parser.parse_args()
+    main(args)
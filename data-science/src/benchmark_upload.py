@@ -0,0 +1,97 @@
+#!/usr/bin/env python3
+"""
+Benchmark: single-stream versus parallel block upload of a model artifact,
+and the cost of an interruption, against the local blob store.
+
+The LocalBlobStore simulates the network: every call waits --latency
+seconds and each staged block is limited to --bandwidth_mb MB/s, like one
+connection. Modes:
+- single:  the whole file as one block on one connection (how
+           Model(path=...) uploads a file)
+- blocks:  --block_size_mb blocks staged by 1, 4, 8 ... workers
+- resume:  an upload interrupted halfway, then re-run; reports the bytes
+           sent twice (a single-stream upload starts over)
+
+Usage:
+    python benchmark_upload.py --size_mb 256 --workers 1,4,8
+    python benchmark_upload.py --size_mb 64 --bandwidth_mb 20 --latency 0.05
+"""
+
+import argparse
+import json
+import os
+import sys
+import tempfile
+import time
+
+from artifact_upload import LocalBlobStore, UploadError, upload_artifact
+
+
+def make_artifact(folder: str, size_mb: float) -> str:
+    """A model folder with one size_mb file of random bytes (written 8 MB at a time)."""
+    os.makedirs(folder)
+    remaining = int(size_mb * 2**20)
+    with open(os.path.join(folder, "model.pkl"), "wb") as f:
+        while remaining:
+            chunk = min(remaining, 8 * 2**20)
+            f.write(os.urandom(chunk))
+            remaining -= chunk
+    return folder
+
+
+def timed_upload(store, artifact: str, prefix: str, block_size: int, workers: int) -> dict:
+    t0 = time.perf_counter()
+    _, stats = upload_artifact(store, artifact, prefix, block_size=block_size, workers=workers, backoff=0)
+    wall_s = time.perf_counter() - t0
+    return {"wall_s": round(wall_s, 3), "mb_s": round(stats["uploaded_bytes"] / 2**20 / wall_s, 1),
+            "blocks": stats["uploaded_blocks"]}
+
+
+def main(args):
+    results = []
+    size = int(args.size_mb * 2**20)
+    block_size = int(args.block_size_mb * 2**20)
+    network = {"latency": args.latency, "bytes_per_s": args.bandwidth_mb * 2**20}
+    with tempfile.TemporaryDirectory() as work:
+        artifact = make_artifact(os.path.join(work, "model"), args.size_mb)
+        store = LocalBlobStore(os.path.join(work, "blob"), **network)
+
+        runs = [("single", size, 1)] + [("blocks", block_size, w) for w in args.workers]
+        for mode, bsize, workers in runs:
+            result = {"mode": mode, "workers": workers, "block_mb": round(bsize / 2**20, 2),
+                      **timed_upload(store, artifact, f"{mode}/{workers}", bsize, workers)}
+            results.append(result)
+            print(f"📤 {mode:<7} {workers:>3} workers {result['wall_s']:>8.3f}s {result['mb_s']:>8.1f} MB/s",
+                  file=sys.stderr, flush=True)
+
+        workers = max(args.workers)
+        half = -(-size // block_size) // 2
+        interrupted = LocalBlobStore(os.path.join(work, "blob"), fail_after=half, **network)
+        t0 = time.perf_counter()
+        try:
+            upload_artifact(interrupted, artifact, "resume", block_size=block_size, workers=workers, backoff=0)
+        except UploadError:
+            pass
+        first_s = time.perf_counter() - t0
+        resumed = LocalBlobStore(os.path.join(work, "blob"), **network)
+        result = {"mode": "resume", "workers": workers, "block_mb": args.block_size_mb,
+                  "interrupted_after_s": round(first_s, 3),
+                  **timed_upload(resumed, artifact, "resume", block_size, workers),
+                  "resent_mb": round((interrupted.staged_bytes + resumed.staged_bytes - size) / 2**20, 2),
+                  "single_stream_resent_mb": round(interrupted.staged_bytes / 2**20, 2)}
+        results.append(result)
+        print(f"📤 resume  {workers:>3} workers {result['wall_s']:>8.3f}s after {first_s:.3f}s, "
+              f"{result['resent_mb']} MB sent twice", file=sys.stderr, flush=True)
+    print(json.dumps({"size_mb": args.size_mb, "latency_s": args.latency, "bandwidth_mb_s": args.bandwidth_mb,
+                      "results": results}, indent=2))
+    return 0
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmark parallel block upload against a single stream")
+    parser.add_argument("--size_mb", type=float, default=256, help="Size of the synthetic model file")
+    parser.add_argument("--block_size_mb", type=float, default=8)
+    parser.add_argument("--workers", type=lambda s: [int(x) for x in s.split(",")], default=[1, 4, 8])
+    parser.add_argument("--latency", type=float, default=0.02, help="Seconds added to every store call")
+    parser.add_argument("--bandwidth_mb", type=float, default=40, help="MB/s of one connection")
+    sys.exit(main(parser.parse_args()))
@@ -0,0 +1,319 @@
+#!/usr/bin/env python3
+"""
+Record-oriented fast path for the used-cars price model.
+
+Scoring a single car through Pipeline.predict means building a one-row
+DataFrame so the ColumnTransformer can select columns by name, then going
+through sklearn's input validation and the forest's joblib dispatch. For one
+record that costs far more than the tree traversal itself.
+
+RecordPredictor compiles a fitted Pipeline(ColumnTransformer, forest) once:
+- one-hot categories become {value: output position} lookups,
+- scaler parameters become plain mean/scale arrays,
+- all trees are flattened into shared node arrays and traversed together
+  with NumPy, one depth level per step.
+
+Predictions match Pipeline.predict to floating-point rounding.
+
+PackedForest.tree_outputs() fills a preallocated (n_rows, n_trees) array with
+every tree's prediction: larger batches get their leaves from the forest's
+own Cython apply(), offset into the packed arrays and gathered with one
+np.take, so no per-tree prediction arrays are built. predict_interval()
+turns these into quantile price ranges at about the cost of a point
+prediction.
+
+Example:
+    predictor = RecordPredictor(joblib.load("model.pkl"))
+    predictor.predict_record({"Segment": "luxury segment", "Kilometers_Driven": 40000, ...})
+    predictor.predict_record(("luxury segment", 40000, 18.2, 1968, 174.3, 5))
+"""
+
+from typing import Dict, List, Sequence, Tuple, Union
+
+import numpy as np
+
+Record = Union[Dict[str, object], Sequence[object]]
+
+# Below this many rows the packed NumPy traversal beats forest.apply(), whose
+# per-tree joblib dispatch costs a few ms (measured on 100 fully grown trees)
+SMALL_BATCH_ROWS = 128
+
+
+class PackedForest:
+    """All trees of a fitted forest flattened into shared node arrays."""
+
+    def __init__(self, forest):
+        estimators = getattr(forest, "estimators_", None)
+        if estimators is None:
+            if hasattr(forest, "tree_"):
+                estimators = [forest]
+            else:
+                raise ValueError(f"Unsupported regressor for fast path: {type(forest).__name__}")
+        if getattr(forest, "n_outputs_", 1) != 1:
+            raise ValueError("Fast path supports single-output regression only")
+
+        trees = [est.tree_ for est in estimators]
+        self.forest = forest
+        counts = np.array([t.node_count for t in trees], dtype=np.int64)
+        offsets = np.concatenate(([0], np.cumsum(counts)[:-1]))
+
+        left = np.concatenate([t.children_left for t in trees]).astype(np.int64)
+        right = np.concatenate([t.children_right for t in trees]).astype(np.int64)
+        is_leaf = left == -1
+        node_offsets = np.repeat(offsets, counts)
+        node_ids = np.arange(left.shape[0], dtype=np.int64)
+
+        # Children become global indices; leaves point to themselves so a
+        # fixed number of steps leaves every tree parked on its leaf.
+        self.left = np.where(is_leaf, node_ids, left + node_offsets)
+        self.right = np.where(is_leaf, node_ids, right + node_offsets)
+        self.feature = np.where(is_leaf, 0, np.concatenate([t.feature for t in trees])).astype(np.int64)
+        self.threshold = np.concatenate([t.threshold for t in trees])
+        self.value = np.concatenate([t.value[:, 0, 0] for t in trees])
+        # Where a NaN feature value goes at each split (sklearn >= 1.3); older trees reject NaN
+        if all(hasattr(t, "missing_go_to_left") for t in trees):
+            self.missing_left = np.concatenate([t.missing_go_to_left for t in trees]).astype(bool)
+        else:
+            self.missing_left = None
+        self.roots = offsets.astype(np.int64)
+        self.n_trees = len(trees)
+        self.max_depth = int(max(t.max_depth for t in trees))
+        self.n_features = int(trees[0].n_features)
+
+    def leaves(self, X: np.ndarray) -> np.ndarray:
+        """Global leaf index reached by every row in every tree, shape (n_rows, n_trees)."""
+        # sklearn trees compare float32 inputs against float64 thresholds
+        X = np.asarray(X, dtype=np.float32)
+        if np.isnan(X).any():
+            return self._nan_leaves(X)
+        rows = np.arange(X.shape[0])[:, None]
+        nodes = np.broadcast_to(self.roots, (X.shape[0], self.n_trees)).copy()
+        for _ in range(self.max_depth):
+            go_left = X[rows, self.feature[nodes]] <= self.threshold[nodes]
+            nodes = np.where(go_left, self.left[nodes], self.right[nodes])
+        return nodes
+
+    def _nan_leaves(self, X: np.ndarray) -> np.ndarray:
+        """leaves() for rows with missing values: a NaN follows the split's missing_go_to_left."""
+        if self.missing_left is None:
+            # sklearn raises its own error for NaN input here
+            return self.forest.apply(X).reshape(X.shape[0], self.n_trees).astype(np.int64) + self.roots
+        rows = np.arange(X.shape[0])[:, None]
+        nodes = np.broadcast_to(self.roots, (X.shape[0], self.n_trees)).copy()
+        for _ in range(self.max_depth):
+            values = X[rows, self.feature[nodes]]
+            go_left = np.where(np.isnan(values), self.missing_left[nodes], values <= self.threshold[nodes])
+            nodes = np.where(go_left, self.left[nodes], self.right[nodes])
+        return nodes
+
+    def leaf_one(self, x: np.ndarray) -> np.ndarray:
+        """Leaf index per tree for a single row (1-D input)."""
+        x = np.asarray(x, dtype=np.float32)
+        if np.isnan(x).any():
+            return self._nan_leaves(x[None, :])[0]
+        nodes = self.roots.copy()
+        for _ in range(self.max_depth):
+            go_left = x[self.feature[nodes]] <= self.threshold[nodes]
+            nodes = np.where(go_left, self.left[nodes], self.right[nodes])
+        return nodes
+
+    def tree_outputs(self, X: np.ndarray, out: np.ndarray = None) -> np.ndarray:
+        """Every tree's prediction for every row, written into out (n_rows, n_trees)."""
+        X = np.ascontiguousarray(X, dtype=np.float32)
+        shape = (X.shape[0], self.n_trees)
+        if out is None:
+            out = np.empty(shape, dtype=np.float64)
+        elif out.shape != shape:
+            raise ValueError(f"out has shape {out.shape}, expected {shape}")
+
+        if X.shape[0] < SMALL_BATCH_ROWS:
+            leaves = self.leaves(X)
+        else:
+            # Per-tree leaf ids from sklearn; a single tree returns them as 1-D
+            leaves = self.forest.apply(X).reshape(shape).astype(np.int64, copy=False)
+            leaves += self.roots
+        np.take(self.value, leaves, out=out)
+        return out
+
+    def predict(self, X: np.ndarray) -> np.ndarray:
+        return self.tree_outputs(X).mean(axis=1)
+
+    def predict_interval(self, X: np.ndarray, quantiles: Sequence[float] = (10, 90),
+                         chunk_rows: int = 8192) -> Tuple[np.ndarray, np.ndarray]:
+        """Point prediction and per-row percentiles across trees.
+
+        Returns (mean, bounds) where bounds has shape (n_rows, len(quantiles)).
+        Percentiles use linear interpolation like np.percentile. Rows are
+        processed in chunks that reuse one preallocated tree-output buffer.
+        """
+        X = np.asarray(X)
+        quantiles = np.asarray(quantiles, dtype=np.float64)
+        if np.any((quantiles < 0) | (quantiles > 100)):
+            raise ValueError("quantiles must be between 0 and 100")
+        n_rows = X.shape[0]
+        mean = np.empty(n_rows, dtype=np.float64)
+        bounds = np.empty((n_rows, quantiles.size), dtype=np.float64)
+
+        pos = (self.n_trees - 1) * quantiles / 100.0
+        lo = np.floor(pos).astype(np.int64)
+        hi = np.ceil(pos).astype(np.int64)
+        frac = pos - lo
+
+        buffer = np.empty((min(chunk_rows, n_rows), self.n_trees), dtype=np.float64)
+        for start in range(0, n_rows, chunk_rows):
+            stop = min(start + chunk_rows, n_rows)
+            outputs = self.tree_outputs(X[start:stop], out=buffer[: stop - start])
+            outputs.mean(axis=1, out=mean[start:stop])
+            # A full sort of ~100 values per row is cheaper than multi-kth partition
+            outputs.sort(axis=1)
+            bounds[start:stop] = outputs[:, lo] + (outputs[:, hi] - outputs[:, lo]) * frac
+        return mean, bounds
+
+    def predict_one(self, x: np.ndarray) -> float:
+        return float(self.value[self.leaf_one(x)].mean())
+
+
+class _OneHot:
+    """Fitted OneHotEncoder as per-column {category: output position} maps."""
+
+    def __init__(self, encoder, columns: List[int], out_start: int):
+        if getattr(encoder, "drop_idx_", None) is not None:
+            raise ValueError("Fast path does not support OneHotEncoder(drop=...)")
+        if getattr(encoder, "_infrequent_enabled", False):
+            raise ValueError("Fast path does not support infrequent categories")
+        self.columns = columns
+        self.handle_unknown = encoder.handle_unknown
+        self.maps = []
+        pos = out_start
+        for cats in encoder.categories_:
+            self.maps.append({_key(c): pos + i for i, c in enumerate(cats)})
+            pos += len(cats)
+
+    def fill(self, values: Sequence[object], out: np.ndarray):
+        for col, mapping in zip(self.columns, self.maps):
+            pos = mapping.get(_key(values[col]))
+            if pos is None:
+                if self.handle_unknown == "error":
+                    raise ValueError(f"Unknown category {values[col]!r} in column {col}")
+                continue
+            out[pos] = 1.0
+
+
+class _Scaler:
+    """Fitted StandardScaler as mean/scale arrays (or a plain passthrough)."""
+
+    def __init__(self, scaler, columns: List[int], out_slice: slice):
+        self.columns = columns
+        self.out_slice = out_slice
+        # with_mean=False still fits mean_ (when with_std=True); with_std=False leaves scale_ None
+        self.mean = scaler.mean_ if scaler is not None and scaler.with_mean else None
+        self.scale = None if scaler is None else scaler.scale_
+
+    def fill(self, values: Sequence[object], out: np.ndarray):
+        x = np.array([values[c] for c in self.columns], dtype=np.float64)
+        if self.mean is not None:
+            x -= self.mean
+        if self.scale is not None:
+            x /= self.scale
+        out[self.out_slice] = x
+
+
+def _key(value):
+    """Normalise NumPy scalars so lookups match plain Python values."""
+    return value.item() if isinstance(value, np.generic) else value
+
+
+class RecordPredictor:
+    """Predict from dicts or tuples of feature values without building a DataFrame."""
+
+    def __init__(self, model):
+        steps = getattr(model, "steps", None)
+        if steps is None:
+            preprocessor, forest = None, model
+        elif len(steps) == 2:
+            preprocessor, forest = steps[0][1], steps[1][1]
+        elif len(steps) == 1:
+            preprocessor, forest = None, steps[0][1]
+        else:
+            raise ValueError("Fast path supports Pipeline(preprocessor, regressor) only")
+
+        self.forest = PackedForest(forest)
+        source = preprocessor if preprocessor is not None else forest
+        names = getattr(source, "feature_names_in_", None)
+        self.feature_names = [str(n) for n in names] if names is not None else None
+        self._index = {n: i for i, n in enumerate(self.feature_names or [])}
+        self._parts = self._compile(preprocessor)
+
+    def _compile(self, preprocessor) -> list:
+        if preprocessor is None:
+            self.n_outputs = self.forest.n_features
+            return [_Scaler(None, list(range(self.n_outputs)), slice(0, self.n_outputs))]
+
+        from sklearn.preprocessing import OneHotEncoder, StandardScaler
+
+        parts = []
+        for name, transformer, columns in preprocessor.transformers_:
+            out_slice = preprocessor.output_indices_[name]
+            if transformer == "drop" or out_slice.stop == out_slice.start:
+                continue
+            cols = self._column_indices(columns)
+            if transformer == "passthrough":
+                parts.append(_Scaler(None, cols, out_slice))
+            elif isinstance(transformer, OneHotEncoder):
+                parts.append(_OneHot(transformer, cols, out_slice.start))
+            elif isinstance(transformer, StandardScaler):
+                parts.append(_Scaler(transformer, cols, out_slice))
+            else:
+                raise ValueError(f"Unsupported transformer for fast path: {type(transformer).__name__}")
+        self.n_outputs = max(preprocessor.output_indices_[name].stop for name, _, _ in preprocessor.transformers_)
+        return parts
+
+    def _column_indices(self, columns) -> List[int]:
+        cols = list(columns)
+        if cols and isinstance(cols[0], (bool, np.bool_)):
+            return [i for i, keep in enumerate(cols) if keep]
+        if cols and isinstance(cols[0], str):
+            return [self._index[c] for c in cols]
+        return [int(c) for c in cols]
+
+    def _values(self, record: Record) -> Sequence[object]:
+        if isinstance(record, dict):
+            if self.feature_names is None:
+                raise ValueError("Model was fitted without column names; pass a tuple of values")
+            try:
+                return [record[name] for name in self.feature_names]
+            except KeyError as e:
+                raise ValueError(f"Record is missing feature {e.args[0]!r}") from None
+        if self.feature_names is not None and len(record) != len(self.feature_names):
+            raise ValueError(f"Expected {len(self.feature_names)} values, got {len(record)}")
+        return record
+
+    def transform_record(self, record: Record, out: np.ndarray = None) -> np.ndarray:
+        """Apply the fitted preprocessing to one record."""
+        values = self._values(record)
+        if out is None:
+            out = np.zeros(self.n_outputs, dtype=np.float64)
+        else:
+            out[:] = 0.0
+        for part in self._parts:
+            part.fill(values, out)
+        return out
+
+    def transform_records(self, records: Sequence[Record]) -> np.ndarray:
+        X = np.zeros((len(records), self.n_outputs), dtype=np.float64)
+        for i, record in enumerate(records):
+            self.transform_record(record, X[i])
+        return X
+
+    def predict_record(self, record: Record) -> float:
+        """Predict the price of one car given as a dict or a tuple in feature order."""
+        return self.forest.predict_one(self.transform_record(record))
+
+    def predict_records(self, records: Sequence[Record]) -> np.ndarray:
+        """Predict a batch of dict or tuple records."""
+        return self.forest.predict(self.transform_records(records))
+
+    def predict_interval_records(self, records: Sequence[Record],
+                                 quantiles: Sequence[float] = (10, 90)) -> Tuple[np.ndarray, np.ndarray]:
+        """Point predictions and per-tree quantile bounds for a batch of records."""
+        return self.forest.predict_interval(self.transform_records(records), quantiles)
@@ -0,0 +1,188 @@
+#!/usr/bin/env python3
+"""
+Structured stage metrics shared by the prep, train and register scripts.
+
+Each script opens one RunRecorder and wraps its stages (read_csv, split,
+fit, predict, serialize, register, ...) in spans. A span records wall time,
+CPU time (all threads of the process), the peak RSS high-water mark at the
+end of the span, how much the span raised that peak, and the rows it
+processed. When the run ends, one JSON file with the schema below is written
+to the given folder (run_metrics.json by default). Keep it out of model
+folders: it changes on every run, and the model folder is what gets hashed
+and registered.
+
+    {
+      "schema": "stage-metrics/v1",
+      "script": "train", "run_id": "...", "status": "completed" | "failed",
+      "error": null, "started_utc": "...", "finished_utc": "...",
+      "wall_s": 1.2, "cpu_s": 3.4, "peak_rss_mb": 210.5,
+      "params": {...}, "environment": {...},
+      "spans": [{"name": "fit", "parent": null, "status": "ok", "error": null,
+                 "start_offset_s": 0.1, "wall_s": 1.0, "cpu_s": 3.2,
+                 "peak_rss_mb": 210.5, "rss_growth_mb": 40.1, "rows": 160,
+                 "attrs": {...}}, ...]
+    }
+
+Example:
+    with RunRecorder("train", args.metrics_output, params=vars(args)) as run:
+        with run.span("read_csv") as span:
+            df = pd.read_csv(path)
+            span.rows = len(df)
+        with run.span("fit", rows=len(X_train)):
+            model.fit(X_train, y_train)
+"""
+
+import json
+import os
+import platform
+import sys
+import time
+import uuid
+from contextlib import contextmanager
+from datetime import datetime
+
+try:
+    import resource
+except ImportError:  # Windows
+    resource = None
+
+SCHEMA = "stage-metrics/v1"
+DEFAULT_FILENAME = "run_metrics.json"
+
+
+def peak_rss_mb():
+    """Peak resident set size of this process so far, in MB (None where unsupported)."""
+    if resource is None:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # ru_maxrss is in kilobytes on Linux and in bytes on macOS
+    return round(peak / (1024 * 1024) if sys.platform == "darwin" else peak / 1024, 2)
+
+
+def _utc_now() -> str:
+    return datetime.utcnow().isoformat() + "Z"
+
+
+class Span:
+    """One timed stage; set .rows (or add to .attrs) inside the with block."""
+
+    def __init__(self, name: str, parent: str = None, rows: int = None, attrs: dict = None):
+        self.name = name
+        self.parent = parent
+        self.rows = rows
+        self.attrs = dict(attrs or {})
+        self.status = "ok"
+        self.error = None
+
+    def to_dict(self, start_offset_s, wall_s, cpu_s, peak_mb, growth_mb) -> dict:
+        return {
+            "name": self.name,
+            "parent": self.parent,
+            "status": self.status,
+            "error": self.error,
+            "start_offset_s": round(start_offset_s, 6),
+            "wall_s": round(wall_s, 6),
+            "cpu_s": round(cpu_s, 6),
+            "peak_rss_mb": peak_mb,
+            "rss_growth_mb": growth_mb,
+            "rows": None if self.rows is None else int(self.rows),
+            "attrs": self.attrs,
+        }
+
+
+class RunRecorder:
+    """Collects spans for one script run and writes them as a single JSON document."""
+
+    def __init__(self, script: str, output_dir: str = None, params: dict = None,
+                 filename: str = DEFAULT_FILENAME, enabled: bool = True, verbose: bool = True):
+        self.script = script
+        self.output_dir = output_dir
+        self.params = dict(params or {})
+        self.filename = filename
+        self.enabled = enabled
+        self.verbose = verbose and enabled
+        self.run_id = os.environ.get("AZUREML_RUN_ID") or uuid.uuid4().hex[:12]
+        self.spans = []
+        self._stack = []
+        self._started_utc = _utc_now()
+        self._t0 = time.perf_counter()
+        self._cpu0 = time.process_time()
+        self.status = "running"
+        self.error = None
+
+    @contextmanager
+    def span(self, name: str, rows: int = None, **attrs):
+        """Time one stage. Exceptions are recorded on the span and re-raised."""
+        span = Span(name, self._stack[-1].name if self._stack else None, rows, attrs)
+        self._stack.append(span)
+        peak_before = peak_rss_mb()
+        t0, cpu0 = time.perf_counter(), time.process_time()
+        try:
+            yield span
+        except BaseException as e:
+            if not (isinstance(e, SystemExit) and e.code in (None, 0)):
+                span.status = "error"
+                span.error = f"{type(e).__name__}: {e}"
+            raise
+        finally:
+            wall, cpu = time.perf_counter() - t0, time.process_time() - cpu0
+            peak_after = peak_rss_mb()
+            growth = None if peak_after is None else round(peak_after - peak_before, 2)
+            self._stack.pop()
+            self.spans.append(span.to_dict(t0 - self._t0, wall, cpu, peak_after, growth))
+            if self.verbose:
+                rows = f", rows {span.rows}" if span.rows is not None else ""
+                peak = f", peak RSS {peak_after:.1f}MB" if peak_after is not None else ""
+                print(f"[METRICS] {name}: wall {wall:.3f}s, cpu {cpu:.3f}s{rows}{peak}", flush=True)
+
+    def to_dict(self) -> dict:
+        return {
+            "schema": SCHEMA,
+            "script": self.script,
+            "run_id": self.run_id,
+            "status": self.status,
+            "error": self.error,
+            "started_utc": self._started_utc,
+            "finished_utc": _utc_now(),
+            "wall_s": round(time.perf_counter() - self._t0, 6),
+            "cpu_s": round(time.process_time() - self._cpu0, 6),
+            "peak_rss_mb": peak_rss_mb(),
+            "params": self.params,
+            "environment": {
+                "python": platform.python_version(),
+                "platform": platform.platform(),
+                "pid": os.getpid(),
+                "cpu_count": os.cpu_count(),
+            },
+            "spans": self.spans,
+        }
+
+    def finish(self, status: str = "completed", error: str = None):
+        """Mark the run finished and write the JSON; returns its path (None if nothing was written)."""
+        self.status = status
+        self.error = error
+        return self.write()
+
+    def write(self, path: str = None):
+        if not self.enabled:
+            return None
+        path = path or os.path.join(self.output_dir or ".", self.filename)
+        try:
+            os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+            with open(path, "w", encoding="utf-8") as f:
+                json.dump(self.to_dict(), f, indent=2, default=str)
+            print(f"[DEBUG] Stage metrics written to: {path}", flush=True)
+            return path
+        except Exception as e:
+            print(f"[WARN] Failed to write stage metrics: {e}", flush=True)
+            return None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        if exc_type is None or (exc_type is SystemExit and exc.code in (None, 0)):
+            self.finish("completed")
+        else:
+            self.finish("failed", f"{exc_type.__name__}: {exc}")
+        return False
@@ -0,0 +1,317 @@
+#!/usr/bin/env python3
+"""
+Replay-based load generator for the used-cars scorer.
+
+Replays recorded scoring requests (one JSON request body per line) against
+score.run() in-process or against a scoring server over HTTP, and reports
+throughput, latency percentiles and error rate as JSON.
+
+Modes:
+- closed: N concurrent clients, each sends its next request as soon as the
+  previous one returns.
+- open:   requests arrive at a fixed rate regardless of how fast the scorer
+  answers; latency is measured from the scheduled arrival time so queueing
+  delay is not hidden.
+
+Passing several --concurrency or --rate values runs a sweep and marks the
+first level at which the scorer saturates.
+
+Examples:
+    python load_test.py --requests requests.jsonl --model_path outputs/model.pkl \
+        --mode closed --concurrency 1,2,4,8 --duration 10
+    python load_test.py --requests requests.jsonl --url http://127.0.0.1:5001/score \
+        --mode open --rate 50,100,200 --duration 10
+    python load_test.py --record_from_csv ../../data/used_cars.csv --requests requests.jsonl
+"""
+
+import argparse
+import itertools
+import json
+import math
+import os
+import sys
+import threading
+import time
+import urllib.error
+import urllib.request
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, List
+
+# Throughput gain below this fraction between sweep levels counts as saturation
+SATURATION_GAIN = 0.05
+
+
+def load_requests(path: str) -> List[str]:
+    """Read one raw JSON request body per non-empty line."""
+    if not os.path.exists(path):
+        raise FileNotFoundError(f"Requests file not found: {path}")
+    with open(path, encoding="utf-8") as f:
+        bodies = [line.strip() for line in f if line.strip()]
+    if not bodies:
+        raise ValueError(f"Requests file contains no requests: {path}")
+    return bodies
+
+
+def record_from_csv(csv_path: str, out_path: str, batch_size: int = 1, target: str = "price") -> int:
+    """Write scoring requests built from CSV rows; returns the number written."""
+    import pandas as pd
+
+    df = pd.read_csv(csv_path)
+    if target in df.columns:
+        df = df.drop(target, axis=1)
+    records = df.to_dict(orient="records")
+    count = 0
+    with open(out_path, "w", encoding="utf-8") as f:
+        for start in range(0, len(records), batch_size):
+            f.write(json.dumps({"data": records[start:start + batch_size]}) + "\n")
+            count += 1
+    return count
+
+
+def in_process_target(model_path: str = None, fast_path: bool = True) -> Callable[[str], object]:
+    """Score through score.run() in this process."""
+    import score
+
+    score.init(model_path, fast_path=fast_path)
+    return score.run
+
+
+def http_target(url: str, timeout: float = 30.0) -> Callable[[str], object]:
+    """Score by POSTing the request body to a scoring server."""
+
+    def send(body: str):
+        req = urllib.request.Request(
+            url, data=body.encode("utf-8"), headers={"Content-Type": "application/json"}, method="POST"
+        )
+        with urllib.request.urlopen(req, timeout=timeout) as resp:
+            return resp.read()
+
+    return send
+
+
+def percentile(sorted_values: List[float], q: float) -> float:
+    """Linear-interpolated percentile of an already sorted list."""
+    if not sorted_values:
+        return float("nan")
+    pos = (len(sorted_values) - 1) * q / 100.0
+    lo = math.floor(pos)
+    hi = math.ceil(pos)
+    if lo == hi:
+        return sorted_values[lo]
+    return sorted_values[lo] + (sorted_values[hi] - sorted_values[lo]) * (pos - lo)
+
+
+def summarize(mode: str, level: dict, latencies: List[float], errors: int, elapsed: float,
+              error_samples: List[str]) -> dict:
+    """Build the JSON report for one load level."""
+    total = len(latencies) + errors
+    ordered = sorted(latencies)
+    ms = [v * 1000.0 for v in ordered]
+    return {
+        "mode": mode,
+        **level,
+        "requests": total,
+        "succeeded": len(latencies),
+        "errors": errors,
+        "error_rate": errors / total if total else 0.0,
+        "duration_s": round(elapsed, 3),
+        "throughput_rps": round(len(latencies) / elapsed, 2) if elapsed > 0 else 0.0,
+        "latency_ms": {
+            "mean": round(sum(ms) / len(ms), 3) if ms else None,
+            "p50": round(percentile(ms, 50), 3) if ms else None,
+            "p90": round(percentile(ms, 90), 3) if ms else None,
+            "p95": round(percentile(ms, 95), 3) if ms else None,
+            "p99": round(percentile(ms, 99), 3) if ms else None,
+            "max": round(ms[-1], 3) if ms else None,
+        },
+        "error_samples": error_samples,
+    }
+
+
+class _Recorder:
+    """Thread-safe latency/error accumulator."""
+
+    def __init__(self, max_error_samples: int = 5):
+        self.lock = threading.Lock()
+        self.latencies = []
+        self.errors = 0
+        self.error_samples = []
+        self.max_error_samples = max_error_samples
+
+    def ok(self, latency: float):
+        with self.lock:
+            self.latencies.append(latency)
+
+    def fail(self, exc: Exception):
+        with self.lock:
+            self.errors += 1
+            if len(self.error_samples) < self.max_error_samples:
+                self.error_samples.append(f"{type(exc).__name__}: {exc}")
+
+
+def run_closed_loop(target: Callable[[str], object], bodies: List[str], concurrency: int,
+                    duration: float = None, total_requests: int = None) -> dict:
+    """N clients send back-to-back requests until duration or total_requests is reached."""
+    if duration is None and total_requests is None:
+        total_requests = len(bodies)
+    recorder = _Recorder()
+    counter = itertools.count()
+    start = time.perf_counter()
+    deadline = start + duration if duration is not None else None
+
+    def client():
+        while True:
+            i = next(counter)
+            if total_requests is not None and i >= total_requests:
+                return
+            if deadline is not None and time.perf_counter() >= deadline:
+                return
+            body = bodies[i % len(bodies)]
+            t0 = time.perf_counter()
+            try:
+                target(body)
+                recorder.ok(time.perf_counter() - t0)
+            except Exception as e:
+                recorder.fail(e)
+
+    threads = [threading.Thread(target=client, daemon=True) for _ in range(concurrency)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    elapsed = time.perf_counter() - start
+    return summarize("closed", {"concurrency": concurrency}, recorder.latencies, recorder.errors,
+                     elapsed, recorder.error_samples)
+
+
+def run_open_loop(target: Callable[[str], object], bodies: List[str], rate: float,
+                  duration: float = None, total_requests: int = None, max_workers: int = 64) -> dict:
+    """Dispatch requests at a fixed arrival rate; latency includes queueing delay."""
+    if rate <= 0:
+        raise ValueError("rate must be positive")
+    if total_requests is None:
+        total_requests = int(rate * duration) if duration is not None else len(bodies)
+    recorder = _Recorder()
+    interval = 1.0 / rate
+
+    def fire(body: str, scheduled: float):
+        try:
+            target(body)
+            recorder.ok(time.perf_counter() - scheduled)
+        except Exception as e:
+            recorder.fail(e)
+
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=max_workers) as pool:
+        for i in range(total_requests):
+            scheduled = start + i * interval
+            delay = scheduled - time.perf_counter()
+            if delay > 0:
+                time.sleep(delay)
+            pool.submit(fire, bodies[i % len(bodies)], scheduled)
+    elapsed = time.perf_counter() - start
+    report = summarize("open", {"offered_rps": rate}, recorder.latencies, recorder.errors,
+                       elapsed, recorder.error_samples)
+    report["achieved_ratio"] = round(report["throughput_rps"] / rate, 3)
+    return report
+
+
+def find_saturation(reports: List[dict], max_error_rate: float = 0.01) -> dict:
+    """Return the first sweep level past which the scorer stops keeping up, if any."""
+    previous = None
+    for report in reports:
+        if report["error_rate"] > max_error_rate:
+            return {"level": report, "reason": "error_rate"}
+        if report["mode"] == "open" and report["achieved_ratio"] < 1.0 - SATURATION_GAIN:
+            return {"level": report, "reason": "throughput_below_offered"}
+        if report["mode"] == "closed" and previous is not None:
+            gain = (report["throughput_rps"] - previous["throughput_rps"]) / max(previous["throughput_rps"], 1e-9)
+            if gain < SATURATION_GAIN:
+                return {"level": report, "reason": "throughput_plateau"}
+        previous = report
+    return None
+
+
+def run_sweep(target: Callable[[str], object], bodies: List[str], mode: str, levels: List[float],
+              duration: float = None, total_requests: int = None, warmup: int = 0, verbose: bool = False) -> dict:
+    """Run each load level in turn and collect the reports (one progress line per level if verbose)."""
+    for body in bodies[:warmup]:
+        try:
+            target(body)
+        except Exception:
+            pass
+
+    reports = []
+    for level in levels:
+        if mode == "closed":
+            report = run_closed_loop(target, bodies, int(level), duration, total_requests)
+        else:
+            report = run_open_loop(target, bodies, float(level), duration, total_requests)
+        if verbose:
+            print(f"📈 {mode} level={level}: {report['throughput_rps']} rps, "
+                  f"p99={report['latency_ms']['p99']} ms, errors={report['errors']}", file=sys.stderr, flush=True)
+        reports.append(report)
+
+    saturation = find_saturation(reports)
+    return {
+        "mode": mode,
+        "levels": reports,
+        "saturation": None if saturation is None else {
+            "reason": saturation["reason"],
+            "concurrency": saturation["level"].get("concurrency"),
+            "offered_rps": saturation["level"].get("offered_rps"),
+        },
+    }
+
+
+def parse_levels(value: str) -> List[float]:
+    return [float(v) for v in value.split(",") if v.strip()]
+
+
+def main(args):
+    if args.record_from_csv:
+        count = record_from_csv(args.record_from_csv, args.requests, args.batch_size)
+        print(f"✅ Wrote {count} requests to: {args.requests}", flush=True)
+        return
+
+    bodies = load_requests(args.requests)
+    target = http_target(args.url) if args.url else in_process_target(args.model_path, not args.no_fast_path)
+
+    if args.mode == "closed":
+        levels = parse_levels(args.concurrency)
+    else:
+        if not args.rate:
+            raise ValueError("--rate is required in open mode")
+        levels = parse_levels(args.rate)
+
+    result = run_sweep(target, bodies, args.mode, levels, args.duration, args.total_requests, args.warmup,
+                       args.verbose)
+    result["target"] = args.url or "in-process"
+    result["requests_file"] = args.requests
+
+    output = json.dumps(result, indent=2)
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            f.write(output)
+        print(f"✅ Load test report written to: {args.output}", file=sys.stderr, flush=True)
+    print(output)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Replay scoring requests against a local scorer")
+    parser.add_argument("--requests", type=str, default="requests.jsonl", help="JSONL file with one request body per line")
+    parser.add_argument("--url", type=str, default=None, help="Scoring URL; omit to score in-process")
+    parser.add_argument("--model_path", type=str, default=None, help="Model for in-process scoring")
+    parser.add_argument("--no_fast_path", action="store_true", help="In-process: score through Pipeline.predict")
+    parser.add_argument("--mode", choices=["closed", "open"], default="closed")
+    parser.add_argument("--concurrency", type=str, default="1", help="Client count(s) for closed mode, e.g. 1,2,4,8")
+    parser.add_argument("--rate", type=str, default=None, help="Arrival rate(s) in req/s for open mode, e.g. 50,100")
+    parser.add_argument("--duration", type=float, default=None, help="Seconds per level")
+    parser.add_argument("--total_requests", type=int, default=None, help="Requests per level (instead of --duration)")
+    parser.add_argument("--warmup", type=int, default=10, help="Requests sent before measuring")
+    parser.add_argument("--verbose", action="store_true", help="Print each level's result as it finishes")
+    parser.add_argument("--output", type=str, default=None, help="Also write the JSON report to this file")
+    parser.add_argument("--record_from_csv", type=str, default=None, help="Build --requests from a CSV and exit")
+    parser.add_argument("--batch_size", type=int, default=1, help="Rows per request with --record_from_csv")
+    args = parser.parse_args()
+    main(args)
@@ -0,0 +1,336 @@
+#!/usr/bin/env python3
+"""
+Multi-version model host with shadow traffic.
+
+Keeps several registered versions of the used-cars model loaded in one
+process. Every request is answered by the primary version; a configurable
+share of requests is also queued for the shadow versions, which a background
+worker scores after the primary response has been returned. Per-version
+latency and prediction deltas against the primary are recorded so a newly
+registered version can be compared with the champion before switching.
+
+Memory sharing: versions whose model.pkl is byte-for-byte identical share
+one loaded object. Distinct versions each hold their own copy of the trees
+(unpickling sklearn trees, and packing them for the fast path, copies the
+arrays), so budget memory per distinct model.
+
+Examples:
+    python model_host.py --model 2=outputs/v2/model.pkl --model 3=outputs/v3/model.pkl \
+        --primary 2 --shadow_fraction 0.25 --requests requests.jsonl
+    python model_host.py --registered used_cars_price_prediction_model:2 \
+        --registered used_cars_price_prediction_model:3 --primary 2 --serve
+"""
+
+import argparse
+import hashlib
+import json
+import os
+import queue
+import random
+import sys
+import threading
+import time
+from collections import deque
+from typing import Dict, List, Optional, Tuple
+
+import joblib
+import numpy as np
+import pandas as pd
+
+from fast_predict import RecordPredictor
+from score import parse_request, resolve_model_path
+
+# Recent observations kept per version for percentiles
+WINDOW = 10000
+
+
+def file_sha256(path: str, chunk_size: int = 1 << 20) -> str:
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(chunk_size), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+class LoadedModel:
+    """A loaded model plus its record fast path, shared between identical versions."""
+
+    def __init__(self, path: str, digest: str = None):
+        self.path = path
+        self.digest = digest
+        self.model = joblib.load(path)
+        try:
+            self.fast = RecordPredictor(self.model)
+        except ValueError:
+            self.fast = None
+
+    def predict(self, records: List[dict]) -> np.ndarray:
+        if self.fast is not None:
+            return self.fast.predict_records(records)
+        return self.model.predict(pd.DataFrame.from_records(records))
+
+
+class VersionStats:
+    """Latency and delta-vs-primary observations for one version."""
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.requests = 0
+        self.rows = 0
+        self.errors = 0
+        self.latencies = deque(maxlen=WINDOW)
+        self.abs_deltas = deque(maxlen=WINDOW)
+        self.rel_deltas = deque(maxlen=WINDOW)
+
+    def record(self, latency: float, rows: int, deltas: Optional[np.ndarray] = None,
+               primary: Optional[np.ndarray] = None):
+        with self.lock:
+            self.requests += 1
+            self.rows += rows
+            self.latencies.append(latency)
+            if deltas is not None:
+                abs_deltas = np.abs(deltas)
+                self.abs_deltas.extend(abs_deltas.tolist())
+                self.rel_deltas.extend((abs_deltas / np.maximum(np.abs(primary), 1e-9)).tolist())
+
+    def error(self):
+        with self.lock:
+            self.errors += 1
+
+    def summary(self) -> dict:
+        with self.lock:
+            latencies = np.array(self.latencies) * 1000.0
+            abs_deltas = np.array(self.abs_deltas)
+            rel_deltas = np.array(self.rel_deltas)
+            out = {"requests": self.requests, "rows": self.rows, "errors": self.errors}
+        if latencies.size:
+            out["latency_ms"] = {
+                "p50": round(float(np.percentile(latencies, 50)), 3),
+                "p95": round(float(np.percentile(latencies, 95)), 3),
+                "p99": round(float(np.percentile(latencies, 99)), 3),
+            }
+        if abs_deltas.size:
+            out["delta_vs_primary"] = {
+                "mean_abs": round(float(abs_deltas.mean()), 6),
+                "max_abs": round(float(abs_deltas.max()), 6),
+                "mean_rel": round(float(rel_deltas.mean()), 6),
+            }
+        return out
+
+
+class ModelHost:
+    """Route requests to a primary version and mirror a share of them to shadows."""
+
+    def __init__(self, shadow_fraction: float = 0.0, queue_size: int = 1000, seed: int = None):
+        if not 0.0 <= shadow_fraction <= 1.0:
+            raise ValueError("shadow_fraction must be between 0 and 1")
+        self.shadow_fraction = shadow_fraction
+        self.versions: Dict[str, LoadedModel] = {}
+        self.stats: Dict[str, VersionStats] = {}
+        self.primary: Optional[str] = None
+        self.shadow_dropped = 0
+        self._by_digest: Dict[str, LoadedModel] = {}
+        self._lock = threading.Lock()
+        self._random = random.Random(seed)
+        self._queue = queue.Queue(maxsize=queue_size)
+        self._worker = threading.Thread(target=self._shadow_loop, name="shadow-scorer", daemon=True)
+        self._worker.start()
+
+    def load(self, version: str, model_path: str) -> LoadedModel:
+        """Load (or share) the model for a version; the first one loaded becomes primary."""
+        path = resolve_model_path(model_path)
+        digest = file_sha256(path)
+        with self._lock:
+            loaded = self._by_digest.get(digest)
+            if loaded is None:
+                loaded = LoadedModel(path, digest)
+                self._by_digest[digest] = loaded
+                print(f"✅ Loaded version {version} from: {path}", flush=True)
+            else:
+                print(f"✅ Version {version} shares the model already loaded from: {loaded.path}", flush=True)
+            previous = self.versions.get(version)
+            self.versions[version] = loaded
+            if previous is not None and previous is not loaded:
+                self._release(previous)
+            self.stats.setdefault(version, VersionStats())
+            if self.primary is None:
+                self.primary = version
+        return loaded
+
+    def load_registered(self, ml_client, name: str, version: str, download_dir: str) -> LoadedModel:
+        """Download a registered model version from the workspace and load it."""
+        target = os.path.join(download_dir, f"{name}_{version}")
+        if not os.path.isdir(target):
+            ml_client.models.download(name=name, version=version, download_path=target)
+        return self.load(version, target)
+
+    def promote(self, version: str):
+        """Make a loaded version the primary."""
+        with self._lock:
+            if version not in self.versions:
+                raise KeyError(f"Version not loaded: {version}")
+            self.primary = version
+        print(f"✅ Version {version} promoted to primary", flush=True)
+
+    def unload(self, version: str) -> Optional[dict]:
+        """Drop a version and its stats; returns its final stats summary (None if not loaded).
+
+        The loaded model is freed once no other version shares it.
+        """
+        with self._lock:
+            if version == self.primary:
+                raise ValueError("Cannot unload the primary version")
+            loaded = self.versions.pop(version, None)
+            stats = self.stats.pop(version, None)
+            if loaded is not None:
+                self._release(loaded)
+        if loaded is None:
+            return None
+        print(f"✅ Version {version} unloaded", flush=True)
+        return stats.summary() if stats else None
+
+    def _release(self, loaded: LoadedModel):
+        """Forget a shared model once no version uses it (call with the lock held)."""
+        if all(other is not loaded for other in self.versions.values()):
+            self._by_digest.pop(loaded.digest, None)
+
+    def predict(self, records: List[dict]) -> Tuple[str, np.ndarray]:
+        """Score on the primary; maybe enqueue the request for the shadows.
+
+        Returns (version, predictions): the primary is read once, so a concurrent
+        promote or unload cannot change which version answered.
+        """
+        with self._lock:
+            version = self.primary
+            if version is None:
+                raise RuntimeError("No model versions loaded")
+            loaded, stats = self.versions[version], self.stats[version]
+            mirror = self.shadow_fraction and len(self.versions) > 1 and self._random.random() < self.shadow_fraction
+        t0 = time.perf_counter()
+        try:
+            predictions = loaded.predict(records)
+        except Exception:
+            stats.error()
+            raise
+        stats.record(time.perf_counter() - t0, len(records))
+
+        if mirror:
+            try:
+                self._queue.put_nowait((version, records, predictions))
+            except queue.Full:
+                # Shadow scoring must never hold up the primary response
+                with self._lock:
+                    self.shadow_dropped += 1
+        return version, predictions
+
+    def run(self, raw_data) -> dict:
+        """score.run()-compatible entry point."""
+        version, predictions = self.predict(parse_request(raw_data))
+        return {"predictions": [float(p) for p in predictions], "model_version": version}
+
+    def _shadow_loop(self):
+        while True:
+            item = self._queue.get()
+            if item is None:
+                self._queue.task_done()
+                return
+            primary, records, primary_predictions = item
+            with self._lock:
+                shadows = [(version, loaded, self.stats[version]) for version, loaded in self.versions.items()
+                           if version != primary]
+            for version, loaded, stats in shadows:
+                t0 = time.perf_counter()
+                try:
+                    predictions = loaded.predict(records)
+                except Exception:
+                    stats.error()
+                    continue
+                stats.record(time.perf_counter() - t0, len(records),
+                             predictions - primary_predictions, primary_predictions)
+            self._queue.task_done()
+
+    def drain(self):
+        """Wait until every queued shadow request has been scored."""
+        self._queue.join()
+
+    def close(self):
+        self._queue.put(None)
+        self._worker.join()
+
+    def report(self) -> dict:
+        with self._lock:
+            primary, dropped, shared = self.primary, self.shadow_dropped, len(self._by_digest)
+            stats = {version: self.stats[version] for version in self.versions}
+        return {
+            "primary": primary,
+            "shadow_fraction": self.shadow_fraction,
+            "shadow_dropped": dropped,
+            "shared_models": shared,
+            "versions": {version: version_stats.summary() for version, version_stats in stats.items()},
+        }
+
+
+def parse_model_arg(value: str):
+    """'version=path' -> (version, path)."""
+    if "=" not in value:
+        raise argparse.ArgumentTypeError(f"Expected VERSION=PATH, got: {value}")
+    version, path = value.split("=", 1)
+    return version, path
+
+
+def main(args):
+    host = ModelHost(shadow_fraction=args.shadow_fraction, queue_size=args.queue_size, seed=args.seed)
+    for version, path in args.model or []:
+        host.load(version, path)
+
+    if args.registered:
+        # Shared workspace config and pooled client (mlops/config)
+        sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", ".."))
+        from mlops.config import get_ml_client
+
+        ml_client = get_ml_client()
+        for ref in args.registered:
+            name, version = ref.rsplit(":", 1)
+            host.load_registered(ml_client, name, version, args.download_dir)
+
+    if args.primary:
+        host.promote(args.primary)
+
+    if args.serve:
+        from score import serve
+
+        serve(args.host, args.port, run_fn=host.run)
+    elif args.requests:
+        with open(args.requests, encoding="utf-8") as f:
+            for line in f:
+                if line.strip():
+                    host.run(line)
+        host.drain()
+
+    report = host.report()
+    output = json.dumps(report, indent=2)
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            f.write(output)
+    print(output)
+    host.close()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Host several model versions with shadow traffic")
+    parser.add_argument("--model", type=parse_model_arg, action="append", help="VERSION=PATH to a model.pkl or folder")
+    parser.add_argument("--registered", action="append", help="NAME:VERSION of a registered model to download")
+    parser.add_argument("--download_dir", type=str, default="downloaded_models")
+    parser.add_argument("--primary", type=str, default=None, help="Version answering requests (default: first loaded)")
+    parser.add_argument("--shadow_fraction", type=float, default=0.1, help="Share of requests mirrored to shadows")
+    parser.add_argument("--queue_size", type=int, default=1000, help="Pending shadow requests before dropping")
+    parser.add_argument("--seed", type=int, default=None)
+    parser.add_argument("--requests", type=str, default=None, help="Replay a JSONL file of request bodies and report")
+    parser.add_argument("--serve", action="store_true", help="Serve /score over HTTP")
+    parser.add_argument("--host", type=str, default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=5001)
+    parser.add_argument("--output", type=str, default=None, help="Also write the JSON report to this file")
+    args = parser.parse_args()
+    if not args.model and not args.registered:
+        parser.error("at least one --model or --registered is required")
+    sys.exit(main(args))
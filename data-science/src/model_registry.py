@@ -0,0 +1,146 @@
+#!/usr/bin/env python3
+"""
+Content-addressed model registration shared by the register scripts.
+
+The model folder (or file) is hashed in one streaming pass: every file in
+sorted relative-path order, as its path, its size and its bytes read in
+1 MiB chunks, so memory stays flat however large the model is. Files that
+train.py rewrites on every run (train_diagnostics.txt with its timestamp,
+run_metrics.json with the timings) are not model content and are left out,
+so retraining the same model gives the same hash. The SHA-256
+is stored on the registered version as the content_sha256 tag. Before
+uploading, the versions of the model name are listed; if one carries the
+same hash it is reused and nothing is uploaded or versioned.
+
+An upload function (e.g. artifact_upload.upload_model, parallel block
+upload) can replace the SDK's serial upload of the local path: the model is
+then registered from the uploaded copy. If it fails, the SDK upload is used.
+
+After an upload the version is tagged with how long the registration took
+(register_seconds), so a later reuse can report the time it saved: that
+registration time minus the time spent hashing and looking up.
+
+Example:
+    model, info = register_model(ml_client, Model(path="outputs/model", name="used-cars-model"))
+    print(model.version, info["reused"], info["saved_s"])
+"""
+
+import fnmatch
+import hashlib
+import os
+import time
+
+HASH_TAG = "content_sha256"
+BYTES_TAG = "content_bytes"
+REGISTER_SECONDS_TAG = "register_seconds"
+CHUNK_SIZE = 1024 * 1024
+# Per-run outputs written next to the model; matched against file names
+RUN_FILES = ("*_diagnostics.txt", "run_metrics.json")
+
+
+def _model_files(path: str, exclude=RUN_FILES) -> list:
+    """(relative path, absolute path) of every file under path, sorted; a file is its own entry.
+
+    Files in a folder whose name matches one of the exclude patterns are skipped.
+    """
+    if os.path.isfile(path):
+        return [(os.path.basename(path), path)]
+    if not os.path.isdir(path):
+        raise FileNotFoundError(f"Model path not found: {path}")
+    files = []
+    for root, dirs, names in os.walk(path):
+        dirs.sort()
+        for name in names:
+            if any(fnmatch.fnmatch(name, pattern) for pattern in exclude):
+                continue
+            full = os.path.join(root, name)
+            files.append((os.path.relpath(full, path).replace(os.sep, "/"), full))
+    return sorted(files)
+
+
+def hash_model_path(path: str, chunk_size: int = CHUNK_SIZE) -> dict:
+    """Streaming SHA-256 of a model file or folder: {"sha256", "bytes", "files"}.
+
+    Paths and sizes are part of the digest, so renaming or moving a file
+    changes it; file timestamps and the per-run files in RUN_FILES are not.
+    """
+    digest = hashlib.sha256()
+    total = 0
+    files = _model_files(path)
+    for relative, full in files:
+        size = os.path.getsize(full)
+        digest.update(f"{relative}\0{size}\0".encode("utf-8"))
+        with open(full, "rb") as f:
+            for chunk in iter(lambda: f.read(chunk_size), b""):
+                digest.update(chunk)
+        total += size
+    return {"sha256": digest.hexdigest(), "bytes": total, "files": len(files)}
+
+
+def _version_key(model):
+    version = str(getattr(model, "version", ""))
+    return (0, int(version), "") if version.isdigit() else (-1, 0, version)
+
+
+def find_registered(ml_client, name: str, sha256: str):
+    """The newest version of the model name tagged with this content hash, or None."""
+    matches = [m for m in ml_client.models.list(name=name)
+               if (getattr(m, "tags", None) or {}).get(HASH_TAG) == sha256]
+    return max(matches, key=_version_key) if matches else None
+
+
+def register_model(ml_client, model, dedup: bool = True, upload=None):
+    """Register model unless a version with the same content exists; returns (model, info).
+
+    info has the hash (content_sha256, bytes, files), the timings (hash_s,
+    lookup_s, register_s) and, when an existing version was reused,
+    reused=True and saved_s. If the path cannot be hashed or the lookup
+    fails, the model is registered as before, without the tag.
+
+    upload(model, content_sha256) -> (remote path, stats) uploads the files
+    first; its stats are returned as info["upload"].
+    """
+    info = {"reused": False, "content_sha256": None, "bytes": None, "files": None,
+            "hash_s": 0.0, "lookup_s": 0.0, "register_s": 0.0, "saved_s": 0.0}
+    if dedup:
+        t0 = time.perf_counter()
+        try:
+            content = hash_model_path(str(model.path))
+        except OSError as e:
+            print(f"⚠️ Not checking for an identical version: {e}", flush=True)
+            content = None
+        info["hash_s"] = time.perf_counter() - t0
+        if content:
+            info.update(content_sha256=content["sha256"], bytes=content["bytes"], files=content["files"])
+            t0 = time.perf_counter()
+            try:
+                existing = find_registered(ml_client, model.name, content["sha256"])
+            except Exception as e:
+                print(f"⚠️ Could not list versions of '{model.name}': {e}", flush=True)
+                existing = None
+            info["lookup_s"] = time.perf_counter() - t0
+            if existing is not None:
+                previous = float((existing.tags or {}).get(REGISTER_SECONDS_TAG, 0) or 0)
+                info["reused"] = True
+                info["saved_s"] = max(previous - info["hash_s"] - info["lookup_s"], 0.0)
+                print(f"🔄 '{model.name}' version {existing.version} has the same content "
+                      f"({content['sha256'][:12]}); reusing it", flush=True)
+                return existing, info
+            model.tags = {**(model.tags or {}), HASH_TAG: content["sha256"], BYTES_TAG: str(content["bytes"])}
+
+    t0 = time.perf_counter()
+    if upload is not None:
+        try:
+            model.path, info["upload"] = upload(model, info["content_sha256"])
+        except Exception as e:
+            print(f"⚠️ Block upload failed, registering from the local path: {e}", flush=True)
+    registered = ml_client.models.create_or_update(model)
+    info["register_s"] = time.perf_counter() - t0
+    if info["content_sha256"]:
+        # Recorded on the version so that reusing it can report the time saved
+        registered.tags = {**(registered.tags or {}), REGISTER_SECONDS_TAG: f"{info['register_s']:.3f}"}
+        try:
+            registered = ml_client.models.create_or_update(registered)
+        except Exception as e:
+            print(f"⚠️ Could not tag '{model.name}' version {registered.version}: {e}", flush=True)
+    return registered, info
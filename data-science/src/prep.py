@@ -5,6 +5,8 @@ import os
 import json
 from datetime import datetime
 
+from instrumentation import RunRecorder
+
 def write_diagnostics(args, log_path, train_rows, test_rows):
     try:
         os.makedirs(os.path.dirname(log_path), exist_ok=True)
@@ -30,17 +32,27 @@ def write_diagnostics(args, log_path, train_rows, test_rows):
     except Exception as e:
         print(f"⚠️ Failed to write diagnostics: {e}", flush=True)
 
+def split_data(df: pd.DataFrame):
+    """80/20 train/test split used by both prep.py and the fused prep_train.py."""
+    return train_test_split(df, test_size=0.2, random_state=42)
+
 def main(args):
     print("🚀 prep.py started", flush=True)
-    df = pd.read_csv(args.raw_data)
-    print(f"✅ Raw data shape: {df.shape}", flush=True)
-    train_df, test_df = train_test_split(df, test_size=0.2, random_state=42)
-
-    os.makedirs(args.train_data, exist_ok=True)
-    os.makedirs(args.test_data, exist_ok=True)
-
-    train_df.to_csv(os.path.join(args.train_data, "train.csv"), index=False)
-    test_df.to_csv(os.path.join(args.test_data, "test.csv"), index=False)
+    run = RunRecorder("prep", args.train_data, params=vars(args))
+    with run:
+        with run.span("read_csv", path=args.raw_data) as span:
+            df = pd.read_csv(args.raw_data)
+            span.rows = len(df)
+        print(f"✅ Raw data shape: {df.shape}", flush=True)
+        with run.span("split", rows=len(df)):
+            train_df, test_df = split_data(df)
+
+        os.makedirs(args.train_data, exist_ok=True)
+        os.makedirs(args.test_data, exist_ok=True)
+
+        with run.span("write_csv", rows=len(df)):
+            train_df.to_csv(os.path.join(args.train_data, "train.csv"), index=False)
+            test_df.to_csv(os.path.join(args.test_data, "test.csv"), index=False)
 
     print(f"✅ Train rows: {len(train_df)}, Test rows: {len(test_df)}")
 
@@ -0,0 +1,52 @@
+#!/usr/bin/env python3
+"""
+Fused prep + train: one process, no intermediate train.csv/test.csv.
+
+Runs the same 80/20 split as prep.py and the same training routine as
+train.py, handing the DataFrames over in memory. Writes the artifacts the
+two-step pipeline produces in its model output (model.pkl, metrics.json,
+train_diagnostics.txt) plus prep_diagnostics.txt, so results can be
+compared one to one; run_metrics.json goes to --metrics_output.
+
+Usage:
+    python prep_train.py --raw_data ../../data/used_cars.csv --model_output ./outputs/model
+"""
+
+import argparse
+import os
+
+import prep
+import train
+from instrumentation import RunRecorder
+
+
+def main(args):
+    print("🚀 prep_train.py started", flush=True)
+    with RunRecorder("prep_train", args.metrics_output, params=vars(args)) as run:
+        df = train.load_csv(args.raw_data, run)
+        print(f"✅ Raw data shape: {df.shape}", flush=True)
+
+        with run.span("split", rows=len(df)):
+            train_df, test_df = prep.split_data(df)
+        print(f"✅ Train rows: {len(train_df)}, Test rows: {len(test_df)}", flush=True)
+        prep.write_diagnostics(argparse.Namespace(raw_data=args.raw_data, train_data="(in memory)",
+                                                  test_data="(in memory)"),
+                               os.path.join(args.model_output, "prep_diagnostics.txt"),
+                               len(train_df), len(test_df))
+
+        X_train, y_train = train.split_target(train_df)
+        X_test, y_test = train.split_target(test_df)
+        train.train_and_save(args, X_train, y_train, X_test, y_test, run)
+    print("🏁 prep_train.py finished", flush=True)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Split and train in one process")
+    parser.add_argument("--raw_data", type=str, required=True, help="Raw CSV (or folder with one CSV)")
+    parser.add_argument("--n_estimators", type=int, default=100)
+    parser.add_argument("--max_depth", type=int, default=None)
+    parser.add_argument("--model_output", type=str, required=True)
+    parser.add_argument("--metrics_output", type=str, default="outputs",
+                        help="Folder for run_metrics.json, kept out of the model (./outputs is saved with the run)")
+    args = parser.parse_args()
+    main(args)
@@ -3,6 +3,8 @@ import argparse, json, os, sys, traceback
 from datetime import datetime
 import pandas as pd
 
+from instrumentation import RunRecorder
+
 def parse_args():
     parser = argparse.ArgumentParser(description="Prepare dataset for training")
     parser.add_argument("--raw_data", required=True, help="Path to raw data file")
@@ -26,8 +28,9 @@ def write_json(path: str, data: dict):
     except Exception as e:
         print(f"[WARN] Failed to write diagnostics: {e}", flush=True)
 
-def main():
+def main(run: RunRecorder):
     args = parse_args()
+    run.params = vars(args)
     raw_path = args.raw_data
 
     if not os.path.exists(raw_path):
@@ -44,7 +47,9 @@ def main():
             sys.exit(1)
 
     try:
-        df = pd.read_csv(raw_path)
+        with run.span("read_csv", path=raw_path) as span:
+            df = pd.read_csv(raw_path)
+            span.rows = df.shape[0]
         print(f"[DEBUG] Read CSV with shape {df.shape}", flush=True)
     except Exception as e:
         print(f"[ERROR] Failed to read CSV: {e}", flush=True)
@@ -55,10 +60,11 @@ def main():
         sys.exit(1)
 
     try:
-        df_shuffled = df.sample(frac=1.0, random_state=args.random_state).reset_index(drop=True)
-        split_idx = int(df.shape[0] * (1.0 - args.test_size))
-        df_train = df_shuffled.iloc[:split_idx].reset_index(drop=True)
-        df_test = df_shuffled.iloc[split_idx:].reset_index(drop=True)
+        with run.span("split", rows=df.shape[0]):
+            df_shuffled = df.sample(frac=1.0, random_state=args.random_state).reset_index(drop=True)
+            split_idx = int(df.shape[0] * (1.0 - args.test_size))
+            df_train = df_shuffled.iloc[:split_idx].reset_index(drop=True)
+            df_test = df_shuffled.iloc[split_idx:].reset_index(drop=True)
         print(f"[DEBUG] Train shape: {df_train.shape}, Test shape: {df_test.shape}", flush=True)
     except Exception as e:
         print(f"[ERROR] Failed to split data: {e}", flush=True)
@@ -68,8 +74,9 @@ def main():
     ensure_dir("outputs/train")
     ensure_dir("outputs/test")
     try:
-        df_train.to_csv("outputs/train/train.csv", index=False)
-        df_test.to_csv("outputs/test/test.csv", index=False)
+        with run.span("write_csv", rows=df.shape[0]):
+            df_train.to_csv("outputs/train/train.csv", index=False)
+            df_test.to_csv("outputs/test/test.csv", index=False)
         print("[DEBUG] CSVs written successfully", flush=True)
     except Exception as e:
         print(f"[WARN] Failed to write CSVs: {e}", flush=True)
@@ -94,7 +101,8 @@ def main():
 
 if __name__ == "__main__":
     try:
-        main()
+        with RunRecorder("prepare", "outputs") as run:
+            main(run)
     except Exception as e:
         print(f"[FATAL] Unexpected error: {e}", flush=True)
         traceback.print_exc()
@@ -1,11 +1,30 @@
 import argparse
 import os
+import sys
 import json
 from azure.ai.ml import MLClient
 from azure.identity import DefaultAzureCredential
 from azure.ai.ml.entities import Model
 from datetime import datetime
 
+from instrumentation import RunRecorder
+from model_registry import register_model
+from artifact_upload import open_blob_store, upload_model
+
+# Shared workspace config (mlops/config) when run from the repository
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", ".."))
+try:
+    from mlops.config import get_ml_client
+except ImportError:
+    def get_ml_client():
+        """Azure ML jobs only ship src/; the job sets the AZUREML_ARM_* variables."""
+        return MLClient(
+            DefaultAzureCredential(),
+            subscription_id=os.environ["AZUREML_ARM_SUBSCRIPTION"],
+            resource_group_name=os.environ["AZUREML_ARM_RESOURCEGROUP"],
+            workspace_name=os.environ["AZUREML_ARM_WORKSPACE_NAME"]
+        )
+
 def write_diagnostics(args, log_path):
     try:
         os.makedirs(os.path.dirname(log_path), exist_ok=True)
@@ -24,39 +43,50 @@ def main(args):
     log_path = os.path.join(args.model_info_output_path, "register_diagnostics.txt")
     write_diagnostics(args, log_path)
 
-<<<<<<< HEAD
-    ml_client = MLClient(
-        DefaultAzureCredential(),
-        subscription_id="77c91b3f-d78c-4832-8ed2-a5dd9c501e0e",
-        resource_group_name="streaming_autovehicle_pricing_MLOPS",
-        workspace_name="project_III_MLOPS"
-=======
-    # Get configuration from environment variables with fallback to defaults
-    subscription_id = os.environ.get("AZUREML_ARM_SUBSCRIPTION", "77c91b3f-d78c-4832-8ed2-a5dd9c501e0e")
-    resource_group = os.environ.get("AZUREML_ARM_RESOURCEGROUP", "streaming_autovehicle_pricing_MLOPS")
-    workspace_name = os.environ.get("AZUREML_ARM_WORKSPACE_NAME", "project_III_MLOPS")
-
-    ml_client = MLClient(
-        DefaultAzureCredential(),
-        subscription_id=subscription_id,
-        resource_group_name=resource_group,
-        workspace_name=workspace_name
->>>>>>> aef2dbfc8c91683f27c0e439296ca79eacd02c7f
-    )
-
-    model = Model(
-        path=args.model_path,
-        name=args.model_name,
-        description="Used cars price prediction model"
-    )
-
-    registered_model = ml_client.models.create_or_update(model)
-
-    os.makedirs(args.model_info_output_path, exist_ok=True)
-    with open(os.path.join(args.model_info_output_path, "model_info.txt"), "w") as f:
-        f.write(f"Model name: {registered_model.name}\n")
-        f.write(f"Version: {registered_model.version}\n")
-        f.write(f"Path: {args.model_path}\n")
+    with RunRecorder("register", args.model_info_output_path, params=vars(args)) as run:
+        with run.span("connect") as span:
+            ml_client = get_ml_client()
+            span.attrs["workspace"] = ml_client.workspace_name
+
+        model = Model(
+            path=args.model_path,
+            name=args.model_name,
+            description="Used cars price prediction model"
+        )
+
+        upload = None
+        if not args.sdk_upload:
+            try:
+                store = open_blob_store(ml_client)
+                upload = lambda m, sha256: upload_model(store, m, sha256, workers=args.upload_workers,
+                                                        block_size=int(args.block_size_mb * 2**20))
+            except Exception as e:
+                print(f"⚠️ No blob store for the block upload, using the SDK upload: {e}", flush=True)
+
+        with run.span("register", model_name=args.model_name) as span:
+            registered_model, info = register_model(ml_client, model, dedup=not args.force_register,
+                                                    upload=upload)
+            span.attrs.update(version=registered_model.version, **info)
+
+        if info["reused"]:
+            print(f"✅ Reused {registered_model.name}:{registered_model.version} "
+                  f"(saved ~{info['saved_s']:.1f}s of upload)", flush=True)
+        else:
+            print(f"✅ Model registered: {registered_model.name}:{registered_model.version}", flush=True)
+        if info.get("upload"):
+            stats = info["upload"]
+            print(f"📤 Uploaded {stats['uploaded_bytes'] / 2**20:.1f} MB in {stats['uploaded_blocks']} blocks "
+                  f"({stats['mb_s']:.1f} MB/s, {stats['resumed_blocks']} resumed, "
+                  f"{stats['skipped_files']} files already uploaded)", flush=True)
+
+        os.makedirs(args.model_info_output_path, exist_ok=True)
+        with open(os.path.join(args.model_info_output_path, "model_info.txt"), "w") as f:
+            f.write(f"Model name: {registered_model.name}\n")
+            f.write(f"Version: {registered_model.version}\n")
+            f.write(f"Path: {args.model_path}\n")
+            f.write(f"Content SHA-256: {info['content_sha256'] or 'n/a'}\n")
+            f.write(f"Reused: {'yes' if info['reused'] else 'no'}\n")
+            f.write(f"Time saved (s): {info['saved_s']:.3f}\n")
 
     print("🏁 register.py finished", flush=True)
 
@@ -65,6 +95,12 @@ if __name__ == "__main__":
     parser.add_argument("--model_name", type=str)
     parser.add_argument("--model_path", type=str)
     parser.add_argument("--model_info_output_path", type=str)
+    parser.add_argument("--force_register", action="store_true",
+                        help="Upload a new version even if one with the same content exists")
+    parser.add_argument("--upload_workers", type=int, default=8, help="Blocks uploaded in parallel")
+    parser.add_argument("--block_size_mb", type=float, default=8, help="Upload block size in MiB")
+    parser.add_argument("--sdk_upload", action="store_true",
+                        help="Let Model(path=...) upload the files (one serial stream) instead")
     args = parser.parse_args()
     main(args)
 
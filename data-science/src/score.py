@@ -0,0 +1,161 @@
+#!/usr/bin/env python3
+"""
+Scoring script for the used-cars price model.
+
+Follows the Azure ML online endpoint contract: init() loads the model once
+and run(raw_data) scores a JSON request body of the form
+{"data": [{"Segment": ..., "Kilometers_Driven": ..., ...}, ...]}.
+
+When the model is a Pipeline(ColumnTransformer, forest), requests are scored
+through fast_predict.RecordPredictor instead of building a DataFrame.
+Adding "quantiles": [10, 90] to the request also returns a price range per
+record, taken from the spread of the forest's per-tree predictions.
+
+Run locally over HTTP with:
+    python score.py --model_path outputs/model.pkl --serve --port 5001
+"""
+
+import argparse
+import json
+import os
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import joblib
+import pandas as pd
+
+from fast_predict import RecordPredictor
+
+model = None
+fast_predictor = None
+
+
+def resolve_model_path(model_path: str = None) -> str:
+    """Resolve model.pkl from an explicit path or AZUREML_MODEL_DIR."""
+    if model_path is None:
+        model_path = os.environ.get("AZUREML_MODEL_DIR")
+    if model_path is None:
+        raise ValueError("❌ No model path provided and AZUREML_MODEL_DIR is not set.")
+
+    if os.path.isdir(model_path):
+        for root, _, files in os.walk(model_path):
+            if "model.pkl" in files:
+                return os.path.join(root, "model.pkl")
+        raise ValueError(f"❌ No model.pkl found under: {model_path}")
+
+    if os.path.isfile(model_path):
+        return model_path
+
+    raise ValueError(f"❌ Invalid model path: {model_path}")
+
+
+def init(model_path: str = None, fast_path: bool = True):
+    """Load the model once per process."""
+    global model, fast_predictor
+    path = resolve_model_path(model_path)
+    model = joblib.load(path)
+    print(f"✅ Model loaded from: {path}", flush=True)
+
+    fast_predictor = None
+    if fast_path:
+        try:
+            fast_predictor = RecordPredictor(model)
+            print("✅ Record fast path enabled", flush=True)
+        except ValueError as e:
+            print(f"[WARN] Record fast path disabled: {e}", flush=True)
+
+
+def parse_request(raw_data) -> list:
+    """Extract the list of records from a request body (str, bytes or dict)."""
+    if isinstance(raw_data, (str, bytes)):
+        raw_data = json.loads(raw_data)
+    records = raw_data.get("data") if isinstance(raw_data, dict) else raw_data
+    if not isinstance(records, list) or not records:
+        raise ValueError("Request must contain a non-empty 'data' list of records")
+    return records
+
+
+def run(raw_data) -> dict:
+    """Score one request body and return {"predictions": [...]}."""
+    if model is None:
+        raise RuntimeError("Model is not loaded; call init() first")
+    if isinstance(raw_data, (str, bytes)):
+        raw_data = json.loads(raw_data)
+    records = parse_request(raw_data)
+    quantiles = raw_data.get("quantiles") if isinstance(raw_data, dict) else None
+    if quantiles:
+        if fast_predictor is None:
+            raise ValueError("Quantile intervals need a forest model with the record fast path")
+        predictions, bounds = fast_predictor.predict_interval_records(records, quantiles)
+        return {
+            "predictions": [float(p) for p in predictions],
+            "quantiles": [float(q) for q in quantiles],
+            "intervals": bounds.tolist(),
+        }
+    if fast_predictor is not None:
+        predictions = fast_predictor.predict_records(records)
+    else:
+        predictions = model.predict(pd.DataFrame.from_records(records))
+    return {"predictions": [float(p) for p in predictions]}
+
+
+class ScoreHandler(BaseHTTPRequestHandler):
+    """POST /score -> server.run_fn(body)."""
+
+    def do_POST(self):
+        if self.path.rstrip("/") != "/score":
+            self._reply(404, {"error": f"Unknown path: {self.path}"})
+            return
+        length = int(self.headers.get("Content-Length", 0))
+        body = self.rfile.read(length)
+        try:
+            self._reply(200, self.server.run_fn(body))
+        except (ValueError, KeyError) as e:
+            self._reply(400, {"error": str(e)})
+        except Exception as e:
+            self._reply(500, {"error": str(e)})
+
+    def _reply(self, status: int, payload: dict):
+        data = json.dumps(payload).encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+    def log_message(self, format, *args):
+        # Per-request access logs would dominate load-test output
+        pass
+
+
+def serve(host: str = "127.0.0.1", port: int = 5001, run_fn=None):
+    """Serve run() (or run_fn) on http://host:port/score until interrupted."""
+    server = ThreadingHTTPServer((host, port), ScoreHandler)
+    server.run_fn = run_fn or run
+    print(f"🚀 Scoring server listening on http://{host}:{port}/score", flush=True)
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+        print("🏁 Scoring server stopped", flush=True)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Score used-cars requests")
+    parser.add_argument("--model_path", type=str, default=None, help="model.pkl or a folder containing it")
+    parser.add_argument("--serve", action="store_true", help="Serve /score over HTTP")
+    parser.add_argument("--host", type=str, default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=5001)
+    parser.add_argument("--request", type=str, default=None, help="Score a single JSON request file and exit")
+    parser.add_argument("--no_fast_path", action="store_true", help="Always score through Pipeline.predict")
+    args = parser.parse_args()
+
+    init(args.model_path, fast_path=not args.no_fast_path)
+    if args.serve:
+        serve(args.host, args.port)
+    elif args.request:
+        with open(args.request, encoding="utf-8") as f:
+            print(json.dumps(run(f.read()), indent=2))
+    else:
+        parser.print_help()
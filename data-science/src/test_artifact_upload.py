@@ -0,0 +1,193 @@
+#!/usr/bin/env python3
+"""
+Tests for the parallel, resumable block upload and the local blob store.
+"""
+
+import os
+import sys
+import tempfile
+from types import SimpleNamespace
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+from artifact_upload import (ChecksumError, LocalBlobStore, UploadError, block_id, plan_file, upload_artifact,
+                             upload_model)
+
+KB = 1024
+
+
+def write_artifact(folder):
+    """A model folder with a multi-block file, a small file and an empty one."""
+    os.makedirs(os.path.join(folder, "sub"), exist_ok=True)
+    files = {"model.pkl": os.urandom(100 * KB + 123), os.path.join("sub", "MLmodel"): b"flavors: {}\n",
+             "empty.txt": b""}
+    for name, data in files.items():
+        with open(os.path.join(folder, name), "wb") as f:
+            f.write(data)
+    return files
+
+
+def assert_uploaded(remote, files):
+    for name, data in files.items():
+        with open(os.path.join(remote, name), "rb") as f:
+            assert f.read() == data, f"{name} differs"
+
+
+def test_plan_file():
+    """Test block boundaries, IDs and the whole-file hash."""
+    print("Testing block plans...")
+    with tempfile.TemporaryDirectory() as tmp:
+        files = write_artifact(tmp)
+        plan = plan_file(os.path.join(tmp, "model.pkl"), block_size=16 * KB)
+        assert plan["size"] == 100 * KB + 123 and len(plan["blocks"]) == 7, plan["size"]
+        assert [b[1] for b in plan["blocks"]] == [i * 16 * KB for i in range(7)]
+        assert plan["blocks"][-1][2] == 4 * KB + 123
+        assert len({len(b[0]) for b in plan["blocks"]}) == 1, "block IDs have one length"
+        assert plan["blocks"][0][0] == block_id(0, plan["blocks"][0][3])
+        assert plan_file(os.path.join(tmp, "model.pkl"), block_size=KB)["sha256"] == plan["sha256"]
+        assert plan_file(os.path.join(tmp, "empty.txt"))["blocks"] == []
+        assert files
+    print("✅ block plan tests passed")
+
+
+def test_parallel_upload():
+    """Test a folder is uploaded in parallel blocks, verified, and skipped when already committed."""
+    print("\nTesting parallel block upload...")
+    with tempfile.TemporaryDirectory() as tmp:
+        files = write_artifact(os.path.join(tmp, "model"))
+        store = LocalBlobStore(os.path.join(tmp, "blob"), latency=0.01)
+        remote, stats = upload_artifact(store, os.path.join(tmp, "model"), "models/m/abc", block_size=8 * KB,
+                                        workers=4)
+        assert remote == os.path.join(tmp, "blob", "models", "m", "abc"), remote
+        assert_uploaded(remote, files)
+        assert stats["files"] == 3 and stats["blocks"] == 14 and stats["uploaded_blocks"] == 14, stats
+        assert stats["uploaded_bytes"] == sum(len(d) for d in files.values())
+        assert 1 < store.peak_in_flight <= 4, store.peak_in_flight
+        assert not [f for _, _, names in os.walk(os.path.join(tmp, "blob", ".blocks")) for f in names], \
+            "staged blocks are removed on commit"
+
+        # The same content again: every file is already committed with its hash
+        _, stats = upload_artifact(store, os.path.join(tmp, "model"), "models/m/abc", block_size=8 * KB)
+        assert stats["skipped_files"] == 3 and stats["uploaded_blocks"] == 0, stats
+
+        # A single file keeps its name under the prefix
+        remote, _ = upload_artifact(store, os.path.join(tmp, "model", "model.pkl"), "models/single/1")
+        with open(remote, "rb") as f:
+            assert f.read() == files["model.pkl"]
+    print("✅ parallel block upload tests passed")
+
+
+def test_resume():
+    """Test an interrupted upload resumes with only the missing blocks."""
+    print("\nTesting resume after an interruption...")
+    with tempfile.TemporaryDirectory() as tmp:
+        files = write_artifact(os.path.join(tmp, "model"))
+        blob = os.path.join(tmp, "blob")
+        try:
+            upload_artifact(LocalBlobStore(blob, fail_after=5), os.path.join(tmp, "model"), "models/m/abc",
+                            block_size=8 * KB, workers=2, backoff=0)
+            assert False, "the interruption should fail the upload"
+        except UploadError as e:
+            assert "re-run to resume" in str(e), e
+        assert not os.path.exists(os.path.join(blob, "models", "m", "abc", "model.pkl")), "nothing committed"
+
+        store = LocalBlobStore(blob)
+        remote, stats = upload_artifact(store, os.path.join(tmp, "model"), "models/m/abc", block_size=8 * KB)
+        assert stats["resumed_blocks"] == 5 and stats["uploaded_blocks"] == 9, stats
+        assert store.staged_calls == 9
+        assert_uploaded(remote, files)
+
+        # Staged blocks of other content are not reused
+        with open(os.path.join(tmp, "model", "model.pkl"), "r+b") as f:
+            f.write(b"changed")
+        _, stats = upload_artifact(store, os.path.join(tmp, "model"), "models/m/abc", block_size=8 * KB)
+        assert stats["uploaded_blocks"] == 13 and stats["skipped_files"] == 2, stats
+    print("✅ resume tests passed")
+
+
+def test_retries_and_checksums():
+    """Test transient failures are retried, 4xx errors are not, and MD5s are checked."""
+    print("\nTesting retries and checksums...")
+    with tempfile.TemporaryDirectory() as tmp:
+        files = write_artifact(os.path.join(tmp, "model"))
+        store = LocalBlobStore(os.path.join(tmp, "blob"), fail_rate=0.3, seed=3)
+        remote, stats = upload_artifact(store, os.path.join(tmp, "model"), "m", block_size=8 * KB, backoff=0)
+        assert store.staged_calls > stats["uploaded_blocks"] == 14, (store.staged_calls, stats)
+        assert_uploaded(remote, files)
+
+        try:
+            store.stage_block("x", block_id(0, "0" * 32), b"data", "0" * 32)
+            assert False, "a wrong MD5 should be rejected"
+        except ChecksumError:
+            pass
+
+        class Forbidden(Exception):
+            status_code = 403
+
+        class DenyingStore(LocalBlobStore):
+            def stage_block(self, *args):
+                self.staged_calls += 1
+                raise Forbidden("no write access")
+
+        denying = DenyingStore(os.path.join(tmp, "denied"))
+        try:
+            upload_artifact(denying, os.path.join(tmp, "model", "model.pkl"), "m", block_size=64 * KB, backoff=0)
+            assert False, "403 should fail the upload"
+        except UploadError as e:
+            assert "after 1 attempt(s)" in str(e), e
+        assert denying.staged_calls == 2, "one attempt per block"
+    print("✅ retry and checksum tests passed")
+
+
+def test_upload_model_skips_run_files():
+    """Test upload_model leaves out the per-run files its content hash ignores."""
+    print("\nTesting model upload without run files...")
+    with tempfile.TemporaryDirectory() as tmp:
+        model_dir = os.path.join(tmp, "model")
+        files = write_artifact(model_dir)
+        diagnostics = os.path.join(model_dir, "train_diagnostics.txt")
+        with open(diagnostics, "w") as f:
+            f.write("Timestamp: first\n")
+        store = LocalBlobStore(os.path.join(tmp, "blob"))
+        model = SimpleNamespace(name="m", path=model_dir)
+        remote, stats = upload_model(store, model, block_size=8 * KB)
+        assert_uploaded(remote, files)
+        assert stats["files"] == len(files) and not os.path.exists(os.path.join(remote, "train_diagnostics.txt"))
+
+        # A re-upload (--force_register) of the same model with new run files writes nothing
+        with open(diagnostics, "w") as f:
+            f.write("Timestamp: later\n")
+        again, stats = upload_model(store, model, block_size=8 * KB)
+        assert again == remote and stats["uploaded_blocks"] == 0 and stats["skipped_files"] == len(files), stats
+    print("✅ model upload run-file tests passed")
+
+
+def main():
+    """Run all tests."""
+    print("=" * 60)
+    print("Running Artifact Upload Tests")
+    print("=" * 60)
+
+    try:
+        test_plan_file()
+        test_parallel_upload()
+        test_resume()
+        test_retries_and_checksums()
+        test_upload_model_skips_run_files()
+
+        print("\n" + "=" * 60)
+        print("✅ All tests passed successfully!")
+        print("=" * 60)
+        return 0
+
+    except AssertionError as e:
+        print(f"\n❌ Test failed: {e}")
+        return 1
+    except Exception as e:
+        print(f"\n❌ Unexpected error: {e}")
+        import traceback
+        traceback.print_exc()
+        return 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,152 @@
+#!/usr/bin/env python3
+"""
+Tests for the local parallel batch executor (partitioning, thresholds, resume).
+"""
+
+import json
+import os
+import shutil
+import sys
+import tempfile
+
+import pandas as pd
+
+sys.path.insert(0, os.path.dirname(__file__))
+from batch_local import PROGRESS_DIR, bind_arguments, parse_size, run_local
+
+# Doubles the 'x' column; fails every mini-batch that contains x == --fail_on
+ENTRY_SCRIPT = '''
+import argparse
+
+fail_on = None
+
+def init():
+    global fail_on
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--fail_on", type=int, default=None)
+    args, _ = parser.parse_known_args()
+    fail_on = args.fail_on
+
+def run(mini_batch):
+    if fail_on is not None and (mini_batch["x"] == fail_on).any():
+        raise ValueError("injected failure")
+    out = mini_batch.copy()
+    out["y"] = out["x"] * 2
+    return out
+'''
+
+
+def _setup(tmp, rows=100):
+    script = os.path.join(tmp, "entry.py")
+    with open(script, "w", encoding="utf-8") as f:
+        f.write(ENTRY_SCRIPT)
+    data = os.path.join(tmp, "input.csv")
+    pd.DataFrame({"x": range(rows)}).to_csv(data, index=False)
+    return script, data
+
+
+def test_helpers():
+    """Test size parsing and input binding."""
+    print("Testing helpers...")
+    assert parse_size("10mb") == 10 * 1024 * 1024
+    assert parse_size("512") == 512
+    argv = bind_arguments("--model ${{inputs.model_path}} --x 1", {"model_path": "/tmp/m"})
+    assert argv == ["--model", "/tmp/m", "--x", "1"], argv
+    print("✅ helper tests passed")
+
+
+def test_parallel_run_preserves_order():
+    """Test all rows are scored once and the merged output keeps input order."""
+    print("\nTesting parallel run...")
+    tmp = tempfile.mkdtemp()
+    try:
+        script, data = _setup(tmp)
+        out_dir = os.path.join(tmp, "out")
+        summary = run_local(script, data, out_dir, rows_per_batch=7, workers=3)
+        assert summary["status"] == "completed", summary
+        assert summary["mini_batches_total"] == 15
+        result = pd.read_csv(summary["output"])
+        assert result["x"].tolist() == list(range(100))
+        assert (result["y"] == result["x"] * 2).all()
+    finally:
+        shutil.rmtree(tmp)
+    print("✅ parallel run tests passed")
+
+
+def test_error_thresholds():
+    """Test failed mini-batches are tolerated up to the threshold and abort beyond it."""
+    print("\nTesting error thresholds...")
+    tmp = tempfile.mkdtemp()
+    try:
+        script, data = _setup(tmp)
+        tolerated = run_local(script, data, os.path.join(tmp, "ok"), ["--fail_on", "3"], rows_per_batch=10,
+                              workers=2, error_threshold=10, max_retries=1)
+        assert tolerated["status"] == "completed_with_errors", tolerated
+        assert tolerated["rows_failed"] == 10
+        assert tolerated["errors"][0]["error"] == "ValueError: injected failure"
+        assert len(pd.read_csv(tolerated["output"])) == 90
+
+        aborted = run_local(script, data, os.path.join(tmp, "bad"), ["--fail_on", "3"], rows_per_batch=10,
+                            workers=2, mini_batch_error_threshold=0, max_retries=0)
+        assert aborted["status"] == "failed", aborted
+        assert "mini_batch_error_threshold" in aborted["aborted_reason"]
+    finally:
+        shutil.rmtree(tmp)
+    print("✅ error threshold tests passed")
+
+
+def test_resume():
+    """Test a rerun only processes mini-batches that did not finish."""
+    print("\nTesting resume...")
+    tmp = tempfile.mkdtemp()
+    try:
+        script, data = _setup(tmp)
+        out_dir = os.path.join(tmp, "out")
+        first = run_local(script, data, out_dir, rows_per_batch=20, workers=2)
+        assert first["mini_batches_processed"] == 5
+
+        # Simulate an interruption after three mini-batches
+        progress_path = os.path.join(out_dir, PROGRESS_DIR, "progress.jsonl")
+        with open(progress_path, encoding="utf-8") as f:
+            records = [json.loads(line) for line in f]
+        with open(progress_path, "w", encoding="utf-8") as f:
+            for record in records:
+                if record["batch"] < 3:
+                    f.write(json.dumps(record) + "\n")
+
+        second = run_local(script, data, out_dir, rows_per_batch=20, workers=2)
+        assert second["mini_batches_resumed"] == 3, second
+        assert second["mini_batches_processed"] == 2, second
+        assert pd.read_csv(second["output"])["x"].tolist() == list(range(100))
+
+        restarted = run_local(script, data, out_dir, rows_per_batch=25, workers=2)
+        assert restarted["mini_batches_resumed"] == 0, "Changed settings must not resume"
+    finally:
+        shutil.rmtree(tmp)
+    print("✅ resume tests passed")
+
+
+def main():
+    """Run all tests."""
+    print("=" * 60)
+    print("Running Local Batch Executor Tests")
+    print("=" * 60)
+
+    try:
+        test_helpers()
+        test_parallel_run_preserves_order()
+        test_error_thresholds()
+        test_resume()
+
+        print("\n" + "=" * 60)
+        print("✅ All tests passed successfully!")
+        print("=" * 60)
+        return 0
+
+    except AssertionError as e:
+        print(f"\n❌ Test failed: {e}")
+        return 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,205 @@
+#!/usr/bin/env python3
+"""
+Parity tests for the record-oriented fast path against Pipeline.predict.
+"""
+
+import os
+import sys
+
+import numpy as np
+import pandas as pd
+from sklearn.compose import ColumnTransformer
+from sklearn.ensemble import RandomForestRegressor
+from sklearn.pipeline import Pipeline
+from sklearn.preprocessing import OneHotEncoder, StandardScaler
+from sklearn.tree import DecisionTreeRegressor
+
+sys.path.insert(0, os.path.dirname(__file__))
+from fast_predict import RecordPredictor
+
+FEATURES = ["Segment", "Kilometers_Driven", "Mileage", "Engine", "Power", "Seats"]
+
+
+def make_data(n_rows=300, seed=0):
+    """Synthetic used-cars frame with the same columns as data/used_cars.csv."""
+    rng = np.random.default_rng(seed)
+    df = pd.DataFrame({
+        "Segment": rng.choice(["luxury segment", "non-luxury segment"], n_rows),
+        "Kilometers_Driven": rng.integers(1000, 200000, n_rows),
+        "Mileage": rng.uniform(8, 30, n_rows).round(2),
+        "Engine": rng.integers(800, 5000, n_rows),
+        "Power": rng.uniform(40, 500, n_rows).round(2),
+        "Seats": rng.choice([2, 4, 5, 7, 8], n_rows),
+    })
+    price = 3 + df["Power"] * 0.08 - df["Kilometers_Driven"] * 1e-5 + (df["Segment"] == "luxury segment") * 20
+    return df, price + rng.normal(0, 1, n_rows)
+
+
+def make_pipeline(X, y, max_depth=None, scaler=None):
+    """Same Pipeline layout as train.py."""
+    categorical_cols = X.select_dtypes(include=["object", "category", "string"]).columns
+    numeric_cols = X.select_dtypes(exclude=["object", "category", "string"]).columns
+    preprocessor = ColumnTransformer(transformers=[
+        ("categorical", OneHotEncoder(handle_unknown="ignore"), categorical_cols),
+        ("numeric", scaler or StandardScaler(), numeric_cols),
+    ])
+    model = Pipeline(steps=[
+        ("preprocessor", preprocessor),
+        ("regressor", RandomForestRegressor(n_estimators=25, max_depth=max_depth, random_state=42)),
+    ])
+    return model.fit(X, y)
+
+
+def test_batch_parity():
+    """Test predict_records matches Pipeline.predict."""
+    print("Testing batch parity...")
+    X, y = make_data()
+    model = make_pipeline(X, y)
+    predictor = RecordPredictor(model)
+    X_new, _ = make_data(100, seed=1)
+
+    expected = model.predict(X_new)
+    actual = predictor.predict_records(X_new.to_dict(orient="records"))
+    assert np.allclose(actual, expected, rtol=1e-10, atol=1e-10), f"Max diff {np.abs(actual - expected).max()}"
+    print("✅ batch parity tests passed")
+
+
+def test_scaler_options():
+    """Test StandardScaler(with_mean=False) and (with_std=False) match Pipeline.predict."""
+    print("\nTesting scaler options...")
+    X, y = make_data()
+    X_new, _ = make_data(50, seed=4)
+    for options in ({"with_mean": False}, {"with_std": False}, {"with_mean": False, "with_std": False}):
+        model = make_pipeline(X, y, max_depth=8, scaler=StandardScaler(**options))
+        actual = RecordPredictor(model).predict_records(X_new.to_dict(orient="records"))
+        assert np.allclose(actual, model.predict(X_new), rtol=1e-10, atol=1e-10), options
+    print("✅ scaler option tests passed")
+
+
+def test_single_record_dict_and_tuple():
+    """Test single dict and tuple records match Pipeline.predict on a one-row frame."""
+    print("\nTesting single record parity...")
+    X, y = make_data()
+    model = make_pipeline(X, y, max_depth=6)
+    predictor = RecordPredictor(model)
+    assert predictor.feature_names == FEATURES, f"Unexpected feature order: {predictor.feature_names}"
+
+    X_new, _ = make_data(20, seed=2)
+    for record in X_new.to_dict(orient="records"):
+        expected = model.predict(pd.DataFrame([record]))[0]
+        from_dict = predictor.predict_record(record)
+        from_tuple = predictor.predict_record(tuple(record[f] for f in FEATURES))
+        assert abs(from_dict - expected) < 1e-9, f"dict: {from_dict} != {expected}"
+        assert abs(from_tuple - expected) < 1e-9, f"tuple: {from_tuple} != {expected}"
+    print("✅ single record parity tests passed")
+
+
+def test_unknown_category_and_validation():
+    """Test unseen categories are ignored like handle_unknown='ignore' and bad records are rejected."""
+    print("\nTesting unknown categories...")
+    X, y = make_data()
+    model = make_pipeline(X, y)
+    predictor = RecordPredictor(model)
+
+    record = X.iloc[0].to_dict()
+    record["Segment"] = "vintage segment"
+    expected = model.predict(pd.DataFrame([record]))[0]
+    assert abs(predictor.predict_record(record) - expected) < 1e-9
+
+    del record["Seats"]
+    try:
+        predictor.predict_record(record)
+        assert False, "Missing feature should raise ValueError"
+    except ValueError:
+        pass
+    print("✅ unknown category tests passed")
+
+
+def test_bare_forest():
+    """Test a forest without preprocessing (numeric tuples)."""
+    print("\nTesting bare forest...")
+    X, y = make_data()
+    X_num = X.drop("Segment", axis=1).to_numpy(dtype=float)
+    forest = RandomForestRegressor(n_estimators=10, random_state=0).fit(X_num, y)
+    predictor = RecordPredictor(forest)
+    assert np.allclose(predictor.predict_records(X_num[:30]), forest.predict(X_num[:30]), rtol=1e-10)
+    assert np.allclose(predictor.forest.predict(X_num), forest.predict(X_num), rtol=1e-10)
+
+    # A single tree's apply() returns 1-D leaf ids
+    tree = DecisionTreeRegressor(max_depth=6, random_state=0).fit(X_num, y)
+    outputs = RecordPredictor(tree).forest.tree_outputs(X_num)
+    assert outputs.shape == (len(X_num), 1) and np.allclose(outputs[:, 0], tree.predict(X_num))
+    print("✅ bare forest tests passed")
+
+
+def test_missing_values():
+    """Test rows with NaN take each split's missing-value branch, as sklearn routes them."""
+    print("\nTesting missing values...")
+    X, y = make_data()
+    X_num = X.drop("Segment", axis=1).to_numpy(dtype=float)
+    rng = np.random.default_rng(5)
+    X_nan = X_num.copy()
+    X_nan[rng.random(X_nan.shape) < 0.2] = np.nan
+    # Trained without NaN (missing values go to the larger child) and with NaN (learned direction)
+    for X_fit in (X_num, X_nan):
+        forest = RandomForestRegressor(n_estimators=10, random_state=0).fit(X_fit, y)
+        packed = RecordPredictor(forest).forest
+        expected = np.column_stack([est.predict(X_nan) for est in forest.estimators_])
+        for n_rows in (20, 200):  # packed traversal and forest.apply() paths
+            assert np.allclose(packed.tree_outputs(X_nan[:n_rows]), expected[:n_rows], rtol=1e-12, atol=1e-12)
+        row = next(i for i in range(len(X_nan)) if np.isnan(X_nan[i]).any())
+        assert np.isclose(packed.predict_one(X_nan[row]), forest.predict(X_nan[row:row + 1])[0], rtol=1e-10)
+    print("✅ missing value tests passed")
+
+
+def test_tree_outputs_and_intervals():
+    """Test per-tree outputs and quantile intervals against looping over estimators_."""
+    print("\nTesting prediction intervals...")
+    X, y = make_data()
+    model = make_pipeline(X, y)
+    forest = RecordPredictor(model).forest
+    regressor = model.named_steps["regressor"]
+
+    for n_rows in (5, 200):  # packed traversal and forest.apply() paths
+        X_new, _ = make_data(n_rows, seed=3)
+        Xt = model.named_steps["preprocessor"].transform(X_new)
+        expected = np.column_stack([est.predict(Xt) for est in regressor.estimators_])
+
+        out = np.empty((n_rows, forest.n_trees))
+        assert forest.tree_outputs(Xt, out=out) is out, "tree_outputs should fill the preallocated array"
+        assert np.allclose(out, expected, rtol=1e-12, atol=1e-12)
+
+        mean, bounds = forest.predict_interval(Xt, quantiles=(10, 50, 90), chunk_rows=64)
+        assert np.allclose(mean, regressor.predict(Xt), rtol=1e-10)
+        assert np.allclose(bounds, np.percentile(expected, [10, 50, 90], axis=1).T, rtol=1e-12)
+        assert (bounds[:, 0] <= bounds[:, 2]).all()
+    print("✅ prediction interval tests passed")
+
+
+def main():
+    """Run all tests."""
+    print("=" * 60)
+    print("Running Fast Predict Parity Tests")
+    print("=" * 60)
+
+    try:
+        test_batch_parity()
+        test_scaler_options()
+        test_single_record_dict_and_tuple()
+        test_unknown_category_and_validation()
+        test_bare_forest()
+        test_missing_values()
+        test_tree_outputs_and_intervals()
+
+        print("\n" + "=" * 60)
+        print("✅ All tests passed successfully!")
+        print("=" * 60)
+        return 0
+
+    except AssertionError as e:
+        print(f"\n❌ Test failed: {e}")
+        return 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,131 @@
+#!/usr/bin/env python3
+"""
+Tests for the shared stage instrumentation.
+"""
+
+import argparse
+import json
+import os
+import shutil
+import sys
+import tempfile
+
+sys.path.insert(0, os.path.dirname(__file__))
+from instrumentation import SCHEMA, RunRecorder
+import prep_train
+from test_fast_predict import make_data
+
+SPAN_KEYS = {"name", "parent", "status", "error", "start_offset_s", "wall_s", "cpu_s",
+             "peak_rss_mb", "rss_growth_mb", "rows", "attrs"}
+
+
+def test_spans_and_schema():
+    """Test spans record timings, rows, nesting and errors, and the run JSON has one schema."""
+    print("Testing spans...")
+    tmp = tempfile.mkdtemp()
+    try:
+        try:
+            with RunRecorder("unit", tmp, params={"alpha": 1}) as run:
+                with run.span("outer", rows=10) as outer:
+                    with run.span("inner", kind="test") as inner:
+                        inner.rows = 5
+                        sum(range(100000))
+                    outer.attrs["note"] = "done"
+                with run.span("broken"):
+                    raise RuntimeError("boom")
+            assert False, "Exception should propagate"
+        except RuntimeError:
+            pass
+
+        with open(os.path.join(tmp, "run_metrics.json")) as f:
+            metrics = json.load(f)
+        assert metrics["schema"] == SCHEMA
+        assert metrics["script"] == "unit" and metrics["params"] == {"alpha": 1}
+        assert metrics["status"] == "failed" and "boom" in metrics["error"]
+        spans = {s["name"]: s for s in metrics["spans"]}
+        assert set(spans) == {"outer", "inner", "broken"}
+        for span in spans.values():
+            assert set(span) == SPAN_KEYS, set(span) ^ SPAN_KEYS
+        assert spans["inner"]["parent"] == "outer" and spans["inner"]["rows"] == 5
+        assert spans["inner"]["attrs"] == {"kind": "test"}
+        assert spans["outer"]["rows"] == 10 and spans["outer"]["attrs"] == {"note": "done"}
+        assert spans["outer"]["wall_s"] >= spans["inner"]["wall_s"] > 0
+        assert spans["broken"]["status"] == "error"
+        if sys.platform != "win32":
+            assert spans["outer"]["peak_rss_mb"] > 0
+    finally:
+        shutil.rmtree(tmp)
+    print("✅ span tests passed")
+
+
+def test_clean_exit_and_disabled():
+    """Test sys.exit(0) counts as completed and a disabled recorder writes nothing."""
+    print("\nTesting exit handling...")
+    tmp = tempfile.mkdtemp()
+    try:
+        try:
+            with RunRecorder("exits", tmp):
+                sys.exit(0)
+        except SystemExit:
+            pass
+        with open(os.path.join(tmp, "run_metrics.json")) as f:
+            assert json.load(f)["status"] == "completed"
+
+        disabled = RunRecorder("quiet", os.path.join(tmp, "disabled"), enabled=False)
+        with disabled.span("work"):
+            pass
+        assert disabled.finish() is None
+        assert not os.path.exists(os.path.join(tmp, "disabled"))
+    finally:
+        shutil.rmtree(tmp)
+    print("✅ exit handling tests passed")
+
+
+def test_prep_train_stages():
+    """Test a real training run records the expected stages."""
+    print("\nTesting prep_train stages...")
+    tmp = tempfile.mkdtemp()
+    try:
+        X, y = make_data(120)
+        raw = os.path.join(tmp, "raw.csv")
+        X.assign(price=y).to_csv(raw, index=False)
+        out, metrics_dir = os.path.join(tmp, "model"), os.path.join(tmp, "metrics")
+        prep_train.main(argparse.Namespace(raw_data=raw, n_estimators=5, max_depth=3, model_output=out,
+                                           metrics_output=metrics_dir))
+
+        assert not os.path.exists(os.path.join(out, "run_metrics.json")), "timings stay out of the model folder"
+        with open(os.path.join(metrics_dir, "run_metrics.json")) as f:
+            metrics = json.load(f)
+        assert metrics["status"] == "completed"
+        stages = [s["name"] for s in metrics["spans"]]
+        assert stages == ["read_csv", "split", "fit", "predict", "serialize"], stages
+        rows = {s["name"]: s["rows"] for s in metrics["spans"]}
+        assert rows["read_csv"] == 120 and rows["fit"] == 96 and rows["predict"] == 24
+    finally:
+        shutil.rmtree(tmp)
+    print("✅ prep_train stage tests passed")
+
+
+def main():
+    """Run all tests."""
+    print("=" * 60)
+    print("Running Instrumentation Tests")
+    print("=" * 60)
+
+    try:
+        test_spans_and_schema()
+        test_clean_exit_and_disabled()
+        test_prep_train_stages()
+
+        print("\n" + "=" * 60)
+        print("✅ All tests passed successfully!")
+        print("=" * 60)
+        return 0
+
+    except AssertionError as e:
+        print(f"\n❌ Test failed: {e}")
+        return 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,121 @@
+#!/usr/bin/env python3
+"""
+Tests for the replay load generator using a stub scorer (no model needed).
+"""
+
+import json
+import os
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(__file__))
+from load_test import find_saturation, load_requests, percentile, run_closed_loop, run_open_loop, run_sweep
+
+
+def stub_target(body):
+    """Sleep briefly and fail on requests without a 'data' key."""
+    time.sleep(0.001)
+    if "data" not in json.loads(body):
+        raise ValueError("missing data")
+    return b"{}"
+
+
+BODIES = [json.dumps({"data": [{"Seats": 5}]}), json.dumps({"data": [{"Seats": 7}]}), json.dumps({"bad": 1})]
+
+
+def test_percentile():
+    """Test linear-interpolated percentiles."""
+    print("Testing percentile...")
+    values = [1.0, 2.0, 3.0, 4.0, 5.0]
+    assert percentile(values, 0) == 1.0
+    assert percentile(values, 50) == 3.0
+    assert percentile(values, 100) == 5.0
+    assert percentile(values, 25) == 2.0
+    print("✅ percentile tests passed")
+
+
+def test_load_requests():
+    """Test JSONL loading skips blank lines."""
+    print("\nTesting load_requests...")
+    with tempfile.NamedTemporaryFile(mode="w", delete=False, suffix=".jsonl") as tmp:
+        tmp.write(BODIES[0] + "\n\n" + BODIES[1] + "\n")
+        tmp_path = tmp.name
+    try:
+        bodies = load_requests(tmp_path)
+        assert bodies == BODIES[:2], f"Unexpected bodies: {bodies}"
+    finally:
+        os.unlink(tmp_path)
+    print("✅ load_requests tests passed")
+
+
+def test_closed_loop_counts_errors():
+    """Test closed-loop mode replays a fixed number of requests and counts failures."""
+    print("\nTesting closed loop...")
+    report = run_closed_loop(stub_target, BODIES, concurrency=3, total_requests=30)
+    assert report["requests"] == 30, f"Expected 30 requests, got {report['requests']}"
+    assert report["errors"] == 10, f"Expected 10 errors, got {report['errors']}"
+    assert abs(report["error_rate"] - 1 / 3) < 1e-9
+    assert report["latency_ms"]["p50"] >= 1.0, "Latency should include the stub's 1 ms sleep"
+    assert report["error_samples"][0].startswith("ValueError")
+    print("✅ closed loop tests passed")
+
+
+def test_open_loop_rate():
+    """Test open-loop mode dispatches at the requested rate."""
+    print("\nTesting open loop...")
+    report = run_open_loop(stub_target, BODIES[:2], rate=200, total_requests=40)
+    assert report["requests"] == 40
+    assert report["errors"] == 0
+    # 40 requests at 200 req/s take at least ~0.195 s to schedule
+    assert report["duration_s"] >= 0.19, f"Open loop finished too fast: {report['duration_s']}"
+    assert report["offered_rps"] == 200
+    print("✅ open loop tests passed")
+
+
+def test_sweep_and_saturation():
+    """Test sweep output and saturation detection."""
+    print("\nTesting sweep...")
+    result = run_sweep(stub_target, BODIES[:2], "closed", [1, 2], total_requests=20)
+    assert [r["concurrency"] for r in result["levels"]] == [1, 2]
+    assert "saturation" in result
+
+    plateau = [
+        {"mode": "closed", "concurrency": 1, "throughput_rps": 100.0, "error_rate": 0.0},
+        {"mode": "closed", "concurrency": 2, "throughput_rps": 190.0, "error_rate": 0.0},
+        {"mode": "closed", "concurrency": 4, "throughput_rps": 192.0, "error_rate": 0.0},
+    ]
+    saturation = find_saturation(plateau)
+    assert saturation["reason"] == "throughput_plateau"
+    assert saturation["level"]["concurrency"] == 4
+
+    lagging = [{"mode": "open", "offered_rps": 500, "achieved_ratio": 0.6, "error_rate": 0.0}]
+    assert find_saturation(lagging)["reason"] == "throughput_below_offered"
+    print("✅ sweep tests passed")
+
+
+def main():
+    """Run all tests."""
+    print("=" * 60)
+    print("Running Load Test Harness Tests")
+    print("=" * 60)
+
+    try:
+        test_percentile()
+        test_load_requests()
+        test_closed_loop_counts_errors()
+        test_open_loop_rate()
+        test_sweep_and_saturation()
+
+        print("\n" + "=" * 60)
+        print("✅ All tests passed successfully!")
+        print("=" * 60)
+        return 0
+
+    except AssertionError as e:
+        print(f"\n❌ Test failed: {e}")
+        return 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
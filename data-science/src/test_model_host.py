@@ -0,0 +1,211 @@
+#!/usr/bin/env python3
+"""
+Tests for the multi-version model host (primary routing, shadow scoring, sharing).
+"""
+
+import os
+import shutil
+import sys
+import tempfile
+import threading
+
+import joblib
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(__file__))
+from model_host import ModelHost
+from test_fast_predict import make_data, make_pipeline
+
+
+def _save(model, folder):
+    os.makedirs(folder, exist_ok=True)
+    joblib.dump(model, os.path.join(folder, "model.pkl"))
+    return folder
+
+
+def test_primary_and_shadow():
+    """Test the primary answers, shadows are scored in the background and deltas recorded."""
+    print("Testing primary and shadow routing...")
+    X, y = make_data()
+    champion = make_pipeline(X, y)
+    challenger = make_pipeline(X, y, max_depth=3)
+    records = X.head(20).to_dict(orient="records")
+
+    tmp = tempfile.mkdtemp()
+    host = ModelHost(shadow_fraction=1.0, seed=0)
+    try:
+        host.load("1", _save(champion, os.path.join(tmp, "v1")))
+        host.load("2", _save(challenger, os.path.join(tmp, "v2")))
+        shutil.copytree(os.path.join(tmp, "v1"), os.path.join(tmp, "v1_copy"))
+        host.load("1-copy", os.path.join(tmp, "v1_copy"))
+        assert host.primary == "1"
+
+        expected = champion.predict(X.head(20))
+        for i, record in enumerate(records):
+            version, predictions = host.predict([record])
+            assert version == "1" and np.allclose(predictions, expected[i])
+        host.drain()
+
+        report = host.report()
+        assert report["shared_models"] == 2, "Identical model files should be loaded once"
+        assert report["versions"]["1"]["requests"] == 20
+        assert report["versions"]["2"]["requests"] == 20
+        assert report["versions"]["2"]["delta_vs_primary"]["mean_abs"] > 0
+        assert report["versions"]["1-copy"]["delta_vs_primary"]["max_abs"] == 0
+
+        host.promote("2")
+        assert host.run({"data": records[:2]})["model_version"] == "2"
+    finally:
+        host.close()
+        shutil.rmtree(tmp)
+    print("✅ primary and shadow routing tests passed")
+
+
+def test_shadow_fraction_zero():
+    """Test no shadow scoring happens when shadow_fraction is 0."""
+    print("\nTesting shadow_fraction=0...")
+    X, y = make_data()
+    tmp = tempfile.mkdtemp()
+    host = ModelHost(shadow_fraction=0.0)
+    try:
+        host.load("1", _save(make_pipeline(X, y), os.path.join(tmp, "v1")))
+        host.load("2", _save(make_pipeline(X, y, max_depth=2), os.path.join(tmp, "v2")))
+        host.predict(X.head(5).to_dict(orient="records"))
+        host.drain()
+        assert host.report()["versions"]["2"]["requests"] == 0
+    finally:
+        host.close()
+        shutil.rmtree(tmp)
+    print("✅ shadow_fraction=0 tests passed")
+
+
+def test_shadow_drops_counted_under_load():
+    """Test every mirrored request is either scored by the shadow or counted as dropped."""
+    print("\nTesting dropped shadow requests from many threads...")
+    X, y = make_data()
+    tmp = tempfile.mkdtemp()
+    host = ModelHost(shadow_fraction=1.0, queue_size=1, seed=0)
+    try:
+        host.load("1", _save(make_pipeline(X, y, max_depth=4), os.path.join(tmp, "v1")))
+        host.load("2", _save(make_pipeline(X, y, max_depth=2), os.path.join(tmp, "v2")))
+        records = X.head(1).to_dict(orient="records")
+
+        def send():
+            for _ in range(50):
+                host.predict(records)
+
+        threads = [threading.Thread(target=send) for _ in range(8)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        host.drain()
+
+        report = host.report()
+        assert report["shadow_dropped"] > 0, "a one-slot queue should overflow"
+        assert report["versions"]["2"]["requests"] + report["shadow_dropped"] == 400, report
+    finally:
+        host.close()
+        shutil.rmtree(tmp)
+    print("✅ dropped shadow request tests passed")
+
+
+def test_unload_frees_model_and_stats():
+    """Test unloading drops the version's stats and frees a model no other version shares."""
+    print("\nTesting unload...")
+    X, y = make_data()
+    tmp = tempfile.mkdtemp()
+    host = ModelHost(shadow_fraction=1.0, seed=0)
+    try:
+        host.load("1", _save(make_pipeline(X, y), os.path.join(tmp, "v1")))
+        host.load("2", _save(make_pipeline(X, y, max_depth=3), os.path.join(tmp, "v2")))
+        host.load("2-copy", os.path.join(tmp, "v2"))
+        host.predict(X.head(5).to_dict(orient="records"))
+        host.drain()
+
+        summary = host.unload("2")
+        assert summary["requests"] == 1, summary
+        assert "2" not in host.stats and host.report()["shared_models"] == 2, "2-copy still shares the model"
+        host.unload("2-copy")
+        assert host.report()["shared_models"] == 1 and set(host.stats) == {"1"}
+        assert host.unload("2") is None
+
+        # Reloading a version with a different file frees the model it used
+        host.load("3", os.path.join(tmp, "v2"))
+        host.load("3", os.path.join(tmp, "v1"))
+        assert host.report()["shared_models"] == 1
+    finally:
+        host.close()
+        shutil.rmtree(tmp)
+    print("✅ unload tests passed")
+
+
+def test_version_matches_predictions_during_promotions():
+    """Test run() reports the version that scored while other threads promote and unload."""
+    print("\nTesting reported versions during promotions...")
+    X, y = make_data()
+    models = {"1": make_pipeline(X, y), "2": make_pipeline(X, y, max_depth=3)}
+    records = X.head(3).to_dict(orient="records")
+    expected = {version: model.predict(X.head(3)) for version, model in models.items()}
+    tmp = tempfile.mkdtemp()
+    host = ModelHost(shadow_fraction=0.5, seed=0)
+    try:
+        paths = {version: _save(model, os.path.join(tmp, f"v{version}")) for version, model in models.items()}
+        for version, path in paths.items():
+            host.load(version, path)
+        stop = threading.Event()
+        errors = []
+
+        def send():
+            while not stop.is_set():
+                try:
+                    result = host.run({"data": records})
+                    if not np.allclose(result["predictions"], expected[result["model_version"]]):
+                        errors.append(f"version {result['model_version']} reported for other predictions")
+                except Exception as e:
+                    errors.append(repr(e))
+
+        threads = [threading.Thread(target=send) for _ in range(4)]
+        for thread in threads:
+            thread.start()
+        for i in range(100):
+            new, old = ("2", "1") if i % 2 == 0 else ("1", "2")
+            host.promote(new)
+            host.unload(old)
+            host.load(old, paths[old])
+        stop.set()
+        for thread in threads:
+            thread.join()
+        host.drain()
+        assert not errors, errors[:3]
+    finally:
+        host.close()
+        shutil.rmtree(tmp)
+    print("✅ reported version tests passed")
+
+
+def main():
+    """Run all tests."""
+    print("=" * 60)
+    print("Running Model Host Tests")
+    print("=" * 60)
+
+    try:
+        test_primary_and_shadow()
+        test_shadow_fraction_zero()
+        test_shadow_drops_counted_under_load()
+        test_unload_frees_model_and_stats()
+        test_version_matches_predictions_during_promotions()
+
+        print("\n" + "=" * 60)
+        print("✅ All tests passed successfully!")
+        print("=" * 60)
+        return 0
+
+    except AssertionError as e:
+        print(f"\n❌ Test failed: {e}")
+        return 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,207 @@
+#!/usr/bin/env python3
+"""
+Tests for content-hash deduplication of model registrations.
+"""
+
+import argparse
+import json
+import os
+import sys
+import tempfile
+from types import SimpleNamespace
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+REPO_ROOT = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "..")
+sys.path.insert(0, os.path.join(REPO_ROOT, "mlops", "scripts"))
+from fake_ml_client import FakeMLClient
+from model_registry import HASH_TAG, REGISTER_SECONDS_TAG, hash_model_path, register_model
+
+
+def write_model(folder, payload=b"weights" * 1000):
+    os.makedirs(os.path.join(folder, "sub"), exist_ok=True)
+    with open(os.path.join(folder, "model.pkl"), "wb") as f:
+        f.write(payload)
+    with open(os.path.join(folder, "sub", "MLmodel"), "w") as f:
+        f.write("flavors: {}\n")
+    return folder
+
+
+def test_hash_model_path():
+    """Test the hash covers content and layout but not timestamps, in small chunks too."""
+    print("Testing streaming model hash...")
+    with tempfile.TemporaryDirectory() as tmp:
+        a = write_model(os.path.join(tmp, "a"))
+        b = write_model(os.path.join(tmp, "b"))
+        first = hash_model_path(a)
+        assert first["files"] == 2 and first["bytes"] == 7000 + 12, first
+        assert hash_model_path(b) == first, "same bytes in another folder hash the same"
+        assert hash_model_path(a, chunk_size=7)["sha256"] == first["sha256"]
+        os.utime(os.path.join(a, "model.pkl"), (0, 0))
+        assert hash_model_path(a) == first, "timestamps are not content"
+        for name in ("train_diagnostics.txt", "run_metrics.json", os.path.join("sub", "prep_diagnostics.txt")):
+            with open(os.path.join(a, name), "w") as f:
+                f.write(f"written by this run: {name}")
+        assert hash_model_path(a) == first, "per-run diagnostics and timings are not content"
+
+        os.rename(os.path.join(b, "sub", "MLmodel"), os.path.join(b, "MLmodel"))
+        assert hash_model_path(b)["sha256"] != first["sha256"], "moving a file changes the hash"
+        write_model(b, payload=b"weights" * 999 + b"x")
+        assert hash_model_path(b)["sha256"] != first["sha256"]
+
+        single = hash_model_path(os.path.join(a, "model.pkl"))
+        assert single["files"] == 1 and single["bytes"] == 7000
+        try:
+            hash_model_path(os.path.join(tmp, "missing"))
+            assert False, "missing path should raise"
+        except FileNotFoundError:
+            pass
+    print("✅ streaming model hash tests passed")
+
+
+def test_register_dedup():
+    """Test an identical model reuses its version and a changed one is uploaded."""
+    print("\nTesting registration deduplication...")
+    client = FakeMLClient(latency={"models": 0.02}, default_latency=0.0)
+    with tempfile.TemporaryDirectory() as tmp:
+        path = write_model(os.path.join(tmp, "model"))
+        model = lambda: SimpleNamespace(name="used-cars-model", path=path, version=None, tags=None, description="")
+
+        first, info = register_model(client, model())
+        assert first.version == "1" and not info["reused"], info
+        assert first.tags[HASH_TAG] == info["content_sha256"]
+        assert float(first.tags[REGISTER_SECONDS_TAG]) >= 0.02, first.tags
+
+        again, info = register_model(client, model())
+        assert again is first and info["reused"], info
+        # The fake's upload is one round trip, like the lookup, so little is saved here
+        expected = float(first.tags[REGISTER_SECONDS_TAG]) - info["hash_s"] - info["lookup_s"]
+        assert abs(info["saved_s"] - max(expected, 0.0)) < 1e-9 and info["register_s"] == 0.0, info
+        assert len(client.calls_for("models", "create_or_update")) == 2, "one upload and one tag update"
+
+        write_model(path, payload=b"retrained" * 1000)
+        changed, info = register_model(client, model())
+        assert changed.version == "2" and not info["reused"]
+        # The older content is still found by its tag
+        old = os.path.join(tmp, "old")
+        write_model(old)
+        reused, info = register_model(client, SimpleNamespace(name="used-cars-model", path=old, version=None,
+                                                              tags=None, description=""))
+        assert reused.version == "1" and info["reused"]
+
+        forced, info = register_model(client, model(), dedup=False)
+        assert forced.version == "3" and info["content_sha256"] is None and HASH_TAG not in forced.tags
+
+        # Without a hashable path the model is registered as before
+        missing, info = register_model(client, SimpleNamespace(name="other", path=os.path.join(tmp, "none"),
+                                                               version=None, tags=None, description=""))
+        assert missing.version == "1" and not info["reused"] and missing.tags == {}
+    print("✅ registration deduplication tests passed")
+
+
+def get_fake_model(name):
+    from mlops.config import get_ml_client
+
+    return get_ml_client().models.get(name, version="1")
+
+
+def test_register_script_reuses():
+    """Test register.py reports the reused version on a second run against the same workspace."""
+    print("\nTesting register.py deduplication...")
+    import register
+
+    previous = {var: os.environ.get(var) for var in ("MLOPS_FAKE_WORKSPACE", "MLOPS_LOCAL_BLOB")}
+    try:
+        with tempfile.TemporaryDirectory() as tmp:
+            os.environ.update(MLOPS_FAKE_WORKSPACE="latency=0.001,seed=49", MLOPS_LOCAL_BLOB=os.path.join(tmp, "blob"))
+            args = argparse.Namespace(model_name="used-cars-model",
+                                      model_path=write_model(os.path.join(tmp, "model")),
+                                      model_info_output_path=os.path.join(tmp, "info"), force_register=False,
+                                      sdk_upload=False, upload_workers=4, block_size_mb=0.001)
+            register.main(args)
+            # A retrained identical model comes with a fresh diagnostics file
+            with open(os.path.join(args.model_path, "train_diagnostics.txt"), "w") as f:
+                f.write("Timestamp: later\n")
+            register.main(args)
+            with open(os.path.join(tmp, "info", "model_info.txt")) as f:
+                text = f.read()
+            assert "Version: 1" in text and "Reused: yes" in text, text
+            with open(os.path.join(tmp, "info", "run_metrics.json")) as f:
+                span = next(s for s in json.load(f)["spans"] if s["name"] == "register")
+            assert span["attrs"]["reused"] and span["attrs"]["content_sha256"], span
+
+            # The first run registered the block-uploaded copy
+            model = get_fake_model("used-cars-model")
+            assert model.path.startswith(os.path.join(tmp, "blob", "models", "used-cars-model")), model.path
+            with open(os.path.join(model.path, "model.pkl"), "rb") as f:
+                assert f.read() == b"weights" * 1000
+    finally:
+        for var, value in previous.items():
+            if value is None:
+                os.environ.pop(var, None)
+            else:
+                os.environ[var] = value
+    print("✅ register.py deduplication tests passed")
+
+
+def test_register_component_snapshot():
+    """Test the pipeline register component runs from its code snapshot alone (code + additional_includes)."""
+    print("\nTesting register component snapshot...")
+    import shutil
+    import subprocess
+    import joblib
+    import yaml
+
+    component_file = os.path.join(REPO_ROOT, "github_workflows", "register_model_component.yml")
+    with open(component_file) as f:
+        component = yaml.safe_load(f)
+    component_dir = os.path.dirname(component_file)
+    with tempfile.TemporaryDirectory() as tmp:
+        # Azure ML uploads the code folder with every additional include copied to its root
+        code = os.path.join(tmp, "code")
+        shutil.copytree(os.path.join(component_dir, component["code"]), code,
+                        ignore=shutil.ignore_patterns("__pycache__"))
+        for include in component.get("additional_includes", []):
+            shutil.copy2(os.path.join(component_dir, include), code)
+        os.makedirs(os.path.join(tmp, "model"))
+        joblib.dump({"weights": [1, 2, 3]}, os.path.join(tmp, "model", "best_model.pkl"))
+
+        # Only the repository root (mlops.config) is importable, not data-science/src
+        env = dict(os.environ, PYTHONPATH=os.path.abspath(REPO_ROOT), MLOPS_FAKE_WORKSPACE="latency=0",
+                   MLOPS_LOCAL_BLOB=os.path.join(tmp, "blob"))
+        proc = subprocess.run([sys.executable, "register.py", "--model", os.path.join(tmp, "model")],
+                              cwd=code, env=env, capture_output=True, text=True)
+        assert proc.returncode == 0, proc.stderr
+        uploaded = os.path.join(tmp, "blob", "models", "final_model")
+        assert os.path.isdir(uploaded) and os.listdir(uploaded), proc.stdout
+    print("✅ register component snapshot tests passed")
+
+
+def main():
+    """Run all tests."""
+    print("=" * 60)
+    print("Running Model Registry Tests")
+    print("=" * 60)
+
+    try:
+        test_hash_model_path()
+        test_register_dedup()
+        test_register_script_reuses()
+        test_register_component_snapshot()
+
+        print("\n" + "=" * 60)
+        print("✅ All tests passed successfully!")
+        print("=" * 60)
+        return 0
+
+    except AssertionError as e:
+        print(f"\n❌ Test failed: {e}")
+        return 1
+    except Exception as e:
+        print(f"\n❌ Unexpected error: {e}")
+        import traceback
+        traceback.print_exc()
+        return 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,81 @@
+#!/usr/bin/env python3
+"""
+Tests that the fused prep_train.py matches prep.py followed by train.py.
+"""
+
+import argparse
+import json
+import os
+import shutil
+import sys
+import tempfile
+
+import joblib
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(__file__))
+import prep
+import prep_train
+import train
+from test_fast_predict import make_data
+
+
+def test_fused_matches_two_step():
+    """Test fused and two-step runs produce the same artifacts, metrics and predictions."""
+    print("Testing fused prep+train...")
+    tmp = tempfile.mkdtemp()
+    try:
+        X, y = make_data(250)
+        raw = os.path.join(tmp, "raw.csv")
+        X.assign(price=y.round(4)).to_csv(raw, index=False)
+
+        train_dir, test_dir = os.path.join(tmp, "train"), os.path.join(tmp, "test")
+        prep.main(argparse.Namespace(raw_data=raw, train_data=train_dir, test_data=test_dir))
+        two_step = os.path.join(tmp, "two_step")
+        train.main(argparse.Namespace(data=None, train_data=train_dir, test_data=test_dir,
+                                      n_estimators=20, max_depth=None, model_output=two_step,
+                                      metrics_output=os.path.join(tmp, "two_step_metrics")))
+
+        fused = os.path.join(tmp, "fused")
+        prep_train.main(argparse.Namespace(raw_data=raw, n_estimators=20, max_depth=None, model_output=fused,
+                                           metrics_output=os.path.join(tmp, "fused_metrics")))
+
+        for artifact in ("model.pkl", "metrics.json", "train_diagnostics.txt"):
+            assert os.path.exists(os.path.join(fused, artifact)), f"Missing {artifact}"
+        assert os.path.exists(os.path.join(fused, "prep_diagnostics.txt"))
+
+        with open(os.path.join(two_step, "metrics.json")) as f:
+            expected_metrics = json.load(f)
+        with open(os.path.join(fused, "metrics.json")) as f:
+            assert json.load(f) == expected_metrics
+
+        X_new, _ = make_data(50, seed=5)
+        expected = joblib.load(os.path.join(two_step, "model.pkl")).predict(X_new)
+        actual = joblib.load(os.path.join(fused, "model.pkl")).predict(X_new)
+        assert np.array_equal(actual, expected), f"Max diff {np.abs(actual - expected).max()}"
+    finally:
+        shutil.rmtree(tmp)
+    print("✅ fused prep+train tests passed")
+
+
+def main():
+    """Run all tests."""
+    print("=" * 60)
+    print("Running Fused Prep+Train Tests")
+    print("=" * 60)
+
+    try:
+        test_fused_matches_two_step()
+
+        print("\n" + "=" * 60)
+        print("✅ All tests passed successfully!")
+        print("=" * 60)
+        return 0
+
+    except AssertionError as e:
+        print(f"\n❌ Test failed: {e}")
+        return 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
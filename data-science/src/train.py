@@ -12,6 +12,8 @@ from sklearn.ensemble import RandomForestRegressor
 from sklearn.metrics import mean_squared_error, r2_score
 from sklearn.model_selection import train_test_split
 
+from instrumentation import RunRecorder
+
 def write_diagnostics(args, mse, r2):
     log_path = os.path.join(args.model_output, "train_diagnostics.txt")
     try:
@@ -50,25 +52,24 @@ def resolve_data_path(data_arg: str) -> str:
 
     raise ValueError(f"❌ Invalid dataset path: {data_arg}")
 
-def main(args):
-    print("🚀 train.py started", flush=True)
-
-    data_path = resolve_data_path(args.data)
-    print(f"📂 Loading dataset from: {data_path}", flush=True)
-
-    df = pd.read_csv(data_path)
-    print(f"✅ Dataset shape: {df.shape}", flush=True)
-
+def split_target(df: pd.DataFrame):
+    """Split a frame into features and the 'price' target."""
     if "price" not in df.columns:
         raise ValueError("❌ Dataset must contain a 'price' column as target variable.")
+    return df.drop("price", axis=1), df["price"]
 
-    X = df.drop("price", axis=1)
-    y = df["price"]
-
-    X_train, X_test, y_train, y_test = train_test_split(
-        X, y, test_size=0.2, random_state=42
-    )
+def load_csv(data_arg: str, run: RunRecorder = None) -> pd.DataFrame:
+    run = run or RunRecorder("train", enabled=False)
+    data_path = resolve_data_path(data_arg)
+    print(f"📂 Loading dataset from: {data_path}", flush=True)
+    with run.span("read_csv", path=data_path) as span:
+        df = pd.read_csv(data_path)
+        span.rows = len(df)
+    print(f"✅ Dataset shape: {df.shape}", flush=True)
+    return df
 
+def train_model(X_train, y_train, n_estimators=100, max_depth=None) -> Pipeline:
+    """Fit the preprocessing + RandomForest pipeline."""
     categorical_cols = X_train.select_dtypes(include=["object", "category"]).columns
     numeric_cols = X_train.select_dtypes(exclude=["object", "category"]).columns
 
@@ -82,19 +83,23 @@ def main(args):
     model = Pipeline(steps=[
         ("preprocessor", preprocessor),
         ("regressor", RandomForestRegressor(
-            n_estimators=args.n_estimators,
-            max_depth=args.max_depth,
+            n_estimators=n_estimators,
+            max_depth=max_depth,
             random_state=42
         ))
     ])
 
-    model.fit(X_train, y_train)
+    return model.fit(X_train, y_train)
 
+def evaluate(model, X_test, y_test):
     preds = model.predict(X_test)
     mse = mean_squared_error(y_test, preds)
     r2 = r2_score(y_test, preds)
     print(f"✅ MSE: {mse:.4f}, R2: {r2:.4f}", flush=True)
+    return mse, r2
 
+def save_artifacts(args, model, mse, r2):
+    """Write model.pkl, metrics.json and train_diagnostics.txt to args.model_output."""
     os.makedirs(args.model_output, exist_ok=True)
     model_path = os.path.join(args.model_output, "model.pkl")
     joblib.dump(model, model_path)
@@ -103,14 +108,48 @@ def main(args):
         json.dump({"MSE": mse, "R2": r2}, f)
 
     write_diagnostics(args, mse, r2)
+
+def train_and_save(args, X_train, y_train, X_test, y_test, run: RunRecorder = None):
+    """Train, evaluate and write artifacts from in-memory splits; returns (model, mse, r2)."""
+    run = run or RunRecorder("train", enabled=False)
+    with run.span("fit", rows=len(X_train), n_estimators=args.n_estimators, max_depth=args.max_depth):
+        model = train_model(X_train, y_train, args.n_estimators, args.max_depth)
+    with run.span("predict", rows=len(X_test)):
+        mse, r2 = evaluate(model, X_test, y_test)
+    with run.span("serialize"):
+        save_artifacts(args, model, mse, r2)
+    return model, mse, r2
+
+def main(args):
+    print("🚀 train.py started", flush=True)
+
+    with RunRecorder("train", args.metrics_output, params=vars(args)) as run:
+        if args.train_data and args.test_data:
+            # Splits written by prep.py
+            X_train, y_train = split_target(load_csv(args.train_data, run))
+            X_test, y_test = split_target(load_csv(args.test_data, run))
+        elif args.data:
+            X, y = split_target(load_csv(args.data, run))
+            with run.span("split", rows=len(X)):
+                X_train, X_test, y_train, y_test = train_test_split(
+                    X, y, test_size=0.2, random_state=42
+                )
+        else:
+            raise ValueError("❌ Provide --data, or both --train_data and --test_data.")
+
+        train_and_save(args, X_train, y_train, X_test, y_test, run)
     print("🏁 train.py finished", flush=True)
 
 
 if __name__ == "__main__":
     parser = argparse.ArgumentParser()
-    parser.add_argument("--data", type=str, help="Path or URL to dataset (CSV)", required=True)
+    parser.add_argument("--data", type=str, help="Path or URL to dataset (CSV); split 80/20 here")
+    parser.add_argument("--train_data", type=str, default=None, help="Train split from prep.py (CSV or folder)")
+    parser.add_argument("--test_data", type=str, default=None, help="Test split from prep.py (CSV or folder)")
     parser.add_argument("--n_estimators", type=int, default=100)
     parser.add_argument("--max_depth", type=int, default=None)
     parser.add_argument("--model_output", type=str, required=True)
+    parser.add_argument("--metrics_output", type=str, default="outputs",
+                        help="Folder for run_metrics.json, kept out of the model (./outputs is saved with the run)")
     args = parser.parse_args()
     main(args)
@@ -1,23 +1,45 @@
 import argparse
+import os
+import sys
 import joblib
 from azure.ai.ml import MLClient
 from azure.identity import DefaultAzureCredential
 from azure.ai.ml.entities import Model
 from pathlib import Path
 
+# Shared workspace config (mlops/config) when run from the repository
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", ".."))
+try:
+    from mlops.config import get_ml_client
+except ImportError:
+    def get_ml_client():
+        # Azure ML jobs only ship src/; the job sets the AZUREML_ARM_* variables
+        return MLClient(
+            DefaultAzureCredential(),
+            subscription_id=os.environ["AZUREML_ARM_SUBSCRIPTION"],
+            resource_group_name=os.environ["AZUREML_ARM_RESOURCEGROUP"],
+            workspace_name=os.environ["AZUREML_ARM_WORKSPACE_NAME"]
+        )
+
+# Content-hash deduplication and block upload (data-science/src); the component ships
+# both modules through additional_includes, the path covers runs from the repository
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "..", "data-science", "src"))
+from model_registry import register_model
+from artifact_upload import open_blob_store, upload_model
+
 parser = argparse.ArgumentParser()
 parser.add_argument("--model", type=str, required=True)
+parser.add_argument("--force_register", action="store_true",
+                    help="Upload a new version even if one with the same content exists")
+parser.add_argument("--upload_workers", type=int, default=8, help="Blocks uploaded in parallel")
+parser.add_argument("--sdk_upload", action="store_true",
+                    help="Let Model(path=...) upload the file (one serial stream) instead")
 args = parser.parse_args()
 
 model_path = Path(args.model) / "best_model.pkl"
 print(f"📥 Registering model from: {model_path}")
 
-ml_client = MLClient(
-    DefaultAzureCredential(),
-    subscription_id="77c91b3f-d78c-4832-8ed2-a5dd9c501e0e",
-    resource_group_name="streaming_autovehicle_pricing_MLOPS",
-    workspace_name="project_iii_mlops"
-)
+ml_client = get_ml_client()
 
 registered_model = Model(
     path=str(model_path),
@@ -26,5 +48,16 @@ registered_model = Model(
     description="Best tuned model",
 )
 
-ml_client.models.create_or_update(registered_model)
-print("✅ Model registered successfully.")
+upload = None
+if not args.sdk_upload:
+    try:
+        store = open_blob_store(ml_client)
+        upload = lambda m, sha256: upload_model(store, m, sha256, workers=args.upload_workers)
+    except Exception as e:
+        print(f"⚠️ No blob store for the block upload, using the SDK upload: {e}")
+
+model, info = register_model(ml_client, registered_model, dedup=not args.force_register, upload=upload)
+if info["reused"]:
+    print(f"✅ Reused {model.name}:{model.version} (saved ~{info['saved_s']:.1f}s of upload)")
+else:
+    print("✅ Model registered successfully.")
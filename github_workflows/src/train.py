@@ -1,12 +1,15 @@
 import argparse
 import pandas as pd
 import joblib
+from sklearn.ensemble import RandomForestClassifier
 from sklearn.linear_model import LogisticRegression
 from pathlib import Path
 
 parser = argparse.ArgumentParser()
 parser.add_argument("--data", type=str, required=True)
 parser.add_argument("--output", type=str, required=True)
+parser.add_argument("--n_estimators", type=int, default=None, help="Train a random forest with this many trees")
+parser.add_argument("--max_depth", type=int, default=None, help="Maximum tree depth (random forest)")
 args = parser.parse_args()
 
 print(f"📥 Loading cleaned data from: {args.data}")
@@ -15,7 +18,12 @@ df = pd.read_csv(Path(args.data) / "clean_data.csv")
 X = df.drop("target", axis=1)
 y = df["target"]
 
-model = LogisticRegression()
+if args.n_estimators is not None or args.max_depth is not None:
+    n_estimators = args.n_estimators or 100
+    print(f"🌲 Random forest: n_estimators={n_estimators}, max_depth={args.max_depth}")
+    model = RandomForestClassifier(n_estimators=n_estimators, max_depth=args.max_depth, random_state=42)
+else:
+    model = LogisticRegression()
 model.fit(X, y)
 
 print(f"📤 Saving model to: {args.output}")
@@ -1,48 +1,245 @@
 """
 Configuration module for loading Azure credentials.
+
+Every entry point resolves the workspace settings the same way, once per
+process. For each setting the first source that has a real value wins:
+
+    1. environment variables (AZURE_SUBSCRIPTION_ID, RESOURCE_GROUP,
+       WORKSPACE_NAME, ... and, inside Azure ML jobs, AZUREML_ARM_*)
+    2. the credentials JSON (mlops/config/azure_credentials.json)
+    3. an Azure ML config.json (.azureml/config.json or config.json in the
+       working directory or a parent, as MLClient.from_config finds it)
+    4. the project defaults below
+
+Unrendered GitHub Actions templates ("${{ ... }}") count as missing. The
+resolved config is memoized, and get_credential()/get_ml_client() hand out
+one credential and one MLClient per workspace for the whole process, so a
+script that builds several clients only parses the files and acquires a
+token once.
+
+With MLOPS_FAKE_WORKSPACE set, get_ml_client() returns the in-memory
+workspace from mlops/scripts/fake_ml_client.py instead, built from the
+variable's value (e.g. "history=500,latency=0.1"; see FakeMLClient.from_spec),
+so every entry point can run offline.
+
+Example:
+    from mlops.config import get_config, get_ml_client
+
+    config = get_config()
+    print(config.workspace_name, config.sources["workspace_name"])
+    ml_client = get_ml_client()
 """
 import json
 import os
+import sys
+import threading
 from pathlib import Path
 
+REPO_ROOT = Path(__file__).resolve().parent.parent.parent
+DEFAULT_CREDENTIALS_FILE = REPO_ROOT / "mlops" / "config" / "azure_credentials.json"
+FAKE_WORKSPACE_VAR = "MLOPS_FAKE_WORKSPACE"
+
+# setting -> (environment variables, credentials JSON key, config.json key)
+SETTINGS = {
+    "subscription_id": (("AZURE_SUBSCRIPTION_ID", "AZUREML_ARM_SUBSCRIPTION"), "AZURE_SUBSCRIPTION_ID",
+                        "subscription_id"),
+    "resource_group": (("RESOURCE_GROUP", "AZUREML_ARM_RESOURCEGROUP"), "RESOURCE_GROUP", "resource_group"),
+    "workspace_name": (("WORKSPACE_NAME", "AZUREML_ARM_WORKSPACE_NAME"), "WORKSPACE_NAME", "workspace_name"),
+    "tenant_id": (("AZURE_TENANT_ID",), "AZURE_TENANT_ID", None),
+    "client_id": (("AZURE_CLIENT_ID",), "AZURE_CLIENT_ID", None),
+    "client_secret": (("AZURE_CLIENT_SECRET",), "AZURE_CLIENT_SECRET", None),
+}
+
+DEFAULTS = {
+    "subscription_id": "77c91b3f-d78c-4832-8ed2-a5dd9c501e0e",
+    "resource_group": "streaming_autovehicle_pricing_MLOPS",
+    "workspace_name": "project_III_MLOPS",
+}
+
+_lock = threading.RLock()
+_files = {}
+_configs = {}
+_credential = None
+_clients = {}
+
+
+def _is_set(value) -> bool:
+    return isinstance(value, str) and value.strip() != "" and "${{" not in value
+
+
+def _read_json(path: Path) -> dict:
+    """Parse a JSON file once; re-read only when its modification time changes."""
+    path = Path(path).resolve()
+    mtime = path.stat().st_mtime
+    with _lock:
+        cached = _files.get(path)
+        if cached is None or cached[0] != mtime:
+            with open(path, 'r') as f:
+                cached = (mtime, json.load(f))
+            _files[path] = cached
+        return dict(cached[1])
+
+
+def find_workspace_config(start=None):
+    """Path of the Azure ML config.json MLClient.from_config would use, or None."""
+    directory = Path(start or os.getcwd()).resolve()
+    for folder in [directory, *directory.parents]:
+        for candidate in (folder / ".azureml" / "config.json", folder / "config.json"):
+            if candidate.is_file():
+                return candidate
+    return None
+
+
+class WorkspaceConfig:
+    """Resolved workspace settings; .sources tells where each value came from."""
+
+    def __init__(self, values: dict, sources: dict):
+        self.values = dict(values)
+        self.sources = dict(sources)
+
+    def __getattr__(self, name):
+        if name in SETTINGS:
+            return self.values.get(name)
+        raise AttributeError(name)
+
+    def require(self, *names):
+        """Raise ValueError naming the settings that could not be resolved."""
+        names = names or ("subscription_id", "resource_group", "workspace_name")
+        missing = [SETTINGS[name][0][0] for name in names if not self.values.get(name)]
+        if missing:
+            raise ValueError(f"Missing environment variable(s): {', '.join(missing)}")
+        return self
+
+    def to_environ(self, overwrite: bool = False):
+        """Export the settings under their primary variable names (for DefaultAzureCredential)."""
+        for name, value in self.values.items():
+            variable = SETTINGS[name][0][0]
+            if value and (overwrite or not _is_set(os.environ.get(variable))):
+                os.environ[variable] = value
+
+    def __repr__(self):
+        shown = {k: v for k, v in self.values.items() if k != "client_secret"}
+        return f"WorkspaceConfig({shown})"
+
+
+def resolve_config(credentials_file=None, environ=None, workspace_config=None, defaults=None) -> WorkspaceConfig:
+    """Resolve every setting from environment, credentials file, config.json and defaults (not cached)."""
+    environ = os.environ if environ is None else environ
+    credentials_file = Path(credentials_file or DEFAULT_CREDENTIALS_FILE)
+    file_values = _read_json(credentials_file) if credentials_file.exists() else {}
+    workspace_config = workspace_config if workspace_config is not None else find_workspace_config()
+    aml_values = _read_json(workspace_config) if workspace_config and Path(workspace_config).exists() else {}
+    defaults = DEFAULTS if defaults is None else defaults
+
+    values, sources = {}, {}
+    for name, (variables, file_key, aml_key) in SETTINGS.items():
+        candidates = [(environ.get(variable), f"env:{variable}") for variable in variables]
+        candidates.append((file_values.get(file_key), f"file:{credentials_file.name}"))
+        if aml_key:
+            candidates.append((aml_values.get(aml_key), f"file:{workspace_config}"))
+        candidates.append((defaults.get(name), "default"))
+        for value, source in candidates:
+            if _is_set(value):
+                values[name], sources[name] = value, source
+                break
+    return WorkspaceConfig(values, sources)
+
+
+def get_config(credentials_file=None, refresh: bool = False) -> WorkspaceConfig:
+    """The process-wide config (resolved on first use); refresh=True resolves it again."""
+    key = str(Path(credentials_file or DEFAULT_CREDENTIALS_FILE).resolve())
+    with _lock:
+        if refresh or key not in _configs:
+            config = resolve_config(credentials_file)
+            config.to_environ()
+            _configs[key] = config
+        return _configs[key]
+
+
+def get_credential():
+    """One DefaultAzureCredential per process, so its token cache is shared by every client."""
+    global _credential
+    with _lock:
+        if _credential is None:
+            from azure.identity import DefaultAzureCredential
+            get_config()
+            _credential = DefaultAzureCredential()
+        return _credential
+
+
+def get_ml_client(workspace_name=None, resource_group=None, subscription_id=None, credentials_file=None):
+    """Pooled MLClient for a workspace (the configured one unless overridden)."""
+    config = get_config(credentials_file)
+    key = (subscription_id or config.subscription_id,
+           resource_group or config.resource_group,
+           workspace_name or config.workspace_name)
+    if not all(key):
+        config.require()
+    fake_spec = os.environ.get(FAKE_WORKSPACE_VAR)
+    with _lock:
+        if fake_spec:
+            key = (FAKE_WORKSPACE_VAR, fake_spec) + key
+            if key not in _clients:
+                scripts_dir = str(REPO_ROOT / "mlops" / "scripts")
+                if scripts_dir not in sys.path:
+                    sys.path.insert(0, scripts_dir)
+                from fake_ml_client import FakeMLClient
+                _clients[key] = FakeMLClient.from_spec(fake_spec)
+                _clients[key].workspace_name = key[-1]
+        elif key not in _clients:
+            from azure.ai.ml import MLClient
+            _clients[key] = MLClient(
+                credential=get_credential(),
+                subscription_id=key[0],
+                resource_group_name=key[1],
+                workspace_name=key[2]
+            )
+        return _clients[key]
+
+
+def reset():
+    """Forget the cached files, configs, credential and clients."""
+    global _credential
+    with _lock:
+        _files.clear()
+        _configs.clear()
+        _clients.clear()
+        _credential = None
+
 
 def load_credentials(credentials_file=None):
     """
     Load Azure credentials from JSON file and set them as environment variables.
-    
+
     Args:
         credentials_file (str, optional): Path to the credentials JSON file.
             If not provided, defaults to mlops/config/azure_credentials.json
             relative to the repository root.
-    
+
     Returns:
         dict: Dictionary containing the loaded credentials.
-    
+
     Raises:
         FileNotFoundError: If the credentials file doesn't exist.
         json.JSONDecodeError: If the credentials file is not valid JSON.
     """
-    if credentials_file is None:
-        # Default path: mlops/config/azure_credentials.json from repo root
-        # Try to find the repository root by looking for .git directory
-        current_dir = Path(__file__).resolve().parent
-        repo_root = current_dir.parent.parent  # Go up from mlops/config to repo root
-        credentials_file = repo_root / "mlops" / "config" / "azure_credentials.json"
-    else:
-        credentials_file = Path(credentials_file)
-    
+    credentials_file = Path(credentials_file or DEFAULT_CREDENTIALS_FILE)
+
     if not credentials_file.exists():
         raise FileNotFoundError(
             f"Credentials file not found: {credentials_file}\n"
             f"Please ensure the file exists or provide a valid path."
         )
-    
-    # Load credentials from JSON file
-    with open(credentials_file, 'r') as f:
-        credentials = json.load(f)
-    
+
+    # Load credentials from JSON file (parsed once per process)
+    credentials = _read_json(credentials_file)
+
     # Set each credential as an environment variable
     for key, value in credentials.items():
         os.environ[key] = value
-    
+
+    # Settings resolved before this call are stale now
+    with _lock:
+        _configs.clear()
+
     return credentials
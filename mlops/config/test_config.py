@@ -0,0 +1,134 @@
+#!/usr/bin/env python3
+"""
+Tests for the shared workspace configuration: source precedence,
+memoization and the pooled credential/MLClient.
+"""
+
+import json
+import os
+import sys
+import tempfile
+from contextlib import contextmanager
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", ".."))
+import mlops.config as config  # noqa: E402
+
+ENV_KEYS = ["AZURE_SUBSCRIPTION_ID", "RESOURCE_GROUP", "WORKSPACE_NAME", "AZUREML_ARM_SUBSCRIPTION",
+            "AZUREML_ARM_RESOURCEGROUP", "AZUREML_ARM_WORKSPACE_NAME"]
+
+
+@contextmanager
+def clean_config():
+    """Fresh caches and no workspace variables; both are restored afterwards."""
+    saved = {key: os.environ.pop(key, None) for key in ENV_KEYS}
+    config.reset()
+    try:
+        yield
+    finally:
+        config.reset()
+        for key, value in saved.items():
+            os.environ.pop(key, None)
+            if value is not None:
+                os.environ[key] = value
+
+
+def write_json(path, data):
+    with open(path, "w") as f:
+        json.dump(data, f)
+    return path
+
+
+def test_precedence():
+    """Environment beats the credentials file, which beats config.json and the defaults."""
+    print("Testing config precedence...")
+    with tempfile.TemporaryDirectory() as tmp:
+        creds = write_json(os.path.join(tmp, "creds.json"), {
+            "AZURE_SUBSCRIPTION_ID": "${{ fromJSON(secrets.AZURE_CREDENTIALS).subscriptionId }}",
+            "RESOURCE_GROUP": "rg-from-file",
+        })
+        aml = write_json(os.path.join(tmp, "config.json"), {
+            "subscription_id": "sub-from-config-json", "resource_group": "rg-from-config-json",
+            "workspace_name": "ws-from-config-json",
+        })
+        resolved = config.resolve_config(creds, environ={"AZUREML_ARM_WORKSPACE_NAME": "ws-from-job"},
+                                         workspace_config=aml)
+        assert resolved.subscription_id == "sub-from-config-json", resolved  # template is ignored
+        assert resolved.resource_group == "rg-from-file", resolved
+        assert resolved.workspace_name == "ws-from-job", resolved
+        assert resolved.sources["workspace_name"] == "env:AZUREML_ARM_WORKSPACE_NAME"
+
+        resolved = config.resolve_config(os.path.join(tmp, "missing.json"), environ={}, workspace_config="")
+        assert resolved.workspace_name == config.DEFAULTS["workspace_name"]
+        assert resolved.sources["resource_group"] == "default"
+
+        empty = config.resolve_config(creds, environ={}, workspace_config="", defaults={})
+        try:
+            empty.require()
+            raise AssertionError("require() should fail without a subscription")
+        except ValueError as e:
+            assert "AZURE_SUBSCRIPTION_ID" in str(e) and "WORKSPACE_NAME" in str(e), e
+    print("✅ config precedence tests passed")
+
+
+def test_memoization():
+    """The config is resolved once; the file is parsed again only when it changes."""
+    print("\nTesting config memoization...")
+    with clean_config(), tempfile.TemporaryDirectory() as tmp:
+        creds = write_json(os.path.join(tmp, "creds.json"), {"WORKSPACE_NAME": "ws-one"})
+        first = config.get_config(creds)
+        assert first is config.get_config(creds)
+        assert first.workspace_name == "ws-one"
+        assert os.environ["WORKSPACE_NAME"] == "ws-one", "resolved values are exported"
+
+        os.environ.pop("WORKSPACE_NAME")
+        write_json(creds, {"WORKSPACE_NAME": "ws-two"})
+        os.utime(creds, (0, os.path.getmtime(creds) + 10))
+        assert config.get_config(creds) is first, "cached until refreshed"
+        assert config.get_config(creds, refresh=True).workspace_name == "ws-two"
+
+        assert config.load_credentials(creds) == {"WORKSPACE_NAME": "ws-two"}
+        assert config.get_config(creds) is not first, "load_credentials invalidates the cache"
+    print("✅ config memoization tests passed")
+
+
+def test_client_pool():
+    """One credential per process and one MLClient per workspace."""
+    print("\nTesting pooled MLClient...")
+    with clean_config():
+        client = config.get_ml_client()
+        assert client is config.get_ml_client()
+        other = config.get_ml_client(workspace_name="another-workspace")
+        assert other is not client
+        assert other.workspace_name == "another-workspace"
+        assert config.get_credential() is config.get_credential()
+    print("✅ pooled MLClient tests passed")
+
+
+def main():
+    """Run all tests."""
+    print("=" * 60)
+    print("Running Config Tests")
+    print("=" * 60)
+
+    try:
+        test_precedence()
+        test_memoization()
+        test_client_pool()
+
+        print("\n" + "=" * 60)
+        print("✅ All tests passed successfully!")
+        print("=" * 60)
+        return 0
+
+    except AssertionError as e:
+        print(f"\n❌ Test failed: {e}")
+        return 1
+    except Exception as e:
+        print(f"\n❌ Unexpected error: {e}")
+        import traceback
+        traceback.print_exc()
+        return 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,124 @@
+#!/usr/bin/env python3
+"""
+Startup benchmark for cli.py: how long the cheap commands take to start and
+which modules they import.
+
+Each command runs as a fresh `python -X importtime cli.py ...` process. The
+import log on stderr gives the modules loaded and their cumulative import
+time; the fastest wall time over --repeat runs is reported. With --check the
+script exits 1 when a command is over --budget seconds or imports one of the
+heavy modules (Azure ML SDK, azure.identity, pandas, sklearn, reportlab),
+which is how a top-level import sneaking back in gets caught.
+
+Usage:
+    python mlops/scripts/benchmark_startup.py
+    python mlops/scripts/benchmark_startup.py --check --budget 1.0 --report startup.json
+"""
+
+import argparse
+import json
+import os
+import subprocess
+import sys
+import time
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+CLI = os.path.join(HERE, "cli.py")
+
+CHEAP_COMMANDS = [
+    ["--help"],
+    ["bootstrap", "--help"],
+    ["compute", "--help"],
+    ["dataset", "--help"],
+    ["environment", "--help"],
+    ["submit", "--help"],
+    ["run-local", "--help"],
+    ["review-jobs", "--help"],
+]
+HEAVY_MODULES = ["azure.ai.ml", "azure.identity", "pandas", "sklearn", "reportlab"]
+
+
+def parse_importtime(stderr: str) -> list:
+    """(module, cumulative seconds, nesting depth) for each line of `-X importtime` output."""
+    imports = []
+    for line in stderr.splitlines():
+        if not line.startswith("import time:") or line.count("|") != 2:
+            continue
+        _, cumulative, name = line[len("import time:"):].split("|")
+        if cumulative.strip().isdigit():
+            depth = (len(name) - len(name.lstrip()) - 1) // 2
+            imports.append((name.strip(), int(cumulative) / 1e6, depth))
+    return imports
+
+
+def heavy_imports(modules, heavy: list = HEAVY_MODULES) -> list:
+    """The heavy packages that were imported (in whole or in part)."""
+    return [h for h in heavy if any(m == h or m.startswith(h + ".") for m in modules)]
+
+
+def measure(argv: list, repeat: int = 3) -> dict:
+    """Start cli.py with argv repeat times; returns the fastest wall time and its import log."""
+    best = None
+    for _ in range(repeat):
+        t0 = time.perf_counter()
+        proc = subprocess.run([sys.executable, "-X", "importtime", CLI, *argv],
+                              capture_output=True, text=True, cwd=HERE)
+        wall = time.perf_counter() - t0
+        if best is None or wall < best[0]:
+            best = (wall, proc)
+    wall, proc = best
+    imports = parse_importtime(proc.stderr)
+    top_level = {m: t for m, t, depth in imports if depth == 0}
+    return {
+        "command": " ".join(argv),
+        "returncode": proc.returncode,
+        "wall_s": round(wall, 3),
+        "import_s": round(sum(top_level.values()), 3),
+        "modules": len(imports),
+        "heavy_imports": heavy_imports(m for m, _, _ in imports),
+        "slowest_imports": [[m, round(t, 3)] for m, t in
+                            sorted(top_level.items(), key=lambda item: -item[1])[:5]],
+    }
+
+
+def violations(result: dict, budget: float) -> list:
+    problems = []
+    if result["returncode"] != 0:
+        problems.append(f"exit code {result['returncode']}")
+    if result["wall_s"] > budget:
+        problems.append(f"{result['wall_s']:.2f}s over the {budget:.2f}s budget")
+    if result["heavy_imports"]:
+        problems.append(f"imports {', '.join(result['heavy_imports'])}")
+    return problems
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Measure cli.py startup time and imports")
+    parser.add_argument("--repeat", type=int, default=3, help="Runs per command; the fastest is reported")
+    parser.add_argument("--budget", type=float, default=1.0, help="Maximum wall time per command (s)")
+    parser.add_argument("--check", action="store_true", help="Exit 1 if a command breaks the budget")
+    parser.add_argument("--report", default=None, help="Write the results to this JSON file")
+    args = parser.parse_args()
+
+    results, failed = [], False
+    print(f"{'Command':<22} {'Wall':>7} {'Imports':>8} {'Modules':>8}  Result")
+    print("-" * 64)
+    for argv in CHEAP_COMMANDS:
+        result = measure(argv, args.repeat)
+        result["violations"] = violations(result, args.budget)
+        failed = failed or bool(result["violations"])
+        results.append(result)
+        status = "✅" if not result["violations"] else "❌ " + "; ".join(result["violations"])
+        print(f"{result['command']:<22} {result['wall_s']:6.2f}s {result['import_s']:7.2f}s "
+              f"{result['modules']:>8}  {status}", flush=True)
+
+    if args.report:
+        with open(args.report, "w", encoding="utf-8") as f:
+            json.dump({"budget_s": args.budget, "python": sys.version.split()[0], "results": results}, f, indent=2)
+        print(f"📄 Report written to: {args.report}")
+    if args.check and failed:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
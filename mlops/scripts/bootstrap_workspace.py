@@ -0,0 +1,209 @@
+#!/usr/bin/env python3
+"""
+Bootstrap the Azure ML workspace in one command.
+
+Does what create_compute.py, register_dataset.py, register_environment.py
+and run_pipeline.py do one after another, with one credential and one
+MLClient. The independent operations run concurrently:
+
+    create_compute ─────────┐
+    register_dataset ───────┤
+    register_environment ───┼──> submit_pipeline
+    load_pipeline (local) ──┘
+
+The pipeline is submitted only after every operation it depends on has
+succeeded; if one fails, the submission is skipped. A per-operation latency
+report is printed and can be written as JSON with --report.
+
+Settings default to the same environment variables the single scripts use
+(DATASET_FILE, ENV_FILE, PIPELINE_FILE). --fake runs everything against
+fake_ml_client.FakeMLClient, without Azure access.
+
+Examples:
+    python mlops/scripts/bootstrap_workspace.py
+    python mlops/scripts/bootstrap_workspace.py --no_pipeline --report bootstrap_report.json
+    python mlops/scripts/bootstrap_workspace.py --fake
+"""
+
+import argparse
+import json
+import os
+import sys
+import time
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from datetime import datetime
+
+from utils import get_config, get_ml_client
+
+
+class Operation:
+    """One bootstrap step: fn(ml_client, results) -> short result, run after depends_on succeed."""
+
+    def __init__(self, name: str, fn, depends_on=()):
+        self.name = name
+        self.fn = fn
+        self.depends_on = set(depends_on)
+
+
+def build_client(credentials_path: str = "mlops/config/azure_credentials.json"):
+    """The shared MLClient for the configured workspace (see mlops/config)."""
+    get_config(credentials_path).require()
+    return get_ml_client(credentials_file=credentials_path)
+
+
+def default_operations(args) -> list:
+    """The four single scripts as operations, with the pipeline depending on the other three."""
+    from azure.ai.ml import load_data, load_environment, load_job
+    from azure.ai.ml.entities import AmlCompute
+
+    def create_compute(ml_client, results):
+        cluster = AmlCompute(
+            name=args.compute_name,
+            size=args.compute_size,
+            min_instances=0,
+            max_instances=args.max_instances,
+            tier="dedicated"
+        )
+        ml_client.compute.begin_create_or_update(cluster).result()
+        return args.compute_name
+
+    def register_dataset(ml_client, results):
+        asset = ml_client.data.create_or_update(load_data(source=args.dataset_file))
+        return f"{asset.name}:{asset.version}"
+
+    def register_environment(ml_client, results):
+        environment = ml_client.environments.create_or_update(load_environment(source=args.env_file))
+        return f"{environment.name}:{environment.version}"
+
+    def load_pipeline(ml_client, results):
+        # Parsing the pipeline YAML is local work; doing it here overlaps it with the service calls
+        return load_job(source=args.pipeline_file)
+
+    def submit_pipeline(ml_client, results):
+        submitted = ml_client.jobs.create_or_update(results["load_pipeline"])
+        return submitted.name
+
+    operations = [
+        Operation("create_compute", create_compute),
+        Operation("register_dataset", register_dataset),
+        Operation("register_environment", register_environment),
+    ]
+    if not args.no_pipeline:
+        operations.append(Operation("load_pipeline", load_pipeline))
+        operations.append(Operation("submit_pipeline", submit_pipeline,
+                                    depends_on=[op.name for op in operations]))
+    return operations
+
+
+def run_operations(ml_client, operations: list, max_workers: int = 4) -> dict:
+    """Run operations concurrently in dependency order; returns the latency report."""
+    names = {op.name for op in operations}
+    for op in operations:
+        unknown = op.depends_on - names
+        if unknown:
+            raise ValueError(f"Operation '{op.name}' depends on unknown operation(s): {sorted(unknown)}")
+
+    values, report = {}, {}
+    start = time.perf_counter()
+
+    def launch(op):
+        t0 = time.perf_counter()
+        print(f"🚀 [{t0 - start:6.2f}s] {op.name} started", flush=True)
+        try:
+            value = op.fn(ml_client, values)
+            entry = {"status": "succeeded"}
+        except Exception as e:
+            value = None
+            entry = {"status": "failed", "error": f"{type(e).__name__}: {e}"}
+        t1 = time.perf_counter()
+        entry.update({"start_s": round(t0 - start, 3), "end_s": round(t1 - start, 3),
+                      "latency_s": round(t1 - t0, 3)})
+        return op, value, entry
+
+    with ThreadPoolExecutor(max_workers=max_workers) as pool:
+        pending = {}
+        remaining = {op.name: op for op in operations}
+        while remaining or pending:
+            for name, op in list(remaining.items()):
+                if any(report.get(dep, {}).get("status") in ("failed", "skipped") for dep in op.depends_on):
+                    report[name] = {"status": "skipped", "reason": "dependency failed"}
+                    print(f"⏭️  {name} skipped (dependency failed)", flush=True)
+                    del remaining[name]
+                elif all(report.get(dep, {}).get("status") == "succeeded" for dep in op.depends_on):
+                    pending[pool.submit(launch, op)] = name
+                    del remaining[name]
+            if not pending:
+                break
+            finished, _ = wait(pending, return_when=FIRST_COMPLETED)
+            for future in finished:
+                del pending[future]
+                op, value, entry = future.result()
+                values[op.name] = value
+                if entry["status"] == "succeeded" and isinstance(value, str):
+                    entry["result"] = value
+                report[op.name] = entry
+                if entry["status"] == "succeeded":
+                    print(f"✅ [{entry['end_s']:6.2f}s] {op.name} in {entry['latency_s']:.2f}s", flush=True)
+                else:
+                    print(f"❌ [{entry['end_s']:6.2f}s] {op.name} failed: {entry['error']}", flush=True)
+
+    wall = time.perf_counter() - start
+    return {
+        "status": "succeeded" if all(e["status"] == "succeeded" for e in report.values()) else "failed",
+        "timestamp_utc": datetime.utcnow().isoformat() + "Z",
+        "wall_time_s": round(wall, 3),
+        "sum_latency_s": round(sum(e.get("latency_s", 0) for e in report.values()), 3),
+        "operations": {op.name: report[op.name] for op in operations if op.name in report},
+    }
+
+
+def print_report(report: dict):
+    width = max(len(name) for name in report["operations"]) if report["operations"] else 9
+    print(f"\n{'Operation':<{width}}  {'Start':>7}  {'End':>7}  {'Latency':>8}  Status")
+    print("-" * (width + 40))
+    for name, entry in report["operations"].items():
+        if "latency_s" in entry:
+            print(f"{name:<{width}}  {entry['start_s']:6.2f}s  {entry['end_s']:6.2f}s  "
+                  f"{entry['latency_s']:7.2f}s  {entry['status']}")
+        else:
+            print(f"{name:<{width}}  {'-':>7}  {'-':>7}  {'-':>8}  {entry['status']}")
+    print(f"\nWall time: {report['wall_time_s']:.2f}s "
+          f"(sequential would take ~{report['sum_latency_s']:.2f}s)")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Create compute, register assets and submit the pipeline")
+    parser.add_argument("--credentials", default="mlops/config/azure_credentials.json")
+    parser.add_argument("--compute_name", default="cpu-cluster")
+    parser.add_argument("--compute_size", default="Standard_DS11_v2")
+    parser.add_argument("--max_instances", type=int, default=1)
+    parser.add_argument("--dataset_file", default=os.environ.get("DATASET_FILE", "mlops/azureml/train/data.yml"))
+    parser.add_argument("--env_file", default=os.environ.get("ENV_FILE", "mlops/azureml/train/train-env.yml"))
+    parser.add_argument("--pipeline_file",
+                        default=os.environ.get("PIPELINE_FILE", "mlops/azureml/train/newpipeline.yml"))
+    parser.add_argument("--no_pipeline", action="store_true", help="Only prepare the workspace")
+    parser.add_argument("--report", default=None, help="Write the latency report to this JSON file")
+    parser.add_argument("--fake", action="store_true", help="Use the in-memory fake client (no Azure calls)")
+    args = parser.parse_args()
+
+    try:
+        if args.fake:
+            from fake_ml_client import FakeMLClient
+            ml_client = FakeMLClient(latency={"compute": 1.0, "data": 0.3, "environments": 0.5, "jobs": 0.4})
+        else:
+            ml_client = build_client(args.credentials)
+    except Exception as e:
+        print(f"❌ Could not create the ML client: {e}")
+        sys.exit(1)
+
+    report = run_operations(ml_client, default_operations(args))
+    print_report(report)
+    if args.report:
+        with open(args.report, "w", encoding="utf-8") as f:
+            json.dump(report, f, indent=2)
+        print(f"📄 Report written to: {args.report}")
+    sys.exit(0 if report["status"] == "succeeded" else 1)
+
+
+if __name__ == "__main__":
+    main()
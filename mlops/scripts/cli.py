@@ -0,0 +1,72 @@
+#!/usr/bin/env python3
+"""
+Single entry point for the mlops scripts.
+
+Each subcommand runs the main() of one script. Only argparse is imported up
+front; the script module (and with it the Azure SDK, pandas or reportlab) is
+imported when its subcommand runs, so `cli.py --help` and the offline
+commands start without paying for the heavy imports.
+
+Arguments after the subcommand are passed to the script unchanged.
+
+Examples:
+    python mlops/scripts/cli.py --help
+    python mlops/scripts/cli.py submit --sweep train_model.n_estimators=50,100 --fake
+    python mlops/scripts/cli.py run-local mlops/azureml/train/newpipeline.yml --dry_run
+    python mlops/scripts/cli.py review-jobs --max_results 20
+"""
+
+import argparse
+import importlib
+import os
+import sys
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+REPO_ROOT = os.path.abspath(os.path.join(HERE, "..", ".."))
+
+# subcommand -> (module, directory holding it, one-line help)
+COMMANDS = {
+    "bootstrap": ("bootstrap_workspace", HERE, "Create compute, register assets and submit the pipeline"),
+    "compute": ("create_compute", HERE, "Create or update the cpu-cluster compute target"),
+    "dataset": ("register_dataset", HERE, "Register the training dataset"),
+    "environment": ("register_environment", HERE, "Register the training environment"),
+    "submit": ("run_pipeline", HERE, "Submit the pipeline (or a parameter sweep) and track it"),
+    "run-local": ("run_pipeline_local", HERE, "Run a pipeline YAML locally as a DAG of processes"),
+    "review-jobs": ("review_jobs", os.path.join(REPO_ROOT, "ai_reviews"), "Report on the latest workspace jobs"),
+}
+
+
+def build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(prog="cli.py", description="mlops workspace and pipeline commands")
+    subparsers = parser.add_subparsers(dest="command", metavar="<command>")
+    for name, (_, _, help_text) in COMMANDS.items():
+        # add_help=False: --help is forwarded so the script prints its own options
+        subparsers.add_parser(name, help=help_text, add_help=False)
+    return parser
+
+
+def run_command(command: str, argv: list):
+    """Import the command's module and run its main() with argv as the command line."""
+    module_name, directory, _ = COMMANDS[command]
+    if directory not in sys.path:
+        sys.path.insert(0, directory)
+    if HERE not in sys.path:
+        sys.path.insert(0, HERE)
+    module = importlib.import_module(module_name)
+    sys.argv = [f"{os.path.basename(sys.argv[0])} {command}"] + list(argv)
+    return module.main()
+
+
+def main(argv: list = None):
+    argv = sys.argv[1:] if argv is None else list(argv)
+    parser = build_parser()
+    # Only the subcommand is parsed here; everything after it belongs to the script
+    args = parser.parse_args(argv[:1])
+    if args.command is None:
+        parser.print_help()
+        return 2
+    return run_command(args.command, argv[1:])
+
+
+if __name__ == "__main__":
+    sys.exit(main())
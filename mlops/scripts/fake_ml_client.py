@@ -0,0 +1,423 @@
+"""
+In-memory stand-in for azure.ai.ml.MLClient used to exercise workspace
+scripts offline.
+
+The calls the workspace scripts, register.py and review_jobs.py make are
+implemented:
+    compute.begin_create_or_update(entity).result()
+    data / environments / models: create_or_update(asset), get(name, version), list(name)
+                                  (create_or_update of an existing version updates its tags)
+    jobs.create_or_update(job)
+    jobs.validate(job)
+    jobs.get(name)
+    jobs.list(parent_job_name=name)      child steps of a pipeline job
+    jobs.list(max_results=n)             workspace job history, newest first, paged
+                                         (iterate it, or .by_page() like ItemPaged)
+
+Each operation group sleeps for a configurable latency (simulating the
+service round trip, optionally with +/- jitter) and can be told to fail:
+fail={"environments"} fails every write to that group, fail={"jobs.list"}
+fails one method, and fail_rate={"jobs.get": 0.1} fails that share of calls
+(seeded, so runs are repeatable). A group can also be given a limit on
+concurrent requests (max_in_flight); calls over the limit are rejected like
+the service's throttling, with HTTP 429 and a Retry-After header. Every call
+is recorded with its start/end time and thread so tests can check
+concurrency and ordering; submitted jobs are kept in .jobs_by_name.
+
+Submitted jobs move through a status schedule measured from submission,
+e.g. [(0, "Queued"), (0.1, "Running"), (0.4, "Completed")]. Pipeline jobs
+get one child job per step, run one after another while the parent is
+Running. add_job() registers a job with its own schedule, and
+seed_history() fills the workspace with finished pipeline jobs (with
+creation times, start/end properties, inputs and child steps) for the job
+history tools. jobs.list() without a parent returns them one page
+(page_size jobs, one round trip) at a time, like the SDK's pager.
+
+Example:
+    client = FakeMLClient(latency={"compute": 0.5, "data": 0.1}, fail={"environments"},
+                          max_in_flight={"jobs": 2})
+    client.compute.begin_create_or_update(cluster).result()
+    client.calls  # [{"group": "compute", "name": "cpu-cluster", "start": ..., "end": ...}, ...]
+
+    client = FakeMLClient.from_spec("history=1000,latency=0.08,page_size=50")
+    jobs = list(client.jobs.list(max_results=200))  # 4 page round trips
+"""
+
+import itertools
+import random
+import threading
+import time
+from datetime import datetime, timedelta
+from types import SimpleNamespace
+
+from azure.core.exceptions import AzureError, HttpResponseError, ResourceNotFoundError
+
+DEFAULT_LATENCY = 0.05
+DEFAULT_PAGE_SIZE = 50
+RETRY_AFTER_SECONDS = 0.05
+DEFAULT_JOB_SCHEDULE = [(0.0, "Queued"), (0.1, "Running"), (0.4, "Completed")]
+TERMINAL_STATUSES = ("Completed", "Failed", "Canceled")
+
+# Pipelines and steps of the seeded history, with typical run times in seconds
+HISTORY_PIPELINES = {
+    "used-cars-training-pipeline": ["prep_data", "train_model", "register_model"],
+    "used-cars-sweep": ["prep_data", "sweep_step", "register_model"],
+    "batch-scoring": ["score"],
+}
+STEP_SECONDS = {"prep_data": 90, "train_model": 420, "sweep_step": 1500, "register_model": 45, "score": 240}
+
+
+def status_at(schedule: list, elapsed: float) -> str:
+    status = schedule[0][1]
+    for at, value in schedule:
+        if elapsed >= at:
+            status = value
+    return status
+
+
+def step_schedules(steps: list, schedule: list) -> dict:
+    """Run the steps one after another inside the parent's Running window."""
+    times = {value: at for at, value in schedule}
+    begin = times.get("Running", schedule[0][0])
+    end, final = schedule[-1]
+    width = (end - begin) / max(len(steps), 1)
+    schedules = {}
+    for i, step in enumerate(steps):
+        last = i == len(steps) - 1
+        step_final = final if last or final == "Completed" else "Completed"
+        schedules[step] = [(0.0, "NotStarted"), (begin + i * width, "Running"),
+                           (begin + (i + 1) * width, step_final)]
+    return schedules
+
+
+def throttled_error(group: str) -> HttpResponseError:
+    error = HttpResponseError(message=f"TooManyRequests: too many concurrent {group} requests")
+    error.status_code = 429
+    error.response = SimpleNamespace(status_code=429, headers={"Retry-After": str(RETRY_AFTER_SECONDS)})
+    return error
+
+
+def _iso(dt: datetime) -> str:
+    return dt.strftime("%Y-%m-%dT%H:%M:%S.%fZ")
+
+
+class _Poller:
+    def __init__(self, fn):
+        self._fn = fn
+
+    def result(self, timeout=None):
+        return self._fn()
+
+
+class _Pager:
+    """Lazy listing like azure.core's ItemPaged: iterate the items, or by_page() for the pages."""
+
+    def __init__(self, pages):
+        self._pages = pages
+        self._items = None
+
+    def __iter__(self):
+        return self
+
+    def __next__(self):
+        if self._items is None:
+            self._items = itertools.chain.from_iterable(self._pages)
+        return next(self._items)
+
+    def by_page(self):
+        return (iter(page) for page in self._pages)
+
+
+class _Operations:
+    def __init__(self, client, group: str):
+        self._client = client
+        self._group = group
+
+    def create_or_update(self, entity, **kwargs):
+        return self._client._call(self._group, entity)
+
+    def begin_create_or_update(self, entity, **kwargs):
+        # Like the SDK, the long-running call starts now; result() waits for it
+        return _Poller(lambda: self._client._call(self._group, entity))
+
+    def get(self, name: str, version: str = None, **kwargs):
+        if self._group == "jobs":
+            return self._client._query(self._group, "get", name)
+        return self._client._get_asset(self._group, name, version)
+
+    def list(self, parent_job_name: str = None, max_results: int = None, name: str = None, **kwargs):
+        if self._group != "jobs":
+            return self._client._list_assets(self._group, name)
+        if parent_job_name is None:
+            return self._client._list_jobs(max_results)
+        return self._client._query(self._group, "list", parent_job_name)
+
+    def validate(self, entity, **kwargs):
+        return self._client._validate(self._group, entity)
+
+
+class FakeMLClient:
+    """Records calls and simulates per-group latency and failures."""
+
+    def __init__(self, latency: dict = None, fail: set = None, default_latency: float = DEFAULT_LATENCY,
+                 max_in_flight: dict = None, job_schedule: list = None, fail_rate: dict = None,
+                 jitter: float = 0.0, page_size: int = DEFAULT_PAGE_SIZE, seed: int = 0):
+        self.latency = dict(latency or {})
+        self.fail = set(fail or ())
+        self.fail_rate = dict(fail_rate or {})
+        self.default_latency = default_latency
+        self.jitter = jitter
+        self.page_size = page_size
+        self.max_in_flight = dict(max_in_flight or {})
+        self.calls = []
+        self.throttled = []
+        self.jobs_by_name = {}
+        self.assets = {}
+        self.job_schedule = list(job_schedule or DEFAULT_JOB_SCHEDULE)
+        self._jobs = {}
+        self._in_flight = {}
+        self.peak_in_flight = {}
+        self._lock = threading.Lock()
+        self._rng = random.Random(seed)
+        self._job_ids = itertools.count(1)
+        self.compute = _Operations(self, "compute")
+        self.data = _Operations(self, "data")
+        self.environments = _Operations(self, "environments")
+        self.models = _Operations(self, "models")
+        self.jobs = _Operations(self, "jobs")
+
+    @classmethod
+    def from_spec(cls, spec: str) -> "FakeMLClient":
+        """Build from 'history=500,latency=0.05,page_size=50,fail_rate=0.01,jitter=0.2,seed=1'.
+
+        latency applies to every group; fail_rate to jobs.get and jobs.list.
+        Any other value (e.g. "1") gives the defaults with no history.
+        """
+        options = dict(part.split("=", 1) for part in spec.split(",") if "=" in part)
+        rate = float(options.get("fail_rate", 0))
+        client = cls(default_latency=float(options.get("latency", DEFAULT_LATENCY)),
+                     page_size=int(options.get("page_size", DEFAULT_PAGE_SIZE)),
+                     jitter=float(options.get("jitter", 0)), seed=int(options.get("seed", 0)),
+                     fail_rate={"jobs.get": rate, "jobs.list": rate} if rate else None)
+        if int(options.get("history", 0)):
+            client.seed_history(int(options["history"]), seed=int(options.get("seed", 0)))
+        return client
+
+    # -- simulated service round trips ------------------------------------------------
+
+    def _sleep(self, group: str):
+        latency = self.latency.get(group, self.default_latency)
+        if self.jitter:
+            with self._lock:
+                latency *= self._rng.uniform(1 - self.jitter, 1 + self.jitter)
+        time.sleep(latency)
+
+    def _injected(self, group: str, method: str) -> bool:
+        """Whether this call fails: always (fail) or by chance (fail_rate). Call with the lock held."""
+        # A bare group name means its writes; "group.method" means that method
+        keys = {f"{group}.{method}"} | ({group} if method == "create_or_update" else set())
+        if keys & self.fail:
+            return True
+        rate = max(self.fail_rate.get(key, 0) for key in keys)
+        return rate > 0 and self._rng.random() < rate
+
+    def _record(self, group: str, method: str, name, start: float, failed: bool = False):
+        self.calls.append({"group": group, "method": method, "name": name, "start": start,
+                           "end": time.perf_counter(), "thread": threading.current_thread().name,
+                           "failed": failed})
+
+    def _call(self, group: str, entity):
+        name = getattr(entity, "name", None)
+        with self._lock:
+            in_flight = self._in_flight.get(group, 0) + 1
+            if in_flight > self.max_in_flight.get(group, in_flight):
+                self.throttled.append({"group": group, "name": name, "time": time.perf_counter()})
+                raise throttled_error(group)
+            self._in_flight[group] = in_flight
+            self.peak_in_flight[group] = max(self.peak_in_flight.get(group, 0), in_flight)
+        start = time.perf_counter()
+        try:
+            self._sleep(group)
+        finally:
+            with self._lock:
+                self._in_flight[group] -= 1
+        with self._lock:
+            failed = self._injected(group, "create_or_update")
+            self._record(group, "create_or_update", name, start, failed)
+            if failed:
+                raise AzureError(f"Injected failure for {group} '{name}'")
+            if group == "jobs":
+                job = SimpleNamespace(name=f"fake_job_{next(self._job_ids)}",
+                                      display_name=getattr(entity, "display_name", None) or name,
+                                      status="Running", studio_url=None, entity=entity)
+                self.jobs_by_name[job.name] = job
+                steps = list(getattr(entity, "jobs", None) or {})
+                self._add_job_locked(job.name, self.job_schedule, step_schedules(steps, self.job_schedule),
+                                     display_name=job.display_name,
+                                     experiment_name=getattr(entity, "experiment_name", None),
+                                     inputs=dict(getattr(entity, "inputs", None) or {}))
+                return job
+            versions = self.assets.setdefault((group, name), [])
+            version = getattr(entity, "version", None)
+            existing = [a for a in versions if version is not None and a.version == str(version)]
+            if existing:
+                # Like the service, writing an existing version only updates its tags and description
+                existing[0].tags = dict(getattr(entity, "tags", None) or {})
+                existing[0].description = getattr(entity, "description", None)
+                return existing[0]
+            asset = SimpleNamespace(name=name, version=str(len(versions) + 1), provisioning_state="Succeeded",
+                                    path=getattr(entity, "path", None), tags=dict(getattr(entity, "tags", None) or {}),
+                                    description=getattr(entity, "description", None),
+                                    creation_context=SimpleNamespace(created_at=datetime.utcnow()))
+            versions.append(asset)
+            return asset
+
+    def _validate(self, group: str, entity):
+        start = time.perf_counter()
+        self._sleep(group)
+        with self._lock:
+            failed = self._injected(group, "validate")
+            self._record(group, "validate", getattr(entity, "name", None), start, failed)
+        errors = {"jobs": f"Injected validation failure for '{getattr(entity, 'name', None)}'"} if failed else {}
+        return SimpleNamespace(passed=not failed, error_messages=errors)
+
+    def _get_asset(self, group: str, name: str, version: str = None):
+        start = time.perf_counter()
+        self._sleep(group)
+        with self._lock:
+            failed = self._injected(group, "get")
+            self._record(group, "get", name, start, failed)
+            if failed:
+                raise AzureError(f"Injected failure for {group}.get '{name}'")
+            versions = self.assets.get((group, name), [])
+            found = [a for a in versions if version is None or a.version == str(version)]
+            if not found:
+                raise ResourceNotFoundError(f"{group} '{name}' version {version} not found")
+            return found[-1]
+
+    def _list_assets(self, group: str, name: str = None):
+        start = time.perf_counter()
+        self._sleep(group)
+        with self._lock:
+            self._record(group, "list", name, start)
+            if name is not None:
+                return list(self.assets.get((group, name), []))
+            return [versions[-1] for (g, _), versions in self.assets.items() if g == group and versions]
+
+    # -- jobs ---------------------------------------------------------------------------
+
+    def add_job(self, name: str, schedule: list = None, steps: dict = None):
+        """Register an existing job with a status schedule (and optional {step: schedule})."""
+        with self._lock:
+            self._add_job_locked(name, list(schedule or self.job_schedule), steps or {})
+
+    def _add_job_locked(self, name: str, schedule: list, steps: dict, **fields):
+        self._jobs[name] = {"start": time.perf_counter(), "created_at": datetime.utcnow(), "schedule": schedule,
+                            "steps": steps, "children": [], "parent": None, "properties": {},
+                            "display_name": name, "experiment_name": None, "inputs": {}, "type": "pipeline"}
+        self._jobs[name].update({k: v for k, v in fields.items() if v is not None})
+
+    def seed_history(self, count: int, start: datetime = None, interval_s: float = 3600.0,
+                     failure_rate: float = 0.1, seed: int = 0) -> list:
+        """Add count finished pipeline jobs (oldest first, interval_s apart); returns their names."""
+        rng = random.Random(seed)
+        start = start or datetime.utcnow() - timedelta(seconds=(count + 1) * interval_s)
+        pipelines = list(HISTORY_PIPELINES)
+        names = []
+        with self._lock:
+            long_ago = time.perf_counter() - 10 ** 6
+            for i in range(count):
+                display_name = pipelines[i % len(pipelines)]
+                steps = HISTORY_PIPELINES[display_name]
+                name = f"hist_{i:06d}_{rng.getrandbits(24):06x}"
+                created = start + timedelta(seconds=i * interval_s)
+                failed_step = rng.randrange(len(steps)) if rng.random() < failure_rate else None
+                clock = created + timedelta(seconds=rng.uniform(5, 120))  # queued before the first step
+                began = clock
+                children = []
+                for index, step in enumerate(steps):
+                    if failed_step is not None and index > failed_step:
+                        status = "Canceled"
+                        step_start, step_end = clock, clock
+                    else:
+                        status = "Failed" if index == failed_step else "Completed"
+                        step_start = clock + timedelta(seconds=rng.uniform(1, 20))
+                        step_end = step_start + timedelta(seconds=STEP_SECONDS[step] * rng.lognormvariate(0, 0.3))
+                        clock = step_end
+                    child = f"{name}_{step}"
+                    self._jobs[child] = {
+                        "start": long_ago, "created_at": created, "schedule": [(0.0, status)], "steps": {},
+                        "children": [], "parent": name, "display_name": step, "experiment_name": display_name,
+                        "inputs": {}, "type": "command", "modified_at": step_end,
+                        "properties": {"start_time": _iso(step_start), "end_time": _iso(step_end)},
+                    }
+                    children.append(child)
+                status = "Failed" if failed_step is not None else "Completed"
+                self._jobs[name] = {
+                    "start": long_ago, "created_at": created, "schedule": [(0.0, status)], "steps": {},
+                    "children": children, "parent": None, "display_name": display_name,
+                    "experiment_name": display_name, "type": "pipeline", "modified_at": clock,
+                    "inputs": {"raw_data": SimpleNamespace(path="azureml:used-cars-data:1", type="uri_file")},
+                    "properties": {"start_time": _iso(began), "end_time": _iso(clock)},
+                }
+                names.append(name)
+        return names
+
+    def _job_view(self, name: str, job: dict, now: float):
+        elapsed = now - job["start"]
+        status = status_at(job["schedule"], elapsed)
+        modified = job.get("modified_at")
+        if modified is None:
+            changed = max((at for at, _ in job["schedule"] if at <= elapsed), default=0.0)
+            modified = job["created_at"] + timedelta(seconds=changed)
+        return SimpleNamespace(
+            name=name, display_name=job["display_name"], status=status, type=job["type"],
+            experiment_name=job["experiment_name"], inputs=dict(job["inputs"]), tags={},
+            properties=dict(job["properties"]) if status in TERMINAL_STATUSES else {},
+            creation_context=SimpleNamespace(created_at=job["created_at"], last_modified_at=modified),
+            studio_url=None)
+
+    def _query(self, group: str, method: str, name: str):
+        start = time.perf_counter()
+        self._sleep(group)
+        with self._lock:
+            failed = self._injected(group, method)
+            self._record(group, method, name, start, failed)
+            if failed:
+                raise AzureError(f"Injected failure for {group}.{method} '{name}'")
+            if name not in self._jobs:
+                raise ResourceNotFoundError(f"Job '{name}' not found")
+            job = self._jobs[name]
+            now = time.perf_counter()
+            if method == "get":
+                return self._job_view(name, job, now)
+            if job["children"]:
+                return [self._job_view(child, self._jobs[child], now) for child in job["children"]]
+            elapsed = now - job["start"]
+            return [SimpleNamespace(name=f"{name}_{step}", display_name=step, status=status_at(schedule, elapsed))
+                    for step, schedule in job["steps"].items()]
+
+    def _list_jobs(self, max_results: int = None):
+        """Top-level jobs, newest first, fetched lazily one page (one round trip) at a time."""
+        return _Pager(self._job_pages(max_results))
+
+    def _job_pages(self, max_results: int = None):
+        with self._lock:
+            names = sorted((n for n, job in self._jobs.items() if job["parent"] is None),
+                           key=lambda n: self._jobs[n]["created_at"], reverse=True)
+        if max_results is not None:
+            names = names[:max_results]
+        for offset in range(0, max(len(names), 1), self.page_size):
+            start = time.perf_counter()
+            self._sleep("jobs")
+            with self._lock:
+                failed = self._injected("jobs", "list")
+                self._record("jobs", "list_page", offset // self.page_size, start, failed)
+                if failed:
+                    raise AzureError(f"Injected failure for jobs.list page {offset // self.page_size}")
+                now = time.perf_counter()
+                page = [self._job_view(n, self._jobs[n], now) for n in names[offset:offset + self.page_size]]
+            yield page
+
+    def calls_for(self, group: str, method: str = None) -> list:
+        return [c for c in self.calls if c["group"] == group and (method is None or c.get("method") == method)]
@@ -1,44 +1,428 @@
-from azure.identity import DefaultAzureCredential
-from azure.ai.ml import MLClient, load_job
-from azure.core.exceptions import AzureError
+#!/usr/bin/env python3
+"""
+Submit the training pipeline to Azure ML.
+
+By default submits PIPELINE_FILE once. With --sweep, expands a parameter grid
+into pipeline job variants and submits them concurrently (asyncio, at most
+--concurrency in flight). Submissions that are throttled (HTTP 429/503) are
+retried with exponential backoff, honouring Retry-After when the service
+sends it. All submitted job names are gathered into one manifest file.
+
+With --wait, the submitted jobs are tracked until they finish; --track NAME
+and --track_manifest FILE track jobs submitted earlier. Each round reads the
+statuses of all active jobs from the first page of the workspace job listing
+(newest first, where freshly submitted jobs are); only jobs not on that page
+are fetched one by one. A pipeline's child steps are listed only in the
+rounds its own status changes. The interval starts at --poll_min, grows
+geometrically up to --poll_max while nothing changes and drops back to
+--poll_min on any job or step status change. Changes are printed as they are
+seen. Exit code: 0 if every job Completed, 1 if any failed or was canceled,
+2 on --timeout.
+
+Sweep parameters:
+    STEP.INPUT=v1,v2   input of one pipeline step (jobs.STEP.inputs.INPUT)
+    INPUT=v1,v2        pipeline-level input (inputs.INPUT)
+    inputs.X.path=...  full keys (starting with inputs. or jobs.) are used as
+                       given, e.g. to change a data input's path but keep its type
+
+Inputs are checked before anything is submitted: they must be declared by
+the pipeline or by the step's component (found as a local YAML, like
+run_pipeline_local.py does). In newpipeline.yml, train_model takes
+n_estimators and max_depth (either one trains a random forest).
+
+Examples:
+    python mlops/scripts/run_pipeline.py
+    python mlops/scripts/run_pipeline.py --sweep train_model.n_estimators=50,100,200 \
+        --sweep train_model.max_depth=5,10 --concurrency 3 --manifest sweep_manifest.json
+    python mlops/scripts/run_pipeline.py \
+        --sweep inputs.training_data.path=azureml:used_cars_raw:1,azureml:used_cars_raw:2
+    python mlops/scripts/run_pipeline.py --wait --poll_min 5 --poll_max 60 --timeout 7200
+    python mlops/scripts/run_pipeline.py --track_manifest sweep_manifest.json
+    python mlops/scripts/run_pipeline.py --sweep train_model.n_estimators=50,100 --fake --wait --poll_min 0.2
+"""
+
+import argparse
+import asyncio
+import functools
+import itertools
+import json
 import os
+import random
 import sys
-from utils import load_credentials
-
-# Load credentials from JSON file
-load_credentials()
-
-# Check for required environment variables
-required = ["AZURE_SUBSCRIPTION_ID", "RESOURCE_GROUP", "WORKSPACE_NAME"]
-for var in required:
-    if not os.environ.get(var):
-        raise ValueError(f"Missing environment variable: {var}")
-
-credential = DefaultAzureCredential()
-
-subscription_id = os.environ["AZURE_SUBSCRIPTION_ID"]
-resource_group = os.environ["RESOURCE_GROUP"]
-workspace_name = os.environ["WORKSPACE_NAME"]
-
-try:
-    ml_client = MLClient(
-        credential=credential,
-        subscription_id=subscription_id,
-        resource_group_name=resource_group,
-        workspace_name=workspace_name
-    )
-
-    pipeline_file = os.environ.get("PIPELINE_FILE", "mlops/azureml/train/newpipeline.yml")
-    job_name = os.environ.get("JOB_NAME", "mlops-pipeline")
-
-    # Load the job from YAML file
-    job = load_job(source=pipeline_file)
-    submitted_job = ml_client.jobs.create_or_update(job)
-    print(f"✅ Pipeline job '{job_name}' submitted successfully")
-    print(f"Job name: {submitted_job.name}")
-except AzureError as e:
-    print(f"❌ Azure API error: {e}")
-    sys.exit(1)
-except Exception as e:
-    print(f"❌ Unexpected error: {e}")
-    sys.exit(1)
+import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+
+import yaml
+
+THROTTLE_STATUS = {429, 503}
+TERMINAL_STATUS = {"Completed", "Failed", "Canceled", "NotResponding"}
+# Statuses in which a pipeline's child steps are worth listing
+STEP_STATUS = {"Running", "Finalizing", "CancelRequested"}
+EXIT_TIMEOUT = 2
+# Components referenced as azureml:NAME:VERSION are looked up here too (see declared_inputs)
+REPO_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), "..", ".."))
+
+
+def parse_grid(items: list) -> dict:
+    """['train_model.n_estimators=50,100', ...] -> {'train_model.n_estimators': [50, 100], ...}"""
+    grid = {}
+    for item in items or []:
+        if "=" not in item:
+            raise ValueError(f"Expected NAME=v1,v2,..., got: {item}")
+        name, values = item.split("=", 1)
+        grid[name.strip()] = [yaml.safe_load(v.strip()) for v in values.split(",") if v.strip()]
+        if not grid[name.strip()]:
+            raise ValueError(f"No values given for {name}")
+    return grid
+
+
+def expand_grid(grid: dict) -> list:
+    """Cartesian product of the grid as a list of {name: value} dicts."""
+    names = list(grid)
+    return [dict(zip(names, values)) for values in itertools.product(*(grid[n] for n in names))]
+
+
+def override_key(name: str) -> str:
+    if name.startswith(("jobs.", "inputs.")):
+        return name
+    if "." in name:
+        step, input_name = name.split(".", 1)
+        return f"jobs.{step}.inputs.{input_name}"
+    return f"inputs.{name}"
+
+
+@functools.lru_cache(maxsize=None)
+def declared_inputs(pipeline_file: str, step: str = None) -> frozenset:
+    """Input names of the pipeline, or of one step's component (resolved like run_pipeline_local.py)."""
+    from run_pipeline_local import PipelineError, Step, load_yaml
+
+    pipeline = load_yaml(pipeline_file)
+    if step is None:
+        return frozenset(pipeline.get("inputs") or {})
+    jobs = pipeline.get("jobs") or {}
+    if step not in jobs:
+        raise ValueError(f"The pipeline has no step '{step}' (steps: {', '.join(jobs)})")
+    pipeline_dir = os.path.dirname(os.path.abspath(pipeline_file))
+    search_dirs = [pipeline_dir, REPO_ROOT, os.getcwd()]
+    try:
+        return frozenset(Step(step, jobs[step], pipeline_dir, search_dirs).component.get("inputs") or {})
+    except PipelineError as e:
+        raise ValueError(f"Cannot check the inputs of step '{step}': {e}") from None
+
+
+def check_overrides(pipeline_file: str, names) -> None:
+    """Raise ValueError for a sweep parameter that is not a declared input of the pipeline or its step."""
+    for name in names:
+        parts = override_key(name).split(".")
+        if parts[0] == "inputs":
+            step, input_name = None, parts[1]
+        elif len(parts) >= 4 and parts[2] == "inputs":
+            step, input_name = parts[1], parts[3]
+        else:
+            continue  # other job settings, e.g. jobs.STEP.compute
+        declared = declared_inputs(pipeline_file, step)
+        if input_name not in declared:
+            owner = f"step '{step}'" if step else "the pipeline"
+            raise ValueError(f"'{name}': {owner} has no input '{input_name}' "
+                             f"(declared: {', '.join(sorted(declared)) or 'none'})")
+
+
+def load_variant(pipeline_file: str, params: dict, index: int, job_name: str):
+    """Load the pipeline YAML with the variant's parameters applied."""
+    from azure.ai.ml import load_job
+
+    check_overrides(pipeline_file, params)
+    suffix = "-".join(f"{name.split('.')[-1]}{value}" for name, value in params.items())
+    override = {override_key(name): value for name, value in params.items()}
+    override["display_name"] = f"{job_name}-{index:03d}-{suffix}"
+    override["tags"] = {name: str(value) for name, value in params.items()}
+    return load_job(source=pipeline_file, params_override=[override])
+
+
+def is_throttled(error: Exception) -> bool:
+    status = getattr(error, "status_code", None)
+    return status in THROTTLE_STATUS or "TooManyRequests" in str(error)
+
+
+def retry_after_seconds(error: Exception):
+    response = getattr(error, "response", None)
+    headers = getattr(response, "headers", None) or {}
+    try:
+        return float(headers.get("Retry-After"))
+    except (TypeError, ValueError):
+        return None
+
+
+async def submit_variant(ml_client, pipeline_file: str, params: dict, index: int, job_name: str,
+                         semaphore: asyncio.Semaphore, max_retries: int, backoff: float) -> dict:
+    """Submit one variant, retrying throttled calls; returns its manifest entry."""
+    entry = {"index": index, "params": params, "attempts": 0}
+    start = time.perf_counter()
+    try:
+        job = await asyncio.to_thread(load_variant, pipeline_file, params, index, job_name)
+    except Exception as e:
+        entry.update({"status": "failed", "error": f"Could not load variant: {e}"})
+        return entry
+    entry["display_name"] = job.display_name
+
+    async with semaphore:
+        while True:
+            entry["attempts"] += 1
+            try:
+                submitted = await asyncio.to_thread(ml_client.jobs.create_or_update, job)
+                entry.update({"status": "submitted", "job_name": submitted.name})
+                print(f"✅ [{index:03d}] {params} -> {submitted.name}", flush=True)
+                break
+            except Exception as e:
+                if not is_throttled(e) or entry["attempts"] > max_retries:
+                    entry.update({"status": "failed", "error": f"{type(e).__name__}: {e}"})
+                    print(f"❌ [{index:03d}] {params}: {e}", flush=True)
+                    break
+                delay = retry_after_seconds(e)
+                if delay is None:
+                    delay = backoff * 2 ** (entry["attempts"] - 1) * (1 + random.random())
+                print(f"[WARN] [{index:03d}] throttled, retrying in {delay:.2f}s "
+                      f"(attempt {entry['attempts']}/{max_retries})", flush=True)
+                await asyncio.sleep(delay)
+    entry["latency_s"] = round(time.perf_counter() - start, 3)
+    return entry
+
+
+async def submit_sweep(ml_client, pipeline_file: str, variants: list, job_name: str = "mlops-pipeline",
+                       concurrency: int = 4, max_retries: int = 5, backoff: float = 1.0) -> list:
+    """Submit every variant with at most `concurrency` submissions in flight."""
+    semaphore = asyncio.Semaphore(concurrency)
+    tasks = [submit_variant(ml_client, pipeline_file, params, i, job_name, semaphore, max_retries, backoff)
+             for i, params in enumerate(variants)]
+    return await asyncio.gather(*tasks)
+
+
+def write_manifest(path: str, pipeline_file: str, grid: dict, entries: list, wall_time_s: float) -> dict:
+    manifest = {
+        "pipeline_file": pipeline_file,
+        "timestamp_utc": datetime.utcnow().isoformat() + "Z",
+        "grid": grid,
+        "wall_time_s": round(wall_time_s, 3),
+        "submitted": sum(1 for e in entries if e["status"] == "submitted"),
+        "failed": sum(1 for e in entries if e["status"] != "submitted"),
+        "job_names": [e["job_name"] for e in entries if e.get("job_name")],
+        "variants": entries,
+    }
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(manifest, f, indent=2, default=str)
+    return manifest
+
+
+def list_statuses(ml_client, names, max_pages: int = 1) -> tuple:
+    """({name: status} for the names seen in the job listing, pages read).
+
+    The listing is newest first and read a page (one API call) at a time,
+    stopping once every name is found or after max_pages pages.
+    """
+    wanted, found, pages = set(names), {}, 0
+    for page in ml_client.jobs.list().by_page():
+        pages += 1
+        for job in page:
+            if job.name in wanted:
+                found[job.name] = job.status
+        if len(found) == len(wanted) or pages >= max_pages:
+            break
+    return found, pages
+
+
+def _safe_get(ml_client, name: str):
+    try:
+        return ml_client.jobs.get(name).status
+    except Exception as e:
+        print(f"[WARN] Could not query {name}: {e}", flush=True)
+        return None
+
+
+def _safe_steps(ml_client, name: str):
+    try:
+        return {child.display_name or child.name: child.status
+                for child in ml_client.jobs.list(parent_job_name=name)}
+    except Exception as e:
+        print(f"[WARN] Could not list the steps of {name}: {e}", flush=True)
+        return None
+
+
+def track_jobs(ml_client, names: list, poll_min: float = 5.0, poll_max: float = 60.0, factor: float = 2.0,
+               timeout: float = None, with_steps: bool = True, max_workers: int = 8,
+               sleep=time.sleep, clock=time.monotonic) -> dict:
+    """Poll jobs until all are terminal (or timeout), printing job and step status changes.
+
+    Steps are listed when a pipeline's status changes to a running or
+    terminal one, so the final step states are seen.
+    """
+    last = {name: None for name in names}
+    last_steps = {name: {} for name in names}
+    finished_at = {}
+    active = list(names)
+    interval = poll_min
+    polls, api_calls = 0, 0
+    start = clock()
+
+    with ThreadPoolExecutor(max_workers=max(1, min(max_workers, len(names)))) as pool:
+        while active:
+            polls += 1
+            try:
+                statuses, pages = list_statuses(ml_client, active)
+            except Exception as e:
+                print(f"[WARN] Could not list jobs: {e}", flush=True)
+                statuses, pages = {}, 1
+            api_calls += pages
+            missing = [name for name in active if name not in statuses]
+            statuses.update(zip(missing, pool.map(lambda n: _safe_get(ml_client, n), missing)))
+            api_calls += len(missing)
+            moved = [name for name in active if statuses[name] is not None and statuses[name] != last[name]
+                     and statuses[name] in STEP_STATUS | TERMINAL_STATUS] if with_steps else []
+            steps_by_job = dict(zip(moved, pool.map(lambda n: _safe_steps(ml_client, n), moved)))
+            api_calls += len(moved)
+
+            changed = False
+            for name in list(active):
+                status, steps = statuses[name], steps_by_job.get(name)
+                for step, step_status in (steps or {}).items():
+                    if last_steps[name].get(step) != step_status:
+                        print(f"   [{clock() - start:7.1f}s] {name} / {step}: {step_status}", flush=True)
+                        last_steps[name][step] = step_status
+                        changed = True
+                if status is not None and status != last[name]:
+                    icon = {"Completed": "✅", "Failed": "❌", "Canceled": "⛔"}.get(status, "🔄")
+                    print(f"{icon} [{clock() - start:7.1f}s] {name}: {status}", flush=True)
+                    last[name] = status
+                    changed = True
+                if status in TERMINAL_STATUS:
+                    active.remove(name)
+                    finished_at[name] = round(clock() - start, 3)
+            if not active:
+                break
+            if timeout is not None and clock() - start + interval > timeout:
+                for name in active:
+                    last[name] = f"TimedOut({last[name]})"
+                break
+            # Back off while nothing moves; react quickly again once something does
+            interval = poll_min if changed else min(interval * factor, poll_max)
+            sleep(interval)
+
+    return {
+        "jobs": {name: {"status": last[name], "steps": last_steps[name], "finished_s": finished_at.get(name)}
+                 for name in names},
+        "polls": polls,
+        "api_calls": api_calls,
+        "elapsed_s": round(clock() - start, 3),
+    }
+
+
+def tracking_exit_code(result: dict) -> int:
+    statuses = [job["status"] for job in result["jobs"].values()]
+    if all(status == "Completed" for status in statuses):
+        return 0
+    if any(status in ("Failed", "Canceled", "NotResponding") for status in statuses):
+        return 1
+    return EXIT_TIMEOUT
+
+
+def get_client(fake: bool):
+    if fake:
+        from fake_ml_client import FakeMLClient
+        return FakeMLClient(latency={"jobs": 0.1},
+                            job_schedule=[(0.0, "Queued"), (1.0, "Running"), (4.0, "Completed")])
+    from bootstrap_workspace import build_client
+    return build_client()
+
+
+def wait_for_jobs(ml_client, names: list, args) -> int:
+    """Track jobs with the --poll_*/--timeout settings; returns the exit code."""
+    print(f"⏳ Tracking {len(names)} job(s): poll {args.poll_min:g}s..{args.poll_max:g}s", flush=True)
+    result = track_jobs(ml_client, names, args.poll_min, args.poll_max, timeout=args.timeout,
+                        with_steps=not args.no_steps)
+    code = tracking_exit_code(result)
+    print(f"🏁 {sum(j['status'] == 'Completed' for j in result['jobs'].values())}/{len(names)} completed "
+          f"in {result['elapsed_s']:.1f}s ({result['polls']} poll round(s), {result['api_calls']} API call(s))")
+    for name, job in result["jobs"].items():
+        if job["status"] != "Completed":
+            print(f"❌ {name}: {job['status']}")
+    return code
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Submit the training pipeline (optionally as a parameter sweep)")
+    parser.add_argument("--pipeline_file",
+                        default=os.environ.get("PIPELINE_FILE", "mlops/azureml/train/newpipeline.yml"))
+    parser.add_argument("--job_name", default=os.environ.get("JOB_NAME", "mlops-pipeline"))
+    parser.add_argument("--sweep", action="append", help="NAME=v1,v2,... (repeatable; grid is the product)")
+    parser.add_argument("--concurrency", type=int, default=4, help="Maximum submissions in flight")
+    parser.add_argument("--max_retries", type=int, default=5, help="Retries per throttled submission")
+    parser.add_argument("--backoff", type=float, default=1.0, help="Base backoff in seconds (doubles per retry)")
+    parser.add_argument("--manifest", default=None, help="Sweep manifest path (default: sweep_manifest_<ts>.json)")
+    parser.add_argument("--wait", action="store_true", help="Track the submitted job(s) until they finish")
+    parser.add_argument("--track", action="append", help="Track an already submitted job (repeatable)")
+    parser.add_argument("--track_manifest", default=None, help="Track every job in a sweep manifest")
+    parser.add_argument("--poll_min", type=float, default=5.0, help="Shortest polling interval in seconds")
+    parser.add_argument("--poll_max", type=float, default=60.0, help="Longest polling interval in seconds")
+    parser.add_argument("--timeout", type=float, default=None, help="Give up tracking after this many seconds")
+    parser.add_argument("--no_steps", action="store_true", help="Do not list pipeline step statuses")
+    parser.add_argument("--fake", action="store_true", help="Submit to the in-memory fake client")
+    args = parser.parse_args()
+
+    try:
+        ml_client = get_client(args.fake)
+    except Exception as e:
+        print(f"❌ Could not create the ML client: {e}")
+        sys.exit(1)
+
+    if args.track or args.track_manifest:
+        names = list(args.track or [])
+        if args.track_manifest:
+            with open(args.track_manifest, "r", encoding="utf-8") as f:
+                names += json.load(f)["job_names"]
+        if args.fake:
+            for name in names:
+                ml_client.add_job(name)
+        sys.exit(wait_for_jobs(ml_client, names, args))
+
+    if not args.sweep:
+        from azure.ai.ml import load_job
+        from azure.core.exceptions import AzureError
+
+        try:
+            job = load_job(source=args.pipeline_file)
+            submitted_job = ml_client.jobs.create_or_update(job)
+            print(f"✅ Pipeline job '{args.job_name}' submitted successfully")
+            print(f"Job name: {submitted_job.name}")
+        except AzureError as e:
+            print(f"❌ Azure API error: {e}")
+            sys.exit(1)
+        except Exception as e:
+            print(f"❌ Unexpected error: {e}")
+            sys.exit(1)
+        if args.wait:
+            sys.exit(wait_for_jobs(ml_client, [submitted_job.name], args))
+        return
+
+    try:
+        grid = parse_grid(args.sweep)
+        check_overrides(args.pipeline_file, grid)
+    except ValueError as e:
+        print(f"❌ {e}")
+        sys.exit(1)
+    variants = expand_grid(grid)
+    print(f"🚀 Submitting {len(variants)} variant(s), at most {args.concurrency} at a time", flush=True)
+    start = time.perf_counter()
+    entries = asyncio.run(submit_sweep(ml_client, args.pipeline_file, variants, args.job_name,
+                                       args.concurrency, args.max_retries, args.backoff))
+    manifest_path = args.manifest or f"sweep_manifest_{datetime.now().strftime('%Y%m%d_%H%M%S')}.json"
+    manifest = write_manifest(manifest_path, args.pipeline_file, grid, entries, time.perf_counter() - start)
+    print(f"🏁 Submitted {manifest['submitted']}/{len(variants)} in {manifest['wall_time_s']:.2f}s; "
+          f"manifest: {manifest_path}")
+    code = 0 if manifest["failed"] == 0 else 1
+    if args.wait and manifest["job_names"]:
+        code = max(code, wait_for_jobs(ml_client, manifest["job_names"], args))
+    sys.exit(code)
+
+
+if __name__ == "__main__":
+    main()
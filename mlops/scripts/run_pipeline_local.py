@@ -0,0 +1,450 @@
+#!/usr/bin/env python3
+"""
+Run an Azure ML pipeline YAML locally, without submitting to a cluster.
+
+Parses the pipeline and its command components, resolves
+${{parent.inputs.*}}, ${{parent.outputs.*}}, ${{parent.jobs.<step>.outputs.*}}
+(or ${{jobs.<step>.outputs.*}}) and the components' ${{inputs.*}} /
+${{outputs.*}} bindings to local folders, then runs every step's command as
+a subprocess in the component's code folder. Steps whose inputs are ready run
+concurrently; a failed step skips only the steps that depend on it. A per-step
+timeline with durations is printed and written to timeline.json.
+
+Step results are cached (see step_cache.py): a step whose code (the
+scripts its command runs and the local modules they import), environment
+spec, input contents and parameters match an earlier run gets that run's
+outputs copied in instead of being executed again. Steps with side effects
+always run: components marked is_deterministic: false (like the register
+components) and steps without outputs. The summary lists the reused steps
+and the time they saved. Use --no_cache to always run every step.
+
+Registered components (component: azureml:<name>:<version>) are resolved to
+component YAML files with the same name found next to the pipeline, in
+--components_dir folders, or anywhere in the repository. Registered data
+assets have no local copy, so pass them with --set <input>=<local path>.
+
+Examples:
+    python mlops/scripts/run_pipeline_local.py github_workflows/newpipeline.yml
+    python mlops/scripts/run_pipeline_local.py mlops/azureml/train/newpipeline.yml \
+        --set training_data=mlops/azureml/train/data/used_cars_raw.csv --max_parallel 4
+    python mlops/scripts/run_pipeline_local.py github_workflows/newpipeline.yml --cache_max_mb 512
+"""
+
+import argparse
+import json
+import os
+import re
+import shlex
+import subprocess
+import sys
+import time
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from datetime import datetime
+
+try:
+    import yaml
+except ImportError:
+    print("❌ PyYAML is not installed.")
+    print("Please install it with: pip install pyyaml")
+    sys.exit(1)
+
+from step_cache import SKIP_DIRS, StepCache, uncacheable_reason
+
+PARENT_BINDING = re.compile(
+    r"\$\{\{\s*(?:parent\.)?(?:(inputs|outputs)|jobs\.([\w-]+)\.outputs)\.([\w-]+)\s*\}\}")
+COMMAND_BINDING = re.compile(r"\$\{\{\s*(inputs|outputs)\.([\w-]+)\s*\}\}")
+OPTIONAL_BLOCK = re.compile(r"\$\[\[(.*?)\]\]", re.DOTALL)
+
+
+class PipelineError(Exception):
+    """Raised when a pipeline cannot be resolved for local execution."""
+
+
+def load_yaml(path: str) -> dict:
+    with open(path, "r", encoding="utf-8") as f:
+        content = yaml.safe_load(f)
+    if not isinstance(content, dict):
+        raise PipelineError(f"Not a YAML mapping: {path}")
+    return content
+
+
+def find_component(reference: str, base_dir: str, search_dirs: list) -> str:
+    """Resolve a component reference (local path or azureml:name[:version|@label]) to a YAML file."""
+    if not reference.startswith("azureml:"):
+        path = os.path.normpath(os.path.join(base_dir, reference.replace("file:", "", 1)))
+        if not os.path.isfile(path):
+            raise PipelineError(f"Component file not found: {path}")
+        return path
+
+    name, _, version = reference[len("azureml:"):].partition(":")
+    name = name.split("@", 1)[0]
+    for directory in search_dirs:
+        for root, dirs, files in os.walk(directory):
+            dirs[:] = [d for d in dirs if d not in SKIP_DIRS]
+            for file in sorted(files):
+                if not file.endswith((".yml", ".yaml")):
+                    continue
+                path = os.path.join(root, file)
+                try:
+                    content = load_yaml(path)
+                except Exception:
+                    continue
+                if content.get("name") != name or "command" not in content:
+                    continue
+                if version and "version" in content and str(content["version"]) != version:
+                    continue
+                return path
+    raise PipelineError(f"No local component YAML found for {reference}")
+
+
+class Step:
+    """One pipeline job resolved to a local command component."""
+
+    def __init__(self, name: str, job: dict, pipeline_dir: str, search_dirs: list):
+        self.name = name
+        self.job = job
+        if "component" in job:
+            self.component_path = find_component(str(job["component"]), pipeline_dir, search_dirs)
+            self.component = load_yaml(self.component_path)
+        else:
+            # Inline command job: the job itself carries command/code
+            self.component_path = None
+            self.component = job
+        if job.get("type", self.component.get("type", "command")) != "command":
+            raise PipelineError(f"Step '{name}': only command steps can run locally")
+        if "command" not in self.component:
+            raise PipelineError(f"Step '{name}': component has no command")
+
+        component_dir = os.path.dirname(self.component_path) if self.component_path else pipeline_dir
+        self.code_dir = os.path.normpath(os.path.join(component_dir, str(self.component.get("code", "."))))
+        self.depends_on = set()
+        for value in (job.get("inputs") or {}).values():
+            for match in PARENT_BINDING.finditer(str(value)):
+                if match.group(2):
+                    self.depends_on.add(match.group(2))
+
+
+def resolve_pipeline_inputs(pipeline: dict, pipeline_dir: str, overrides: dict) -> dict:
+    """Local value of every pipeline-level input (paths made absolute)."""
+    values = {}
+    for name, spec in (pipeline.get("inputs") or {}).items():
+        if name in overrides:
+            value = overrides[name]
+        elif isinstance(spec, dict):
+            value = spec.get("path", spec.get("default", spec.get("value")))
+        else:
+            value = spec
+        if value is None:
+            continue
+        value = str(value)
+        if value.startswith("azureml:") or value.startswith("azureml://"):
+            values[name] = None  # registered asset; needs --set
+            continue
+        candidate = os.path.join(pipeline_dir, value)
+        if not os.path.isabs(value) and os.path.exists(candidate):
+            value = os.path.normpath(candidate)
+        elif os.path.exists(value):
+            # Paths written relative to the repository root
+            value = os.path.abspath(value)
+        values[name] = value
+    for name, value in overrides.items():
+        values.setdefault(name, value)
+    return values
+
+
+def plan_outputs(steps: dict, run_dir: str) -> dict:
+    """Local folder for every step output: {step: {output: path}}."""
+    paths = {}
+    for step in steps.values():
+        job_outputs = step.job.get("outputs") or {}
+        names = list(step.component.get("outputs") or {})
+        names += [n for n in job_outputs if n not in names]
+        paths[step.name] = {}
+        for output in names:
+            match = PARENT_BINDING.search(str(job_outputs.get(output, "")))
+            if match and match.group(1) == "outputs":
+                paths[step.name][output] = os.path.join(run_dir, "outputs", match.group(3))
+            else:
+                paths[step.name][output] = os.path.join(run_dir, "steps", step.name, output)
+    return paths
+
+
+def resolve_step_inputs(step: Step, pipeline_inputs: dict, output_paths: dict, pipeline_dir: str) -> dict:
+    """Local value of each input the job binds."""
+    values = {}
+    component_inputs = step.component.get("inputs") or {}
+    for name, spec in component_inputs.items():
+        if isinstance(spec, dict) and "default" in spec:
+            values[name] = str(spec["default"])
+    for name, value in (step.job.get("inputs") or {}).items():
+        if isinstance(value, dict):
+            value = value.get("path", value.get("value"))
+            if value is not None and not os.path.isabs(str(value)):
+                value = os.path.normpath(os.path.join(pipeline_dir, str(value)))
+
+        def replace(match):
+            kind, producer, key = match.groups()
+            if producer:
+                if producer not in output_paths or key not in output_paths[producer]:
+                    raise PipelineError(f"Step '{step.name}': unknown output {producer}.{key}")
+                return output_paths[producer][key]
+            if kind == "inputs":
+                if pipeline_inputs.get(key) is None:
+                    raise PipelineError(
+                        f"Step '{step.name}': pipeline input '{key}' has no local value; pass --set {key}=PATH")
+                return pipeline_inputs[key]
+            raise PipelineError(f"Step '{step.name}': inputs cannot bind to parent outputs ({key})")
+
+        if value is not None:
+            values[name] = PARENT_BINDING.sub(replace, str(value))
+    return values
+
+
+def build_command(step: Step, inputs: dict, outputs: dict) -> list:
+    """Substitute ${{inputs.*}}/${{outputs.*}} into the component command and split it."""
+    command = str(step.component["command"])
+
+    def optional(match):
+        block = match.group(1)
+        names = [m.group(2) for m in COMMAND_BINDING.finditer(block) if m.group(1) == "inputs"]
+        return block if all(n in inputs for n in names) else ""
+
+    command = OPTIONAL_BLOCK.sub(optional, command)
+
+    def replace(match):
+        kind, name = match.groups()
+        source = inputs if kind == "inputs" else outputs
+        if name not in source:
+            raise PipelineError(f"Step '{step.name}': no value for ${{{{{kind}.{name}}}}}")
+        return shlex.quote(source[name])
+
+    argv = shlex.split(COMMAND_BINDING.sub(replace, command))
+    if argv and argv[0] in ("python", "python3"):
+        argv[0] = sys.executable
+    return argv
+
+
+def execute_step(step: Step, argv: list, log_dir: str, outputs: dict) -> dict:
+    """Run one step's command as a subprocess; stdout/stderr go to log files."""
+    os.makedirs(log_dir, exist_ok=True)
+    for path in outputs.values():
+        os.makedirs(path, exist_ok=True)
+    stdout_path = os.path.join(log_dir, "stdout.txt")
+    stderr_path = os.path.join(log_dir, "stderr.txt")
+    with open(stdout_path, "w", encoding="utf-8") as out, open(stderr_path, "w", encoding="utf-8") as err:
+        proc = subprocess.run(argv, cwd=step.code_dir, stdout=out, stderr=err)
+    return {"status": "completed" if proc.returncode == 0 else "failed", "returncode": proc.returncode,
+            "stdout": stdout_path, "stderr": stderr_path}
+
+
+def load_steps(pipeline_path: str, components_dirs: list = None) -> tuple:
+    """Parse the pipeline YAML into (pipeline, {name: Step}) and check the dependency graph."""
+    pipeline = load_yaml(pipeline_path)
+    if pipeline.get("type") != "pipeline" or "jobs" not in pipeline:
+        raise PipelineError(f"Not a pipeline YAML with jobs: {pipeline_path}")
+    pipeline_dir = os.path.dirname(os.path.abspath(pipeline_path))
+    search_dirs = [pipeline_dir] + [os.path.abspath(d) for d in components_dirs or []] + [os.getcwd()]
+    steps = {name: Step(name, job, pipeline_dir, search_dirs) for name, job in pipeline["jobs"].items()}
+    for step in steps.values():
+        unknown = step.depends_on - steps.keys()
+        if unknown:
+            raise PipelineError(f"Step '{step.name}' depends on unknown step(s): {sorted(unknown)}")
+    topological_order(steps)
+    return pipeline, steps
+
+
+def topological_order(steps: dict) -> list:
+    order, visiting, done = [], set(), set()
+
+    def visit(name):
+        if name in done:
+            return
+        if name in visiting:
+            raise PipelineError(f"Dependency cycle through step '{name}'")
+        visiting.add(name)
+        for dep in sorted(steps[name].depends_on):
+            visit(dep)
+        visiting.discard(name)
+        done.add(name)
+        order.append(name)
+
+    for name in steps:
+        visit(name)
+    return order
+
+
+def run_pipeline(pipeline_path: str, run_dir: str, overrides: dict = None, components_dirs: list = None,
+                 max_parallel: int = 4, dry_run: bool = False, executor=execute_step,
+                 cache: StepCache = None) -> dict:
+    """Run every step of a pipeline locally; returns the run summary with the timeline.
+
+    With a StepCache, steps whose cache key matches an earlier run are restored
+    from the cache (status "reused") and completed steps are added to it.
+    """
+    overrides = overrides or {}
+    pipeline, steps = load_steps(pipeline_path, components_dirs)
+    pipeline_dir = os.path.dirname(os.path.abspath(pipeline_path))
+    run_dir = os.path.abspath(run_dir)
+    pipeline_inputs = resolve_pipeline_inputs(pipeline, pipeline_dir, overrides)
+    output_paths = plan_outputs(steps, run_dir)
+
+    commands, step_inputs = {}, {}
+    for name in topological_order(steps):
+        step = steps[name]
+        step_inputs[name] = resolve_step_inputs(step, pipeline_inputs, output_paths, pipeline_dir)
+        commands[name] = build_command(step, step_inputs[name], output_paths[name])
+
+    if dry_run:
+        return {"pipeline": pipeline_path, "dry_run": True,
+                "steps": {name: {"code": steps[name].code_dir, "depends_on": sorted(steps[name].depends_on),
+                                 "command": commands[name]} for name in topological_order(steps)}}
+
+    os.makedirs(run_dir, exist_ok=True)
+    results = {}
+    start = time.perf_counter()
+
+    def launch(name):
+        step = steps[name]
+        t0 = time.perf_counter()
+        key, result = None, None
+        not_cached = uncacheable_reason(step) if cache is not None else None
+        try:
+            if cache is not None and not_cached is None:
+                # Upstream outputs exist by now, so their content can be fingerprinted
+                key = cache.step_key(step, step_inputs[name])
+                meta = cache.restore(key, output_paths[name])
+                if meta is not None:
+                    result = {"status": "reused", "cache_key": key, "saved_s": meta["duration_s"]}
+            if result is None:
+                print(f"🚀 [{t0 - start:7.2f}s] {name} started", flush=True)
+                result = executor(step, commands[name], os.path.join(run_dir, "steps", name, "logs"),
+                                  output_paths[name])
+        except Exception as e:
+            result = {"status": "failed", "error": str(e)}
+        t1 = time.perf_counter()
+        if key is not None and result["status"] == "completed":
+            try:
+                cache.store(key, name, output_paths[name], round(t1 - t0, 3))
+                result["cache_key"] = key
+            except OSError as e:
+                print(f"[WARN] Could not cache {name}: {e}", flush=True)
+        if not_cached:
+            result["not_cached"] = not_cached
+        result.update({"start_s": round(t0 - start, 3), "end_s": round(t1 - start, 3),
+                       "duration_s": round(t1 - t0, 3)})
+        return name, result
+
+    with ThreadPoolExecutor(max_workers=max_parallel) as pool:
+        pending = {}
+        remaining = dict(steps)
+        while remaining or pending:
+            for name, step in list(remaining.items()):
+                if any(results.get(dep, {}).get("status") in ("failed", "skipped") for dep in step.depends_on):
+                    results[name] = {"status": "skipped", "reason": "upstream step failed"}
+                    print(f"⏭️  {name} skipped (upstream failure)", flush=True)
+                    del remaining[name]
+                elif all(results.get(dep, {}).get("status") in ("completed", "reused")
+                         for dep in step.depends_on):
+                    pending[pool.submit(launch, name)] = name
+                    del remaining[name]
+            if not pending:
+                break
+            finished, _ = wait(pending, return_when=FIRST_COMPLETED)
+            for future in finished:
+                del pending[future]
+                name, result = future.result()
+                results[name] = result
+                icon = {"completed": "✅", "reused": "♻️ "}.get(result["status"], "❌")
+                print(f"{icon} [{result['end_s']:7.2f}s] {name} {result['status']} in {result['duration_s']:.2f}s",
+                      flush=True)
+
+    total = time.perf_counter() - start
+    reused = [name for name in topological_order(steps) if results.get(name, {}).get("status") == "reused"]
+    status = "completed" if all(r["status"] in ("completed", "reused") for r in results.values()) else "failed"
+    summary = {
+        "pipeline": pipeline_path,
+        "status": status,
+        "timestamp_utc": datetime.utcnow().isoformat() + "Z",
+        "run_dir": run_dir,
+        "wall_time_s": round(total, 3),
+        "sum_step_time_s": round(sum(r.get("duration_s", 0) for r in results.values()), 3),
+        "reused_steps": reused,
+        "time_saved_s": round(sum(results[name]["saved_s"] for name in reused), 3),
+        "steps": {name: results[name] for name in topological_order(steps) if name in results},
+        "outputs": {name: os.path.join(run_dir, "outputs", name) for name in pipeline.get("outputs") or {}},
+    }
+    with open(os.path.join(run_dir, "timeline.json"), "w", encoding="utf-8") as f:
+        json.dump(summary, f, indent=2)
+    return summary
+
+
+def print_timeline(summary: dict, width: int = 40):
+    """Print one row per step with its start/end offsets and a bar on a shared time axis."""
+    total = max(summary["wall_time_s"], 1e-9)
+    name_width = max([len(n) for n in summary["steps"]] + [4])
+    print(f"\n{'Step':<{name_width}}  {'Start':>8}  {'End':>8}  {'Duration':>9}  Status")
+    print("-" * (name_width + 42 + width))
+    for name, result in summary["steps"].items():
+        if "start_s" not in result:
+            print(f"{name:<{name_width}}  {'-':>8}  {'-':>8}  {'-':>9}  {result['status']}")
+            continue
+        begin = int(result["start_s"] / total * width)
+        length = max(1, int(result["duration_s"] / total * width))
+        bar = " " * begin + "█" * length
+        print(f"{name:<{name_width}}  {result['start_s']:7.2f}s  {result['end_s']:7.2f}s  "
+              f"{result['duration_s']:8.2f}s  {result['status']:<10} |{bar:<{width}}|")
+    print(f"\nWall time: {summary['wall_time_s']:.2f}s (sum of step times: {summary['sum_step_time_s']:.2f}s)")
+    if summary.get("reused_steps"):
+        print(f"♻️  Reused from cache: {', '.join(summary['reused_steps'])} "
+              f"(saved ~{summary['time_saved_s']:.2f}s)")
+
+
+def parse_overrides(items: list) -> dict:
+    overrides = {}
+    for item in items or []:
+        if "=" not in item:
+            raise PipelineError(f"Expected NAME=VALUE, got: {item}")
+        key, value = item.split("=", 1)
+        overrides[key] = os.path.abspath(value) if os.path.exists(value) else value
+    return overrides
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Run an Azure ML pipeline YAML locally")
+    parser.add_argument("pipeline", help="Pipeline YAML, e.g. mlops/azureml/train/newpipeline.yml")
+    parser.add_argument("--set", action="append", help="NAME=VALUE for a pipeline input (repeatable)")
+    parser.add_argument("--components_dir", action="append", help="Extra folder to search for component YAMLs")
+    parser.add_argument("--run_dir", default=None, help="Folder for outputs and logs (default: local_runs/<timestamp>)")
+    parser.add_argument("--max_parallel", type=int, default=4, help="Steps allowed to run at the same time")
+    parser.add_argument("--dry_run", action="store_true", help="Print the resolved commands without running them")
+    parser.add_argument("--cache_dir", default=os.path.join("local_runs", "cache"), help="Step result cache folder")
+    parser.add_argument("--cache_max_mb", type=float, default=2048, help="Cache size limit before eviction")
+    parser.add_argument("--no_cache", action="store_true", help="Run every step, ignoring cached results")
+    args = parser.parse_args()
+
+    run_dir = args.run_dir or os.path.join("local_runs", datetime.now().strftime("%Y%m%d_%H%M%S"))
+    cache = None
+    if not args.no_cache and not args.dry_run:
+        cache = StepCache(args.cache_dir, int(args.cache_max_mb * 1024 * 1024),
+                          search_dirs=[os.getcwd()] + (args.components_dir or []))
+    try:
+        summary = run_pipeline(args.pipeline, run_dir, parse_overrides(args.set), args.components_dir,
+                               args.max_parallel, args.dry_run, cache=cache)
+    except PipelineError as e:
+        print(f"❌ {e}")
+        sys.exit(1)
+
+    if args.dry_run:
+        print(json.dumps(summary, indent=2))
+        sys.exit(0)
+
+    print_timeline(summary)
+    print(f"📂 Run folder: {summary['run_dir']}")
+    for name, result in summary["steps"].items():
+        if result["status"] == "failed" and result.get("stderr"):
+            print(f"❌ {name} failed; see {result['stderr']}")
+    sys.exit(0 if summary["status"] == "completed" else 1)
+
+
+if __name__ == "__main__":
+    main()
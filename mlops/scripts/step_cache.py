@@ -0,0 +1,343 @@
+#!/usr/bin/env python3
+"""
+Local step-result cache for run_pipeline_local.py.
+
+A step's cache key is the SHA-256 of:
+- the code the command runs: the Python scripts it names in the component's
+  code folder (python train.py, python -m pkg.mod) and the modules of that
+  folder they import, followed transitively; editing register.py does not
+  invalidate prep_data even though both live in ./src. A command that names
+  no script there falls back to every file in the folder,
+- the environment spec (the environment reference, plus the content of a
+  matching local environment YAML and its conda file) and the local Python,
+- the component command and every input value; inputs that are local files
+  or folders contribute a fingerprint of their content instead of their path,
+  so upstream outputs written to a new run folder still match.
+
+Steps that must run every time are never cached (see uncacheable_reason):
+components marked is_deterministic: false (Azure ML's own switch for result
+reuse, set on the register components) and steps that declare no outputs,
+since they run only for their side effects.
+
+Entries are stored as <cache_dir>/<key>/outputs/<output name> with a
+meta.json holding the step's original duration. When the total size goes
+over max_bytes the least recently used entries are removed.
+
+Example:
+    cache = StepCache("local_runs/cache", max_bytes=2 * 1024 ** 3)
+    if uncacheable_reason(step) is None:
+        key = cache.step_key(step, inputs)
+    hit = cache.restore(key, outputs)  # meta dict, or None on a miss
+"""
+
+import ast
+import hashlib
+import json
+import os
+import re
+import shutil
+import sys
+import threading
+import time
+
+import yaml
+
+SKIP_DIRS = {".git", "node_modules", "venv", ".venv", "env", "__pycache__", ".ipynb_checkpoints",
+             ".ipynb_aml_checkpoints", ".pytest_cache", "outputs", "local_runs"}
+CHUNK_SIZE = 1024 * 1024
+SCRIPT_ARG = re.compile(r"""(?:^|[\s'"])([\w./\\-]+\.py)(?=$|[\s'"])""")
+MODULE_ARG = re.compile(r"(?:^|\s)-m\s+([\w.]+)")
+
+
+def _hash_file(path: str, digest) -> None:
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(CHUNK_SIZE), b""):
+            digest.update(chunk)
+
+
+def fingerprint_files(root: str, files: list) -> str:
+    """Content hash of the given files under root, with their relative paths."""
+    digest = hashlib.sha256()
+    for full in files:
+        digest.update(os.path.relpath(full, root).replace(os.sep, "/").encode())
+        digest.update(b"\0")
+        _hash_file(full, digest)
+    return digest.hexdigest()
+
+
+def fingerprint_path(path: str) -> str:
+    """Content hash of a file, or of every file (with relative paths) under a folder."""
+    if os.path.isfile(path):
+        digest = hashlib.sha256()
+        _hash_file(path, digest)
+        return digest.hexdigest()
+    files = []
+    for root, dirs, names in os.walk(path):
+        dirs[:] = sorted(d for d in dirs if d not in SKIP_DIRS)
+        files.extend(os.path.join(root, name) for name in sorted(names) if not name.endswith((".pyc", ".pyo")))
+    return fingerprint_files(path, files)
+
+
+def _module_file(module: str, search_dirs: list):
+    """Source file of a dotted module name under one of search_dirs, or None."""
+    parts = module.split(".")
+    for directory in search_dirs:
+        base = os.path.join(directory, *parts)
+        for candidate in (base + ".py", os.path.join(base, "__init__.py")):
+            if os.path.isfile(candidate):
+                return candidate
+    return None
+
+
+def _imported_modules(path: str) -> list:
+    """Dotted names a Python file imports (relative imports resolved against its folder)."""
+    try:
+        with open(path, "r", encoding="utf-8") as f:
+            tree = ast.parse(f.read(), filename=path)
+    except (OSError, SyntaxError, ValueError):
+        return []
+    names = []
+    for node in ast.walk(tree):
+        if isinstance(node, ast.Import):
+            names.extend(alias.name for alias in node.names)
+        elif isinstance(node, ast.ImportFrom):
+            prefix = "." * node.level + (node.module or "")
+            names.append(prefix)
+            # from pkg import mod may name a submodule
+            names.extend(f"{prefix}.{alias.name}" if node.module else prefix + alias.name for alias in node.names)
+    return names
+
+
+def command_files(command: str, code_dir: str):
+    """Python files a command runs from code_dir: its scripts and the local modules they import.
+
+    Returns None when the command names no script in code_dir.
+    """
+    code_dir = os.path.abspath(code_dir)
+    pending = [os.path.join(code_dir, arg) for arg in SCRIPT_ARG.findall(command)]
+    pending += [_module_file(module, [code_dir]) for module in MODULE_ARG.findall(command)]
+    pending = [os.path.abspath(p) for p in pending if p and os.path.isfile(p)]
+    if not pending:
+        return None
+    found = set()
+    while pending:
+        path = pending.pop()
+        if path in found or not path.startswith(code_dir + os.sep):
+            continue
+        found.add(path)
+        folder = os.path.dirname(path)
+        for name in _imported_modules(path):
+            if name.startswith("."):
+                level = len(name) - len(name.lstrip("."))
+                base = folder
+                for _ in range(level - 1):
+                    base = os.path.dirname(base)
+                target = _module_file(name.lstrip("."), [base]) if name.lstrip(".") else None
+            else:
+                # The script's folder is first on sys.path, then the working directory (code_dir)
+                target = _module_file(name, [folder, code_dir])
+            if target:
+                pending.append(os.path.abspath(target))
+    return sorted(found)
+
+
+def uncacheable_reason(step) -> str:
+    """Why a step (run_pipeline_local.Step) must run every time, or None if it may be reused."""
+    deterministic = step.job.get("is_deterministic", step.component.get("is_deterministic", True))
+    if str(deterministic).lower() == "false":
+        return "is_deterministic: false"
+    if not (step.job.get("outputs") or step.component.get("outputs")):
+        return "no outputs, runs for its side effects"
+    return None
+
+
+def _size_of(path: str) -> int:
+    if os.path.isfile(path):
+        return os.path.getsize(path)
+    return sum(os.path.getsize(os.path.join(root, f)) for root, _, files in os.walk(path) for f in files)
+
+
+def _copy(src: str, dst: str) -> None:
+    if os.path.isdir(src):
+        shutil.copytree(src, dst, dirs_exist_ok=True)
+    else:
+        os.makedirs(os.path.dirname(dst), exist_ok=True)
+        shutil.copy2(src, dst)
+
+
+class StepCache:
+    """Content-addressed store of step outputs with size-based LRU eviction."""
+
+    def __init__(self, cache_dir: str, max_bytes: int = 2 * 1024 ** 3, search_dirs: list = None):
+        self.cache_dir = os.path.abspath(cache_dir)
+        self.max_bytes = max_bytes
+        self.search_dirs = search_dirs or [os.getcwd()]
+        self._code_hashes = {}
+        self._lock = threading.Lock()
+        # Entries being copied out by restore(); eviction skips them until they are released
+        self._pins = {}
+        self._evict_pending = False
+        os.makedirs(self.cache_dir, exist_ok=True)
+
+    def code_hash(self, code_dir: str, command: str = None) -> str:
+        """Fingerprint of the files command runs from code_dir (the whole folder if it names none)."""
+        # Code doesn't change during a run; several steps often share a folder or a module
+        with self._lock:
+            files = command_files(command, code_dir) if command and os.path.isdir(code_dir) else None
+            cache_key = (code_dir, tuple(files) if files else None)
+            if cache_key not in self._code_hashes:
+                if files:
+                    value = fingerprint_files(code_dir, files)
+                else:
+                    value = fingerprint_path(code_dir) if os.path.exists(code_dir) else "missing"
+                self._code_hashes[cache_key] = value
+            return self._code_hashes[cache_key]
+
+    def environment_spec(self, component: dict, component_dir: str) -> str:
+        """Environment reference plus the content of the local environment/conda files it points to."""
+        env = component.get("environment")
+        if env is None and isinstance(component.get("task"), dict):
+            env = component["task"].get("environment")
+        parts = [json.dumps(env, sort_keys=True, default=str), sys.version, sys.executable]
+        env_file = None
+        if isinstance(env, str) and env.startswith("azureml:"):
+            name = env[len("azureml:"):].split(":", 1)[0].split("@", 1)[0]
+            env_file = self._find_environment(name)
+        elif isinstance(env, str):
+            env_file = os.path.normpath(os.path.join(component_dir, env.replace("file:", "", 1)))
+        if isinstance(env, dict):
+            spec, spec_dir = env, component_dir
+        elif env_file and os.path.isfile(env_file):
+            with open(env_file, "r", encoding="utf-8") as f:
+                spec = yaml.safe_load(f) or {}
+            spec_dir = os.path.dirname(env_file)
+            parts.append(json.dumps(spec, sort_keys=True, default=str))
+        else:
+            spec, spec_dir = {}, component_dir
+        conda_file = spec.get("conda_file") if isinstance(spec, dict) else None
+        if isinstance(conda_file, str):
+            conda_path = os.path.join(spec_dir, conda_file.replace("file:", "", 1))
+            if os.path.isfile(conda_path):
+                parts.append(fingerprint_path(conda_path))
+        return "\n".join(parts)
+
+    def _find_environment(self, name: str):
+        for directory in self.search_dirs:
+            for root, dirs, files in os.walk(directory):
+                dirs[:] = [d for d in dirs if d not in SKIP_DIRS]
+                for file in sorted(files):
+                    if not file.endswith((".yml", ".yaml")):
+                        continue
+                    path = os.path.join(root, file)
+                    try:
+                        with open(path, "r", encoding="utf-8") as f:
+                            content = yaml.safe_load(f)
+                    except Exception:
+                        continue
+                    if isinstance(content, dict) and content.get("name") == name and (
+                            "image" in content or "conda_file" in content):
+                        return path
+        return None
+
+    def step_key(self, step, inputs: dict) -> str:
+        """Cache key for a step (run_pipeline_local.Step) given its resolved input values."""
+        component_dir = os.path.dirname(step.component_path) if step.component_path else step.code_dir
+        digest = hashlib.sha256()
+        digest.update(f"code:{self.code_hash(step.code_dir, step.component['command'])}\n".encode())
+        digest.update(f"env:{self.environment_spec(step.component, component_dir)}\n".encode())
+        digest.update(f"command:{step.component['command']}\n".encode())
+        for name in sorted(inputs):
+            value = str(inputs[name])
+            if os.path.exists(value):
+                value = "content:" + fingerprint_path(value)
+            digest.update(f"input:{name}={value}\n".encode())
+        return digest.hexdigest()
+
+    def _meta_path(self, key: str) -> str:
+        return os.path.join(self.cache_dir, key, "meta.json")
+
+    def restore(self, key: str, outputs: dict):
+        """Copy a cached entry into the step's output paths; returns its metadata, or None on a miss."""
+        meta_path = self._meta_path(key)
+        with self._lock:
+            if not os.path.exists(meta_path):
+                return None
+            with open(meta_path, "r", encoding="utf-8") as f:
+                meta = json.load(f)
+            if set(meta["outputs"]) != set(outputs):
+                return None
+            meta["last_used"] = time.time()
+            meta["hits"] = meta.get("hits", 0) + 1
+            with open(meta_path, "w", encoding="utf-8") as f:
+                json.dump(meta, f, indent=2)
+            self._pins[key] = self._pins.get(key, 0) + 1
+        try:
+            for name, path in outputs.items():
+                cached = os.path.join(self.cache_dir, key, "outputs", name)
+                if os.path.exists(cached):
+                    _copy(cached, path)
+                else:
+                    os.makedirs(path, exist_ok=True)
+        finally:
+            with self._lock:
+                self._pins[key] -= 1
+                if not self._pins[key]:
+                    del self._pins[key]
+                    if self._evict_pending:
+                        self._evict()
+        return meta
+
+    def store(self, key: str, step_name: str, outputs: dict, duration_s: float) -> None:
+        """Save a completed step's outputs under key, then evict down to max_bytes."""
+        entry = os.path.join(self.cache_dir, key)
+        tmp = os.path.join(self.cache_dir, f".tmp-{key}-{os.getpid()}-{threading.get_ident()}")
+        shutil.rmtree(tmp, ignore_errors=True)
+        for name, path in outputs.items():
+            if os.path.exists(path):
+                _copy(path, os.path.join(tmp, "outputs", name))
+        os.makedirs(tmp, exist_ok=True)
+        now = time.time()
+        meta = {"step": step_name, "outputs": sorted(outputs), "duration_s": duration_s,
+                "size_bytes": _size_of(tmp), "created": now, "last_used": now, "hits": 0}
+        with open(os.path.join(tmp, "meta.json"), "w", encoding="utf-8") as f:
+            json.dump(meta, f, indent=2)
+        with self._lock:
+            if os.path.exists(entry):
+                shutil.rmtree(tmp, ignore_errors=True)
+            else:
+                os.replace(tmp, entry)
+            self._evict()
+
+    def entries(self) -> list:
+        """Metadata of every cache entry (with its key)."""
+        result = []
+        for key in os.listdir(self.cache_dir):
+            meta_path = self._meta_path(key)
+            if key.startswith(".tmp-") or not os.path.exists(meta_path):
+                continue
+            try:
+                with open(meta_path, "r", encoding="utf-8") as f:
+                    meta = json.load(f)
+            except (OSError, ValueError):
+                continue
+            meta["key"] = key
+            result.append(meta)
+        return result
+
+    def _evict(self) -> None:
+        """Remove least recently used entries until the rest fit (call with the lock held)."""
+        entries = sorted(self.entries(), key=lambda m: m.get("last_used", 0))
+        total = sum(m.get("size_bytes", 0) for m in entries)
+        pinned = [m for m in entries if m["key"] in self._pins]
+        entries = [m for m in entries if m["key"] not in self._pins]
+        self._evict_pending = False
+        while total > self.max_bytes:
+            if not entries:
+                # Only entries being restored are left; evict once they are released
+                self._evict_pending = bool(pinned)
+                break
+            oldest = entries.pop(0)
+            shutil.rmtree(os.path.join(self.cache_dir, oldest["key"]), ignore_errors=True)
+            total -= oldest.get("size_bytes", 0)
+            print(f"🧹 Evicted cached {oldest['step']} ({oldest['key'][:12]}, {oldest['size_bytes']} bytes)",
+                  flush=True)
@@ -0,0 +1,99 @@
+#!/usr/bin/env python3
+"""
+Offline tests for the concurrent workspace bootstrap using the fake MLClient.
+"""
+
+import argparse
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(__file__))
+from bootstrap_workspace import Operation, default_operations, run_operations
+from fake_ml_client import FakeMLClient
+
+TRAIN_DIR = os.path.join(os.path.dirname(__file__), "..", "azureml", "train")
+
+
+def _args(no_pipeline=False):
+    return argparse.Namespace(
+        compute_name="cpu-cluster", compute_size="Standard_DS11_v2", max_instances=1,
+        dataset_file=os.path.join(TRAIN_DIR, "data.yml"),
+        env_file=os.path.join(TRAIN_DIR, "train-env.yml"),
+        pipeline_file=os.path.join(TRAIN_DIR, "newpipeline.yml"),
+        no_pipeline=no_pipeline)
+
+
+def test_concurrent_then_submit():
+    """Test compute/dataset/environment overlap and the pipeline is submitted after all of them."""
+    print("Testing concurrent bootstrap...")
+    client = FakeMLClient(latency={"compute": 0.4, "data": 0.3, "environments": 0.3, "jobs": 0.05})
+    report = run_operations(client, default_operations(_args()))
+    assert report["status"] == "succeeded", report
+
+    prepare = [client.calls_for(group)[0] for group in ("compute", "data", "environments")]
+    assert max(c["start"] for c in prepare) < min(c["end"] for c in prepare), "Operations should overlap"
+    assert len({c["thread"] for c in prepare}) == 3
+
+    submit = client.calls_for("jobs")
+    assert len(submit) == 1 and submit[0]["start"] >= max(c["end"] for c in prepare)
+    assert report["wall_time_s"] < report["sum_latency_s"]
+    assert report["operations"]["register_dataset"]["result"] == "used-cars-data:1"
+    assert report["operations"]["submit_pipeline"]["result"] == "fake_job_1"
+    for entry in report["operations"].values():
+        assert entry["latency_s"] >= 0
+    print("✅ concurrent bootstrap tests passed")
+
+
+def test_failure_skips_submit():
+    """Test a failed dependency skips the pipeline submission but not independent operations."""
+    print("\nTesting failure handling...")
+    client = FakeMLClient(fail={"environments"})
+    report = run_operations(client, default_operations(_args()))
+    operations = report["operations"]
+    assert report["status"] == "failed"
+    assert operations["register_environment"]["status"] == "failed"
+    assert "Injected failure" in operations["register_environment"]["error"]
+    assert operations["create_compute"]["status"] == "succeeded"
+    assert operations["register_dataset"]["status"] == "succeeded"
+    assert operations["submit_pipeline"]["status"] == "skipped"
+    assert client.calls_for("jobs") == [], "Pipeline must not be submitted"
+    print("✅ failure handling tests passed")
+
+
+def test_no_pipeline_and_unknown_dependency():
+    """Test --no_pipeline only prepares the workspace and bad dependencies are rejected."""
+    print("\nTesting options...")
+    report = run_operations(FakeMLClient(), default_operations(_args(no_pipeline=True)))
+    assert set(report["operations"]) == {"create_compute", "register_dataset", "register_environment"}
+
+    try:
+        run_operations(FakeMLClient(), [Operation("a", lambda c, r: None, depends_on=["missing"])])
+        assert False, "Expected ValueError"
+    except ValueError as e:
+        assert "missing" in str(e)
+    print("✅ option tests passed")
+
+
+def main():
+    """Run all tests."""
+    print("=" * 60)
+    print("Running Workspace Bootstrap Tests")
+    print("=" * 60)
+
+    try:
+        test_concurrent_then_submit()
+        test_failure_skips_submit()
+        test_no_pipeline_and_unknown_dependency()
+
+        print("\n" + "=" * 60)
+        print("✅ All tests passed successfully!")
+        print("=" * 60)
+        return 0
+
+    except AssertionError as e:
+        print(f"\n❌ Test failed: {e}")
+        return 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
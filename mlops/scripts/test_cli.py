@@ -0,0 +1,96 @@
+#!/usr/bin/env python3
+"""
+Tests for cli.py and its startup benchmark: cheap commands must start
+without importing the Azure SDK, pandas, sklearn or reportlab.
+"""
+
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(__file__))
+from benchmark_startup import CHEAP_COMMANDS, heavy_imports, measure, parse_importtime, violations
+from cli import COMMANDS, main as cli_main
+
+STARTUP_BUDGET_S = 1.0
+
+
+def test_importtime_parsing():
+    """The -X importtime log is parsed and heavy packages are detected."""
+    print("Testing importtime parsing...")
+    stderr = "\n".join([
+        "import time: self [us] | cumulative | imported package",
+        "import time:       120 |        120 |   azure.ai.ml._utils",
+        "import time:      1500 |     900000 | azure.ai.ml",
+        "import time:       300 |       2400 | json",
+    ])
+    imports = parse_importtime(stderr)
+    assert [m for m, _, _ in imports] == ["azure.ai.ml._utils", "azure.ai.ml", "json"], imports
+    assert [depth for _, _, depth in imports] == [1, 0, 0], imports
+    assert imports[1][1] == 0.9, imports
+    assert heavy_imports(["json", "azure.ai.ml._utils", "azure.core"]) == ["azure.ai.ml"]
+    assert heavy_imports(["pandas_like", "yaml"]) == []
+
+    result = {"returncode": 0, "wall_s": 1.5, "heavy_imports": ["pandas"]}
+    assert len(violations(result, budget=1.0)) == 2
+    print("✅ importtime parsing tests passed")
+
+
+def test_cheap_commands_stay_light():
+    """--help of every subcommand starts within budget and without heavy imports."""
+    print("\nTesting cheap command startup...")
+    assert {argv[0] for argv in CHEAP_COMMANDS if argv[0] != "--help"} == set(COMMANDS)
+    for argv in CHEAP_COMMANDS:
+        result = measure(argv, repeat=1)
+        assert result["returncode"] == 0, result
+        assert result["heavy_imports"] == [], f"{result['command']} imports {result['heavy_imports']}"
+        assert result["wall_s"] < STARTUP_BUDGET_S * 3, result
+        print(f"   {result['command']:<20} {result['wall_s']:.2f}s, {result['modules']} modules")
+    print("✅ cheap command startup tests passed")
+
+
+def test_dispatch():
+    """Arguments after the subcommand reach the script's own parser."""
+    print("\nTesting subcommand dispatch...")
+    saved_argv = sys.argv
+    try:
+        for argv, expected in [(["submit", "--help"], 0), (["submit", "--no_such_flag"], 2), (["nope"], 2)]:
+            try:
+                cli_main(argv)
+                code = None
+            except SystemExit as e:
+                code = e.code
+            assert code == expected, f"{argv}: expected exit {expected}, got {code}"
+        assert cli_main([]) == 2
+    finally:
+        sys.argv = saved_argv
+    print("✅ subcommand dispatch tests passed")
+
+
+def main():
+    """Run all tests."""
+    print("=" * 60)
+    print("Running CLI Startup Tests")
+    print("=" * 60)
+
+    try:
+        test_importtime_parsing()
+        test_cheap_commands_stay_light()
+        test_dispatch()
+
+        print("\n" + "=" * 60)
+        print("✅ All tests passed successfully!")
+        print("=" * 60)
+        return 0
+
+    except AssertionError as e:
+        print(f"\n❌ Test failed: {e}")
+        return 1
+    except Exception as e:
+        print(f"\n❌ Unexpected error: {e}")
+        import traceback
+        traceback.print_exc()
+        return 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,154 @@
+#!/usr/bin/env python3
+"""
+Tests for the in-memory fake workspace: paged job history, latency,
+failure injection, validation, model registration, and running the
+workspace scripts offline through MLOPS_FAKE_WORKSPACE.
+"""
+
+import os
+import subprocess
+import sys
+import tempfile
+import time
+from types import SimpleNamespace
+
+sys.path.insert(0, os.path.dirname(__file__))
+from azure.core.exceptions import AzureError, ResourceNotFoundError
+from fake_ml_client import FakeMLClient
+
+REPO_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), "..", ".."))
+
+
+def test_paged_history():
+    """jobs.list() pages lazily, newest first, one round trip per page."""
+    print("Testing paged job history...")
+    client = FakeMLClient(default_latency=0.05, page_size=20)
+    names = client.seed_history(90, seed=3)
+    assert len(names) == 90
+
+    t0 = time.perf_counter()
+    jobs = list(client.jobs.list(max_results=50))
+    elapsed = time.perf_counter() - t0
+    assert [j.name for j in jobs] == names[::-1][:50], "newest first"
+    assert len(client.calls_for("jobs", "list_page")) == 3, client.calls_for("jobs", "list_page")
+    assert 0.15 <= elapsed < 0.6, f"3 pages at 50ms should take ~0.15s, took {elapsed:.2f}s"
+
+    pager = client.jobs.list()
+    next(pager)
+    assert len(client.calls_for("jobs", "list_page")) == 4, "only the first page is fetched up front"
+
+    job = client.jobs.get(names[0])
+    assert job.status in ("Completed", "Failed"), job.status
+    assert job.creation_context.created_at < job.creation_context.last_modified_at
+    assert set(job.properties) == {"start_time", "end_time"}, job.properties
+    assert job.inputs["raw_data"].path.startswith("azureml:")
+    steps = client.jobs.list(parent_job_name=names[0])
+    assert [s.display_name for s in steps] == ["prep_data", "train_model", "register_model"], steps
+    failed = [client.jobs.get(n) for n in names if client.jobs.get(n).status == "Failed"]
+    assert failed, "seeded history should contain failures"
+    assert any(s.status == "Failed" for s in client.jobs.list(parent_job_name=failed[0].name))
+    print("✅ paged job history tests passed")
+
+
+def test_failure_injection():
+    """Whole methods can fail, or a seeded share of calls."""
+    print("\nTesting failure injection...")
+    client = FakeMLClient(default_latency=0.001, fail={"jobs.list"})
+    client.seed_history(5)
+    try:
+        list(client.jobs.list())
+        raise AssertionError("jobs.list should fail")
+    except AzureError:
+        pass
+    client.jobs.get(client.seed_history(1)[0])  # other methods still work
+
+    client = FakeMLClient(default_latency=0.001, fail_rate={"jobs.get": 0.3}, seed=7)
+    name = client.seed_history(1)[0]
+    outcomes = []
+    for _ in range(200):
+        try:
+            client.jobs.get(name)
+            outcomes.append(True)
+        except AzureError:
+            outcomes.append(False)
+    failures = outcomes.count(False)
+    assert 35 <= failures <= 85, f"~30% of 200 calls should fail, got {failures}"
+    assert sum(c["failed"] for c in client.calls_for("jobs", "get")) == failures
+
+    try:
+        FakeMLClient(default_latency=0.001).jobs.get("missing")
+        raise AssertionError("unknown job should raise")
+    except ResourceNotFoundError:
+        pass
+    print("✅ failure injection tests passed")
+
+
+def test_validate_and_models():
+    """jobs.validate returns a result; models get a new version per registration."""
+    print("\nTesting validate and model registration...")
+    client = FakeMLClient(default_latency=0.001, fail={"jobs.validate"})
+    result = client.jobs.validate(SimpleNamespace(name="pipeline"))
+    assert result.passed is False and result.error_messages, result
+    assert FakeMLClient(default_latency=0.001).jobs.validate(SimpleNamespace(name="p")).passed
+
+    models = FakeMLClient(default_latency=0.001).models
+    first = models.create_or_update(SimpleNamespace(name="used-cars-model", path="model.pkl"))
+    second = models.create_or_update(SimpleNamespace(name="used-cars-model", path="model.pkl"))
+    assert (first.version, second.version) == ("1", "2")
+    assert models.get("used-cars-model").version == "2"
+    assert models.get("used-cars-model", version="1") is first
+    assert [m.version for m in models.list(name="used-cars-model")] == ["1", "2"]
+    print("✅ validate and model registration tests passed")
+
+
+def test_scripts_run_offline():
+    """MLOPS_FAKE_WORKSPACE routes get_ml_client() to the fake, so scripts run without Azure."""
+    print("\nTesting scripts against the fake workspace...")
+    env = dict(os.environ, MLOPS_FAKE_WORKSPACE="history=20,latency=0.001")
+    with tempfile.TemporaryDirectory() as tmp:
+        commands = [
+            [os.path.join(REPO_ROOT, "mlops", "scripts", "cli.py"), "compute"],
+            [os.path.join(REPO_ROOT, "data-science", "src", "register.py"), "--model_name", "used-cars-model",
+             "--model_path", os.path.join(tmp, "model"), "--model_info_output_path", os.path.join(tmp, "info")],
+            [os.path.join(REPO_ROOT, "ai_reviews", "review_jobs.py"), "--max_results", "7", "--output_dir", tmp],
+        ]
+        for command in commands:
+            proc = subprocess.run([sys.executable, *command], capture_output=True, text=True, env=env, cwd=REPO_ROOT)
+            assert proc.returncode == 0, f"{command[0]} failed:\n{proc.stdout}\n{proc.stderr}"
+
+        with open(os.path.join(tmp, "info", "model_info.txt")) as f:
+            assert "Version: 1" in f.read()
+        with open(os.path.join(tmp, "job_review.csv"), encoding="utf-8") as f:
+            assert len(f.read().strip().splitlines()) == 8, "header plus 7 jobs"
+    print("✅ offline script tests passed")
+
+
+def main():
+    """Run all tests."""
+    print("=" * 60)
+    print("Running Fake Workspace Tests")
+    print("=" * 60)
+
+    try:
+        test_paged_history()
+        test_failure_injection()
+        test_validate_and_models()
+        test_scripts_run_offline()
+
+        print("\n" + "=" * 60)
+        print("✅ All tests passed successfully!")
+        print("=" * 60)
+        return 0
+
+    except AssertionError as e:
+        print(f"\n❌ Test failed: {e}")
+        return 1
+    except Exception as e:
+        print(f"\n❌ Unexpected error: {e}")
+        import traceback
+        traceback.print_exc()
+        return 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
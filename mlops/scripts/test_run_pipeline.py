@@ -0,0 +1,198 @@
+#!/usr/bin/env python3
+"""
+Offline tests for run_pipeline.py sweep submission and job tracking using the fake MLClient.
+"""
+
+import asyncio
+import json
+import os
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(__file__))
+from fake_ml_client import FakeMLClient
+from run_pipeline import (EXIT_TIMEOUT, check_overrides, expand_grid, override_key, parse_grid, submit_sweep,
+                          track_jobs, tracking_exit_code, write_manifest)
+
+PIPELINE_FILE = os.path.join(os.path.dirname(__file__), "..", "azureml", "train", "newpipeline.yml")
+
+
+def test_grid_expansion():
+    """Test grid parsing, expansion and override keys."""
+    print("Testing grid expansion...")
+    grid = parse_grid(["train_model.n_estimators=50,100,200", "train_model.max_depth=5,null"])
+    assert grid == {"train_model.n_estimators": [50, 100, 200], "train_model.max_depth": [5, None]}
+    variants = expand_grid(grid)
+    assert len(variants) == 6
+    assert variants[0] == {"train_model.n_estimators": 50, "train_model.max_depth": 5}
+    assert override_key("train_model.n_estimators") == "jobs.train_model.inputs.n_estimators"
+    assert override_key("learning_rate") == "inputs.learning_rate"
+    assert override_key("jobs.a.inputs.b") == "jobs.a.inputs.b"
+    try:
+        parse_grid(["no_values"])
+        assert False, "Expected ValueError"
+    except ValueError:
+        pass
+    print("✅ grid expansion tests passed")
+
+
+def test_overrides_must_be_declared():
+    """Test sweep keys are checked against the inputs of the pipeline and of the step's component."""
+    print("\nTesting override checks...")
+    check_overrides(PIPELINE_FILE, ["train_model.n_estimators", "train_model.max_depth",
+                                    "inputs.training_data.path", "training_data", "jobs.train_model.compute"])
+    for name, message in [("train_model.learning_rate", "step 'train_model' has no input 'learning_rate'"),
+                          ("prep_data.n_estimators", "step 'prep_data' has no input 'n_estimators'"),
+                          ("no_step.x", "no step 'no_step'"),
+                          ("epochs", "the pipeline has no input 'epochs'")]:
+        try:
+            check_overrides(PIPELINE_FILE, [name])
+            assert False, f"{name} should be rejected"
+        except ValueError as e:
+            assert message in str(e), e
+
+    # A variant with an undeclared input fails before anything is submitted
+    client = FakeMLClient(default_latency=0.001)
+    entries = asyncio.run(submit_sweep(client, PIPELINE_FILE, [{"train_model.epochs": 3}], "sweep"))
+    assert entries[0]["status"] == "failed" and "no input 'epochs'" in entries[0]["error"], entries
+    assert not client.calls_for("jobs", "create_or_update")
+    print("✅ override check tests passed")
+
+
+def test_sweep_concurrency_cap_and_manifest():
+    """Test variants are submitted concurrently, capped, with their parameters applied."""
+    print("\nTesting sweep submission...")
+    client = FakeMLClient(latency={"jobs": 0.2})
+    variants = expand_grid({"train_model.n_estimators": [50, 100, 200], "train_model.max_depth": [5, 10]})
+    entries = asyncio.run(submit_sweep(client, PIPELINE_FILE, variants, "sweep", concurrency=3))
+
+    assert all(e["status"] == "submitted" for e in entries), entries
+    assert client.peak_in_flight["jobs"] == 3, client.peak_in_flight
+    assert len({e["job_name"] for e in entries}) == 6
+    for entry in entries:
+        job = client.jobs_by_name[entry["job_name"]].entity
+        assert job.jobs["train_model"].inputs["n_estimators"]._data == entry["params"]["train_model.n_estimators"]
+        assert job.tags["train_model.max_depth"] == str(entry["params"]["train_model.max_depth"])
+        assert job.display_name.startswith(f"sweep-{entry['index']:03d}-")
+
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "manifest.json")
+        write_manifest(path, PIPELINE_FILE, {"x": [1]}, entries, 1.0)
+        with open(path) as f:
+            manifest = json.load(f)
+    assert manifest["submitted"] == 6 and manifest["failed"] == 0
+    assert manifest["job_names"] == [e["job_name"] for e in entries]
+    print("✅ sweep submission tests passed")
+
+
+def test_throttling_retry_and_failures():
+    """Test throttled submissions are retried with backoff and other errors are not."""
+    print("\nTesting throttling...")
+    client = FakeMLClient(latency={"jobs": 0.1}, max_in_flight={"jobs": 2})
+    variants = expand_grid({"train_model.n_estimators": [10, 20, 30, 40, 50]})
+    entries = asyncio.run(submit_sweep(client, PIPELINE_FILE, variants, concurrency=5, backoff=0.01))
+    assert all(e["status"] == "submitted" for e in entries), entries
+    assert client.throttled, "Some submissions should have been throttled"
+    assert sum(e["attempts"] for e in entries) == len(entries) + len(client.throttled)
+
+    failing = FakeMLClient(fail={"jobs"})
+    entries = asyncio.run(submit_sweep(failing, PIPELINE_FILE, variants[:2], backoff=0.01))
+    assert all(e["status"] == "failed" and e["attempts"] == 1 for e in entries), entries
+
+    throttled = FakeMLClient(latency={"jobs": 1.0}, max_in_flight={"jobs": 1})
+    entries = asyncio.run(submit_sweep(throttled, PIPELINE_FILE, variants[:3], concurrency=3, max_retries=0))
+    assert sum(e["status"] == "failed" for e in entries) == 2, "Without retries the throttled calls fail"
+    print("✅ throttling tests passed")
+
+
+def test_adaptive_polling():
+    """Test the interval backs off while nothing changes and resets on a change."""
+    print("\nTesting adaptive polling...")
+    client = FakeMLClient(default_latency=0.001)
+    client.add_job("slow", [(0.0, "Queued"), (0.6, "Running"), (0.8, "Completed")],
+                   steps={"prep": [(0.0, "NotStarted"), (0.6, "Running"), (0.7, "Completed")]})
+    intervals = []
+
+    def sleep(seconds):
+        intervals.append(seconds)
+        time.sleep(seconds)
+
+    result = track_jobs(client, ["slow"], poll_min=0.02, poll_max=0.16, sleep=sleep)
+    assert result["jobs"]["slow"]["status"] == "Completed"
+    assert result["jobs"]["slow"]["steps"] == {"prep": "Completed"}
+    assert intervals[:4] == [0.02, 0.04, 0.08, 0.16], intervals
+    assert max(intervals) == 0.16
+    assert 0.02 in intervals[4:], "Interval should reset after a status change"
+    # Fixed polling at poll_min would need ~40 rounds for the same job
+    assert result["polls"] < 15, result["polls"]
+    assert result["api_calls"] == len(client.calls_for("jobs"))
+    assert tracking_exit_code(result) == 0
+    print("✅ adaptive polling tests passed")
+
+
+def test_many_jobs_failure_and_timeout():
+    """Test batched status queries, failed jobs and timeouts map to exit codes."""
+    print("\nTesting job tracking outcomes...")
+    client = FakeMLClient(default_latency=0.05)
+    client.add_job("ok", [(0.0, "Running"), (0.1, "Completed")])
+    client.add_job("bad", [(0.0, "Running"), (0.1, "Failed")],
+                   steps={"train": [(0.0, "Running"), (0.1, "Failed")]})
+    client.add_job("ok2", [(0.0, "Queued"), (0.1, "Completed")])
+    result = track_jobs(client, ["ok", "bad", "ok2"], poll_min=0.05, poll_max=0.1)
+    assert result["jobs"]["bad"]["status"] == "Failed"
+    assert result["jobs"]["bad"]["steps"] == {"train": "Failed"}
+    assert tracking_exit_code(result) == 1
+
+    # One listing page per round covers all three; steps are listed only when a job's status moves
+    assert not client.calls_for("jobs", "get"), "Statuses come from the job listing"
+    assert len(client.calls_for("jobs", "list_page")) == result["polls"]
+    step_lists = [c["name"] for c in client.calls_for("jobs", "list")]
+    assert all(step_lists.count(name) <= 2 for name in ("ok", "bad", "ok2")), step_lists
+    assert result["api_calls"] == len(client.calls_for("jobs"))
+
+    # Jobs beyond the first page are fetched individually, together
+    paged = FakeMLClient(default_latency=0.05, page_size=1)
+    for name in ("old1", "old2", "new"):
+        paged.add_job(name, [(0.0, "Running"), (0.1, "Completed")])
+    result = track_jobs(paged, ["old1", "old2", "new"], poll_min=0.05, poll_max=0.1, with_steps=False)
+    assert tracking_exit_code(result) == 0
+    first_round = sorted(paged.calls_for("jobs", "get"), key=lambda c: c["start"])[:2]
+    assert {c["name"] for c in first_round} == {"old1", "old2"}, first_round
+    assert max(c["start"] for c in first_round) < min(c["end"] for c in first_round), \
+        "Status queries for jobs off the first page should go out together"
+    assert result["api_calls"] == len(paged.calls_for("jobs"))
+
+    client.add_job("stuck", [(0.0, "Queued")])
+    result = track_jobs(client, ["stuck"], poll_min=0.02, poll_max=0.05, timeout=0.2)
+    assert result["jobs"]["stuck"]["status"] == "TimedOut(Queued)"
+    assert tracking_exit_code(result) == EXIT_TIMEOUT
+    print("✅ job tracking outcome tests passed")
+
+
+def main():
+    """Run all tests."""
+    print("=" * 60)
+    print("Running Pipeline Sweep Tests")
+    print("=" * 60)
+
+    try:
+        test_grid_expansion()
+        test_overrides_must_be_declared()
+        test_sweep_concurrency_cap_and_manifest()
+        test_throttling_retry_and_failures()
+        test_adaptive_polling()
+        test_many_jobs_failure_and_timeout()
+
+        print("\n" + "=" * 60)
+        print("✅ All tests passed successfully!")
+        print("=" * 60)
+        return 0
+
+    except AssertionError as e:
+        print(f"\n❌ Test failed: {e}")
+        return 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,309 @@
+#!/usr/bin/env python3
+"""
+Tests for the local pipeline runner using a throwaway pipeline and components.
+"""
+
+import json
+import os
+import shutil
+import sys
+import tempfile
+
+sys.path.insert(0, os.path.dirname(__file__))
+from run_pipeline_local import PipelineError, load_steps, run_pipeline
+from step_cache import StepCache, command_files
+
+# Copies its input file into its output folder, tagging it with --tag, after sleeping
+STEP_SCRIPT = '''
+import argparse, os, shutil, sys, time
+parser = argparse.ArgumentParser()
+parser.add_argument("--src", action="append", default=[])
+parser.add_argument("--out")
+parser.add_argument("--tag")
+parser.add_argument("--sleep", type=float, default=0.0)
+parser.add_argument("--fail", action="store_true")
+args = parser.parse_args()
+time.sleep(args.sleep)
+if args.fail:
+    sys.exit(3)
+os.makedirs(args.out, exist_ok=True)
+lines = []
+for src in args.src:
+    path = os.path.join(src, "data.txt") if os.path.isdir(src) else src
+    with open(path) as f:
+        lines.append(f.read().strip())
+with open(os.path.join(args.out, "data.txt"), "w") as f:
+    f.write("|".join(lines + [args.tag]))
+'''
+
+COMPONENT = '''
+name: {name}
+version: 1
+type: command
+code: ./src
+command: >-
+  python step.py {sources} --out ${{{{outputs.result}}}} --tag {name}
+  --sleep ${{{{inputs.sleep}}}} $[[--fail_flag ${{{{inputs.never_set}}}}]] {extra}
+inputs:
+{inputs}
+  sleep:
+    type: number
+    default: 0.4
+outputs:
+  result:
+    type: uri_folder
+'''
+
+PIPELINE = '''
+type: pipeline
+inputs:
+  raw:
+    type: uri_file
+    path: raw.txt
+outputs:
+  final:
+    type: uri_folder
+jobs:
+  left:
+    type: command
+    component: azureml:left:1
+    inputs:
+      a: ${{parent.inputs.raw}}
+  right:
+    type: command
+    component: azureml:right:1
+    inputs:
+      a: ${{parent.inputs.raw}}
+  join:
+    type: command
+    component: azureml:join:1
+    inputs:
+      a: ${{parent.jobs.left.outputs.result}}
+      b: ${{jobs.right.outputs.result}}
+    outputs:
+      result: ${{parent.outputs.final}}
+'''
+
+
+def _write_pipeline(tmp, failing=None):
+    os.makedirs(os.path.join(tmp, "src"))
+    with open(os.path.join(tmp, "src", "step.py"), "w") as f:
+        f.write(STEP_SCRIPT)
+    with open(os.path.join(tmp, "raw.txt"), "w") as f:
+        f.write("raw")
+    one_input = "  a:\n    type: uri_file"
+    two_inputs = one_input + "\n  b:\n    type: uri_folder"
+    for name, sources, inputs in [("left", "--src ${{inputs.a}}", one_input),
+                                  ("right", "--src ${{inputs.a}}", one_input),
+                                  ("join", "--src ${{inputs.a}} --src ${{inputs.b}}", two_inputs)]:
+        with open(os.path.join(tmp, f"{name}.yml"), "w") as f:
+            f.write(COMPONENT.format(name=name, sources=sources, inputs=inputs,
+                                     extra="--fail" if name == failing else ""))
+    path = os.path.join(tmp, "pipeline.yml")
+    with open(path, "w") as f:
+        f.write(PIPELINE)
+    return path
+
+
+def test_parallel_branches_and_bindings():
+    """Test independent steps overlap and outputs flow through parent/job bindings."""
+    print("Testing parallel branches...")
+    tmp = tempfile.mkdtemp()
+    try:
+        pipeline = _write_pipeline(tmp)
+        summary = run_pipeline(pipeline, os.path.join(tmp, "run"), max_parallel=4)
+        assert summary["status"] == "completed", json.dumps(summary, indent=2)
+        steps = summary["steps"]
+        assert steps["left"]["start_s"] < steps["right"]["end_s"] and steps["right"]["start_s"] < steps["left"]["end_s"], \
+            "left and right should run concurrently"
+        assert steps["join"]["start_s"] >= max(steps["left"]["end_s"], steps["right"]["end_s"])
+        assert summary["wall_time_s"] < summary["sum_step_time_s"]
+
+        with open(os.path.join(tmp, "run", "outputs", "final", "data.txt")) as f:
+            assert f.read() == "raw|left|raw|right|join"
+        assert os.path.exists(os.path.join(tmp, "run", "timeline.json"))
+    finally:
+        shutil.rmtree(tmp)
+    print("✅ parallel branch tests passed")
+
+
+def test_failure_skips_dependents():
+    """Test a failed step skips its dependents but not independent branches."""
+    print("\nTesting failure handling...")
+    tmp = tempfile.mkdtemp()
+    try:
+        pipeline = _write_pipeline(tmp, failing="left")
+        summary = run_pipeline(pipeline, os.path.join(tmp, "run"))
+        assert summary["status"] == "failed"
+        assert summary["steps"]["left"]["status"] == "failed"
+        assert summary["steps"]["left"]["returncode"] == 3
+        assert summary["steps"]["right"]["status"] == "completed"
+        assert summary["steps"]["join"]["status"] == "skipped"
+    finally:
+        shutil.rmtree(tmp)
+    print("✅ failure handling tests passed")
+
+
+def test_step_cache_reuse_and_invalidation():
+    """Test unchanged steps are reused, changed inputs rerun, and the cache is evicted by size."""
+    print("\nTesting step cache...")
+    tmp = tempfile.mkdtemp()
+    try:
+        pipeline = _write_pipeline(tmp)
+        cache = StepCache(os.path.join(tmp, "cache"), search_dirs=[tmp])
+        first = run_pipeline(pipeline, os.path.join(tmp, "run1"), cache=cache)
+        assert first["status"] == "completed" and first["reused_steps"] == []
+        assert len(cache.entries()) == 3
+
+        second = run_pipeline(pipeline, os.path.join(tmp, "run2"), cache=cache)
+        assert second["status"] == "completed"
+        assert second["reused_steps"] == ["left", "right", "join"], second["reused_steps"]
+        assert second["time_saved_s"] >= 3 * 0.4
+        assert second["wall_time_s"] < first["wall_time_s"]
+        with open(os.path.join(tmp, "run2", "outputs", "final", "data.txt")) as f:
+            assert f.read() == "raw|left|raw|right|join"
+
+        # Another script in the shared code folder is not part of any step's key
+        with open(os.path.join(tmp, "src", "register.py"), "w") as f:
+            f.write("print('registered')\n")
+        unrelated = run_pipeline(pipeline, os.path.join(tmp, "run2b"), cache=cache)
+        assert unrelated["reused_steps"] == ["left", "right", "join"], unrelated["reused_steps"]
+
+        # Changing the right branch's code reruns it and the join, but not the left branch
+        with open(os.path.join(tmp, "right.yml")) as f:
+            component = f.read()
+        with open(os.path.join(tmp, "right.yml"), "w") as f:
+            f.write(component.replace("--tag right", "--tag right2"))
+        third = run_pipeline(pipeline, os.path.join(tmp, "run3"), cache=cache)
+        assert third["reused_steps"] == ["left"], third["reused_steps"]
+        with open(os.path.join(tmp, "run3", "outputs", "final", "data.txt")) as f:
+            assert f.read() == "raw|left|raw|right2|join"
+
+        # A component with side effects always runs; its unchanged output still lets join be reused
+        with open(os.path.join(tmp, "right.yml"), "a") as f:
+            f.write("is_deterministic: false\n")
+        fourth = run_pipeline(pipeline, os.path.join(tmp, "run4"), cache=cache)
+        assert fourth["reused_steps"] == ["left", "join"], fourth["reused_steps"]
+        assert fourth["steps"]["right"]["not_cached"] == "is_deterministic: false"
+
+        # A tiny size limit evicts the least recently used entries until the rest fit
+        cache.max_bytes = 1
+        cache.store("0" * 64, "empty", {}, 0.0)
+        assert [m["step"] for m in cache.entries()] == ["empty"], cache.entries()
+    finally:
+        shutil.rmtree(tmp)
+    print("✅ step cache tests passed")
+
+
+def test_restore_pins_entry():
+    """Test an entry being restored is not evicted until its outputs are copied."""
+    print("\nTesting restore during eviction...")
+    import threading
+    import step_cache
+
+    tmp = tempfile.mkdtemp()
+    copy = step_cache._copy
+    try:
+        cache = StepCache(os.path.join(tmp, "cache"))
+        source = os.path.join(tmp, "out")
+        os.makedirs(source)
+        for i in range(20):
+            with open(os.path.join(source, f"part{i}.txt"), "w") as f:
+                f.write("x" * 1000)
+        cache.store("a" * 64, "left", {"data": source}, 1.0)
+
+        copying, evicted = threading.Event(), threading.Event()
+
+        def slow_copy(src, dst):
+            copying.set()
+            evicted.wait(5)
+            copy(src, dst)
+
+        step_cache._copy = slow_copy
+        restored = {}
+        thread = threading.Thread(target=lambda: restored.update(
+            meta=cache.restore("a" * 64, {"data": os.path.join(tmp, "restored")})))
+        thread.start()
+        assert copying.wait(5)
+        # Another step finishes and the size limit would evict the entry mid-copy
+        cache.max_bytes = 1
+        cache.store("b" * 64, "right", {}, 0.0)
+        assert "a" * 64 in [m["key"] for m in cache.entries()], "a pinned entry was evicted"
+        evicted.set()
+        thread.join()
+        assert restored["meta"]["step"] == "left"
+        assert len(os.listdir(os.path.join(tmp, "restored"))) == 20
+        assert cache.entries() == [], "the deferred eviction runs once the entry is released"
+    finally:
+        step_cache._copy = copy
+        shutil.rmtree(tmp)
+    print("✅ restore pin tests passed")
+
+
+def test_command_files():
+    """Test the code key follows a command's scripts and their local imports only."""
+    print("\nTesting command code files...")
+    tmp = tempfile.mkdtemp()
+    try:
+        files = {"train.py": "import os\nimport helpers\nfrom pkg import tools\n",
+                 "register.py": "import helpers\n", "helpers.py": "import numpy\n",
+                 os.path.join("pkg", "__init__.py"): "", os.path.join("pkg", "tools.py"): "from . import extra\n",
+                 os.path.join("pkg", "extra.py"): "", "score.py": "import broken(\n"}
+        for name, text in files.items():
+            os.makedirs(os.path.dirname(os.path.join(tmp, name)), exist_ok=True)
+            with open(os.path.join(tmp, name), "w") as f:
+                f.write(text)
+        found = [os.path.relpath(p, tmp) for p in command_files("python train.py --data ${{inputs.x}}", tmp)]
+        assert found == sorted(["train.py", "helpers.py", os.path.join("pkg", "__init__.py"),
+                                os.path.join("pkg", "tools.py"), os.path.join("pkg", "extra.py")]), found
+        found = [os.path.relpath(p, tmp) for p in command_files("python -m score --x 1", tmp)]
+        assert found == ["score.py"], "unparsable scripts still count themselves"
+        assert command_files("bash run.sh", tmp) is None, "no script falls back to the whole folder"
+    finally:
+        shutil.rmtree(tmp)
+    print("✅ command code file tests passed")
+
+
+def test_unknown_component():
+    """Test a missing registered component is reported."""
+    print("\nTesting unknown component...")
+    tmp = tempfile.mkdtemp()
+    try:
+        pipeline = _write_pipeline(tmp)
+        os.remove(os.path.join(tmp, "join.yml"))
+        try:
+            load_steps(pipeline, [])
+            assert False, "Expected PipelineError"
+        except PipelineError as e:
+            assert "azureml:join:1" in str(e)
+    finally:
+        shutil.rmtree(tmp)
+    print("✅ unknown component tests passed")
+
+
+def main():
+    """Run all tests."""
+    print("=" * 60)
+    print("Running Local Pipeline Runner Tests")
+    print("=" * 60)
+
+    try:
+        test_parallel_branches_and_bindings()
+        test_failure_skips_dependents()
+        test_step_cache_reuse_and_invalidation()
+        test_restore_pins_entry()
+        test_command_files()
+        test_unknown_component()
+
+        print("\n" + "=" * 60)
+        print("✅ All tests passed successfully!")
+        print("=" * 60)
+        return 0
+
+    except AssertionError as e:
+        print(f"\n❌ Test failed: {e}")
+        return 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
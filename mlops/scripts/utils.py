@@ -1,5 +1,13 @@
-import json
 import os
+import sys
+
+# The shared config lives in mlops/config; make it importable from the scripts folder
+REPO_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), "..", ".."))
+if REPO_ROOT not in sys.path:
+    sys.path.insert(0, REPO_ROOT)
+
+from mlops.config import get_config, get_credential, get_ml_client  # noqa: E402
+from mlops.config import load_credentials as _load_credentials  # noqa: E402
 
 
 def load_credentials(path="mlops/config/azure_credentials.json"):
@@ -13,8 +21,4 @@ def load_credentials(path="mlops/config/azure_credentials.json"):
     Returns:
         dict: Dictionary containing the loaded credentials.
     """
-    with open(path) as f:
-        creds = json.load(f)
-    for key, value in creds.items():
-        os.environ[key] = value
-    return creds
+    return _load_credentials(path)
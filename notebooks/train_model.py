@@ -7,6 +7,9 @@ from sklearn.metrics import mean_squared_error
 import mlflow
 import mlflow.sklearn
 
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "data-science", "src"))
+from instrumentation import RunRecorder  # shipped next to this script by azureml_jobs/train_job.py
+
 def parse_args():
     parser = argparse.ArgumentParser(description="Train Random Forest Regressor")
     parser.add_argument("--train_data", required=True, help="Path to training CSV")
@@ -14,6 +17,7 @@ def parse_args():
     parser.add_argument("--n_estimators", type=int, default=100)
     parser.add_argument("--max_depth", type=int, default=None)
     parser.add_argument("--model_output", required=True, help="Directory to save MLflow model")
+    parser.add_argument("--metrics_output", default="outputs", help="Directory for run_metrics.json")
     return parser.parse_args()
 
 def ensure_dir(path):
@@ -27,10 +31,12 @@ def write_json(path, data):
     except Exception as e:
         print(f"[WARN] Failed to write diagnostics: {e}", flush=True)
 
-def load_data(path):
+def load_data(path, run):
     if not os.path.exists(path):
         raise FileNotFoundError(f"File not found: {path}")
-    df = pd.read_csv(path)
+    with run.span("read_csv", path=path) as span:
+        df = pd.read_csv(path)
+        span.rows = df.shape[0]
     if df.shape[0] == 0:
         raise ValueError("CSV contains zero rows")
     return df
@@ -38,10 +44,11 @@ def load_data(path):
 def main():
     args = parse_args()
     print(f"[DEBUG] Parsed args: {vars(args)}", flush=True)
+    run = RunRecorder("train_model", args.metrics_output, params=vars(args))
 
     try:
-        df_train = load_data(args.train_data)
-        df_test = load_data(args.test_data)
+        df_train = load_data(args.train_data, run)
+        df_test = load_data(args.test_data, run)
 
         X_train = df_train.drop("price", axis=1)
         y_train = df_train["price"]
@@ -55,17 +62,20 @@ def main():
         )
 
         mlflow.start_run()
-        model.fit(X_train, y_train)
-        y_pred = model.predict(X_test)
+        with run.span("fit", rows=X_train.shape[0]):
+            model.fit(X_train, y_train)
+        with run.span("predict", rows=X_test.shape[0]):
+            y_pred = model.predict(X_test)
         mse = mean_squared_error(y_test, y_pred)
 
         mlflow.log_param("n_estimators", args.n_estimators)
         mlflow.log_param("max_depth", args.max_depth)
         mlflow.log_metric("mse", mse)
-        mlflow.sklearn.log_model(model, artifact_path="model")
+        with run.span("serialize"):
+            mlflow.sklearn.log_model(model, artifact_path="model")
 
-        ensure_dir(args.model_output)
-        mlflow.sklearn.save_model(model, args.model_output)
+            ensure_dir(args.model_output)
+            mlflow.sklearn.save_model(model, args.model_output)
 
         diagnostics = {
             "status": "completed",
@@ -81,10 +91,12 @@ def main():
 
         print(f"✅ Model trained. MSE: {mse:.4f}", flush=True)
         mlflow.end_run()
+        run.finish("completed")
         sys.exit(0)
 
     except Exception as e:
         traceback.print_exc()
+        run.finish("failed", str(e))
         write_json(".", {"status": "failed", "exception": str(e)})
         sys.exit(1)
 
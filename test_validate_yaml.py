@@ -0,0 +1,293 @@
+#!/usr/bin/env python3
+"""
+Tests for validate_yaml.py: single parse per file, the result cache,
+parallel validation, cross-file reference checks, watch mode and
+git-diff-scoped validation.
+"""
+
+import os
+import subprocess
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+import validate_yaml
+from validate_yaml import ReferenceIndex, TreeWatcher, ValidationCache, check_file, validate_files
+from validate_yaml import git_changed_files, validate_scope
+
+PIPELINE = """$schema: https://azuremlschemas.azureedge.net/latest/pipelineJob.schema.json
+type: pipeline
+display_name: test-pipeline
+jobs:
+  train:
+    type: command
+    component: azureml:train_model_component:1
+"""
+
+COMPONENT = """$schema: https://azuremlschemas.azureedge.net/latest/commandComponent.schema.json
+type: command
+name: train_model_component
+command: python train.py
+environment: azureml:used-cars-env:1
+"""
+
+
+def write(path, text):
+    os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+    with open(path, 'w', encoding='utf-8') as f:
+        f.write(text)
+    return path
+
+
+def test_check_file():
+    """Test that one parse produces the same report as before."""
+    print("Testing single-parse file checks...")
+    with tempfile.TemporaryDirectory() as tmp:
+        result = check_file(write(os.path.join(tmp, "pipeline.yml"), PIPELINE))
+        assert result['valid'] and len(result['sha256']) == 64, result
+        assert result['messages'][:2] == ["✅ YAML syntax is valid", "ℹ️  Validated as: Azure ML Pipeline"]
+
+        broken = check_file(write(os.path.join(tmp, "broken.yml"), "jobs: [unclosed\n"))
+        assert not broken['valid'] and broken['messages'][0].startswith("❌ YAML syntax error"), broken
+
+        missing = check_file(os.path.join(tmp, "missing.yml"))
+        assert not missing['valid'] and missing['sha256'] is None, missing
+        assert validate_yaml.validate_file(os.path.join(tmp, "pipeline.yml")) is True
+        assert validate_yaml.validate_yaml_syntax(os.path.join(tmp, "pipeline.yml")) == \
+            (True, "✅ YAML syntax is valid")
+        valid, message = validate_yaml.validate_yaml_syntax(os.path.join(tmp, "broken.yml"))
+        assert not valid and message.startswith("❌ YAML syntax error"), message
+    print("✅ single-parse file check tests passed")
+
+
+def test_cache():
+    """Test that unchanged files come from the cache and edited ones are parsed again."""
+    print("\nTesting the validation cache...")
+    with tempfile.TemporaryDirectory() as tmp:
+        files = [write(os.path.join(tmp, f"c{i}.yml"), COMPONENT) for i in range(5)]
+        cache_path = os.path.join(tmp, "cache.json")
+
+        results, stats = validate_files(files, cache=ValidationCache(cache_path), jobs=1)
+        assert stats['parsed'] == 5 and stats['cached'] == 0, stats
+        assert all(r['valid'] for r in results)
+
+        results, stats = validate_files(files, cache=ValidationCache(cache_path), jobs=1)
+        assert stats['parsed'] == 0 and stats['cached'] == 5, stats
+        assert [r['path'] for r in results] == files
+
+        # A touched file is matched by content hash; an edited one is parsed
+        future = time.time() + 10
+        os.utime(files[0], (future, future))
+        write(files[1], COMPONENT.replace("command: python train.py\n", ""))
+        results, stats = validate_files(files, cache=ValidationCache(cache_path), jobs=1)
+        assert stats['parsed'] == 1 and stats['cached'] == 4, stats
+        assert "❌ Command component missing 'command' field" in results[1]['messages'], results[1]
+
+        # Results of another version of the rules are not reused
+        cache = ValidationCache(cache_path)
+        cache.version = "other"
+        cache.dirty = True
+        cache.save()
+        _, stats = validate_files(files, cache=ValidationCache(cache_path), jobs=1)
+        assert stats['parsed'] == 5, stats
+    print("✅ validation cache tests passed")
+
+
+def test_parallel():
+    """Test that the process pool returns the same results, in order."""
+    print("\nTesting parallel validation...")
+    with tempfile.TemporaryDirectory() as tmp:
+        count = validate_yaml.PARALLEL_MIN_FILES + 8
+        files = [write(os.path.join(tmp, f"f{i:03d}.yml"), PIPELINE if i % 2 else "a: [1\n") for i in range(count)]
+        parallel, stats = validate_files(files, jobs=2)
+        assert stats['workers'] == 2 and stats['parsed'] == count, stats
+        serial, stats = validate_files(files, jobs=1)
+        assert stats['workers'] == 1
+        assert parallel == serial
+        assert [r['valid'] for r in parallel] == [bool(i % 2) for i in range(count)]
+    print("✅ parallel validation tests passed")
+
+
+def test_reference_index():
+    """Test that references resolve against the definitions of every file."""
+    print("\nTesting cross-file references...")
+    with tempfile.TemporaryDirectory() as tmp:
+        os.makedirs(os.path.join(tmp, "src"))
+        write(os.path.join(tmp, "components", "train.yml"),
+              COMPONENT.replace("command: python", "version: 1\ncode: ../src\ncommand: python"))
+        write(os.path.join(tmp, "env.yml"), "$schema: https://azuremlschemas.azureedge.net/latest/"
+                                            "environment.schema.json\nname: used-cars-env\nimage: python\n")
+        write(os.path.join(tmp, "a", "prep.yml"), COMPONENT.replace("train_model_component", "prep_component"))
+        write(os.path.join(tmp, "b", "prep.yml"), COMPONENT.replace("train_model_component", "prep_component")
+              .replace("azureml:used-cars-env:1", "azureml:used-cars-env@latest\ncode: ./missing"))
+        write(os.path.join(tmp, "pipeline.yml"), PIPELINE + """  prep:
+    type: command
+    component: azureml:prep_component:1
+  score:
+    type: command
+    component: azureml:score_component:1
+  train_v2:
+    type: command
+    component: azureml:train_model_component:2
+  local:
+    type: command
+    component: ./components/train.yml
+  not_a_component:
+    type: command
+    component: ./pipeline.yml
+inputs:
+  raw: azureml:used-cars-data:1
+  local_csv:
+    type: uri_file
+    path: data/used_cars.csv
+  remote:
+    type: uri_folder
+    path: azureml://datastores/workspaceblobstore/paths/raw
+""")
+        paths = sorted(os.path.join(root, f) for root, _, files in os.walk(tmp) for f in files)
+        results, _ = validate_files(paths, jobs=1)
+        index = ReferenceIndex(results)
+        by_name = {os.path.relpath(r['path'], tmp): r for r in results}
+
+        assert by_name["components/train.yml"]['definition'] == \
+            {'kind': 'component', 'name': 'train_model_component', 'version': '1'}
+        assert index.check(by_name["components/train.yml"]) == [], "code path and environment resolve"
+        assert index.check(by_name["env.yml"]) == []
+
+        messages = index.check(by_name["pipeline.yml"])
+        text = "\n".join(messages)
+        assert len(messages) == 6, text
+        assert "jobs.train.component" not in text, "azureml:train_model_component:1 resolves"
+        assert "jobs.prep.component: azureml:prep_component:1 is ambiguous" in text
+        assert "no component 'score_component' is defined in the repo" in text
+        assert "'train_model_component' is only defined with version(s) 1" in text
+        assert "jobs.local.component" not in text, "component YAML paths resolve"
+        assert "❌ jobs.not_a_component.component: './pipeline.yml' is not a component definition" in text
+        assert "no data 'used-cars-data' is defined" in text
+        assert "❌ inputs.local_csv.path: 'data/used_cars.csv' does not resolve" in text
+        assert "remote" not in text, "datastore URIs are not local paths"
+
+        assert index.check(by_name["b/prep.yml"]) == [
+            "❌ code: './missing' does not resolve (%s not found)" % os.path.join(tmp, "b", "missing")]
+        assert index.stats['references'] == 12 and index.stats['dangling'] == 6, index.stats
+        assert index.stats['ambiguous'] == 1, index.stats
+        assert index.stats['errors'] == 5, "undefined assets are not errors: %s" % index.stats
+    print("✅ cross-file reference tests passed")
+
+
+def test_watch():
+    """Test that a poll re-checks changed files and the files that reference them."""
+    print("\nTesting watch mode...")
+    with tempfile.TemporaryDirectory() as tmp:
+        component = write(os.path.join(tmp, "train.yml"),
+                          COMPONENT.replace("command: python", "version: 1\ncommand: python"))
+        pipeline = write(os.path.join(tmp, "pipeline.yml"), PIPELINE)
+        other = write(os.path.join(tmp, "other.yml"), "name: unrelated\n")
+        watcher = TreeWatcher(tmp)
+        assert sorted(watcher.results) == sorted([component, pipeline, other])
+        assert watcher.poll() is None, "nothing changed"
+
+        # Bumping the component's version leaves the pipeline's reference dangling
+        write(component, COMPONENT.replace("command: python", "version: 2\ncommand: python"))
+        os.utime(component, ns=(time.time_ns() + 10**9, time.time_ns() + 10**9))
+        update = watcher.poll()
+        assert update['changed'] == [component] and update['dependents'] == [pipeline], update
+        reports = dict((result['path'], messages) for result, messages in update['reports'])
+        assert "only defined with version(s) 2" in reports[pipeline][0], reports
+        assert watcher.poll() is None
+
+        # Removing it: the pipeline is reported again; a new file is picked up
+        os.remove(component)
+        added = write(os.path.join(tmp, "sub", "broken.yml"), "a: [1\n")
+        update = watcher.poll()
+        assert update['removed'] == [component] and update['changed'] == [added], update
+        assert update['dependents'] == [pipeline], update
+        reports = dict((result['path'], (result, messages)) for result, messages in update['reports'])
+        assert "no component 'train_model_component' is defined" in reports[pipeline][1][0]
+        assert not reports[added][0]['valid']
+        assert other not in reports
+    print("✅ watch mode tests passed")
+
+
+def test_git_scope():
+    """Test that only changed files and the YAMLs related to them are parsed."""
+    print("\nTesting git-diff-scoped validation...")
+    cwd = os.getcwd()
+    with tempfile.TemporaryDirectory() as tmp:
+        try:
+            os.chdir(tmp)
+            git = lambda *args: subprocess.run(['git', '-c', 'user.name=test', '-c', 'user.email=test@example.com',
+                                                *args], check=True, capture_output=True)
+            git('init', '-q', '.')
+            write("components/train.yml", COMPONENT.replace("command: python", "version: 1\ncommand: python"))
+            write("environments/used-cars-env.yml", "$schema: https://azuremlschemas.azureedge.net/latest/"
+                                           "environment.schema.json\nname: used-cars-env\nimage: python\n")
+            write("pipelines/train.yml", PIPELINE)
+            write("pipelines/local.yml", PIPELINE.replace("azureml:train_model_component:1", "../components/train.yml"))
+            for i in range(10):
+                write(f"unrelated/u{i}.yml", f"name: unrelated_{i}\ntype: command\ncommand: echo\n")
+            git('add', '-A')
+            git('commit', '-qm', 'initial')
+            assert git_changed_files(staged=True) == [] and git_changed_files('HEAD') == []
+
+            write("components/train.yml", COMPONENT.replace("command: python", "version: 2\ncommand: python"))
+            write("notes.yml", "draft: true\n")
+            assert git_changed_files('HEAD') == ["components/train.yml", "notes.yml"], "untracked files count"
+            git('add', 'components/train.yml')
+            changed = git_changed_files(staged=True)
+            assert changed == ["components/train.yml"], changed
+
+            results, index, stats = validate_scope(changed)
+            reported = [os.path.normpath(r['path']) for r in results]
+            assert reported[0] == os.path.normpath("components/train.yml")
+            assert sorted(reported[1:]) == sorted(os.path.normpath(p) for p in
+                                                  ["environments/used-cars-env.yml", "pipelines/train.yml",
+                                                   "pipelines/local.yml"]), reported
+            assert stats['parsed'] == 4 and stats['tree_files'] == 15, stats
+            pipeline = next(r for r in results if r['path'].endswith(os.path.join("pipelines", "train.yml")))
+            assert "only defined with version(s) 2" in index.check(pipeline)[0]
+
+            # The pre-commit hook: the version bump fails the run only with --strict
+            script = os.path.join(os.path.dirname(os.path.abspath(__file__)), "validate_yaml.py")
+            hook = lambda *flags: subprocess.run([sys.executable, script, '--staged', '--no_cache', *flags],
+                                                 capture_output=True, text=True)
+            assert hook().returncode == 0
+            strict = hook('--strict')
+            assert strict.returncode == 1 and "reference error(s) (--strict)" in strict.stdout, strict.stdout
+        finally:
+            os.chdir(cwd)
+    print("✅ git-diff-scoped validation tests passed")
+
+
+def main():
+    """Run all tests."""
+    print("=" * 60)
+    print("Running YAML Validation Tests")
+    print("=" * 60)
+
+    try:
+        test_check_file()
+        test_cache()
+        test_parallel()
+        test_reference_index()
+        test_watch()
+        test_git_scope()
+
+        print("\n" + "=" * 60)
+        print("✅ All tests passed successfully!")
+        print("=" * 60)
+        return 0
+
+    except AssertionError as e:
+        print(f"\n❌ Test failed: {e}")
+        return 1
+    except Exception as e:
+        print(f"\n❌ Unexpected error: {e}")
+        import traceback
+        traceback.print_exc()
+        return 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -8,18 +8,48 @@ This script helps validate YAML files for:
 - GitHub Actions workflows
 - Conda environment files
 
+Each file is read and parsed once (with the LibYAML CSafeLoader when PyYAML
+was built with it). Results are cached in .validate_yaml_cache.json, keyed on
+path, size, mtime and content hash, so unchanged files are not parsed again;
+the cache is dropped whenever this script changes. With many files to parse,
+they are validated in a process pool.
+
+References between files are resolved against an index of every YAML in
+the repo: azureml:<name>[:<version>] components, environments and data
+assets, component YAML paths, and local code/conda_file/input paths.
+Unresolved and ambiguous references are reported per file.
+
+--watch keeps running after the first pass: it polls size/mtime snapshots
+of the tree and re-validates changed files plus the files that reference
+them.
+
+--staged and --changed [REF] validate only the YAMLs git reports as changed,
+plus the YAMLs they reference or are referenced by. Related files are found
+by searching the raw text of the tree for the names involved, so the rest of
+the tree is not parsed.
+
 Usage:
     python validate_yaml.py <file_path>
     python validate_yaml.py --all  # Validate all YAML files in the project
+    python validate_yaml.py --all --jobs 8 --no_cache
+    python validate_yaml.py --watch  # Re-validate files as they are saved
+    python validate_yaml.py --staged  # Staged files and related YAMLs (pre-commit)
 
 Example:
     python validate_yaml.py mlops/azureml/train/newpipeline.yml
 """
 
 import argparse
+import hashlib
+import json
 import sys
 import os
-from typing import List, Tuple
+import re
+import subprocess
+import time
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime
+from typing import Dict, List, Optional, Tuple
 
 try:
     import yaml
@@ -28,10 +58,20 @@ except ImportError:
     print("Please install it with: pip install pyyaml")
     sys.exit(1)
 
+# LibYAML parser when available (several times faster than the pure-Python one)
+SafeLoader = getattr(yaml, 'CSafeLoader', yaml.SafeLoader)
+
+DEFAULT_CACHE_FILE = '.validate_yaml_cache.json'
+PARALLEL_MIN_FILES = 32  # below this, starting a process pool costs more than it saves
+
+# Named Azure ML references: azureml:<name>, azureml:<name>:<version>, azureml:<name>@<label>
+ASSET_REFERENCE = re.compile(r'^azureml:(?!//)([^:@/\s]+)(?::([^@\s]+)|@(\w+))?$')
+LOCAL_PATH_KEYS = ('code', 'conda_file')  # resolved relative to the YAML file
+
 
 def validate_yaml_syntax(file_path: str) -> Tuple[bool, str]:
     """
-    Validate YAML syntax for a given file.
+    Validate YAML syntax for a given file (the syntax line of check_file).
     
     Args:
         file_path: Path to the YAML file
@@ -39,14 +79,8 @@ def validate_yaml_syntax(file_path: str) -> Tuple[bool, str]:
     Returns:
         Tuple of (is_valid, message)
     """
-    try:
-        with open(file_path, 'r', encoding='utf-8') as f:
-            yaml.safe_load(f)
-        return True, "✅ YAML syntax is valid"
-    except yaml.YAMLError as e:
-        return False, f"❌ YAML syntax error: {e}"
-    except Exception as e:
-        return False, f"❌ Error reading file: {e}"
+    message = check_file(file_path)['messages'][0]
+    return message.startswith("✅"), message
 
 
 def check_azure_ml_schema(file_path: str, content: dict) -> List[str]:
@@ -184,70 +218,586 @@ def check_conda_env(content: dict) -> List[str]:
     return messages
 
 
-def validate_file(file_path: str) -> bool:
+def extract_definition(content: dict) -> Optional[Dict]:
     """
-    Validate a single YAML file.
+    The asset an Azure ML YAML defines, if any.
     
     Args:
-        file_path: Path to the file
+        content: Parsed YAML content
         
     Returns:
-        True if validation passed, False otherwise
+        Dict with 'kind' (component, environment or data), 'name' and
+        'version' (None if not pinned), or None for jobs and other files
     """
-    print(f"\n📄 Validating: {file_path}")
-    print("=" * 60)
+    name = content.get('name')
+    if not isinstance(name, str):
+        return None
+    schema = str(content.get('$schema', ''))
+    file_type = content.get('type')
+    if 'Component' in schema or (not schema and file_type in ('command', 'parallel') and 'version' in content):
+        kind = 'component'
+    elif 'environment.schema' in schema or (not schema and ('image' in content or 'build' in content)):
+        kind = 'environment'
+    elif 'data.schema' in schema or (not schema and file_type in ('uri_file', 'uri_folder', 'mltable')
+                                     and 'path' in content):
+        kind = 'data'
+    else:
+        return None
+    version = content.get('version')
+    return {'kind': kind, 'name': name, 'version': None if version is None else str(version)}
+
+
+def extract_references(content: dict) -> List[Dict]:
+    """
+    Component, environment, data asset and local path references of an Azure ML YAML.
     
-    # Check syntax
-    is_valid, message = validate_yaml_syntax(file_path)
-    print(message)
+    Args:
+        content: Parsed YAML content
+        
+    Returns:
+        List of dicts with 'kind' (component, environment, data or path),
+        'value' (the reference as written) and 'key' (where it was found)
+    """
+    references = []
+    
+    def add(kind, value, trail):
+        value = value.strip()
+        if kind == 'path':
+            if value and '://' not in value and not value.startswith(('azureml:', '${{')):
+                references.append({'kind': 'path', 'value': value, 'key': '.'.join(trail)})
+        elif ASSET_REFERENCE.match(value):
+            references.append({'kind': kind, 'value': value, 'key': '.'.join(trail)})
+        elif kind == 'component' and value.endswith(('.yml', '.yaml')):
+            references.append({'kind': 'path', 'value': value, 'key': '.'.join(trail)})
+    
+    def walk(obj, trail):
+        if isinstance(obj, list):
+            for index, item in enumerate(obj):
+                walk(item, trail + [str(index)])
+            return
+        if not isinstance(obj, dict):
+            return
+        in_inputs = bool(trail) and trail[-1] == 'inputs'
+        for key, value in obj.items():
+            key = str(key)
+            if isinstance(value, str):
+                if key in ('component', 'environment'):
+                    add(key, value, trail + [key])
+                elif key in LOCAL_PATH_KEYS:
+                    add('path', value, trail + [key])
+                elif in_inputs:
+                    add('data', value, trail + [key])
+                elif key == 'path' and 'inputs' in trail:
+                    add('data' if value.startswith('azureml:') else 'path', value, trail + [key])
+            else:
+                walk(value, trail + [key])
+    
+    walk(content, [])
+    return references
+
+
+def check_file(file_path: str) -> Dict:
+    """
+    Read, parse and check a single YAML file, without printing.
+    
+    Args:
+        file_path: Path to the file
+        
+    Returns:
+        Dict with 'path', 'valid', 'messages' (the report lines) and 'sha256'
+    """
+    result = {'path': file_path, 'valid': False, 'messages': [], 'sha256': None,
+              'definition': None, 'references': []}
+    messages = result['messages']
     
-    if not is_valid:
-        return False
+    # Read once; the bytes are both hashed (for the cache) and parsed
+    try:
+        with open(file_path, 'rb') as f:
+            data = f.read()
+    except Exception as e:
+        messages.append(f"❌ Error reading file: {e}")
+        return result
+    result['sha256'] = hashlib.sha256(data).hexdigest()
     
-    # Load content for deeper validation
     try:
-        with open(file_path, 'r', encoding='utf-8') as f:
-            content = yaml.safe_load(f)
+        content = yaml.load(data, Loader=SafeLoader)
+    except yaml.YAMLError as e:
+        messages.append(f"❌ YAML syntax error: {e}")
+        return result
     except Exception as e:
-        print(f"❌ Could not load YAML: {e}")
-        return False
+        messages.append(f"❌ Could not load YAML: {e}")
+        return result
+    messages.append("✅ YAML syntax is valid")
+    result['valid'] = True
+    
+    # Check if content is a dictionary (some YAMLs might be lists or other types)
+    if not isinstance(content, dict):
+        messages.append("ℹ️  YAML content is not a dictionary")
+        return result
     
     # Determine file type and run appropriate checks
-    messages = []
+    checks = []
     validation_type = None
     
     file_name = os.path.basename(file_path).lower()
     parent_dir = os.path.basename(os.path.dirname(file_path))
     
-    # Check if content is a dictionary (some YAMLs might be lists or other types)
-    if not isinstance(content, dict):
-        messages.append("ℹ️  YAML content is not a dictionary")
-        for msg in messages:
-            print(msg)
-        return True
-    
     if 'workflow' in file_path or parent_dir == 'workflows':
-        messages = check_github_actions(content)
+        checks = check_github_actions(content)
         validation_type = "GitHub Actions Workflow"
     elif 'conda' in file_name or 'environment' in file_name:
-        messages = check_conda_env(content)
+        checks = check_conda_env(content)
         validation_type = "Conda Environment"
     elif content.get('type') in ['pipeline', 'command', 'sweep']:
-        messages = check_azure_ml_schema(file_path, content)
+        checks = check_azure_ml_schema(file_path, content)
         validation_type = f"Azure ML {content.get('type').title()}"
     
-    # Print validation type
+    # Cross-file references are resolved later, against the index of every file
+    # (GitHub Actions workflows are recognised by their trigger, not their folder)
+    if 'on' not in content and True not in content:
+        result['definition'] = extract_definition(content)
+        result['references'] = extract_references(content)
+    
     if validation_type:
-        print(f"ℹ️  Validated as: {validation_type}")
+        messages.append(f"ℹ️  Validated as: {validation_type}")
     
-    # Print validation messages
-    if messages:
-        for msg in messages:
-            print(msg)
+    if checks:
+        messages.extend(checks)
     elif not validation_type:
-        print("ℹ️  No specific validation rules applied")
+        messages.append("ℹ️  No specific validation rules applied")
+    
+    return result
+
+
+def print_result(result: Dict, reference_messages: List[str] = ()) -> None:
+    """Print the report of one checked file (and of its references, if resolved)."""
+    print(f"\n📄 Validating: {result['path']}")
+    print("=" * 60)
+    for message in list(result['messages']) + list(reference_messages):
+        print(message)
+
+
+def validate_file(file_path: str) -> bool:
+    """
+    Validate a single YAML file.
+    
+    Args:
+        file_path: Path to the file
+        
+    Returns:
+        True if validation passed, False otherwise
+    """
+    result = check_file(file_path)
+    print_result(result)
+    return result['valid']
+
+
+class ValidationCache:
+    """
+    Results of check_file() persisted as JSON, keyed on the file path.
+    
+    An entry is reused when size and mtime still match; if only the mtime
+    changed, the content hash decides (e.g. after a checkout or touch).
+    Entries written by a different version of this script are ignored.
+    """
+    
+    def __init__(self, path: str = DEFAULT_CACHE_FILE):
+        self.path = path
+        self.version = _rules_version()
+        self.entries = {}
+        self.dirty = False
+        try:
+            with open(path, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+            if data.get('version') == self.version:
+                self.entries = data.get('files', {})
+        except (OSError, ValueError):
+            pass
+    
+    def get(self, file_path: str) -> Optional[Dict]:
+        entry = self.entries.get(os.path.abspath(file_path))
+        if entry is None:
+            return None
+        try:
+            stat = os.stat(file_path)
+        except OSError:
+            return None
+        if entry['size'] != stat.st_size:
+            return None
+        if entry['mtime_ns'] != stat.st_mtime_ns:
+            with open(file_path, 'rb') as f:
+                if hashlib.sha256(f.read()).hexdigest() != entry['result']['sha256']:
+                    return None
+            entry['mtime_ns'] = stat.st_mtime_ns
+            self.dirty = True
+        return dict(entry['result'], path=file_path)
+    
+    def put(self, result: Dict, stat: os.stat_result) -> None:
+        if result['sha256'] is None:
+            return
+        self.entries[os.path.abspath(result['path'])] = {
+            'size': stat.st_size, 'mtime_ns': stat.st_mtime_ns, 'result': result}
+        self.dirty = True
+    
+    def save(self) -> None:
+        if not self.dirty:
+            return
+        tmp_path = f"{self.path}.tmp"
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump({'version': self.version, 'files': self.entries}, f)
+        os.replace(tmp_path, self.path)
+        self.dirty = False
+
+
+def _rules_version() -> str:
+    """Hash of this script, so edited validation rules invalidate cached results."""
+    with open(os.path.abspath(__file__), 'rb') as f:
+        return hashlib.sha256(f.read()).hexdigest()[:16]
+
+
+def validate_files(file_paths: List[str], cache: ValidationCache = None,
+                   jobs: int = None) -> Tuple[List[Dict], Dict]:
+    """
+    Check files, reusing cached results and parsing the rest in parallel.
+    
+    Args:
+        file_paths: Files to check
+        cache: Optional ValidationCache (updated and saved)
+        jobs: Worker processes (default: CPU count; 1 = in this process)
+        
+    Returns:
+        Tuple of (results in the order of file_paths, stats dict)
+    """
+    started = time.perf_counter()
+    results = {}
+    pending = []
+    for file_path in file_paths:
+        cached = cache.get(file_path) if cache else None
+        if cached is not None:
+            results[file_path] = cached
+        else:
+            pending.append(file_path)
+    
+    # Stat before reading, so a file saved during the run is re-checked next time
+    stats = {}
+    for file_path in pending:
+        try:
+            stats[file_path] = os.stat(file_path)
+        except OSError:
+            pass
+    
+    jobs = jobs or os.cpu_count() or 1
+    parallel = jobs > 1 and len(pending) >= PARALLEL_MIN_FILES
+    if parallel:
+        with ProcessPoolExecutor(max_workers=jobs) as pool:
+            checked = list(pool.map(check_file, pending, chunksize=max(1, len(pending) // (jobs * 4))))
+    else:
+        checked = [check_file(file_path) for file_path in pending]
+    
+    for result in checked:
+        results[result['path']] = result
+        if cache and result['path'] in stats:
+            cache.put(result, stats[result['path']])
+    if cache:
+        cache.save()
+    
+    return [results[file_path] for file_path in file_paths], {
+        'files': len(file_paths),
+        'cached': len(file_paths) - len(pending),
+        'parsed': len(pending),
+        'workers': jobs if parallel else 1,
+        'seconds': time.perf_counter() - started,
+    }
+
+
+class ReferenceIndex:
+    """
+    Repo-wide index of the components, environments and data assets the
+    checked YAML files define, for resolving the references of each file.
+    
+    Building it and checking every reference are both linear: one dict
+    insert per definition, one lookup (or one stat for local paths) per
+    reference.
+    """
+    
+    def __init__(self, results: List[Dict]):
+        self.definitions = {}  # (kind, name) -> [(version, path)]
+        self.files = {}        # absolute path -> definition
+        self.referrers = {}    # (kind, name) or ('path', absolute path) -> paths of the referring files
+        for result in results:
+            definition = result.get('definition')
+            if definition:
+                self.definitions.setdefault((definition['kind'], definition['name']), []).append(
+                    (definition['version'], result['path']))
+                self.files[os.path.abspath(result['path'])] = definition
+            base_dir = os.path.dirname(os.path.abspath(result['path']))
+            for reference in result.get('references', []):
+                self.referrers.setdefault(self._target(reference, base_dir), set()).add(result['path'])
+        # errors: the references --strict fails on (unresolved paths, versions the repo no longer
+        # defines, ambiguous names); assets the repo does not define at all may exist in the workspace
+        self.stats = {'references': 0, 'dangling': 0, 'ambiguous': 0, 'errors': 0}
+    
+    def check(self, result: Dict) -> List[str]:
+        """
+        Resolve the references of one checked file.
+        
+        Args:
+            result: A check_file() result
+            
+        Returns:
+            List of validation messages (empty if every reference resolves)
+        """
+        messages = []
+        base_dir = os.path.dirname(os.path.abspath(result['path']))
+        for reference in result.get('references', []):
+            self.stats['references'] += 1
+            message = self._check_path(reference, base_dir) if reference['kind'] == 'path' \
+                else self._check_asset(reference)
+            if message:
+                messages.append(message)
+        return messages
+    
+    def dependents(self, file_path: str, definitions: List[Optional[Dict]] = ()) -> set:
+        """
+        Files that reference file_path, by path or by an asset name it defines.
+        
+        Args:
+            file_path: A changed, added or removed file
+            definitions: What the file defined (before and after the change)
+            
+        Returns:
+            Set of the referring files' paths
+        """
+        found = set(self.referrers.get(('path', os.path.abspath(file_path)), ()))
+        for definition in definitions:
+            if definition:
+                found |= self.referrers.get((definition['kind'], definition['name']), set())
+        found.discard(file_path)
+        return found
+    
+    @staticmethod
+    def _target(reference: Dict, base_dir: str) -> tuple:
+        if reference['kind'] == 'path':
+            return 'path', os.path.normpath(os.path.join(base_dir, reference['value']))
+        return reference['kind'], ASSET_REFERENCE.match(reference['value']).group(1)
+    
+    def _check_path(self, reference: Dict, base_dir: str) -> Optional[str]:
+        target = os.path.normpath(os.path.join(base_dir, reference['value']))
+        if not os.path.exists(target):
+            self.stats['dangling'] += 1
+            self.stats['errors'] += 1
+            return f"❌ {reference['key']}: '{reference['value']}' does not resolve ({target} not found)"
+        if reference['key'].endswith('component') and self.files.get(target, {}).get('kind') != 'component':
+            self.stats['dangling'] += 1
+            self.stats['errors'] += 1
+            return f"❌ {reference['key']}: '{reference['value']}' is not a component definition"
+        return None
+    
+    def _check_asset(self, reference: Dict) -> Optional[str]:
+        name, version, _ = ASSET_REFERENCE.match(reference['value']).groups()
+        candidates = self.definitions.get((reference['kind'], name), [])
+        matches = [path for defined, path in candidates if version is None or defined in (None, version)]
+        if not matches:
+            self.stats['dangling'] += 1
+            if candidates:
+                self.stats['errors'] += 1
+                versions = ', '.join(sorted(str(defined) for defined, _ in candidates))
+                return (f"⚠️  {reference['key']}: {reference['value']} - {reference['kind']} '{name}' is only "
+                        f"defined with version(s) {versions} in the repo")
+            return (f"⚠️  {reference['key']}: {reference['value']} - no {reference['kind']} '{name}' is defined "
+                    f"in the repo (it must already exist in the workspace)")
+        if len(matches) > 1:
+            self.stats['ambiguous'] += 1
+            self.stats['errors'] += 1
+            return (f"⚠️  {reference['key']}: {reference['value']} is ambiguous - {reference['kind']} '{name}' is "
+                    f"defined in {', '.join(sorted(matches))}")
+        return None
+
+
+class TreeWatcher:
+    """
+    Re-validates a tree as files are saved, by polling mtime snapshots.
+    
+    A poll only lists the directories and stats the YAML files; files are
+    read again only when their size or mtime changed. Changed, added and
+    removed files are re-checked together with the files that reference
+    them (by path or by the asset names they define).
+    """
+    
+    def __init__(self, root_dir: str = '.', cache: ValidationCache = None, jobs: int = None):
+        self.root_dir = root_dir
+        self.cache = cache
+        self.jobs = jobs
+        self.snapshot = self._snapshot()
+        checked, _ = validate_files(sorted(self.snapshot), cache=cache, jobs=jobs)
+        self.results = {result['path']: result for result in checked}
+        self.index = ReferenceIndex(list(self.results.values()))
+    
+    def _snapshot(self) -> Dict[str, tuple]:
+        snapshot = {}
+        for file_path in find_yaml_files(self.root_dir):
+            try:
+                stat = os.stat(file_path)
+            except OSError:
+                continue
+            snapshot[file_path] = (stat.st_size, stat.st_mtime_ns)
+        return snapshot
+    
+    def poll(self) -> Optional[Dict]:
+        """
+        Check the tree once.
+        
+        Returns:
+            None if nothing changed, else a dict with 'changed', 'removed'
+            and 'dependents' (lists of paths), 'reports' (list of
+            (result, reference messages)) and 'seconds'
+        """
+        started = time.perf_counter()
+        snapshot = self._snapshot()
+        changed = sorted(path for path, key in snapshot.items() if self.snapshot.get(path) != key)
+        removed = sorted(path for path in self.snapshot if path not in snapshot)
+        self.snapshot = snapshot
+        if not changed and not removed:
+            return None
+        
+        before = {path: self.results[path].get('definition') for path in changed + removed if path in self.results}
+        dependents = set()
+        for path in changed + removed:
+            dependents |= self.index.dependents(path, [before.get(path)])
+        for path in removed:
+            self.results.pop(path, None)
+        checked, _ = validate_files(changed, cache=self.cache, jobs=self.jobs)
+        for result in checked:
+            self.results[result['path']] = result
+        self.index = ReferenceIndex(list(self.results.values()))
+        for result in checked:
+            dependents |= self.index.dependents(result['path'], [result.get('definition')])
+        dependents = sorted(path for path in dependents - set(changed) if path in self.results)
+        
+        reports = [(self.results[path], self.index.check(self.results[path])) for path in changed + dependents]
+        return {'changed': changed, 'removed': removed, 'dependents': dependents, 'reports': reports,
+                'seconds': time.perf_counter() - started}
+    
+    def run(self, interval: float = 0.5) -> None:
+        """Poll every interval seconds and print what changed, until interrupted."""
+        print(f"\n👀 Watching {len(self.snapshot)} YAML file(s) under {self.root_dir} "
+              f"(every {interval:g}s, Ctrl+C to stop)", flush=True)
+        try:
+            while True:
+                time.sleep(interval)
+                update = self.poll()
+                if update is None:
+                    continue
+                for path in update['removed']:
+                    print(f"\n🗑️  Removed: {path}")
+                for result, reference_messages in update['reports']:
+                    print_result(result, reference_messages)
+                failed = sum(not result['valid'] for result, _ in update['reports'])
+                print(f"\n🔄 {datetime.now().strftime('%H:%M:%S')} re-validated {len(update['changed'])} changed "
+                      f"and {len(update['dependents'])} dependent file(s) in {update['seconds'] * 1000:.0f} ms"
+                      + (f" - {failed} with syntax errors" if failed else ""), flush=True)
+        except KeyboardInterrupt:
+            print("\n⏹️  Stopped watching")
+
+
+def git_changed_files(ref: str = None, staged: bool = False) -> List[str]:
+    """
+    YAML files changed against a git ref (or staged for commit).
     
-    return True
+    Args:
+        ref: Commit to compare the working tree with (plus untracked files)
+        staged: Use the files staged in the index instead
+        
+    Returns:
+        Existing changed YAML files, relative to the current directory
+    """
+    command = ['git', 'diff', '--name-only', '--diff-filter=ACMR', '--relative']
+    command += ['--cached'] if staged else [ref or 'HEAD']
+    listed = subprocess.run(command, capture_output=True, text=True, check=True).stdout.splitlines()
+    if not staged:
+        listed += subprocess.run(['git', 'ls-files', '--others', '--exclude-standard'],
+                                 capture_output=True, text=True, check=True).stdout.splitlines()
+    return sorted({path for path in listed if path.endswith(('.yml', '.yaml')) and os.path.isfile(path)})
+
+
+def validate_scope(changed: List[str], root_dir: str = '.', cache: ValidationCache = None,
+                   jobs: int = None) -> Tuple[List[Dict], ReferenceIndex, Dict]:
+    """
+    Validate changed files plus the YAMLs they reference and the ones referencing them.
+    
+    Instead of parsing the whole tree, the raw text of the other YAML files
+    is searched for the asset names and file names involved; only files
+    that mention one are parsed (through the cache) and indexed.
+    
+    Args:
+        changed: Changed YAML files
+        root_dir: Root of the tree to search for related files
+        cache: Optional ValidationCache
+        jobs: Worker processes for parsing
+        
+    Returns:
+        Tuple of (results to report: changed files first, then related ones,
+        the ReferenceIndex, stats dict)
+    """
+    started = time.perf_counter()
+    changed_results, _ = validate_files(changed, cache=cache, jobs=jobs)
+    
+    # Names to look for: what the changed files define and reference, and their file names
+    needles = set()
+    referenced_paths = set()
+    for result in changed_results:
+        needles.add(os.path.basename(result['path']))
+        if result.get('definition'):
+            needles.add(result['definition']['name'])
+        base_dir = os.path.dirname(os.path.abspath(result['path']))
+        for reference in result.get('references', []):
+            kind, target = ReferenceIndex._target(reference, base_dir)
+            if kind != 'path':
+                needles.add(target)
+            elif target.endswith(('.yml', '.yaml')) and os.path.isfile(target):
+                referenced_paths.add(target)
+    encoded = [needle.encode('utf-8') for needle in needles]
+    
+    known = {os.path.abspath(path) for path in changed}
+    candidates = []
+    tree_files = find_yaml_files(root_dir)
+    for file_path in tree_files:
+        absolute = os.path.abspath(file_path)
+        if absolute in known:
+            continue
+        if absolute in referenced_paths:
+            candidates.append(file_path)
+            continue
+        try:
+            with open(file_path, 'rb') as f:
+                data = f.read()
+        except OSError:
+            continue
+        if any(needle in data for needle in encoded):
+            candidates.append(file_path)
+    candidate_results, candidate_stats = validate_files(candidates, cache=cache, jobs=jobs)
+    index = ReferenceIndex(changed_results + candidate_results)
+    
+    # Report the related files that are actually referenced by, or reference, a changed file
+    related = set()
+    for result in changed_results:
+        base_dir = os.path.dirname(os.path.abspath(result['path']))
+        for reference in result.get('references', []):
+            kind, target = ReferenceIndex._target(reference, base_dir)
+            if kind == 'path':
+                related.add(target)
+            else:
+                related.update(os.path.abspath(path) for _, path in index.definitions.get((kind, target), []))
+        related.update(os.path.abspath(path) for path in index.dependents(result['path'], [result.get('definition')]))
+    related_results = [result for result in candidate_results if os.path.abspath(result['path']) in related]
+    
+    return changed_results + related_results, index, {
+        'changed': len(changed_results),
+        'related': len(related_results),
+        'tree_files': len(tree_files),
+        'parsed': len(changed_results) + candidate_stats['parsed'],
+        'seconds': time.perf_counter() - started,
+    }
 
 
 def find_yaml_files(root_dir: str = '.', excluded_dirs: set = None) -> List[str]:
@@ -292,6 +842,21 @@ Examples:
   
   # Validate specific directory
   python validate_yaml.py --directory mlops/azureml/train
+  
+  # Re-parse everything, in 8 processes
+  python validate_yaml.py --all --no_cache --jobs 8
+  
+  # Per-file checks only, without resolving cross-file references
+  python validate_yaml.py mlops/azureml/train/newpipeline.yml --no_refs
+  
+  # Re-validate on every save (changed files and the files referencing them)
+  python validate_yaml.py --watch
+  
+  # Pre-commit hook: staged YAMLs and the YAMLs they reference; reference errors fail it
+  python validate_yaml.py --staged --strict
+  
+  # Everything changed on this branch
+  python validate_yaml.py --changed origin/main
         """
     )
     
@@ -309,8 +874,60 @@ Examples:
         '--directory',
         help='Validate all YAML files in a specific directory'
     )
+    parser.add_argument(
+        '--changed',
+        nargs='?',
+        const='HEAD',
+        metavar='REF',
+        help='Validate YAML files changed against a git ref (default HEAD, untracked included)'
+    )
+    parser.add_argument(
+        '--staged',
+        action='store_true',
+        help='Validate YAML files staged for commit (for a pre-commit hook)'
+    )
+    parser.add_argument(
+        '--jobs',
+        type=int,
+        default=None,
+        help='Worker processes for parsing (default: CPU count; 1 = no pool)'
+    )
+    parser.add_argument(
+        '--cache',
+        default=DEFAULT_CACHE_FILE,
+        help=f'Result cache file (default: {DEFAULT_CACHE_FILE})'
+    )
+    parser.add_argument(
+        '--no_cache',
+        action='store_true',
+        help='Parse every file again and leave the cache untouched'
+    )
+    parser.add_argument(
+        '--no_refs',
+        action='store_true',
+        help='Skip resolving component, environment, data and path references'
+    )
+    parser.add_argument(
+        '--strict',
+        action='store_true',
+        help='Also fail on reference errors: unresolved paths, asset versions the repo no longer defines '
+             'and ambiguous names'
+    )
+    parser.add_argument(
+        '--watch',
+        action='store_true',
+        help='Keep running and re-validate files (and their dependents) when they change'
+    )
+    parser.add_argument(
+        '--interval',
+        type=float,
+        default=0.5,
+        help='Seconds between checks for changes in --watch mode (default: 0.5)'
+    )
     
     args = parser.parse_args()
+    if args.watch and not (args.file or args.directory):
+        args.all = True
     
     # Determine which files to validate
     files_to_validate = []
@@ -324,6 +941,16 @@ Examples:
             sys.exit(1)
         print(f"🔍 Finding YAML files in {args.directory}...")
         files_to_validate = find_yaml_files(args.directory)
+    elif args.staged or args.changed:
+        try:
+            files_to_validate = git_changed_files(args.changed, staged=args.staged)
+        except (OSError, subprocess.CalledProcessError) as e:
+            print(f"❌ Could not list changed files with git: {getattr(e, 'stderr', None) or e}")
+            sys.exit(1)
+        print(f"🔍 {'Staged' if args.staged else 'Changed'} YAML files: {len(files_to_validate)}")
+        if not files_to_validate:
+            print("✅ No YAML files to validate")
+            sys.exit(0)
     elif args.file:
         if not os.path.exists(args.file):
             print(f"❌ File not found: {args.file}")
@@ -339,12 +966,42 @@ Examples:
     
     print(f"📋 Found {len(files_to_validate)} YAML file(s) to validate")
     
-    # Validate each file
+    # Validate the files (cached results first, the rest in parallel). The
+    # rest of the repo is checked too (mostly from the cache), to index what
+    # every file defines before resolving the selected files' references
+    cache = None if args.no_cache else ValidationCache(args.cache)
+    if (args.staged or args.changed) and not args.no_refs:
+        # Only the changed files and the YAMLs related to them
+        reported, index, stats = validate_scope(files_to_validate, cache=cache, jobs=args.jobs)
+    else:
+        selected = {os.path.normpath(f): f for f in files_to_validate}
+        index_files = [] if args.no_refs else [f for f in find_yaml_files() if os.path.normpath(f) not in selected]
+        results, stats = validate_files(list(selected.values()) + index_files, cache=cache, jobs=args.jobs)
+        index = None if args.no_refs else ReferenceIndex(results)
+        reported = results[:len(selected)]
     all_valid = True
-    for file_path in files_to_validate:
-        if not validate_file(file_path):
+    for result in reported:
+        print_result(result, index.check(result) if index else ())
+        if not result['valid']:
             all_valid = False
     
+    if 'changed' in stats:
+        print(f"\n📈 {stats['changed']} changed and {stats['related']} related file(s) in {stats['seconds']:.2f}s; "
+              f"{stats['parsed']} of {stats['tree_files']} YAML file(s) in the tree parsed")
+    else:
+        print(f"\n📈 {stats['files']} file(s) in {stats['seconds']:.2f}s: {stats['cached']} from cache, "
+              f"{stats['parsed']} parsed ({stats['workers']} worker(s))")
+    if index:
+        print(f"🔗 {index.stats['references']} reference(s) checked: {index.stats['dangling']} unresolved, "
+              f"{index.stats['ambiguous']} ambiguous")
+        if args.strict and index.stats['errors']:
+            print(f"❌ {index.stats['errors']} reference error(s) (--strict)")
+            all_valid = False
+    
+    if args.watch:
+        TreeWatcher(args.directory or '.', cache=cache, jobs=args.jobs).run(interval=args.interval)
+        sys.exit(0)
+    
     # Summary
     print("\n" + "=" * 60)
     if all_valid: